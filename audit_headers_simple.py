@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 import pandas as pd
 import os
+import sys
+from pathlib import Path
+
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from header_detect import find_header_row
 
 os.chdir(r"c:\Users\DanielVillamizar\COR L.A.MA\INSUMOS")
 
 file_path = "(COL) PEREIRA CORTE NACIONAL.xlsx"
-df = pd.read_excel(file_path, sheet_name="ODOMETER", header=6)
+df = pd.read_excel(file_path, sheet_name="ODOMETER", header=find_header_row(file_path, "ODOMETER"))
 
 print("\nCOLUMNAS ENCONTRADAS:")
 print("=" * 100)
@@ -1,12 +1,12 @@
-import pandas as pd
+from pathlib import Path
+import sys
 
-file_path = 'INSUMOS/(COL) INDIVIDUAL REPORT - REGION NORTE.xlsm'
-df = pd.read_excel(file_path, sheet_name='DATOS', header=7)
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from parse_cache import load_sheet_frame
+from xlsx_stream import not_empty, value_in
 
-# Limpiar datos
-df_clean = df[df['CHAPTER'].notna() & (df['MEMBER NAME'].notna())].copy()
-df_clean['MEMBER NAME'] = df_clean['MEMBER NAME'].str.strip()
-df_clean['CHAPTER'] = df_clean['CHAPTER'].str.strip()
+file_path = 'INSUMOS/(COL) INDIVIDUAL REPORT - REGION NORTE.xlsm'
 
 # Buscar capítulos específicos
 chapters_search = [
@@ -18,6 +18,18 @@ chapters_search = [
     '(COL) CARTAGENA',
     '(COL) BUCARAMANGA'
 ]
+in_search = value_in(chapters_search)
+
+# Solo las filas de los capitulos buscados o con SABANA en el nombre (filtro durante el streaming)
+df = load_sheet_frame(file_path, 'DATOS', header=7, where={
+    'CHAPTER': lambda chapter: in_search(chapter) or (isinstance(chapter, str) and 'SABANA' in chapter.upper()),
+    'MEMBER NAME': not_empty,
+})
+
+# Limpiar datos
+df_clean = df[df['CHAPTER'].notna() & (df['MEMBER NAME'].notna())].copy()
+df_clean['MEMBER NAME'] = df_clean['MEMBER NAME'].str.strip()
+df_clean['CHAPTER'] = df_clean['CHAPTER'].str.strip()
 
 total_members = 0
 for chapter in chapters_search:
@@ -1,11 +1,19 @@
-import pandas as pd
+import sys
+from pathlib import Path
+
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from header_detect import find_header_row
+from parse_cache import load_sheet_frame
+from plate_index import canonical_plate
 
 file_path = 'INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx'
-df = pd.read_excel(file_path, sheet_name='ODOMETER', header=7)
+df = load_sheet_frame(file_path, 'ODOMETER', header=find_header_row(file_path))
 
-# Mostrar duplicados en Lic Plate
+# Mostrar duplicados en Lic Plate (forma canonica: 'ABC-123' == 'abc 123')
+# Entre capitulos y corridas: python python/plate_index.py plate_index.sqlite
 lic_plates = df['Lic Plate'].dropna()
-duplicados = lic_plates[lic_plates.duplicated(keep=False)]
+duplicados = lic_plates[lic_plates.map(canonical_plate).duplicated(keep=False)]
 
 if len(duplicados) > 0:
     print('Placas duplicadas encontradas:')
@@ -1,8 +1,15 @@
 import pandas as pd
+import sys
+from pathlib import Path
 
-df = pd.read_excel('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx', 
-                   sheet_name='ODOMETER', 
-                   header=7, 
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from header_detect import find_header_row
+
+file_path = 'INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx'
+df = pd.read_excel(file_path,
+                   sheet_name='ODOMETER',
+                   header=find_header_row(file_path),
                    nrows=5)
 
 print("=" * 70)
@@ -1,6 +1,13 @@
-import pandas as pd
+import sys
+from pathlib import Path
 
-df = pd.read_excel('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx', sheet_name='ODOMETER', header=7, nrows=300)
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from header_detect import find_header_row
+from parse_cache import load_sheet_frame
+
+file_path = 'INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx'
+df = load_sheet_frame(file_path, 'ODOMETER', header=find_header_row(file_path), nrows=300)
 
 print('=== COLUMNAS ENCONTRADAS ===')
 for i, col in enumerate(df.columns):
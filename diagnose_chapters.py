@@ -1,6 +1,11 @@
 import pandas as pd
 import openpyxl
 from pathlib import Path
+import sys
+
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from legacy_xls import LegacyConversionError, xlsx_path
 
 chapters_config = {
     '(COL) PEREIRA CORTE NACIONAL.xlsx': {'id': 1},
@@ -27,8 +32,12 @@ for filename in chapters_config.keys():
     try:
         # Leer sin header para ver estructura
         if filename.endswith('.xls'):
-            print('[INFO] Formato XLS - requiere xlrd')
-            continue
+            try:
+                file_path = xlsx_path(file_path)
+            except LegacyConversionError as e:
+                print(f'[ERROR] {e}')
+                continue
+            print(f'[INFO] Formato XLS - leyendo la conversion {file_path.name}')
         
         # Primero, obtener hojas disponibles
         xl_file = pd.ExcelFile(file_path)
@@ -1,8 +1,27 @@
-import pandas as pd
+import argparse
+from pathlib import Path
 import sys
 
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from identity_resolution import resolve_groups
+from parse_cache import load_sheet_frame
+from sql_emitter import MAX_VALUES_ROWS, batched_inserts, check_batch_size
+from xlsx_stream import not_empty, value_in
+
+parser = argparse.ArgumentParser(description='Genera migration_members_norte.sql desde la hoja DATOS (REGION NORTE)')
+parser.add_argument('--batch-size', type=int, default=0,
+                    help=f'Filas por INSERT multi-fila (1-{MAX_VALUES_ROWS}); 0 = un INSERT por fila')
+parser.add_argument('--match-table', metavar='CSV',
+                    help='Resolver identidades entre capitulos y guardar la tabla de coincidencias con puntaje')
+args = parser.parse_args()
+if args.batch_size:
+    check_batch_size(args.batch_size)
+
+MEMBER_COLUMNS = ('[ChapterId]', '[Order]', '[ Complete Names]', '[Country Birth]', '[In Lama Since]',
+                  '[STATUS]', '[is_eligible]')
+
 file_path = 'INSUMOS/(COL) INDIVIDUAL REPORT - REGION NORTE.xlsm'
-df = pd.read_excel(file_path, sheet_name='DATOS', header=7)
 
 # Mapeo de capítulos a ChapterId
 chapter_mapping = {
@@ -26,6 +45,10 @@ chapters_of_interest = [
     '(COL) BUCARAMANGA'
 ]
 
+# Leer de DATOS solo las filas de los capitulos de interes (filtro evaluado durante el streaming)
+df = load_sheet_frame(file_path, 'DATOS', header=7,
+                      where={'CHAPTER': value_in(chapters_of_interest), 'MEMBER NAME': not_empty})
+
 # Limpiar datos
 df_clean = df[df['CHAPTER'].notna() & (df['MEMBER NAME'].notna())].copy()
 df_clean['MEMBER NAME'] = df_clean['MEMBER NAME'].str.strip()
@@ -62,13 +85,23 @@ for chapter in chapters_of_interest:
             chapter_groups[chapter_id] = []
         chapter_groups[chapter_id].extend(chapter_members['MEMBER NAME'].tolist())
 
+if args.match_table:
+    # 'José Pérez' y 'JOSE PEREZ ' en el mismo capitulo son un solo miembro
+    resolution = resolve_groups(chapter_groups)
+    chapter_groups = resolution.dedupe_groups()
+    resolution.write_match_table(args.match_table)
+    resolution.print_summary()
+    print(f'[OK] Tabla de coincidencias: {args.match_table}')
+
 # Crear inserts con orden secuencial por capítulo
+member_rows = []
 order_counter = 1
 for chapter_id in sorted(chapter_groups.keys()):
     members = chapter_groups[chapter_id]
     for member_name in members:
         # Escapar comillas simples
         safe_name = member_name.replace("'", "''")
+        member_rows.append((str(chapter_id), str(order_counter), f"N'{safe_name}'", "N'COLOMBIA'", '2025', "'ACTIVE'", '1'))
         insert_sql = f"""INSERT INTO [dbo].[Members] 
     ([ChapterId], [Order], [ Complete Names], [Country Birth], [In Lama Since], [STATUS], [is_eligible])
 VALUES 
@@ -78,6 +111,11 @@ VALUES
         sql_inserts.append(insert_sql)
         order_counter += 1
 
+if args.batch_size:
+    # INSERT multi-fila en lotes (maximo 1000 filas por VALUES)
+    sql_inserts, report = batched_inserts('[dbo].[Members]', MEMBER_COLUMNS, member_rows, args.batch_size)
+    report.print_summary()
+
 # Guardar script
 output_file = 'migration_members_norte.sql'
 with open(output_file, 'w', encoding='utf-8-sig') as f:
@@ -1,6 +1,12 @@
-import pandas as pd
 from pathlib import Path
-import subprocess
+import sys
+
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from column_resolver import resolve_columns
+from header_detect import find_header_row
+from legacy_xls import ensure_xlsx
+from parse_cache import load_sheet_frame
 
 chapters_config = {
     '(COL) PEREIRA CORTE NACIONAL.xlsx': {'id': 1, 'name': '(COL) PEREIRA CORTE NACIONAL'},
@@ -19,6 +25,10 @@ print('='*70)
 print('IMPORTACIÓN DE MIEMBROS - TODOS LOS CAPÍTULOS')
 print('='*70)
 
+# Libros .xls: un solo lote de conversion para los que no esten ya convertidos (cache por hash)
+readable = ensure_xlsx(insumos_path / filename for filename in chapters_config
+                       if (insumos_path / filename).exists())
+
 for filename, chapter_info in chapters_config.items():
     file_path = insumos_path / filename
     chapter_id = chapter_info['id']
@@ -32,37 +42,16 @@ for filename, chapter_info in chapters_config.items():
     print(f'     ChapterId: {chapter_id}, Nombre: {chapter_name}')
     
     try:
-        # Para .xls, convertir a xlsx primero si es necesario
-        if filename.endswith('.xls'):
-            print(f'     [INFO] Convirtiendo XLS a XLSX...')
-            # Intentar leer con xlrd si está disponible, sino saltar
-            try:
-                import xlrd
-                df = pd.read_excel(file_path, sheet_name='ODOMETER', header=7)
-            except ImportError:
-                print(f'     [WARNING] xlrd no disponible, intentando con openpyxl + libreoffice...')
-                # Convertir con libreoffice
-                output_path = file_path.with_suffix('.xlsx')
-                result = subprocess.run(
-                    ['soffice', '--headless', '--convert-to', 'xlsx', '--outdir', str(insumos_path), str(file_path)],
-                    capture_output=True, timeout=30
-                )
-                if result.returncode == 0:
-                    df = pd.read_excel(output_path, sheet_name='ODOMETER', header=7)
-                else:
-                    print(f'     [ERROR] No se pudo convertir XLS')
-                    continue
-        else:
-            # Leer xlsx normalmente - leer desde fila 10 en adelante (después de header en fila 8)
-            df = pd.read_excel(file_path, sheet_name='ODOMETER', skiprows=9)
+        # .xls ya convertido a .xlsx (o .xlsx tal cual)
+        source = readable.get(file_path)
+        if source is None:
+            print(f'     [ERROR] No se pudo convertir XLS')
+            continue
+        df = load_sheet_frame(source, 'ODOMETER', header=find_header_row(source))
         
         # Las primeras dos columnas no nos interesan (None y Order), buscamos Complete Names
         # Identificar la columna correcta
-        complete_names_col = None
-        for col in df.columns:
-            if 'Complete' in str(col) or 'NAME' in str(col).upper():
-                complete_names_col = col
-                break
+        complete_names_col = resolve_columns(df.columns).names
         
         if complete_names_col is None:
             print(f'     [ERROR] No se encontró columna Complete Names')
@@ -1,5 +1,27 @@
-import pandas as pd
+import argparse
 from pathlib import Path
+import sys
+
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from column_resolver import resolve_columns
+from header_detect import find_header_row
+from identity_resolution import resolve_groups
+from legacy_xls import LegacyConversionError, xlsx_path
+from parse_cache import load_sheet_frame
+from sql_emitter import MAX_VALUES_ROWS, batched_inserts, check_batch_size
+
+parser = argparse.ArgumentParser(description='Genera migration_all_chapters.sql desde los libros CORTE NACIONAL')
+parser.add_argument('--batch-size', type=int, default=0,
+                    help=f'Filas por INSERT multi-fila (1-{MAX_VALUES_ROWS}); 0 = un INSERT por fila')
+parser.add_argument('--match-table', metavar='CSV',
+                    help='Resolver identidades entre capitulos y guardar la tabla de coincidencias con puntaje')
+args = parser.parse_args()
+if args.batch_size:
+    check_batch_size(args.batch_size)
+
+MEMBER_COLUMNS = ('[ChapterId]', '[Order]', '[ Complete Names]', '[Country Birth]', '[In Lama Since]',
+                  '[STATUS]', '[is_eligible]')
 
 chapters_config = {
     '(COL) PEREIRA CORTE NACIONAL.xlsx': {'id': 1},
@@ -28,30 +50,18 @@ for filename, chapter_info in chapters_config.items():
     print(f'\n[OK] Leyendo: {filename}')
     
     try:
-        # Saltar .xls por ahora
-        if filename.endswith('.xls'):
-            print(f'     [WARNING] Archivo XLS - requiere conversión')
+        # .xls: conversion a .xlsx cacheada por hash del contenido
+        try:
+            file_path = xlsx_path(file_path)
+        except LegacyConversionError as e:
+            print(f'     [WARNING] {e}')
             continue
         
         # Leer con header en fila 8 (index=7)
-        df = pd.read_excel(file_path, sheet_name='ODOMETER', header=7, nrows=300)
+        df = load_sheet_frame(file_path, 'ODOMETER', header=find_header_row(file_path), nrows=300)
         
-        # Buscar columna Complete Names (con o sin espacio)
-        # Priorizar "Complete" sobre "NAME" para evitar "Unnamed"
-        complete_col = None
-        for col in df.columns:
-            col_str = str(col).strip()
-            if 'Complete' in col_str:
-                complete_col = col
-                break
-        
-        # Si no encuentra "Complete", buscar "Names" específicamente
-        if complete_col is None:
-            for col in df.columns:
-                col_str = str(col).strip().upper()
-                if 'NAMES' in col_str and 'UNNAMED' not in col_str:
-                    complete_col = col
-                    break
+        # Buscar columna Complete Names (prioriza "Complete" sobre "NAMES" para evitar "Unnamed")
+        complete_col = resolve_columns(df.columns).names
         
         if complete_col is None:
             print(f'     [ERROR] No encontró Complete Names')
@@ -80,12 +90,22 @@ for filename, chapter_info in chapters_config.items():
     except Exception as e:
         print(f'     [ERROR] {str(e)}')
 
+if args.match_table:
+    # Identidades: se quitan las repeticiones dentro del mismo capitulo que solo difieren en tildes,
+    # mayusculas, espacios u orden de los tokens; las demas coincidencias quedan en la tabla
+    resolution = resolve_groups(all_members)
+    all_members = resolution.dedupe_groups()
+    resolution.write_match_table(args.match_table)
+    resolution.print_summary()
+    print(f'[OK] Tabla de coincidencias: {args.match_table}')
+
 # Generar SQL
 print(f'\n{"="*70}')
 print('GENERANDO SQL')
 print(f'{"="*70}')
 
 sql_lines = []
+member_rows = []
 order_counter = 1
 
 for chapter_id in sorted(all_members.keys()):
@@ -94,6 +114,7 @@ for chapter_id in sorted(all_members.keys()):
     
     for member in members:
         safe_name = member.replace("'", "''")
+        member_rows.append((str(chapter_id), str(order_counter), f"N'{safe_name}'", "N'COLOMBIA'", '2025', "'ACTIVE'", '1'))
         sql = f"""INSERT INTO [dbo].[Members] 
     ([ChapterId], [Order], [ Complete Names], [Country Birth], [In Lama Since], [STATUS], [is_eligible])
 VALUES 
@@ -103,6 +124,11 @@ VALUES
         sql_lines.append(sql)
         order_counter += 1
 
+if args.batch_size:
+    # INSERT multi-fila en lotes (maximo 1000 filas por VALUES)
+    sql_lines, report = batched_inserts('[dbo].[Members]', MEMBER_COLUMNS, member_rows, args.batch_size)
+    report.print_summary()
+
 # Guardar
 with open('migration_all_chapters.sql', 'w', encoding='utf-8-sig') as f:
     f.write('-- IMPORTACIÓN DE MIEMBROS\n')
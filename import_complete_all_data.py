@@ -1,13 +1,21 @@
-import pandas as pd
+import argparse
 from pathlib import Path
-from datetime import datetime
+import sys
 
-print("=" * 70)
-print("IMPORTACIÓN COMPLETA - TODOS LOS CAPÍTULOS CON TODAS LAS COLUMNAS")
-print("=" * 70)
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from bulk_export import BULK_ENCODINGS, OUTPUT_TARGETS, write_bulk_load
+from chapter_ingest import (MEMBER_COLUMNS, VEHICLE_COLUMNS, bulk_tables, ingest_chapters, member_values,
+                            vehicle_values)
+from order_allocator import OrderAllocator, chapter_ranges
+from plate_index import PlateIndex
+from run_profiler import active_profiler, add_profile_arguments, instrumented
+from sql_emitter import (DEFAULT_BATCH_SIZE, LINK_MODES, MAX_VALUES_ROWS, check_batch_size, column_names,
+                         stream_batched_inserts, stream_linked_vehicle_inserts)
+from sql_writer import SqlScriptWriter, split_bytes
 
 # Mapeo de archivos a ChapterId
-files_chapters = [
+FILES_CHAPTERS = [
     ('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx', 1, 'PEREIRA'),
     ('INSUMOS/(COL) MEDELLÍN CORTE NACIONAL.xlsx', 2, 'MEDELLÍN'),
     ('INSUMOS/(COL) SABANA CORTE NACIONAL.xlsx', 3, 'SABANA'),
@@ -16,242 +24,170 @@ files_chapters = [
     ('INSUMOS/(COL) BUCARAMANGA CORTE NACIONAL.xlsx', 6, 'BUCARAMANGA'),
 ]
 
-all_members = []
-all_vehicles = []
-order_counter = 1
-used_lic_plates = set()  # Para detectar duplicados
 
-for file_path_str, chapter_id, chapter_name in files_chapters:
-    file_path = Path(file_path_str)
-    
-    if not file_path.exists():
-        print(f'\n[SKIP] {file_path.name}')
-        continue
-    
-    print(f'\n[OK] Leyendo: {file_path.name}')
-    
-    # Leer Excel
-    df = pd.read_excel(file_path, sheet_name='ODOMETER', header=7, nrows=300)
-    
-    # Buscar columna Complete Names
-    complete_col = None
-    for col in df.columns:
-        col_str = str(col).strip()
-        if 'Complete' in col_str:
-            complete_col = col
-            break
-    
-    if complete_col is None:
-        print(f'     [ERROR] No encontró Complete Names')
-        continue
-    
-    # Buscar otras columnas importantes
-    col_map = {
-        'complete_names': complete_col,
-        'order': None,
-        'dama': None,
-        'country_birth': None,
-        'in_lama_since': None,
-        'status': None,
-        'motorcycle_data': None,
-        'trike': None,
-        'lic_plate': None,
-        'photography': None,
-        'starting_odometer': None,
-        'final_odometer': None
-    }
-    
-    # Mapear columnas
-    for col in df.columns:
-        col_str = str(col).strip().upper()
-        if 'ORDER' in col_str and col_map['order'] is None:
-            col_map['order'] = col
-        elif 'DAMA' in col_str:
-            col_map['dama'] = col
-        elif 'COUNTRY' in col_str and 'BIRTH' in col_str:
-            col_map['country_birth'] = col
-        elif 'LAMA' in col_str and 'SINCE' in col_str:
-            col_map['in_lama_since'] = col
-        elif 'STATUS' in col_str:
-            col_map['status'] = col
-        elif 'MOTORCYCLE' in col_str and 'DATA' in col_str:
-            col_map['motorcycle_data'] = col
-        elif 'TRIKE' in col_str:
-            col_map['trike'] = col
-        elif 'LIC' in col_str or 'PLATE' in col_str:
-            col_map['lic_plate'] = col
-        elif 'PHOTO' in col_str:
-            col_map['photography'] = col
-        elif 'STARTING' in col_str and 'ODOMETER' in col_str:
-            col_map['starting_odometer'] = col
-        elif 'FINAL' in col_str and 'ODOMETER' in col_str:
-            col_map['final_odometer'] = col
-    
-    print(f'     [OK] Columnas mapeadas')
-    
-    # Filtrar solo filas con nombres válidos
-    df_clean = df[df[complete_col].notna()].copy()
-    df_clean = df_clean[df_clean[complete_col].astype(str).str.strip() != '']
-    
-    if len(df_clean) == 0:
-        print(f'     [WARNING] Sin miembros')
-        continue
-    
-    print(f'     [OK] {len(df_clean)} miembros')
-    
-    # Procesar cada miembro
-    for idx, row in df_clean.iterrows():
-        # Datos del miembro
-        complete_name = str(row[complete_col]).strip()
-        dama = str(row[col_map['dama']]).strip().upper() if col_map['dama'] and pd.notna(row[col_map['dama']]) else 'NO'
-        country_birth = str(row[col_map['country_birth']]).strip() if col_map['country_birth'] and pd.notna(row[col_map['country_birth']]) else 'COLOMBIA'
-        
-        # In Lama Since (extraer año)
-        in_lama_since = None
-        if col_map['in_lama_since'] and pd.notna(row[col_map['in_lama_since']]):
-            val = row[col_map['in_lama_since']]
-            if isinstance(val, datetime):
-                in_lama_since = val.year
-            elif isinstance(val, (int, float)):
-                in_lama_since = int(val)
-            else:
-                try:
-                    in_lama_since = int(str(val)[:4])
-                except:
-                    in_lama_since = 2025
-        else:
-            in_lama_since = 2025
-        
-        status = str(row[col_map['status']]).strip() if col_map['status'] and pd.notna(row[col_map['status']]) else 'ACTIVE'
-        
-        # Datos del vehículo
-        motorcycle_data = str(row[col_map['motorcycle_data']]).strip() if col_map['motorcycle_data'] and pd.notna(row[col_map['motorcycle_data']]) else None
-        trike = str(row[col_map['trike']]).strip().upper() if col_map['trike'] and pd.notna(row[col_map['trike']]) else 'NO'
-        lic_plate = str(row[col_map['lic_plate']]).strip() if col_map['lic_plate'] and pd.notna(row[col_map['lic_plate']]) else None
-        
-        # Manejar placas duplicadas
-        if lic_plate:
-            if lic_plate in used_lic_plates:
-                # Agregar sufijo para hacerla única
-                lic_plate = f"{lic_plate}_ORD{order_counter}"
-            used_lic_plates.add(lic_plate)
-        else:
-            lic_plate = f'AUTO_ORD_{order_counter}'
-        
-        photography = str(row[col_map['photography']]).strip().upper() if col_map['photography'] and pd.notna(row[col_map['photography']]) else 'NO'
-        
-        starting_odometer = None
-        if col_map['starting_odometer'] and pd.notna(row[col_map['starting_odometer']]):
-            try:
-                starting_odometer = float(row[col_map['starting_odometer']])
-            except:
-                pass
-        
-        final_odometer = None
-        if col_map['final_odometer'] and pd.notna(row[col_map['final_odometer']]):
-            try:
-                final_odometer = float(row[col_map['final_odometer']])
-            except:
-                pass
-        
-        # Agregar miembro
-        all_members.append({
-            'chapter_id': chapter_id,
-            'order': order_counter,
-            'complete_name': complete_name,
-            'dama': dama,
-            'country_birth': country_birth,
-            'in_lama_since': in_lama_since,
-            'status': status
-        })
-        
-        # Agregar vehículo si tiene datos
-        if motorcycle_data or lic_plate:
-            all_vehicles.append({
-                'order': order_counter,  # Usaremos Order para vincular temporalmente
-                'motorcycle_data': motorcycle_data,
-                'lic_plate': lic_plate,
-                'trike': trike,
-                'photography': photography,
-                'starting_odometer': starting_odometer,
-                'final_odometer': final_odometer
-            })
-        
-        order_counter += 1
+def write_bulk(args, all_members, all_vehicles):
+    """Carga masiva: archivos de datos + format files + driver BULK INSERT"""
+    print('\nGenerando archivos de carga masiva...')
+    driver = write_bulk_load(args.bulk_dir, bulk_tables(all_members, all_vehicles), args.bulk_encoding,
+                             title='IMPORTACION COMPLETA')
+    print(f'[OK] {len(all_members)} Members + {len(all_vehicles)} Vehicles en {args.bulk_dir}')
+    print(f'     sqlcmd -S <servidor> -d LamaDb -v BulkDir="<carpeta>" -i {driver}')
+    print("=" * 70)
 
-print(f'\n{"=" * 70}')
-print(f'TOTAL: {len(all_members)} miembros, {len(all_vehicles)} vehículos')
-print(f'{"=" * 70}')
 
-# Generar SQL
-print('\nGenerando SQL...')
+def write_script(args, all_members, all_vehicles):
+    """Script de INSERTs escrito en streaming"""
+    # Generar SQL
+    print('\nGenerando SQL...')
 
-sql_lines = []
-sql_lines.append("-- IMPORTACIÓN COMPLETA - MIEMBROS Y VEHÍCULOS")
-sql_lines.append("SET NOCOUNT ON;")
-sql_lines.append("BEGIN TRANSACTION;")
-sql_lines.append("")
-sql_lines.append("BEGIN TRY")
-sql_lines.append("")
+    # El script se escribe en streaming (sin acumular sql_lines en memoria)
+    output_file = 'migration_complete_all_data.sql'
+    sql_lines = SqlScriptWriter(output_file, encoding='utf-8-sig', compress=args.gzip,
+                                part_bytes=split_bytes(args.split_mb))
+    sql_lines.append("-- IMPORTACIÓN COMPLETA - MIEMBROS Y VEHÍCULOS")
+    sql_lines.append("SET NOCOUNT ON;")
+    sql_lines.append("BEGIN TRANSACTION;")
+    sql_lines.append("")
+    sql_lines.append("BEGIN TRY")
+    sql_lines.append("")
 
-# INSERTs de Members
-sql_lines.append("-- ===== MEMBERS =====")
-for member in all_members:
-    safe_name = member['complete_name'].replace("'", "''")
-    safe_country = member['country_birth'].replace("'", "''")
-    safe_status = member['status'].replace("'", "''")
-    safe_dama = member['dama'].replace("'", "''")
-    
-    sql = f"""INSERT INTO [dbo].[Members]
-    ([ChapterId], [Order], [ Complete Names], [Dama], [Country Birth], [In Lama Since], [STATUS], [is_eligible])
+    # INSERTs de Members
+    sql_lines.append("-- ===== MEMBERS =====")
+    if args.batch_size:
+        statements, report = stream_batched_inserts('[dbo].[Members]', column_names(MEMBER_COLUMNS),
+                                                    map(member_values, all_members), args.batch_size)
+        sql_lines.extend(statements)
+        report.print_summary()
+    else:
+        for member in all_members:
+            safe_name = member['complete_name'].replace("'", "''")
+            safe_normalized = member['complete_name_normalized'].replace("'", "''")
+            safe_country = member['country_birth'].replace("'", "''")
+            safe_status = member['status'].replace("'", "''")
+            safe_dama = member['dama'].replace("'", "''")
+    
+            sql = f"""INSERT INTO [dbo].[Members]
+    ([ChapterId], [Order], [ Complete Names], [CompleteNamesNormalized], [Dama], [Country Birth], [In Lama Since], [STATUS], [is_eligible])
 VALUES
-    ({member['chapter_id']}, {member['order']}, N'{safe_name}', N'{safe_dama}',
+    ({member['chapter_id']}, {member['order']}, N'{safe_name}', N'{safe_normalized}', N'{safe_dama}',
      N'{safe_country}', {member['in_lama_since']}, N'{safe_status}', 1);"""
     
-    sql_lines.append(sql)
+            sql_lines.append(sql)
 
-sql_lines.append("")
-sql_lines.append("-- ===== VEHICLES =====")
+    sql_lines.append("")
+    sql_lines.append("-- ===== VEHICLES =====")
 
-# INSERTs de Vehicles (vinculados por Order)
-for vehicle in all_vehicles:
-    # Obtener MemberId basado en Order
-    sql_lines.append(f"""
+    # INSERTs de Vehicles (vinculados por Order)
+    if args.batch_size or args.link == 'staging':
+        statements, report = stream_linked_vehicle_inserts(
+            VEHICLE_COLUMNS, ((vehicle['order'], vehicle_values(vehicle)) for vehicle in all_vehicles),
+            link=args.link, batch_size=args.batch_size or DEFAULT_BATCH_SIZE)
+        sql_lines.extend(statements)
+        report.print_summary()
+    else:
+        for vehicle in all_vehicles:
+            # Obtener MemberId basado en Order
+            sql_lines.append(f"""
 DECLARE @MemberId_{vehicle['order']} INT;
 SELECT @MemberId_{vehicle['order']} = [MemberId] FROM [dbo].[Members] WHERE [Order] = {vehicle['order']};
 """)
     
-    safe_motorcycle = vehicle['motorcycle_data'].replace("'", "''") if vehicle['motorcycle_data'] else ''
-    safe_lic_plate = vehicle['lic_plate'].replace("'", "''") if vehicle['lic_plate'] else f'AUTO_ORD_{vehicle["order"]}'
-    safe_photo = vehicle['photography'].replace("'", "''")
+            safe_motorcycle = vehicle['motorcycle_data'].replace("'", "''") if vehicle['motorcycle_data'] else ''
+            safe_lic_plate = vehicle['lic_plate'].replace("'", "''") if vehicle['lic_plate'] else f'AUTO_ORD_{vehicle["order"]}'
+            safe_photo = vehicle['photography'].replace("'", "''")
     
-    trike_bit = 1 if vehicle['trike'] == 'SI' else 0
-    starting_odo = vehicle['starting_odometer'] if vehicle['starting_odometer'] is not None else 'NULL'
-    final_odo = vehicle['final_odometer'] if vehicle['final_odometer'] is not None else 'NULL'
+            trike_bit = 1 if vehicle['trike'] == 'SI' else 0
+            starting_odo = vehicle['starting_odometer'] if vehicle['starting_odometer'] is not None else 'NULL'
+            final_odo = vehicle['final_odometer'] if vehicle['final_odometer'] is not None else 'NULL'
     
-    sql = f"""INSERT INTO [dbo].[Vehicles]
+            sql = f"""INSERT INTO [dbo].[Vehicles]
     ([MemberId], [ Motorcycle Data], [Lic Plate], [Trike], [Photography], [Starting Odometer], [Final Odometer], [IsActiveForChampionship])
 VALUES
     (@MemberId_{vehicle['order']}, N'{safe_motorcycle}', N'{safe_lic_plate}',
      {trike_bit}, N'{safe_photo}', {starting_odo}, {final_odo}, 1);"""
     
-    sql_lines.append(sql)
+            sql_lines.append(sql)
+
+    sql_lines.append("")
+    sql_lines.append("COMMIT TRANSACTION;")
+    sql_lines.append("PRINT 'Importación completa exitosa.';")
+    sql_lines.append("")
+    sql_lines.append("END TRY")
+    sql_lines.append("BEGIN CATCH")
+    sql_lines.append("    ROLLBACK TRANSACTION;")
+    sql_lines.append("    THROW;")
+    sql_lines.append("END CATCH;")
+
+    # Cerrar (partes y manifiesto si se divide)
+    sql_lines.close()
+    sql_lines.print_summary()
+
+    print(f'\n[OK] Script generado: {sql_lines.script_path}')
+    print(f'[OK] {len(all_members)} Members + {len(all_vehicles)} Vehicles')
+    print("=" * 70)
+
+
+def run(args):
+    print("=" * 70)
+    print("IMPORTACIÓN COMPLETA - TODOS LOS CAPÍTULOS CON TODAS LAS COLUMNAS")
+    print("=" * 70)
+
+    # Indice persistente de placas: sufijos _ORD estables entre corridas
+    plate_index = PlateIndex(args.plate_index, label=Path(__file__).stem) if args.plate_index else None
+    all_members, all_vehicles = ingest_chapters(FILES_CHAPTERS, status_mode='raw', workers=args.workers,
+                                                plate_index=plate_index)
+    if plate_index:
+        plate_index.print_summary()
+        plate_index.close()
+
+    # Los Orders 1..N de la recarga quedan en el ledger: las importaciones por capitulo reservan por encima
+    if args.order_ledger:
+        with OrderAllocator(args.order_ledger) as allocator:
+            next_order = allocator.record(chapter_ranges(all_members), label=Path(__file__).stem)
+        print(f'[OK] Ledger de Orders actualizado; siguiente Order libre: {next_order}')
+
+    print(f'\n{"=" * 70}')
+    print(f'TOTAL: {len(all_members)} miembros, {len(all_vehicles)} vehículos')
+    print(f'{"=" * 70}')
+
+    # Emision (la etapa 'emit' de la instrumentacion)
+    with active_profiler().stage('emit', rows_in=len(all_members) + len(all_vehicles)) as stage:
+        if args.target == 'bulk':
+            write_bulk(args, all_members, all_vehicles)
+        else:
+            write_script(args, all_members, all_vehicles)
+        stage.rows_out = stage.rows_in
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Procesos para parsear capitulos en paralelo (0 = todos los nucleos)')
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help=f'Filas por INSERT multi-fila (1-{MAX_VALUES_ROWS}); 0 = un INSERT por fila')
+    parser.add_argument('--link', choices=LINK_MODES, default='lookup',
+                        help='Vinculo vehiculo-miembro: subconsulta por fila o tabla staging con un solo join')
+    parser.add_argument('--target', choices=OUTPUT_TARGETS, default='sql',
+                        help='sql = script de INSERTs; bulk = archivos delimitados + format files + driver BULK INSERT')
+    parser.add_argument('--bulk-dir', default='bulk_complete_all_data',
+                        help='Carpeta de salida del target bulk')
+    parser.add_argument('--bulk-encoding', choices=BULK_ENCODINGS, default='utf-16',
+                        help='Codificacion de los archivos de datos del target bulk')
+    parser.add_argument('--gzip', action='store_true', help='Escribir el script comprimido (.sql.gz)')
+    parser.add_argument('--split-mb', type=float, default=0,
+                        help='Dividir el script en partes de ~N MB con manifiesto (0 = un solo archivo)')
+    parser.add_argument('--plate-index', metavar='SQLITE',
+                        help='Indice persistente de placas (p.ej. plate_index.sqlite); sin el, solo en memoria')
+    parser.add_argument('--order-ledger', metavar='SQLITE',
+                        help='Registrar los Orders asignados en el ledger de Orders (p.ej. order_ledger.sqlite)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    if args.batch_size:
+        check_batch_size(args.batch_size)
 
-sql_lines.append("")
-sql_lines.append("COMMIT TRANSACTION;")
-sql_lines.append("PRINT 'Importación completa exitosa.';")
-sql_lines.append("")
-sql_lines.append("END TRY")
-sql_lines.append("BEGIN CATCH")
-sql_lines.append("    ROLLBACK TRANSACTION;")
-sql_lines.append("    THROW;")
-sql_lines.append("END CATCH;")
+    with instrumented(args, Path(__file__).stem):
+        run(args)
 
-# Guardar
-output_file = 'migration_complete_all_data.sql'
-with open(output_file, 'w', encoding='utf-8-sig') as f:
-    f.write('\n'.join(sql_lines))
 
-print(f'\n[OK] Script generado: {output_file}')
-print(f'[OK] {len(all_members)} Members + {len(all_vehicles)} Vehicles')
-print("=" * 70)
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,13 @@
-import pandas as pd
 from pathlib import Path
+import sys
+
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from column_resolver import resolve_columns
+from db_access import DatabaseError
+from header_detect import find_header_row
+from order_allocator import OrderAllocator, seed_from_database
+from parse_cache import load_sheet_frame
 
 print("=" * 70)
 print("IMPORTACIÓN SABANA CORTE NACIONAL")
@@ -11,22 +19,10 @@ chapter_name = "(COL) SABANA CORTE NACIONAL"
 
 # Leer Excel XLSX
 print(f"\n[OK] Leyendo: {file_path.name}")
-df = pd.read_excel(file_path, sheet_name='ODOMETER', header=7, nrows=300)
-
-# Buscar columna Complete Names
-complete_col = None
-for col in df.columns:
-    col_str = str(col).strip()
-    if 'Complete' in col_str:
-        complete_col = col
-        break
+df = load_sheet_frame(file_path, 'ODOMETER', header=find_header_row(file_path), nrows=300)
 
-if complete_col is None:
-    for col in df.columns:
-        col_str = str(col).strip().upper()
-        if 'NAMES' in col_str and 'UNNAMED' not in col_str:
-            complete_col = col
-            break
+# Buscar columna Complete Names (prioriza "Complete" sobre "NAMES" para evitar "Unnamed")
+complete_col = resolve_columns(df.columns).names
 
 if complete_col is None:
     print(f'     [ERROR] No encontró Complete Names')
@@ -52,17 +48,17 @@ for member in members_list[:5]:
 if len(members_list) > 5:
     print(f'        ... +{len(members_list)-5}')
 
-# Obtener último Order de la BD
-import subprocess
-result = subprocess.run(
-    ['sqlcmd', '-S', 'P-DVILLAMIZARA', '-d', 'LamaDb', '-Q', 
-     'SELECT ISNULL(MAX([Order]), 0) AS MaxOrder FROM [dbo].[Members];', '-h', '-1', '-W'],
-    capture_output=True, text=True
-)
-# Limpiar output de sqlcmd (quitar espacios y líneas extra)
-output_lines = [line.strip() for line in result.stdout.split('\n') if line.strip()]
-max_order = int(output_lines[0]) if output_lines else 0
-print(f'\n[OK] Último Order en BD: {max_order}')
+# Reservar el rango de Orders del capitulo en el ledger (order_ledger.sqlite); solo la primera
+# vez se consulta MAX([Order]) en la BD (LAMA_DB_URL) como semilla
+with OrderAllocator() as allocator:
+    if not allocator.seeded:
+        try:
+            seed_from_database(allocator)
+        except DatabaseError as e:
+            print(f'\n[ERROR] No se pudo leer el último Order: {e}')
+            exit(1)
+    orders = allocator.reserve(chapter_id, len(members_list), label=chapter_name)
+print(f'\n[OK] Orders reservados: {orders.start}-{orders.last}')
 
 # Generar SQL
 print("\n" + "=" * 70)
@@ -77,7 +73,7 @@ sql_lines.append("")
 sql_lines.append("BEGIN TRY")
 sql_lines.append("")
 
-order_counter = max_order + 1
+order_counter = orders.start
 
 for member in members_list:
     safe_name = member.replace("'", "''")
@@ -1,44 +1,37 @@
-import zipfile
-import xml.etree.ElementTree as ET
+import sys
 from pathlib import Path
 
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from workbook_metadata import load_metadata, sheet_metadata
+
 file_path = Path('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx')
 
 print("=" * 70)
 print("INSPECCIONANDO VALIDACIONES DE DATOS - BÚSQUEDA AVANZADA")
 print("=" * 70)
 
-with zipfile.ZipFile(file_path) as zip_file:
-    worksheet_xml = zip_file.read('xl/worksheets/sheet1.xml')
-
-# Parsear sin namespaces para búsqueda simple
-root = ET.fromstring(worksheet_xml)
+# Metadatos del libro (una sola lectura del ZIP, cacheada por hash del archivo)
+metadata = load_metadata(file_path)
 
 # Buscar todos los elementos dataValidation
 print('\nTodas las validaciones en el archivo:\n')
 
-# Con namespace completo
-ns = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
-
-for dv in root.findall('.//x:dataValidation', ns):
-    sqref = dv.get('sqref')
-    dv_type = dv.get('type')
-    allow = dv.get('allow')
-    formula1_elem = dv.find('x:formula1', ns)
-    formula2_elem = dv.find('x:formula2', ns)
+for dv in sheet_metadata(metadata)['validations']:
+    print(f"Rango: {dv['sqref']}")
+    print(f"  type: {dv['type']}")
+    print(f"  allow: {dv['attributes'].get('allow')}")
     
-    print(f'Rango: {sqref}')
-    print(f'  type: {dv_type}')
-    print(f'  allow: {allow}')
-    
-    if formula1_elem is not None:
-        print(f'  formula1: {formula1_elem.text}')
-    if formula2_elem is not None:
-        print(f'  formula2: {formula2_elem.text}')
+    if dv['formula1'] is not None:
+        print(f"  formula1: {dv['formula1']}")
+    if dv['formula2'] is not None:
+        print(f"  formula2: {dv['formula2']}")
+    if dv['values'] is not None:
+        print(f"  valores: {len(dv['values'])}")
     
     # Mostrar todos los atributos
-    if dv.attrib:
-        print(f'  Otros atributos: {dv.attrib}')
+    if dv['attributes']:
+        print(f"  Otros atributos: {dv['attributes']}")
     
     print()
 
@@ -47,25 +40,13 @@ print("\n" + "=" * 70)
 print("BUSCANDO RANGOS NOMBRADOS Y REFERENCIAS")
 print("=" * 70)
 
-# Ver workbook.xml para named ranges
-try:
-    with zipfile.ZipFile(file_path) as zip_file:
-        workbook_xml = zip_file.read('xl/workbook.xml')
-    
-    wb_root = ET.fromstring(workbook_xml)
-    ns_wb = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
-    
-    named_ranges = wb_root.findall('.//x:definedName', ns_wb)
-    if named_ranges:
-        print('\nRangos nombrados encontrados:')
-        for nr in named_ranges:
-            name = nr.get('name')
-            content = nr.text
-            print(f'  {name}: {content}')
-    else:
-        print('\nNo hay rangos nombrados definidos.')
-        
-except Exception as e:
-    print(f'Error al leer workbook: {e}')
+named_ranges = metadata['defined_names']
+if named_ranges:
+    print('\nRangos nombrados encontrados:')
+    for nr in named_ranges:
+        scope = f" (hoja {nr['sheet']})" if nr['sheet'] else ''
+        print(f"  {nr['name']}{scope}: {nr['value']}")
+else:
+    print('\nNo hay rangos nombrados definidos.')
 
 print("\n" + "=" * 70)
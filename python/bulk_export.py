@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Salida de carga masiva (BULK INSERT / bcp) como alternativa al script de INSERTs.
+
+Por cada tabla se escribe un archivo de datos delimitado (<nombre>.dat, UTF-16LE 'widechar'
+o UTF-8 con CODEPAGE 65001) y su format file no-XML (<nombre>.fmt). El driver load_bulk.sql
+carga cada archivo en una tabla staging temporal con BULK INSERT (TABLOCK, carga minimamente
+registrada en tempdb) y luego mueve los datos con un INSERT ... SELECT por tabla; los
+vehiculos resuelven su MemberId con el mismo join por Order del modo --link staging.
+
+Ejecutar el driver con la carpeta vista desde el servidor SQL:
+  sqlcmd -S <servidor> -d LamaDb -v BulkDir="C:\\ruta\\bulk" -i load_bulk.sql
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, List, Sequence, Tuple
+
+from sql_emitter import column_names, order_link_insert, staging_table
+
+OUTPUT_TARGETS = ('sql', 'bulk')
+BULK_ENCODINGS = ('utf-16', 'utf-8')
+MEMBER_STAGING_TABLE = '#MemberStaging'
+BULK_VEHICLE_STAGING_TABLE = '#VehicleBulkStaging'
+
+FIELD_TERMINATOR = '\t'
+ROW_TERMINATOR = '\r\n'
+# Version de format file no-XML (SQL Server 2008+)
+FORMAT_VERSION = '10.0'
+DRIVER_NAME = 'load_bulk.sql'
+
+# Codec de Python, tipo de dato del format file y terminadores escritos en el format file
+_ENCODINGS = {
+    'utf-16': ('utf-16', 'SQLNCHAR', r'"\t\0"', r'"\r\0\n\0"'),
+    'utf-8': ('utf-8', 'SQLCHAR', r'"\t"', r'"\r\n"'),
+}
+_TEXT_TYPES = ('NVARCHAR', 'NCHAR', 'VARCHAR', 'CHAR')
+
+
+@dataclass
+class BulkTable:
+    """Tabla a cargar: archivo base, destino, columnas (columna, tipo SQL) y filas con valores Python"""
+    name: str
+    target: str
+    staging: str
+    columns: Sequence[Tuple[str, str]]
+    # Filas con los valores en el orden de columns; con link_by_order: (Order, valores)
+    rows: Iterable[Sequence[Any]]
+    link_by_order: bool = False
+    # Columnas de texto donde un campo vacio es NULL; en las demas el vacio se restaura como N''
+    nullable: Sequence[str] = ()
+
+
+def check_encoding(encoding: str) -> str:
+    """Valida la codificacion de los archivos de datos"""
+    if encoding not in BULK_ENCODINGS:
+        raise ValueError(f'encoding invalido: {encoding} (opciones: {", ".join(BULK_ENCODINGS)})')
+    return encoding
+
+
+def bulk_field(value: Any) -> str:
+    """Texto de un campo: vacio para None, 1/0 para bool; los separadores se reemplazan por espacio"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    text = str(value)
+    if '\t' in text or '\r' in text or '\n' in text:
+        # BULK INSERT no tiene escape: un tab o salto de linea partiria la fila
+        text = text.replace('\r\n', ' ').replace('\t', ' ').replace('\r', ' ').replace('\n', ' ')
+    return text
+
+
+def format_file(field_names: Sequence[str], encoding: str = 'utf-16') -> str:
+    """Format file no-XML: un campo delimitado por columna, en el orden de la tabla staging"""
+    _, host_type, field_terminator, row_terminator = _ENCODINGS[check_encoding(encoding)]
+    lines = [FORMAT_VERSION, str(len(field_names))]
+    for number, name in enumerate(field_names, 1):
+        terminator = row_terminator if number == len(field_names) else field_terminator
+        # El nombre es informativo (bcp usa la posicion) pero no puede tener espacios
+        label = ''.join(name.strip('[]').split())
+        lines.append(f'{number:<8}{host_type:<12}0       0       {terminator:<14}{number:<6}{label:<28}""')
+    return '\n'.join(lines) + '\n'
+
+
+def write_data_file(path: Path, rows: Iterable[Sequence[Any]], encoding: str = 'utf-16') -> int:
+    """Escribe las filas delimitadas (con BOM en UTF-16) y retorna cuantas se escribieron"""
+    codec = _ENCODINGS[check_encoding(encoding)][0]
+    count = 0
+    with open(path, 'w', encoding=codec, newline='') as f:
+        for row in rows:
+            f.write(FIELD_TERMINATOR.join(map(bulk_field, row)) + ROW_TERMINATOR)
+            count += 1
+    return count
+
+
+def _move_statement(table: BulkTable) -> str:
+    """INSERT ... SELECT de la staging al destino, en el orden original ([Seq])"""
+    names = column_names(table.columns)
+    select = [
+        f"ISNULL(s.{name}, N'')" if sql_type.upper().startswith(_TEXT_TYPES) and name not in table.nullable
+        else f's.{name}'
+        for name, sql_type in table.columns
+    ]
+    if table.link_by_order:
+        return order_link_insert(table.target, table.staging, names, select)
+    return (f"INSERT INTO {table.target}\n    ({', '.join(names)})\n"
+            f"SELECT {', '.join(select)}\nFROM {table.staging} AS s\nORDER BY s.[Seq];")
+
+
+def write_bulk_load(output_dir: str, tables: Sequence[BulkTable], encoding: str = 'utf-16',
+                    preamble: Sequence[str] = (), title: str = 'CARGA MASIVA') -> Path:
+    """
+    Escribe <tabla>.dat + <tabla>.fmt por tabla y el driver load_bulk.sql en output_dir.
+    preamble: sentencias a ejecutar dentro de la transaccion antes de cargar (DELETE, ...).
+    Retorna la ruta del driver.
+    """
+    check_encoding(encoding)
+    folder = Path(output_dir)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    options = 'KEEPNULLS, TABLOCK' + (", CODEPAGE = '65001'" if encoding == 'utf-8' else '')
+    loads: List[str] = []
+    moves: List[str] = []
+    for table in tables:
+        if table.link_by_order:
+            rows = ((seq, order, *values) for seq, (order, values) in enumerate(table.rows, 1))
+        else:
+            rows = ((seq, *values) for seq, values in enumerate(table.rows, 1))
+        data_path = folder / f'{table.name}.dat'
+        count = write_data_file(data_path, rows, encoding)
+        keys = ['[Seq]', '[Order]'] if table.link_by_order else ['[Seq]']
+        (folder / f'{table.name}.fmt').write_text(
+            format_file(keys + column_names(table.columns), encoding), encoding='ascii')
+        print(f'[OK] {data_path}: {count} filas ({data_path.stat().st_size:,} bytes)')
+
+        loads.extend(staging_table(table.staging, table.columns, with_order=table.link_by_order))
+        loads.append(f"BULK INSERT {table.staging}\n    FROM '$(BulkDir)\\{table.name}.dat'\n"
+                     f"    WITH (FORMATFILE = '$(BulkDir)\\{table.name}.fmt', {options});")
+        moves.append(_move_statement(table))
+        moves.append(f'DROP TABLE {table.staging};')
+
+    lines = [
+        '-- ============================================',
+        f'-- LAMA MOTOTURISMO - {title} (BULK INSERT)',
+        '-- Auto-generado por bulk_export.py',
+        f'-- sqlcmd -S <servidor> -d LamaDb -v BulkDir="<carpeta vista por el servidor>" -i {DRIVER_NAME}',
+        '-- ============================================',
+        '',
+        'SET NOCOUNT ON;',
+        '',
+        '-- Carga de archivos a staging (fuera de la transaccion: solo tablas temporales)',
+        *loads,
+        '',
+        'BEGIN TRANSACTION;',
+        '',
+        'BEGIN TRY',
+        '',
+        *preamble,
+        '',
+        '-- Movimiento set-based de staging a las tablas finales',
+        *moves,
+        '',
+        'COMMIT TRANSACTION;',
+        f"PRINT '{title} completada.';",
+        '',
+        'END TRY',
+        'BEGIN CATCH',
+        '    ROLLBACK TRANSACTION;',
+        '    THROW;',
+        'END CATCH;',
+    ]
+    driver = folder / DRIVER_NAME
+    with open(driver, 'w', encoding='utf-8-sig') as f:
+        f.write('\n'.join(lines) + '\n')
+    print(f'[OK] Driver generado: {driver}')
+    return driver
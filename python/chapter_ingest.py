@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Ingesta por capitulo de los libros CORTE NACIONAL (hoja ODOMETER).
+
+Cada libro se parsea, mapea y normaliza de forma independiente (parse_chapter), lo que
+permite procesar los capitulos en paralelo con un pool de procesos. El merge posterior
+(merge_chapters) es serial y asigna Order y sufijos de placas duplicadas exactamente en
+el mismo orden que el ciclo serial original: por capitulo segun files_chapters y por fila
+segun el Excel. Las placas se comparan en forma canonica (canonical_plate); con un
+PlateIndex los sufijos se conservan entre corridas.
+"""
+
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from bulk_export import BULK_VEHICLE_STAGING_TABLE, MEMBER_STAGING_TABLE, BulkTable
+from column_resolver import resolve_columns
+from columnar_transform import (float_column, iterrows_view, normalize_name, normalized_name_column, text_column,
+                                year_column)
+from header_detect import find_header_row
+from legacy_xls import LegacyConversionError, is_legacy, xlsx_path
+from parse_cache import load_sheet_frame
+from plate_index import PlateIndex, canonical_plate
+from run_profiler import RunProfiler, activated, active_profiler
+from sql_emitter import sql_literal
+from status_normalizer import normalize_status_column
+
+# Modos de STATUS soportados:
+#   'normalize' -> normalize_status() contra los 33 valores validos (default PROSPECT)
+#   'raw'       -> valor del Excel tal cual (default ACTIVE)
+STATUS_MODES = ('normalize', 'raw')
+
+
+def transform_rows(df_clean: pd.DataFrame, col_map: Dict[str, Any], status_mode: str) -> List[Dict[str, Any]]:
+    """Convierte cada fila en un registro miembro+vehiculo sin Order ni placa definitiva"""
+    count = len(df_clean)
+    df_clean = iterrows_view(df_clean)
+
+    def column(key, convert, missing, **kwargs):
+        # Columna completa convertida, o el valor por defecto si el template no la tiene
+        if col_map[key]:
+            return convert(df_clean[col_map[key]], **kwargs)
+        return [missing] * count
+
+    # Datos del miembro
+    complete_names = [str(value).strip() for value in df_clean[col_map['complete_names']].tolist()]
+    # CompleteNamesNormalized se emite con el INSERT (antes: UPDATE de NormalizeMemberNames.sql)
+    normalized_names = normalized_name_column(complete_names)
+    damas = column('dama', text_column, 'NO', default='NO', upper=True)
+    countries = column('country_birth', text_column, 'COLOMBIA', default='COLOMBIA')
+    # In Lama Since (extraer año)
+    years = column('in_lama_since', year_column, 2025)
+
+    with active_profiler().stage('status_normalize', rows_in=count) as stage:
+        if status_mode == 'normalize':
+            # STATUS: usar el valor real del Excel, normalizado una vez por valor unico
+            statuses = column('status', normalize_status_column, 'PROSPECT')
+        else:
+            statuses = column('status', text_column, 'ACTIVE', default='ACTIVE')
+        stage.rows_out = len(statuses)
+
+    # Datos del vehículo
+    motorcycles = column('motorcycle_data', text_column, None, default=None)
+    trikes = column('trike', text_column, 'NO', default='NO', upper=True)
+    plates = column('lic_plate', text_column, None, default=None)
+    photos = column('photography', text_column, 'NO', default='NO', upper=True)
+    starting = column('starting_odometer', float_column, None)
+    final = column('final_odometer', float_column, None)
+
+    return [
+        {
+            'complete_name': complete_name,
+            'complete_name_normalized': complete_name_normalized,
+            'dama': dama,
+            'country_birth': country_birth,
+            'in_lama_since': in_lama_since,
+            'status': status,
+            'motorcycle_data': motorcycle_data,
+            'trike': trike,
+            'lic_plate': lic_plate,
+            'photography': photography,
+            'starting_odometer': starting_odometer,
+            'final_odometer': final_odometer
+        }
+        for (complete_name, complete_name_normalized, dama, country_birth, in_lama_since, status, motorcycle_data,
+             trike, lic_plate, photography, starting_odometer, final_odometer)
+        in zip(complete_names, normalized_names, damas, countries, years, statuses, motorcycles, trikes, plates,
+               photos, starting, final)
+    ]
+
+
+def _parse_chapter(file_path_str: str, chapter_id: int, chapter_name: str,
+                   status_mode: str) -> Dict[str, Any]:
+    file_path = Path(file_path_str)
+
+    if not file_path.exists():
+        print(f'\n[SKIP] {file_path.name}')
+        return {'chapter_id': chapter_id, 'rows': []}
+
+    print(f'\n[OK] Leyendo: {file_path.name}')
+    profiler = active_profiler()
+    if is_legacy(file_path):
+        # .xls: conversion cacheada por hash; desde aqui se lee como cualquier .xlsx
+        try:
+            file_path = xlsx_path(file_path)
+        except LegacyConversionError as e:
+            print(f'     [ERROR] {e}')
+            return {'chapter_id': chapter_id, 'rows': []}
+
+    # Leer Excel (fila de encabezado detectada, no fija)
+    with profiler.stage('header_detect', chapter_name):
+        header = find_header_row(file_path)
+    with profiler.stage('open_workbook', chapter_name) as stage:
+        df = load_sheet_frame(file_path, 'ODOMETER', header=header, nrows=300)
+        stage.rows_out = len(df)
+
+    # Plan de columnas memoizado por firma del encabezado (compartido por todos los capitulos)
+    with profiler.stage('column_map', chapter_name, rows_in=len(df.columns)) as stage:
+        col_map = resolve_columns(df.columns).col_map()
+        stage.rows_out = sum(1 for col in (col_map or {}).values() if col is not None)
+    if col_map is None:
+        print(f'     [ERROR] No encontró Complete Names')
+        return {'chapter_id': chapter_id, 'rows': []}
+
+    print(f'     [OK] Columnas mapeadas')
+
+    with profiler.stage('transform', chapter_name, rows_in=len(df)) as stage:
+        # Filtrar solo filas con nombres válidos
+        complete_col = col_map['complete_names']
+        df_clean = df[df[complete_col].notna()].copy()
+        df_clean = df_clean[df_clean[complete_col].astype(str).str.strip() != '']
+
+        if len(df_clean) == 0:
+            print(f'     [WARNING] Sin miembros')
+            return {'chapter_id': chapter_id, 'rows': []}
+
+        print(f'     [OK] {len(df_clean)} miembros')
+
+        rows = transform_rows(df_clean, col_map, status_mode)
+        stage.rows_out = len(rows)
+    return {'chapter_id': chapter_id, 'rows': rows}
+
+
+def parse_chapter(file_path_str: str, chapter_id: int, chapter_name: str,
+                  status_mode: str = 'normalize', instrument: Optional[Dict[str, bool]] = None) -> Dict[str, Any]:
+    """
+    Parsea y transforma un libro de capitulo. Es seguro ejecutarlo en otro proceso:
+    la salida de consola se captura y se devuelve en 'log' para imprimirla en orden.
+    instrument: opciones de RunProfiler; las etapas medidas se devuelven en 'stages'.
+    """
+    if status_mode not in STATUS_MODES:
+        raise ValueError(f'status_mode invalido: {status_mode}')
+    profiler = RunProfiler(**instrument) if instrument else None
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), (activated(profiler) if profiler else contextlib.nullcontext()):
+        result = _parse_chapter(file_path_str, chapter_id, chapter_name, status_mode)
+    result['log'] = buffer.getvalue()
+    if profiler:
+        profiler.close()
+        result['stages'] = profiler.records
+    return result
+
+
+def natural_key(chapter_id: int, complete_name: str, seen: Dict[Tuple[int, str], int]) -> str:
+    """Llave natural 'capitulo|NOMBRE NORMALIZADO|ocurrencia' (seen cuenta los nombres repetidos)"""
+    name = ' '.join(str(complete_name).upper().split())
+    occurrence = seen.get((chapter_id, name), 0) + 1
+    seen[(chapter_id, name)] = occurrence
+    return f'{chapter_id}|{name}|{occurrence}'
+
+
+def natural_keys(all_members: Sequence[Dict[str, Any]]) -> List[str]:
+    """Llave natural por miembro (estable entre corridas aunque cambie el Order)"""
+    seen: Dict[Tuple[int, str], int] = {}
+    return [natural_key(member['chapter_id'], member['complete_name'], seen) for member in all_members]
+
+
+def merge_chapters(results: Sequence[Dict[str, Any]], plate_index: Optional[PlateIndex] = None,
+                   assign_order: Optional[Callable[[str], int]] = None
+                   ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Une los capitulos en el orden recibido asignando Order secuencial y resolviendo
+    placas duplicadas con el sufijo _ORD{n}, igual que el ciclo serial.
+    Con plate_index la placa de cada miembro (por llave natural) se conserva entre corridas.
+    assign_order: Order de cada miembro segun su llave natural (p.ej. el de la importacion
+    anterior o uno reservado en el ledger) en vez del secuencial desde 1.
+    """
+    all_members = []
+    all_vehicles = []
+    order_counter = 1
+    used_lic_plates = set()
+    seen_names: Dict[Tuple[int, str], int] = {}
+
+    for result in results:
+        for row in result['rows']:
+            lic_plate = row['lic_plate']
+            # La llave natural cuenta todas las filas (tambien las que no tienen placa)
+            owner = None
+            if plate_index is not None or assign_order is not None:
+                owner = natural_key(result['chapter_id'], row['complete_name'], seen_names)
+            order = assign_order(owner) if assign_order is not None else order_counter
+
+            # Manejar placas duplicadas
+            if plate_index is not None:
+                if lic_plate:
+                    lic_plate = plate_index.assign(lic_plate, owner, result['chapter_id'], order)
+            elif lic_plate:
+                if canonical_plate(lic_plate) in used_lic_plates:
+                    # Agregar sufijo para hacerla única
+                    lic_plate = f"{lic_plate}_ORD{order}"
+                used_lic_plates.add(canonical_plate(lic_plate))
+            if not lic_plate:
+                lic_plate = f'AUTO_ORD_{order}'
+
+            all_members.append({
+                'chapter_id': result['chapter_id'],
+                'order': order,
+                'complete_name': row['complete_name'],
+                'complete_name_normalized': row.get('complete_name_normalized'),
+                'dama': row['dama'],
+                'country_birth': row['country_birth'],
+                'in_lama_since': row['in_lama_since'],
+                'status': row['status']
+            })
+
+            # Agregar vehículo si tiene datos
+            if row['motorcycle_data'] or lic_plate:
+                all_vehicles.append({
+                    'order': order,
+                    'motorcycle_data': row['motorcycle_data'],
+                    'lic_plate': lic_plate,
+                    'trike': row['trike'],
+                    'photography': row['photography'],
+                    'starting_odometer': row['starting_odometer'],
+                    'final_odometer': row['final_odometer']
+                })
+
+            order_counter += 1
+
+    return all_members, all_vehicles
+
+
+# Columnas de Members (con su tipo para la tabla staging de la carga masiva)
+MEMBER_COLUMNS = (('[ChapterId]', 'INT'), ('[Order]', 'INT'), ('[ Complete Names]', 'NVARCHAR(255)'),
+                  ('[CompleteNamesNormalized]', 'NVARCHAR(255)'), ('[Dama]', 'NVARCHAR(10)'),
+                  ('[Country Birth]', 'NVARCHAR(100)'), ('[In Lama Since]', 'INT'), ('[STATUS]', 'NVARCHAR(50)'),
+                  ('[is_eligible]', 'BIT'))
+# Datos del vehiculo (sin [MemberId], que se vincula por Order) con su tipo para la tabla staging
+VEHICLE_COLUMNS = (('[ Motorcycle Data]', 'NVARCHAR(MAX)'), ('[Lic Plate]', 'NVARCHAR(50)'), ('[Trike]', 'BIT'),
+                   ('[Photography]', 'NVARCHAR(50)'), ('[Starting Odometer]', 'FLOAT'),
+                   ('[Final Odometer]', 'FLOAT'), ('[IsActiveForChampionship]', 'BIT'))
+
+
+def member_record(member: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Valores de un miembro en el orden de MEMBER_COLUMNS"""
+    normalized = member.get('complete_name_normalized')
+    if normalized is None:
+        normalized = normalize_name(member['complete_name'])
+    return (member['chapter_id'], member['order'], member['complete_name'], normalized, member['dama'],
+            member['country_birth'], member['in_lama_since'], member['status'], 1)
+
+
+def vehicle_record(vehicle: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Valores de un vehiculo en el orden de VEHICLE_COLUMNS"""
+    order = vehicle['order']
+    return (vehicle['motorcycle_data'] or '', vehicle['lic_plate'] or f'AUTO_ORD_{order}',
+            1 if vehicle['trike'] == 'SI' else 0, vehicle['photography'],
+            vehicle['starting_odometer'], vehicle['final_odometer'], 1)
+
+
+def member_values(member: Dict[str, Any]) -> Tuple[str, ...]:
+    """Literales SQL de un miembro en el orden de MEMBER_COLUMNS"""
+    return tuple(map(sql_literal, member_record(member)))
+
+
+def vehicle_values(vehicle: Dict[str, Any]) -> Tuple[str, ...]:
+    """Literales SQL de un vehiculo en el orden de VEHICLE_COLUMNS"""
+    return tuple(map(sql_literal, vehicle_record(vehicle)))
+
+
+def bulk_tables(all_members: Sequence[Dict[str, Any]],
+                all_vehicles: Sequence[Dict[str, Any]]) -> List[BulkTable]:
+    """Members y Vehicles para la carga masiva (los vehiculos se vinculan por Order)"""
+    return [
+        BulkTable('members', '[dbo].[Members]', MEMBER_STAGING_TABLE, MEMBER_COLUMNS,
+                  map(member_record, all_members)),
+        BulkTable('vehicles', '[dbo].[Vehicles]', BULK_VEHICLE_STAGING_TABLE, VEHICLE_COLUMNS,
+                  ((vehicle['order'], vehicle_record(vehicle)) for vehicle in all_vehicles), link_by_order=True),
+    ]
+
+
+def ingest_chapters(files_chapters: Sequence[Tuple[str, int, str]], status_mode: str = 'normalize',
+                    workers: int = 1, plate_index: Optional[PlateIndex] = None,
+                    assign_order: Optional[Callable[[str], int]] = None
+                    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Procesa todos los capitulos y retorna (all_members, all_vehicles).
+    workers=1 procesa en serie; workers>1 usa un pool de procesos; workers<=0 usa todos los nucleos.
+    El resultado y la salida de consola son identicos en ambos modos.
+    plate_index: indice persistente de placas (sufijos estables entre corridas).
+    assign_order: Order por llave natural (ver merge_chapters); None = secuencial desde 1.
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(len(files_chapters), 1))
+
+    # Con instrumentacion cada capitulo se mide con un profiler propio (tambien en otro proceso)
+    profiler = active_profiler()
+    instrument = profiler.options() if profiler.enabled else None
+    args = [(path, chapter_id, name, status_mode, instrument) for path, chapter_id, name in files_chapters]
+    results = []
+    if workers == 1:
+        for arg in args:
+            results.append(parse_chapter(*arg))
+            print(results[-1]['log'], end='')
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map conserva el orden de files_chapters sin importar cual termina primero
+            for result in executor.map(parse_chapter, *zip(*args)):
+                results.append(result)
+                print(result['log'], end='')
+
+    for result in results:
+        profiler.merge(result.pop('stages', []))
+    with profiler.stage('plate_dedup', rows_in=sum(len(result['rows']) for result in results)) as stage:
+        all_members, all_vehicles = merge_chapters(results, plate_index, assign_order)
+        stage.rows_out = len(all_members)
+    return all_members, all_vehicles
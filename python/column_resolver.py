@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Resolucion compilada de columnas del ODOMETER (reemplaza la cadena if/elif por archivo).
+
+Las reglas de mapeo se compilan una sola vez en un indice token -> reglas. Cada encabezado
+distinto se clasifica una vez (memo por texto del encabezado) y el plan completo se memoiza
+por firma del encabezado (tupla de columnas): todos los capitulos comparten el template, asi
+que solo el primer libro paga la resolucion.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+# Reglas en el orden de la cadena if/elif original: (campo, tokens requeridos en MAYUSCULAS,
+# solo la primera coincidencia). Un encabezado se asigna a la primera regla aplicable.
+COLUMN_RULES = (
+    ('order', ('ORDER',), True),
+    ('dama', ('DAMA',), False),
+    ('country_birth', ('COUNTRY', 'BIRTH'), False),
+    ('in_lama_since', ('LAMA', 'SINCE'), False),
+    ('status', ('STATUS',), False),
+    ('motorcycle_data', ('MOTORCYCLE', 'DATA'), False),
+    ('trike', ('TRIKE',), False),
+    ('lic_plate', ('LIC',), False),
+    ('lic_plate', ('PLATE',), False),
+    ('photography', ('PHOTO',), False),
+    ('starting_odometer', ('STARTING', 'ODOMETER'), False),
+    ('final_odometer', ('FINAL', 'ODOMETER'), False),
+)
+
+# Columna de nombres: 'Complete' (sensible a mayusculas); alternativa 'NAMES' sin 'UNNAMED'
+COMPLETE_TOKEN = 'Complete'
+
+FIELDS = ('complete_names',) + tuple(dict.fromkeys(name for name, _, _ in COLUMN_RULES))
+
+# Indice compilado: token -> reglas que lo requieren
+_TOKEN_INDEX: Dict[str, Tuple[int, ...]] = {}
+for _rule_index, (_, _tokens, _) in enumerate(COLUMN_RULES):
+    for _token in _tokens:
+        _TOKEN_INDEX[_token] = _TOKEN_INDEX.get(_token, ()) + (_rule_index,)
+
+# Memos en proceso: texto del encabezado -> reglas aplicables; firma -> plan
+_header_memo: Dict[str, Tuple[int, ...]] = {}
+_plan_memo: Dict[Tuple[Tuple[Any, ...], Tuple[str, ...]], 'ColumnPlan'] = {}
+
+
+def _matching_rules(header: Any) -> Tuple[int, ...]:
+    """Reglas (en orden) cuyos tokens aparecen todos en el encabezado"""
+    text = str(header).strip().upper()
+    rules = _header_memo.get(text)
+    if rules is None:
+        present = {token for token in _TOKEN_INDEX if token in text}
+        candidates = sorted({rule for token in present for rule in _TOKEN_INDEX[token]})
+        rules = tuple(rule for rule in candidates if all(token in present for token in COLUMN_RULES[rule][1]))
+        _header_memo[text] = rules
+    return rules
+
+
+@dataclass
+class ColumnPlan:
+    """Plan de columnas para una firma de encabezado"""
+    headers: Tuple[Any, ...]
+    # Campo -> columna real del encabezado (None si no existe)
+    fields: Dict[str, Any] = field(default_factory=dict)
+    # Columna de nombres con la alternativa 'NAMES' (import_chapters_clean / import_sabana)
+    names: Any = None
+    # Prefijo -> primera columna de texto que empieza con el ('Starting Odometer', ...)
+    prefixed: Dict[str, Any] = field(default_factory=dict)
+
+    def col_map(self) -> Optional[Dict[str, Any]]:
+        """col_map de la ingesta por capitulo; None si no hay columna Complete Names"""
+        if self.fields['complete_names'] is None:
+            return None
+        return dict(self.fields)
+
+
+def _build_plan(headers: Tuple[Any, ...], prefixes: Tuple[str, ...]) -> ColumnPlan:
+    plan = ColumnPlan(headers=headers, fields=dict.fromkeys(FIELDS))
+    plan.prefixed = dict.fromkeys(prefixes)
+    fallback = None
+
+    for col in headers:
+        text = str(col).strip()
+        if plan.fields['complete_names'] is None and COMPLETE_TOKEN in text:
+            plan.fields['complete_names'] = col
+        upper = text.upper()
+        if fallback is None and 'NAMES' in upper and 'UNNAMED' not in upper:
+            fallback = col
+
+        for rule in _matching_rules(col):
+            name, _, first_only = COLUMN_RULES[rule]
+            if first_only and plan.fields[name] is not None:
+                continue
+            plan.fields[name] = col
+            break
+
+        if isinstance(col, str):
+            for prefix in prefixes:
+                if plan.prefixed[prefix] is None and col.startswith(prefix):
+                    plan.prefixed[prefix] = col
+
+    plan.names = plan.fields['complete_names'] if plan.fields['complete_names'] is not None else fallback
+    return plan
+
+
+def resolve_columns(headers: Iterable[Any], prefixes: Sequence[str] = ()) -> ColumnPlan:
+    """Resuelve el encabezado a un plan de columnas (memoizado por firma)"""
+    headers = tuple(headers)
+    key = (headers, tuple(prefixes))
+    plan = _plan_memo.get(key)
+    if plan is None:
+        plan = _build_plan(headers, key[1])
+        _plan_memo[key] = plan
+    return plan
+
+
+def clear_memos() -> None:
+    """Vacia los memos en proceso (para medir la resolucion en frio)"""
+    _header_memo.clear()
+    _plan_memo.clear()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Transformacion columnar de miembros/vehiculos (reemplaza los ciclos df.iterrows()).
+
+Cada conversion trabaja sobre una columna completa: las columnas numericas (int64/float64)
+se resuelven con operaciones de numpy; las columnas de texto se factorizan y cada valor
+distinto (SI/NO, años, STATUS, ...) se convierte una sola vez y se reparte con un take.
+Las reglas son exactamente las de los ciclos originales (safe_parse_int, pd.notna,
+isinstance datetime, float con try/except), asi el SQL generado es identico byte a byte.
+"""
+
+import re
+import unicodedata
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Enteros representables sin perdida en float64 (int(float(str(v))) == v)
+_EXACT_INT_LIMIT = 2 ** 53
+_MISSING = object()
+_MEMO_TYPES = (str, int, datetime)
+# Marcas diacriticas combinantes que deja la descomposicion NFD (tildes, dieresis, virgulilla)
+_COMBINING_MARKS = '[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]'
+_COMBINING_MARKS_RE = re.compile(_COMBINING_MARKS)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def parse_int(value: Any) -> Optional[int]:
+    """Parsea un valor de forma segura a int (año si es datetime), None si no es posible"""
+    try:
+        if pd.isna(value) or value == '' or str(value).strip() == '':
+            return None
+        # Si es datetime, extraer year
+        if hasattr(value, 'year'):
+            return value.year
+        # Si es string o numero, convertir
+        return int(float(str(value).strip()))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def escape_sql_string(value: Any) -> str:
+    """Literal N'...' con comillas escapadas; NULL para None/NaN"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return "NULL"
+    value = str(value).replace("'", "''")
+    return f"N'{value}'"
+
+
+def iterrows_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Frame con los mismos tipos que entregaba df.iterrows(): si todas las columnas son numericas
+    las filas se unificaban a un dtype comun (int64 + float64 -> float64, 5 -> 5.0).
+    """
+    dtypes = list(df.dtypes)
+    if not dtypes or not all(isinstance(dtype, np.dtype) and dtype.kind in 'iuf' for dtype in dtypes):
+        return df
+    common = np.result_type(*dtypes)
+    if all(dtype == common for dtype in dtypes):
+        return df
+    return df.astype(common)
+
+
+def map_values(series: pd.Series, convert: Callable[[Any], Any]) -> List[Any]:
+    """
+    convert(valor) para cada celda de la columna. Las columnas de solo texto se factorizan
+    (cada texto distinto se convierte una vez); en las mixtas se memoizan textos y enteros.
+    """
+    if pd.api.types.infer_dtype(series, skipna=True) == 'string':
+        codes, uniques = pd.factorize(series)
+        lookup = np.empty(len(uniques) + 1, dtype=object)
+        lookup[:-1] = [convert(value) for value in uniques.tolist()]
+        result = lookup[codes].tolist()
+        # Celdas vacias (codigo -1): se convierten con su valor original (None o NaN)
+        empty = np.flatnonzero(codes < 0).tolist()
+        if empty:
+            values = series.tolist()
+            for i in empty:
+                result[i] = convert(values[i])
+        return result
+
+    memo: Dict[Any, Any] = {}
+    result = []
+    for value in series.tolist():
+        # str, int (no bool) y datetime tienen una unica representacion por valor: memo seguro
+        if type(value) in _MEMO_TYPES:
+            converted = memo.get(value, _MISSING)
+            if converted is _MISSING:
+                converted = memo[value] = convert(value)
+        else:
+            converted = convert(value)
+        result.append(converted)
+    return result
+
+
+def _numeric(series: pd.Series) -> Optional[np.ndarray]:
+    """Valores float64 de una columna int64/float64 finita y exacta; None si no aplica"""
+    dtype = series.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in 'iuf':
+        return None
+    values = series.to_numpy(dtype='float64', na_value=np.nan)
+    finite = values[~np.isnan(values)]
+    if finite.size and (np.isinf(finite).any() or np.abs(finite).max() >= _EXACT_INT_LIMIT):
+        return None
+    return values
+
+
+def int_column(series: pd.Series) -> List[Optional[int]]:
+    """parse_int sobre la columna completa"""
+    values = _numeric(series)
+    if values is None:
+        return map_values(series, parse_int)
+    missing = np.isnan(values)
+    ints = np.trunc(np.where(missing, 0, values)).astype('int64').tolist()
+    return [None if miss else value for miss, value in zip(missing.tolist(), ints)]
+
+
+def text_column(series: pd.Series, default: Any, upper: bool = False) -> List[Any]:
+    """str(valor).strip() (y .upper()) para valores presentes; default para vacios (NaN/None)"""
+    present = series.notna().tolist()
+    if upper:
+        texts = map_values(series, lambda value: str(value).strip().upper())
+    else:
+        texts = map_values(series, lambda value: str(value).strip())
+    return [text if ok else default for ok, text in zip(present, texts)]
+
+
+def _year(value: Any, default: int) -> int:
+    if isinstance(value, datetime):
+        return value.year
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        return int(str(value)[:4])
+    except:
+        return default
+
+
+def year_column(series: pd.Series, default: int = 2025) -> List[int]:
+    """Año de 'In Lama Since' (datetime, numero o texto 'AAAA...'); default si vacio o invalido"""
+    present = series.notna().tolist()
+    values = _numeric(series)
+    if values is not None:
+        years = np.trunc(np.where(np.isnan(values), 0, values)).astype('int64').tolist()
+    else:
+        # Solo se convierten las celdas presentes (int(NaN) fallaria)
+        cells = pd.Series([value if ok else default for ok, value in zip(present, series.tolist())], dtype=object)
+        years = map_values(cells, lambda value: _year(value, default))
+    return [year if ok else default for ok, year in zip(present, years)]
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except:
+        return None
+
+
+def float_column(series: pd.Series) -> List[Optional[float]]:
+    """float(valor) para valores presentes; None si vacio o no convertible"""
+    present = series.notna().tolist()
+    values = _numeric(series)
+    if values is not None:
+        floats = values.tolist()
+    else:
+        floats = map_values(series, _to_float)
+    return [value if ok else None for ok, value in zip(present, floats)]
+
+
+def odometer_column(series: pd.Series) -> List[Any]:
+    """Lectura de odometro: el valor si es > 0, si no 0 (igual que el generador original)"""
+    values = _numeric(series)
+    if values is not None:
+        positive = (values > 0).tolist()
+        return [value if ok else 0 for ok, value in zip(positive, series.tolist())]
+    return [value if pd.notna(value) and value > 0 else 0 for value in series.tolist()]
+
+
+def truthy_bit_column(series: pd.Series) -> List[int]:
+    """1 si la celda tiene valor verdadero ('SI', 'NO', 1, ...), 0 si esta vacia o es falsa"""
+    present = series.notna().tolist()
+    return [1 if ok and value else 0 for ok, value in zip(present, series.tolist())]
+
+
+def normalize_name(value: Any) -> str:
+    """CompleteNamesNormalized: sin tildes (NFD), mayusculas y espacios colapsados"""
+    text = _COMBINING_MARKS_RE.sub('', unicodedata.normalize('NFD', str(value)))
+    return _WHITESPACE_RE.sub(' ', text.upper()).strip()
+
+
+def normalized_name_column(names: Sequence[Any]) -> List[str]:
+    """normalize_name con operaciones de texto sobre la columna de valores unicos (repartidos con un take)"""
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object))
+    texts = pd.Series(uniques, dtype=object).astype(str).str.normalize('NFD')
+    texts = texts.str.replace(_COMBINING_MARKS, '', regex=True).str.upper()
+    texts = texts.str.replace(r'\s+', ' ', regex=True).str.strip()
+    lookup = np.empty(len(uniques) + 1, dtype=object)
+    lookup[:-1] = texts.tolist()
+    lookup[-1] = ''
+    return lookup[codes].tolist()
+
+
+def sql_string_column(series: pd.Series) -> List[str]:
+    """escape_sql_string(str(valor)) sobre la columna completa"""
+    return map_values(series, lambda value: escape_sql_string(str(value)))
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Acceso a LamaDb para las consultas de referencia de los importadores (ultimo [Order], STATUS
+usados, ...), sin lanzar sqlcmd por consulta ni parsear su salida de consola.
+
+  - ConnectionPool: conexiones reutilizables; el login y el handshake se pagan una vez por
+    conexion y no por consulta. Acotado: si todas estan en uso, se espera una libre.
+  - LOOKUPS: consultas con nombre y parametros '?'. Cada conexion mantiene un cursor por
+    consulta, asi el driver reutiliza la sentencia preparada en las siguientes ejecuciones.
+  - Backends: 'mssql' (pyodbc, opcional) y 'sqlite' (base local con el esquema traducido de
+    sqlite_target, para pruebas y para correr los importadores sin SQL Server). Las consultas
+    se escriben en T-SQL; para SQLite se traducen con sqlite_target.translate_statement.
+
+Configuracion (LAMA_DB_URL):
+  mssql://P-DVILLAMIZARA/LamaDb     SQL Server con autenticacion integrada (por defecto)
+  sqlite:///carga.db                 archivo SQLite (p.ej. creado con SqliteTarget('carga.db'))
+  LAMA_DB_DRIVER                     driver ODBC (por defecto 'ODBC Driver 17 for SQL Server')
+
+Uso:
+  with Database() as db:
+      max_order = db.max_order()
+      statuses = db.distinct_statuses()
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlite_target import translate_statement
+
+DEFAULT_DB_URL = 'mssql://P-DVILLAMIZARA/LamaDb'
+DEFAULT_ODBC_DRIVER = 'ODBC Driver 17 for SQL Server'
+DEFAULT_POOL_SIZE = 4
+DEFAULT_TIMEOUT = 30.0
+
+# Consultas de referencia con nombre (T-SQL, parametros '?')
+LOOKUPS = {
+    'max_order': 'SELECT ISNULL(MAX([Order]), 0) FROM [dbo].[Members]',
+    'max_order_by_chapter': 'SELECT ISNULL(MAX([Order]), 0) FROM [dbo].[Members] WHERE [ChapterId] = ?',
+    'distinct_statuses': 'SELECT DISTINCT [STATUS] FROM [dbo].[Members] ORDER BY [STATUS]',
+}
+
+
+class DatabaseError(RuntimeError):
+    """Error de conexion o de consulta contra LamaDb"""
+
+
+class _PooledConnection:
+    """Conexion del pool con sus cursores por consulta (sentencias preparadas)"""
+
+    def __init__(self, raw: Any):
+        self.raw = raw
+        self.cursors: Dict[str, Any] = {}
+
+    def cursor(self, sql: str) -> Any:
+        cursor = self.cursors.get(sql)
+        if cursor is None:
+            cursor = self.cursors[sql] = self.raw.cursor()
+        return cursor
+
+    def close(self) -> None:
+        self.cursors.clear()
+        self.raw.close()
+
+
+class ConnectionPool:
+    """Pool acotado de conexiones; connect() crea una conexion nueva del backend"""
+
+    def __init__(self, connect: Callable[[], Any], size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self._idle: 'queue.LifoQueue[_PooledConnection]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.opened = 0
+
+    @contextmanager
+    def connection(self) -> Iterator[_PooledConnection]:
+        """Presta una conexion; si la consulta falla la conexion se descarta en vez de volver al pool"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise DatabaseError(f'Sin conexiones libres en el pool ({self.size}) tras {self.timeout:.0f} s')
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = _PooledConnection(self._connect())
+                self.opened += 1
+            try:
+                yield conn
+            except BaseException:
+                conn.close()
+                raise
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _mssql_backend(location: str) -> Tuple[Callable[[], Any], Tuple[type, ...], Callable[[str], str]]:
+    try:
+        import pyodbc
+    except ImportError as exc:
+        raise DatabaseError('pyodbc no esta instalado (pip install pyodbc); para una base local usar '
+                            'LAMA_DB_URL=sqlite:///ruta.db') from exc
+    server, _, database = location.partition('/')
+    driver = os.environ.get('LAMA_DB_DRIVER', DEFAULT_ODBC_DRIVER)
+    connection_string = (f'DRIVER={{{driver}}};SERVER={server};DATABASE={database or "LamaDb"};'
+                         'Trusted_Connection=yes;')
+    return (lambda: pyodbc.connect(connection_string, autocommit=True)), (pyodbc.Error,), str
+
+
+def _sqlite_backend(location: str) -> Tuple[Callable[[], Any], Tuple[type, ...], Callable[[str], str]]:
+    path = location[1:] if location.startswith('/') else location
+    if path != ':memory:' and not os.path.exists(path):
+        raise DatabaseError(f'No existe la base SQLite {path} (crearla con SqliteTarget)')
+
+    def connect():
+        return sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+
+    return connect, (sqlite3.Error,), translate_statement
+
+
+_BACKENDS = {'mssql': _mssql_backend, 'sqlite': _sqlite_backend}
+
+
+class Database:
+    """Consultas de referencia sobre un pool de conexiones del backend configurado"""
+
+    def __init__(self, url: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE):
+        self.url = url or os.environ.get('LAMA_DB_URL') or DEFAULT_DB_URL
+        scheme, separator, location = self.url.partition('://')
+        if not separator or scheme not in _BACKENDS:
+            raise DatabaseError(f'URL de base de datos no soportada: {self.url} (mssql:// o sqlite://)')
+        self.backend = scheme
+        connect, self._errors, self._translate = _BACKENDS[scheme](location)
+        self.pool = ConnectionPool(connect, size=pool_size)
+        self._translated: Dict[str, str] = {}
+
+    def __enter__(self) -> 'Database':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.pool.close()
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        """Filas de una consulta T-SQL con parametros '?'"""
+        translated = self._translated.get(sql)
+        if translated is None:
+            translated = self._translated[sql] = self._translate(sql)
+        try:
+            with self.pool.connection() as conn:
+                cursor = conn.cursor(translated)
+                cursor.execute(translated, tuple(params))
+                return [tuple(row) for row in cursor.fetchall()]
+        except self._errors as exc:
+            raise DatabaseError(f'{exc} ({sql})') from exc
+
+    def scalar(self, sql: str, params: Sequence[Any] = (), default: Any = None) -> Any:
+        rows = self.query(sql, params)
+        return rows[0][0] if rows and rows[0][0] is not None else default
+
+    def lookup(self, name: str, *params: Any) -> List[Tuple[Any, ...]]:
+        """Ejecuta una consulta de LOOKUPS por nombre"""
+        if name not in LOOKUPS:
+            raise KeyError(f"Consulta '{name}' no registrada en LOOKUPS")
+        return self.query(LOOKUPS[name], params)
+
+    def max_order(self, chapter_id: Optional[int] = None) -> int:
+        """Ultimo [Order] de Members (0 si esta vacia), global o de un capitulo"""
+        rows = self.lookup('max_order') if chapter_id is None else self.lookup('max_order_by_chapter', chapter_id)
+        return int(rows[0][0] or 0)
+
+    def distinct_statuses(self) -> List[str]:
+        """Valores de [STATUS] usados en Members"""
+        return [status for status, in self.lookup('distinct_statuses') if status is not None]
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Importacion incremental (delta) en vez de DELETE + reimportacion completa.
+
+Cada importacion guarda un manifiesto local (snapshot JSON) con un hash por fila, indexado por
+(capitulo, llave natural): nombre normalizado del miembro + ocurrencia dentro del capitulo.
+El siguiente parseo se compara contra ese snapshot y solo se emiten sentencias para las filas
+que cambiaron:
+  - DELETE de vehiculos (por [Lic Plate], unica) y miembros (por [Order]) que ya no existen
+  - un MERGE de Members con las filas nuevas o modificadas (se identifican por su Order anterior)
+  - un MERGE de Vehicles con los vehiculos nuevos o modificados (por su placa anterior), con el
+    MemberId resuelto por Order igual que el modo --link staging
+Una correccion de una celda produce un script de una sola sentencia. Para eso el parseo del
+delta conserva el Order de cada miembro del snapshot (carry_orders): agregar o quitar un miembro
+no desplaza los Orders (ni las placas _ORD{n}) del resto de la tabla.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from chapter_ingest import (MEMBER_COLUMNS, VEHICLE_COLUMNS, member_values, natural_keys, vehicle_record,
+                            vehicle_values)
+from sql_emitter import column_names, sql_literal
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT = 'import_snapshot.json'
+
+_MEMBER_JOIN = 'SELECT [Order], MAX([MemberId]) AS [MemberId] FROM [dbo].[Members] GROUP BY [Order]'
+
+
+def row_hash(values: Sequence[Any]) -> str:
+    """Hash estable de los valores de una fila"""
+    payload = json.dumps(list(values), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _vehicles_by_order(all_vehicles: Sequence[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    return {vehicle['order']: vehicle for vehicle in all_vehicles}
+
+
+def build_snapshot(all_members: Sequence[Dict[str, Any]],
+                   all_vehicles: Sequence[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Llave natural -> Order, placa y hashes de miembro/vehiculo tal como quedan en la base"""
+    vehicles = _vehicles_by_order(all_vehicles)
+    rows = {}
+    for key, member in zip(natural_keys(all_members), all_members):
+        vehicle = vehicles.get(member['order'])
+        rows[key] = {
+            'order': member['order'],
+            'member': row_hash(member_values(member)),
+            'plate': vehicle_record(vehicle)[1] if vehicle else None,
+            'vehicle': row_hash(vehicle_values(vehicle)) if vehicle else None,
+        }
+    return rows
+
+
+def carry_orders(previous: Dict[str, Dict[str, Any]],
+                 reserve: Optional[Callable[[int], int]] = None) -> Callable[[str], int]:
+    """
+    assign_order para merge_chapters: el Order del snapshot por llave natural; las llaves nuevas
+    reciben Orders por encima del maximo anterior, o reserve(chapter_id) (p.ej. el ledger)
+    """
+    orders = {key: row['order'] for key, row in previous.items()}
+    next_order = max(orders.values(), default=0) + 1
+
+    def assign(key: str) -> int:
+        nonlocal next_order
+        if key not in orders:
+            if reserve is not None:
+                orders[key] = reserve(int(key.split('|', 1)[0]))
+            else:
+                orders[key] = next_order
+                next_order += 1
+        return orders[key]
+
+    return assign
+
+
+def load_snapshot(path: Union[str, Path]) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Filas del snapshot, o None si no existe o es de otra version"""
+    try:
+        data = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (FileNotFoundError, ValueError):
+        return None
+    if data.get('version') != SNAPSHOT_VERSION:
+        return None
+    return data['rows']
+
+
+def save_snapshot(path: Union[str, Path], rows: Dict[str, Dict[str, Any]]) -> None:
+    """Escribe el snapshot de forma atomica"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump({'version': SNAPSHOT_VERSION, 'rows': rows}, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_name, path)
+
+
+@dataclass
+class Delta:
+    """Cambios entre el snapshot y el nuevo parseo"""
+    # (Order anterior o None si es nuevo, miembro)
+    members: List[Tuple[Optional[int], Dict[str, Any]]] = field(default_factory=list)
+    # (placa anterior o None si es nuevo, vehiculo)
+    vehicles: List[Tuple[Optional[str], Dict[str, Any]]] = field(default_factory=list)
+    deleted_orders: List[int] = field(default_factory=list)
+    deleted_plates: List[str] = field(default_factory=list)
+
+    @property
+    def empty(self) -> bool:
+        return not (self.members or self.vehicles or self.deleted_orders or self.deleted_plates)
+
+    def print_summary(self) -> None:
+        inserted = sum(1 for match, _ in self.members if match is None)
+        print(f'[OK] Members: {inserted} nuevos, {len(self.members) - inserted} modificados, '
+              f'{len(self.deleted_orders)} eliminados')
+        inserted = sum(1 for match, _ in self.vehicles if match is None)
+        print(f'[OK] Vehicles: {inserted} nuevos, {len(self.vehicles) - inserted} modificados, '
+              f'{len(self.deleted_plates)} eliminados')
+
+
+def diff_snapshot(old: Dict[str, Dict[str, Any]], all_members: Sequence[Dict[str, Any]],
+                  all_vehicles: Sequence[Dict[str, Any]]) -> Delta:
+    """Compara el nuevo parseo contra el snapshot por llave natural"""
+    new = build_snapshot(all_members, all_vehicles)
+    vehicles = _vehicles_by_order(all_vehicles)
+    delta = Delta()
+
+    for key, member in zip(natural_keys(all_members), all_members):
+        entry, previous = new[key], old.get(key)
+        if previous is None:
+            delta.members.append((None, member))
+        elif previous['member'] != entry['member']:
+            delta.members.append((previous['order'], member))
+
+        previous_plate = previous['plate'] if previous else None
+        if entry['vehicle'] is None:
+            if previous_plate is not None:
+                delta.deleted_plates.append(previous_plate)
+        elif previous is None or previous['vehicle'] != entry['vehicle']:
+            delta.vehicles.append((previous_plate, vehicles[member['order']]))
+
+    for key, previous in old.items():
+        if key not in new:
+            if previous['plate'] is not None:
+                delta.deleted_plates.append(previous['plate'])
+            delta.deleted_orders.append(previous['order'])
+    return delta
+
+
+def _values_block(rows: Sequence[Sequence[str]]) -> str:
+    return ',\n'.join(f"    ({', '.join(row)})" for row in rows)
+
+
+def delta_statements(delta: Delta) -> List[str]:
+    """Sentencias DELETE/MERGE del delta (las eliminaciones primero para liberar Order y placas)"""
+    statements = []
+    if delta.deleted_plates:
+        plates = ', '.join(sql_literal(plate) for plate in delta.deleted_plates)
+        statements.append(f"DELETE FROM [dbo].[Vehicles] WHERE [Lic Plate] IN ({plates});")
+    if delta.deleted_orders:
+        orders = ', '.join(str(order) for order in delta.deleted_orders)
+        statements.append(f"DELETE FROM [dbo].[Members] WHERE [Order] IN ({orders});")
+
+    if delta.members:
+        # Un solo MERGE: el match por Order anterior se evalua antes de actualizar (Orders desplazados)
+        names = column_names(MEMBER_COLUMNS)
+        rows = [(sql_literal(match), *member_values(member)) for match, member in delta.members]
+        statements.append(
+            f"MERGE [dbo].[Members] AS t\nUSING (VALUES\n{_values_block(rows)}\n"
+            f") AS s([MatchOrder], {', '.join(names)})\n"
+            f"ON t.[Order] = s.[MatchOrder]\n"
+            f"WHEN MATCHED THEN\n    UPDATE SET {', '.join(f't.{name} = s.{name}' for name in names)}\n"
+            f"WHEN NOT MATCHED BY TARGET THEN\n"
+            f"    INSERT ({', '.join(names)})\n    VALUES ({', '.join('s.' + name for name in names)});"
+        )
+
+    if delta.vehicles:
+        names = column_names(VEHICLE_COLUMNS)
+        rows = [(sql_literal(match), str(vehicle['order']), *vehicle_values(vehicle))
+                for match, vehicle in delta.vehicles]
+        targets = ['[MemberId]', *names]
+        statements.append(
+            f"MERGE [dbo].[Vehicles] AS t\nUSING (\n"
+            f"    SELECT m.[MemberId], v.*\n    FROM (VALUES\n{_values_block(rows)}\n"
+            f"    ) AS v([MatchPlate], [Order], {', '.join(names)})\n"
+            f"    LEFT JOIN ({_MEMBER_JOIN}) AS m\n        ON m.[Order] = v.[Order]\n"
+            f") AS s\n"
+            f"ON t.[Lic Plate] = s.[MatchPlate]\n"
+            f"WHEN MATCHED THEN\n    UPDATE SET {', '.join(f't.{name} = s.{name}' for name in targets)}\n"
+            f"WHEN NOT MATCHED BY TARGET THEN\n"
+            f"    INSERT ({', '.join(targets)})\n    VALUES ({', '.join('s.' + name for name in targets)});"
+        )
+    return statements
+
+
+def delta_script(statements: Sequence[str], header: str, done_message: str) -> List[str]:
+    """Lineas del script incremental: las sentencias del delta en una sola transaccion"""
+    lines = [f"-- {header}", "SET NOCOUNT ON;", "BEGIN TRANSACTION;", "", "BEGIN TRY", ""]
+    lines.extend(statements)
+    lines.extend(["", "COMMIT TRANSACTION;", "PRINT '" + done_message.replace("'", "''") + "';", "",
+                  "END TRY", "BEGIN CATCH", "    ROLLBACK TRANSACTION;", "    THROW;", "END CATCH;"])
+    return lines
+
+
+def chapter_snapshot(rows: Dict[str, Dict[str, Any]], chapter_id: int) -> Dict[str, Dict[str, Any]]:
+    """Filas del snapshot de un capitulo (las llaves naturales empiezan con 'capitulo|')"""
+    prefix = f'{chapter_id}|'
+    return {key: row for key, row in rows.items() if key.startswith(prefix)}
+
+
+def record_snapshot(path: Union[str, Path], all_members: Sequence[Dict[str, Any]],
+                    all_vehicles: Sequence[Dict[str, Any]]) -> None:
+    """Guarda el snapshot de lo importado (base del siguiente delta)"""
+    rows = build_snapshot(all_members, all_vehicles)
+    save_snapshot(path, rows)
+    print(f'[OK] Snapshot: {path} ({len(rows)} filas)')
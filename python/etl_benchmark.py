@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Benchmark del ETL sobre libros sinteticos (synthetic_workbook.py).
+
+Mide por separado cada etapa de la ingesta de un capitulo:
+  read       deteccion del encabezado + lectura en streaming de la hoja ODOMETER (sin cache)
+  resolve    resolucion de columnas en frio (memos vacios)
+  transform  filtrado de nombres + transform_rows + merge_chapters (Order y placas duplicadas)
+  emit       INSERTs de Members y Vehicles escritos con SqlScriptWriter
+
+Cada corrida se agrega a un archivo JSONL (una linea por tamaño) y se compara contra la
+corrida anterior con los mismos parametros, mostrando la variacion por etapa.
+
+Uso:
+  python python/etl_benchmark.py --rows 100 10000 1000000 [--repeat 3] [--label antes]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from chapter_ingest import MEMBER_COLUMNS, VEHICLE_COLUMNS, member_values, merge_chapters, transform_rows
+from chapter_ingest import vehicle_values
+from column_resolver import clear_memos, resolve_columns
+from header_detect import scan_header
+from sql_emitter import DEFAULT_BATCH_SIZE, LINK_MODES, column_names, stream_batched_inserts
+from sql_emitter import stream_linked_vehicle_inserts
+from sql_writer import SqlScriptWriter
+from synthetic_workbook import write_workbook
+from xlsx_stream import XlsxStreamReader, read_sheet_frame
+
+STAGES = ('read', 'resolve', 'transform', 'emit')
+DEFAULT_ROWS = (100, 1000, 10000)
+DEFAULT_RESULTS = 'bench_results.jsonl'
+DEFAULT_WORKBOOK_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'bench'
+# Parametros que deben coincidir para comparar dos corridas
+COMPARE_KEYS = ('rows', 'seed', 'batch_size', 'link')
+
+
+def synthetic_workbook(rows: int, seed: int = 0, folder: Union[str, Path] = DEFAULT_WORKBOOK_DIR) -> Path:
+    """Libro sintetico de rows filas (se genera una sola vez por tamaño y semilla)"""
+    path = Path(folder) / f'synthetic_{rows}_{seed}.xlsx'
+    if not path.exists():
+        started = time.perf_counter()
+        write_workbook(path, rows, seed)
+        print(f'[OK] Generado {path.name} en {time.perf_counter() - started:.1f} s')
+    return path
+
+
+def run_pipeline(workbook: Union[str, Path], output_dir: Union[str, Path], batch_size: int = DEFAULT_BATCH_SIZE,
+                 link: str = 'lookup') -> Dict[str, Any]:
+    """Ejecuta las etapas una vez y retorna {'stages': {etapa: segundos}, conteos}"""
+    stages: Dict[str, float] = {}
+
+    started = time.perf_counter()
+    with XlsxStreamReader(workbook) as reader:
+        match = scan_header(reader, 'ODOMETER')
+    if match is None:
+        raise ValueError(f'Encabezado ODOMETER no encontrado en {workbook}')
+    df = read_sheet_frame(workbook, 'ODOMETER', header=match.header)
+    stages['read'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    clear_memos()
+    col_map = resolve_columns(df.columns).col_map()
+    if col_map is None:
+        raise ValueError(f'Columna Complete Names no encontrada en {workbook}')
+    stages['resolve'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    complete_col = col_map['complete_names']
+    df_clean = df[df[complete_col].notna()]
+    df_clean = df_clean[df_clean[complete_col].astype(str).str.strip() != '']
+    rows = transform_rows(df_clean, col_map, 'normalize')
+    all_members, all_vehicles = merge_chapters([{'chapter_id': 1, 'rows': rows}])
+    stages['transform'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    members, _ = stream_batched_inserts('[dbo].[Members]', column_names(MEMBER_COLUMNS),
+                                        map(member_values, all_members), batch_size)
+    vehicles, _ = stream_linked_vehicle_inserts(
+        VEHICLE_COLUMNS, ((vehicle['order'], vehicle_values(vehicle)) for vehicle in all_vehicles), link, batch_size)
+    with SqlScriptWriter(Path(output_dir) / 'benchmark.sql') as script:
+        script.write_statements(members)
+        script.write('\n')
+        script.write_statements(vehicles)
+    stages['emit'] = time.perf_counter() - started
+
+    return {'stages': stages, 'members': len(all_members), 'vehicles': len(all_vehicles),
+            'sql_bytes': script.bytes_written}
+
+
+def _commit() -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def benchmark(rows: int, seed: int = 0, repeat: int = 1, batch_size: int = DEFAULT_BATCH_SIZE,
+              link: str = 'lookup', label: str = '',
+              workbook_dir: Union[str, Path] = DEFAULT_WORKBOOK_DIR) -> Dict[str, Any]:
+    """Mejor tiempo por etapa en repeat corridas sobre el libro sintetico de rows filas"""
+    workbook = synthetic_workbook(rows, seed, workbook_dir)
+    best: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as output_dir:
+        for _ in range(repeat):
+            # Los avisos por fila se capturan como en parse_chapter (no se mide la consola)
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = run_pipeline(workbook, output_dir, batch_size, link)
+            for stage, seconds in result['stages'].items():
+                best[stage] = min(seconds, best.get(stage, seconds))
+    total = sum(best.values())
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'label': label,
+        'python': platform.python_version(),
+        'rows': rows,
+        'seed': seed,
+        'batch_size': batch_size,
+        'link': link,
+        'repeat': repeat,
+        'members': result['members'],
+        'vehicles': result['vehicles'],
+        'sql_bytes': result['sql_bytes'],
+        'stages': best,
+        'total': total,
+        'rows_per_second': rows / total if total else 0.0,
+    }
+
+
+def load_results(path: Union[str, Path]) -> List[Dict[str, Any]]:
+    """Corridas guardadas (las lineas invalidas se ignoran)"""
+    try:
+        lines = Path(path).read_text(encoding='utf-8').splitlines()
+    except FileNotFoundError:
+        return []
+    results = []
+    for line in lines:
+        try:
+            results.append(json.loads(line))
+        except ValueError:
+            continue
+    return results
+
+
+def append_result(path: Union[str, Path], result: Dict[str, Any]) -> None:
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result, ensure_ascii=False) + '\n')
+
+
+def previous_result(results: Sequence[Dict[str, Any]], result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Ultima corrida guardada con los mismos parametros"""
+    for previous in reversed(results):
+        if all(previous.get(key) == result[key] for key in COMPARE_KEYS):
+            return previous
+    return None
+
+
+def print_result(result: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    print(f"\n[OK] {result['rows']:,} filas -> {result['members']:,} miembros, {result['vehicles']:,} vehiculos, "
+          f"{result['sql_bytes']:,} bytes SQL ({result['rows_per_second']:,.0f} filas/s)")
+    reference = ''
+    if previous:
+        reference = f" (vs {previous.get('commit') or '?'} {previous.get('label') or previous['timestamp']})"
+    print(f'     {"etapa":<10} {"segundos":>10} {"anterior":>10} {"cambio":>8}{reference}')
+    for stage in (*STAGES, 'total'):
+        seconds = result['total'] if stage == 'total' else result['stages'][stage]
+        line = f'     {stage:<10} {seconds:>10.4f}'
+        if previous:
+            before = previous['total'] if stage == 'total' else previous['stages'].get(stage)
+            if before:
+                line += f' {before:>10.4f} {(seconds - before) / before:>+8.1%}'
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark por etapas del ETL sobre libros sinteticos')
+    parser.add_argument('--rows', type=int, nargs='+', default=list(DEFAULT_ROWS), help='Tamaños a medir')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla del libro sintetico')
+    parser.add_argument('--repeat', type=int, default=1, help='Corridas por tamaño (se guarda el mejor tiempo)')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Filas por INSERT (1-1000)')
+    parser.add_argument('--link', choices=LINK_MODES, default='lookup', help='Vinculo vehiculo-miembro')
+    parser.add_argument('--label', default='', help='Etiqueta de la corrida (p.ej. rama o cambio)')
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help='Archivo JSONL de resultados')
+    parser.add_argument('--workbook-dir', default=str(DEFAULT_WORKBOOK_DIR), help='Carpeta de libros sinteticos')
+    parser.add_argument('--no-save', action='store_true', help='No guardar la corrida en el archivo de resultados')
+    args = parser.parse_args()
+
+    history = load_results(args.results)
+    for rows in args.rows:
+        result = benchmark(rows, args.seed, max(args.repeat, 1), args.batch_size, args.link, args.label,
+                           args.workbook_dir)
+        print_result(result, previous_result(history, result))
+        if not args.no_save:
+            append_result(args.results, result)
+    if not args.no_save:
+        print(f'\n[OK] Resultados: {args.results}')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,8 @@
 Script para explorar la estructura exacta del Excel y encontrar el header correcto
 """
 
-import pandas as pd
-from pathlib import Path
+from header_detect import DEFAULT_MAX_ROWS, detect_header
+from xlsx_stream import XlsxStreamReader
 
 excel_path = r"C:\Users\DanielVillamizar\COR L.A.MA\INSUMOS\(COL) PEREIRA CORTE NACIONAL.xlsx"
 
@@ -12,33 +12,28 @@ print("="*80)
 print("EXPLORACIÓN DE ESTRUCTURA DEL EXCEL")
 print("="*80)
 
-# Leer sin header para ver toda la estructura
-df_raw = pd.read_excel(excel_path, sheet_name='ODOMETER', header=None)
+# Leer en streaming solo las primeras filas (no se carga la hoja completa)
+with XlsxStreamReader(excel_path) as reader:
+    print(f"\nAncho declarado: {reader.sheet_width('ODOMETER')} columnas\n")
 
-print(f"\nDimensiones totales: {df_raw.shape[0]} filas x {df_raw.shape[1]} columnas\n")
-
-# Mostrar primeras 15 filas para encontrar el header
-print("Primeras 15 filas del Excel:")
-print("-"*80)
-for idx, row in df_raw.head(15).iterrows():
-    print(f"Fila {idx}: {list(row)}")
+    print("Primeras 15 filas del Excel:")
+    print("-"*80)
+    for idx, values in reader.iter_raw_rows('ODOMETER'):
+        if idx >= 15:
+            break
+        width = max(values) + 1 if values else 0
+        print(f"Fila {idx}: {[values.get(i) for i in range(width)]}")
 
 print("\n" + "="*80)
-print("BÚSQUEDA DE COLUMNA 'Order' (indicador del header)")
+print(f"DETECCIÓN DE ENCABEZADO (primeras {DEFAULT_MAX_ROWS} filas vs vocabulario conocido)")
 print("="*80 + "\n")
 
-# Buscar dónde aparece 'Order'
-for idx, row in df_raw.iterrows():
-    for col_idx, val in enumerate(row):
-        if isinstance(val, str) and 'Order' in val:
-            print(f"✓ Encontrado 'Order' en: Fila {idx}, Columna {col_idx}")
-            print(f"  Contenido de la fila {idx}: {list(row[:10])}")
-            
-            # Mostrar 3 filas alrededor
-            print(f"\n  Contexto (filas alrededor):")
-            for context_idx in range(max(0, idx-1), min(df_raw.shape[0], idx+3)):
-                print(f"    Fila {context_idx}: {list(df_raw.iloc[context_idx][:10])}")
-            break
-    else:
-        continue
-    break
+match = detect_header(excel_path, 'ODOMETER')
+if match is None:
+    print("✗ No se encontró una fila de encabezado reconocible")
+else:
+    print(f"✓ Encabezado en: Fila {match.header} (header={match.header}), {match.score} columnas reconocidas")
+    print(f"  Columnas: {match.columns[:10]}")
+    print(f"\n  Mapa de columnas:")
+    for canonical, column in match.column_map.items():
+        print(f"    {canonical:30s} -> '{column}'")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Deteccion automatica de la fila de encabezado (reemplaza header=7 / header=6 / skiprows=9 fijos).
+
+Lee en streaming solo las primeras N filas de la hoja y puntua cada fila candidata contra el
+vocabulario conocido de columnas ('Order', 'Complete Names', 'Lic Plate', 'STATUS', ...).
+La fila con mas coincidencias es el encabezado. El resultado (indice + mapa de columnas) se
+guarda por huella del libro (hash de contenido + hoja), asi un libro ya visto no vuelve a
+escanearse y un encabezado desplazado nunca obliga a recargar la hoja completa.
+"""
+
+import json
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from parse_cache import default_cache, file_digest
+from xlsx_stream import XlsxStreamReader, dedupe_headers
+
+# Vocabulario canonico de columnas de los templates ODOMETER y DATOS (REGION NORTE)
+HEADER_VOCABULARY = (
+    'Order', 'Complete Names', 'Dama', 'Country Birth', 'In Lama Since', 'STATUS',
+    'Motorcycle Data', 'Trike', 'Lic Plate', 'Photography', 'Starting Odometer', 'Final Odometer',
+    'Event Start Date (AAAA/MM/DD)', 'Name of the event', 'Mileage', 'Points per event',
+    'Points per Distance', 'Points awarded per member', 'Visitor Class',
+    'CHAPTER', 'MEMBER NAME',
+)
+
+DEFAULT_MAX_ROWS = 30
+MIN_MATCHES = 2
+HEADER_INDEX_FILE = 'headers.json'
+
+_SPACES = re.compile(r'\s+')
+
+
+def vocabulary_key(value: Any) -> str:
+    """Forma comparable de un encabezado: sin espacios extremos, minusculas, espacios colapsados"""
+    return _SPACES.sub(' ', str(value).strip()).casefold()
+
+
+_VOCABULARY_KEYS = {vocabulary_key(name): name for name in HEADER_VOCABULARY}
+
+
+def _canonical(value: Any) -> Optional[str]:
+    """Nombre canonico del vocabulario para una celda, o None si no coincide"""
+    if not isinstance(value, str):
+        return None
+    key = vocabulary_key(value)
+    if key in _VOCABULARY_KEYS:
+        return _VOCABULARY_KEYS[key]
+    # 'Starting Odometer (Miles)', 'Final Odometer 2025', ...
+    for vocab_key, name in _VOCABULARY_KEYS.items():
+        if key.startswith(vocab_key + ' ') or key.startswith(vocab_key + '('):
+            return name
+    return None
+
+
+@dataclass
+class HeaderMatch:
+    """Resultado de la deteccion: fila de encabezado (0-based, como header= de pandas)"""
+    header: int
+    score: int
+    columns: List[Any] = field(default_factory=list)
+    # Nombre canonico -> nombre real de la columna en la hoja (con sus espacios)
+    column_map: Dict[str, Any] = field(default_factory=dict)
+
+
+def score_row(values: Dict[int, Any]) -> int:
+    """Cantidad de celdas de la fila que coinciden con el vocabulario (sin repetir)"""
+    return len({name for name in map(_canonical, values.values()) if name})
+
+
+def scan_header(reader: XlsxStreamReader, sheet_name: str = 'ODOMETER',
+                max_rows: int = DEFAULT_MAX_ROWS) -> Optional[HeaderMatch]:
+    """Puntua las primeras max_rows filas y retorna la mejor candidata"""
+    best = None
+    best_values: Dict[int, Any] = {}
+    for row_index, values in reader.iter_raw_rows(sheet_name):
+        if row_index >= max_rows:
+            break
+        score = score_row(values)
+        if score >= MIN_MATCHES and (best is None or score > best.score):
+            best = HeaderMatch(header=row_index, score=score)
+            best_values = values
+    if best is None:
+        return None
+
+    width = max(max(best_values) + 1, reader.sheet_width(sheet_name))
+    best.columns = dedupe_headers([best_values.get(i) for i in range(width)])
+    for column in best.columns:
+        name = _canonical(column)
+        if name and name not in best.column_map:
+            best.column_map[name] = column
+    return best
+
+
+class HeaderIndex:
+    """Indice persistente huella-del-libro -> HeaderMatch (JSON en el directorio del cache)"""
+
+    def __init__(self, path: Union[str, Path, None] = None):
+        self.path = Path(path) if path else default_cache().cache_dir / HEADER_INDEX_FILE
+        self._explicit = path is not None
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def _persistent(self) -> bool:
+        # El indice por defecto respeta LAMA_PARSE_CACHE=off (solo memoria)
+        return self._explicit or default_cache().enabled
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            if not self._persistent():
+                self._entries = {}
+                return self._entries
+            try:
+                self._entries = json.loads(self.path.read_text(encoding='utf-8'))
+            except (FileNotFoundError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[HeaderMatch]:
+        entry = self._load().get(key)
+        return HeaderMatch(**entry) if entry else None
+
+    def put(self, key: str, match: HeaderMatch) -> None:
+        entries = self._load()
+        entries[key] = asdict(match)
+        if not self._persistent():
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, default=str)
+        os.replace(tmp_name, self.path)
+
+
+_default_index: Optional[HeaderIndex] = None
+
+
+def detect_header(excel_path: Union[str, Path], sheet_name: str = 'ODOMETER',
+                  max_rows: int = DEFAULT_MAX_ROWS, index: Optional[HeaderIndex] = None) -> Optional[HeaderMatch]:
+    """Detecta el encabezado de la hoja, usando el indice por huella del libro si ya se vio"""
+    global _default_index
+    if index is None:
+        if _default_index is None:
+            _default_index = HeaderIndex()
+        index = _default_index
+
+    key = f'{file_digest(excel_path)}|{sheet_name}'
+    match = index.get(key)
+    if match is None:
+        with XlsxStreamReader(excel_path) as reader:
+            match = scan_header(reader, sheet_name, max_rows)
+        if match is not None:
+            index.put(key, match)
+    return match
+
+
+def find_header_row(excel_path: Union[str, Path], sheet_name: str = 'ODOMETER', default: int = 7) -> int:
+    """Indice de la fila de encabezado para header= ; usa default si no se detecta"""
+    match = detect_header(excel_path, sheet_name)
+    if match is None:
+        print(f"     [WARNING] Encabezado no detectado en '{sheet_name}', usando header={default}")
+        return default
+    return match.header
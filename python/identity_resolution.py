@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Resolucion de identidad de miembros entre capitulos y reportes.
+
+El mismo motociclista puede aparecer como 'José Pérez' en un libro de capitulo y como
+'JOSE PEREZ ' en el reporte REGION NORTE. En vez de comparar todos contra todos, cada
+nombre genera claves de bloqueo y solo se comparan los nombres que comparten un bloque:
+  - nombre plegado: sin tildes, mayusculas, tokens ordenados ('JOSE PEREZ')
+  - clave fonetica del nombre completo (reglas del español: V/B, Z/S/CE/CI, LL/Y, H muda...)
+  - cada par de tokens foneticos (captura nombres con o sin segundo nombre/apellido)
+Los bloques mas grandes que max_block (p.ej. un nombre muy comun) se descartan, asi el
+costo total es casi lineal en la cantidad de nombres.
+
+El resultado es una tabla de coincidencias con puntaje de confianza y la regla que la
+produjo, y entidades (componentes conexos de las coincidencias sobre el umbral).
+"""
+
+import csv
+import itertools
+import re
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Sequence, Tuple, Union
+
+# Puntaje minimo para reportar una coincidencia y para unir dos nombres en una entidad
+MIN_SCORE = 0.75
+MATCH_THRESHOLD = 0.85
+MAX_BLOCK = 100
+
+MATCH_TABLE_COLUMNS = ('left_source', 'left_name', 'right_source', 'right_name', 'score', 'rule', 'entity')
+
+_NON_LETTERS = re.compile(r'[^A-Z]+')
+# Reglas foneticas en orden; las minusculas marcan sonidos ya resueltos que las reglas
+# siguientes no deben tocar (CH, GUE/GUI, QUE/QUI)
+_PHONETIC_RULES = tuple((re.compile(pattern), replacement) for pattern, replacement in (
+    (r'CH', 'x'),
+    (r'^X', 'J'),
+    (r'X', 'KS'),
+    (r'LL', 'Y'),
+    (r'QU(?=[EI])', 'k'),
+    (r'GU(?=[EI])', 'g'),
+    (r'C(?=[EI])', 'S'),
+    (r'G(?=[EI])', 'J'),
+    (r'[CQ]', 'K'),
+    (r'Z', 'S'),
+    (r'[VW]', 'B'),
+    (r'H', ''),
+    (r'Y(?![AEIOU])', 'I'),
+))
+_VOWELS = frozenset('AEIOU')
+
+
+def fold_name(name: str) -> List[str]:
+    """Tokens del nombre sin tildes ni puntuacion, en mayusculas"""
+    text = unicodedata.normalize('NFKD', str(name).upper())
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_LETTERS.sub(' ', text).split()
+
+
+@lru_cache(maxsize=65536)
+def spanish_phonetic(token: str) -> str:
+    """Codigo fonetico de un token: primera letra + consonantes segun la pronunciacion en español"""
+    for pattern, replacement in _PHONETIC_RULES:
+        token = pattern.sub(replacement, token)
+    token = token.upper()
+    if not token:
+        return ''
+    code = [token[0]]
+    for ch in token[1:]:
+        if ch not in _VOWELS and ch != code[-1]:
+            code.append(ch)
+    return ''.join(code)
+
+
+@dataclass(frozen=True)
+class NameKey:
+    """Formas comparables de un nombre"""
+    folded: str
+    phonetic: Tuple[str, ...]
+
+    @classmethod
+    def of(cls, name: str) -> 'NameKey':
+        tokens = sorted(fold_name(name))
+        phonetic = tuple(sorted(code for code in map(spanish_phonetic, tokens) if code))
+        return cls(' '.join(tokens), phonetic)
+
+    def blocking_keys(self) -> List[Tuple[str, ...]]:
+        keys: List[Tuple[str, ...]] = [('N', self.folded), ('P', *self.phonetic)]
+        keys.extend(('T', *pair) for pair in itertools.combinations(sorted(set(self.phonetic)), 2))
+        return keys
+
+
+def name_similarity(a: NameKey, b: NameKey, min_score: float = 0.0) -> Tuple[float, str]:
+    """
+    (puntaje 0-1, regla) entre dos nombres. Un puntaje fuzzy menor que min_score es aproximado
+    (no se calcula la similitud de texto completa).
+    """
+    if a.folded == b.folded:
+        return 1.0, 'exact'
+    if a.phonetic == b.phonetic:
+        return 0.95, 'phonetic'
+    left, right = set(a.phonetic), set(b.phonetic)
+    overlap = len(left & right)
+    # Uno contiene al otro (segundo nombre o apellido omitido); se premian los tokens escritos igual
+    if overlap >= 2 and overlap == min(len(left), len(right)):
+        tokens_a, tokens_b = set(a.folded.split()), set(b.folded.split())
+        same = len(tokens_a & tokens_b) / max(len(tokens_a), len(tokens_b))
+        return round(0.85 + 0.1 * same - 0.05 * (max(len(left), len(right)) - overlap), 3), 'subset'
+    jaccard = overlap / len(left | right) if left or right else 0.0
+    # Menos de la mitad de los tokens suenan igual, o el puntaje no alcanza min_score aunque
+    # los textos fueran casi iguales (ratio < 1): no se calcula la similitud de texto
+    if jaccard < 0.5 or 0.5 * (1 + jaccard) <= min_score:
+        return round(0.5 * jaccard, 3), 'fuzzy'
+    # Cotas baratas antes de ratio(), como difflib.get_close_matches
+    matcher = SequenceMatcher(None, a.folded, b.folded)
+    for bound in (matcher.real_quick_ratio, matcher.quick_ratio, matcher.ratio):
+        score = 0.5 * (bound() + jaccard)
+        if score < min_score:
+            break
+    return round(score, 3), 'fuzzy'
+
+
+@dataclass(frozen=True)
+class MemberRecord:
+    """Nombre de un miembro en una fuente (capitulo o archivo)"""
+    record_id: int
+    name: str
+    source: Hashable = ''
+
+
+@dataclass(frozen=True)
+class Match:
+    left: MemberRecord
+    right: MemberRecord
+    score: float
+    rule: str
+
+
+class Resolution:
+    """Coincidencias y entidades resueltas"""
+
+    def __init__(self, records: Sequence[MemberRecord], matches: List[Match], threshold: float):
+        self.records = list(records)
+        self.matches = matches
+        self.threshold = threshold
+        self.comparisons = 0
+        self.skipped_blocks = 0
+        parent = list(range(len(self.records)))
+        for match in matches:
+            if match.score >= threshold:
+                _union(parent, match.left.record_id, match.right.record_id)
+        self.entity_of = [_find(parent, index) for index in range(len(self.records))]
+
+    def entities(self) -> List[List[MemberRecord]]:
+        """Grupos de registros de la misma persona (solo los de mas de un registro)"""
+        groups: Dict[int, List[MemberRecord]] = {}
+        for record in self.records:
+            groups.setdefault(self.entity_of[record.record_id], []).append(record)
+        return [group for group in groups.values() if len(group) > 1]
+
+    def duplicates_within_source(self, min_score: float = 1.0) -> List[int]:
+        """record_id repetidos dentro de su fuente (se conserva el primero de cada grupo)"""
+        parent = list(range(len(self.records)))
+        for match in self.matches:
+            if match.score >= min_score and match.left.source == match.right.source:
+                _union(parent, match.left.record_id, match.right.record_id)
+        return [record.record_id for record in self.records if _find(parent, record.record_id) != record.record_id]
+
+    def dedupe_groups(self, min_score: float = 1.0) -> Dict[Hashable, List[str]]:
+        """Nombres por fuente sin las repeticiones dentro de la misma fuente"""
+        duplicates = set(self.duplicates_within_source(min_score))
+        groups: Dict[Hashable, List[str]] = {}
+        for record in self.records:
+            names = groups.setdefault(record.source, [])
+            if record.record_id not in duplicates:
+                names.append(record.name)
+        return groups
+
+    def write_match_table(self, path: Union[str, Path]) -> None:
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(MATCH_TABLE_COLUMNS)
+            for match in self.matches:
+                writer.writerow((match.left.source, match.left.name, match.right.source, match.right.name,
+                                 f'{match.score:.3f}', match.rule, self.entity_of[match.left.record_id]))
+
+    def print_summary(self) -> None:
+        cross = sum(1 for match in self.matches if match.left.source != match.right.source)
+        print(f'[OK] Identidades: {len(self.records)} nombres, {self.comparisons} comparaciones, '
+              f'{len(self.matches)} coincidencias ({cross} entre fuentes), {len(self.entities())} entidades '
+              f'con mas de un registro')
+        if self.skipped_blocks:
+            print(f'     [WARNING] {self.skipped_blocks} bloques de mas de {MAX_BLOCK} nombres omitidos')
+
+
+def _find(parent: List[int], index: int) -> int:
+    while parent[index] != index:
+        parent[index] = parent[parent[index]]
+        index = parent[index]
+    return index
+
+
+def _union(parent: List[int], a: int, b: int) -> None:
+    a, b = _find(parent, a), _find(parent, b)
+    if a != b:
+        parent[max(a, b)] = min(a, b)
+
+
+def resolve_identities(names: Iterable[Tuple[Hashable, str]], min_score: float = MIN_SCORE,
+                       threshold: float = MATCH_THRESHOLD, max_block: int = MAX_BLOCK) -> Resolution:
+    """
+    Compara los nombres (fuente, nombre) solo dentro de sus bloques y retorna la resolucion
+    con las coincidencias de puntaje >= min_score; se unen en entidades las >= threshold.
+    """
+    records = [MemberRecord(index, name, source) for index, (source, name) in enumerate(names)]
+    keys = [NameKey.of(record.name) for record in records]
+
+    blocks: Dict[Tuple[str, ...], List[int]] = {}
+    for index, key in enumerate(keys):
+        if not key.folded:
+            continue
+        for block_key in key.blocking_keys():
+            blocks.setdefault(block_key, []).append(index)
+
+    compared = set()
+    matches = []
+    skipped = 0
+    for members in blocks.values():
+        if len(members) > max_block:
+            skipped += 1
+            continue
+        for a, b in itertools.combinations(members, 2):
+            if (a, b) in compared:
+                continue
+            compared.add((a, b))
+            score, rule = name_similarity(keys[a], keys[b], min_score)
+            if score >= min_score:
+                matches.append(Match(records[a], records[b], score, rule))
+
+    matches.sort(key=lambda match: (match.left.record_id, match.right.record_id))
+    resolution = Resolution(records, matches, threshold)
+    resolution.comparisons = len(compared)
+    resolution.skipped_blocks = skipped
+    return resolution
+
+
+def resolve_groups(groups: Mapping[Hashable, Sequence[str]], **kwargs: Any) -> Resolution:
+    """resolve_identities sobre {fuente: [nombres]} (p.ej. nombres por ChapterId)"""
+    return resolve_identities(((source, name) for source, names in groups.items() for name in names), **kwargs)
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Servicio de ingesta incremental: vigila INSUMOS/ y procesa solo los libros nuevos o modificados.
+
+Cada sondeo revisa el tamaño y el mtime de los libros '(COL) <CAPITULO> CORTE NACIONAL.xlsx' (o .xls);
+solo si cambiaron se calcula el hash del contenido (un libro re-guardado sin cambios no se
+procesa). Los libros que cambiaron se parsean en un pool de procesos acotado, con a lo sumo un
+trabajo por capitulo: si el libro cambia de nuevo mientras se procesa, se reprocesa al terminar.
+
+Por capitulo (en el proceso principal, uno a la vez):
+  - Order: los miembros ya importados conservan el suyo (snapshot del capitulo); los nuevos
+    reciben un rango reservado en el ledger de Orders, sin depender de los demas capitulos
+  - placas: indice persistente de placas (sufijos _ORD estables entre capitulos y corridas). Antes
+    de asignar, las placas ya importadas de todos los capitulos se registran en el indice: una
+    placa repetida sigue con el dueño que la tenia en la reimportacion completa, sin importar
+    que capitulo se procese primero
+  - delta contra el snapshot del capitulo -> ingest_state/deltas/delta_<id>_<capitulo>_<fecha>.sql
+  - una linea en el journal (ingest_state/journal.jsonl) por libro procesado, con o sin cambios
+
+La primera vez que se ve un capitulo, su snapshot sale del snapshot global de la reimportacion
+completa (import_snapshot.json), asi el servicio continua desde la ultima carga completa.
+
+Uso:
+  python python/ingest_service.py                 # sondeo continuo cada 10 s (Ctrl+C para salir)
+  python python/ingest_service.py --once          # procesar los cambios pendientes y salir
+"""
+
+import argparse
+import json
+import os
+import re
+import tempfile
+import time
+import unicodedata
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+from chapter_ingest import STATUS_MODES, merge_chapters, natural_keys, parse_chapter
+from db_access import DatabaseError
+from delta_import import (DEFAULT_SNAPSHOT, build_snapshot, chapter_snapshot, delta_script, delta_statements,
+                          diff_snapshot, load_snapshot, save_snapshot)
+from order_allocator import DEFAULT_ORDER_LEDGER, OrderAllocator, seed_from_database
+from parse_cache import file_digest
+from plate_index import DEFAULT_PLATE_INDEX, PlateIndex
+
+DEFAULT_WATCH_DIR = 'INSUMOS'
+DEFAULT_STATE_DIR = 'ingest_state'
+DEFAULT_INTERVAL = 10.0
+# Un libro modificado hace menos de SETTLE_SECONDS puede estar copiandose todavia
+SETTLE_SECONDS = 2.0
+STATE_VERSION = 1
+
+# Capitulo -> ChapterId (mismos ids que FILES_CHAPTERS de los importadores)
+CHAPTERS = {'PEREIRA': 1, 'MEDELLÍN': 2, 'SABANA': 3, 'CUCUTA': 4, 'CARTAGENA': 5, 'BUCARAMANGA': 6}
+
+_CHAPTER_FILE = re.compile(r'^\(COL\) (?P<name>.+) CORTE NACIONAL\.xlsx?$', re.IGNORECASE)
+
+
+def _fold(text: str) -> str:
+    # NFC: el mismo nombre puede llegar con la tilde compuesta o separada segun el sistema de archivos
+    return unicodedata.normalize('NFC', text).strip().upper()
+
+
+def chapter_for(path: Union[str, Path], chapters: Mapping[str, int] = CHAPTERS) -> Optional[Tuple[int, str]]:
+    """(ChapterId, capitulo) del libro segun su nombre, o None si no es un libro de capitulo conocido"""
+    match = _CHAPTER_FILE.match(_fold(Path(path).name))
+    if not match:
+        return None
+    folded = {_fold(name): (chapter_id, name) for name, chapter_id in chapters.items()}
+    return folded.get(match.group('name'))
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Tamaño, mtime y hash del contenido de un libro"""
+    size: int
+    mtime_ns: int
+    sha256: str
+
+    def same_stat(self, stat: os.stat_result) -> bool:
+        return self.size == stat.st_size and self.mtime_ns == stat.st_mtime_ns
+
+
+@dataclass(frozen=True)
+class Change:
+    """Libro nuevo o modificado de un capitulo"""
+    path: Path
+    chapter_id: int
+    chapter: str
+    fingerprint: Fingerprint
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Escritura atomica (archivo temporal + replace)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_name, path)
+
+
+class IngestService:
+    """Sondeo de la carpeta, pool de parseo y delta por capitulo"""
+
+    def __init__(self, watch_dir: Union[str, Path] = DEFAULT_WATCH_DIR,
+                 state_dir: Union[str, Path] = DEFAULT_STATE_DIR, workers: int = 2, status_mode: str = 'normalize',
+                 chapters: Mapping[str, int] = CHAPTERS, bootstrap_snapshot: Optional[str] = DEFAULT_SNAPSHOT,
+                 order_ledger: str = DEFAULT_ORDER_LEDGER, plate_index: str = DEFAULT_PLATE_INDEX,
+                 settle_seconds: float = SETTLE_SECONDS):
+        if status_mode not in STATUS_MODES:
+            raise ValueError(f'status_mode invalido: {status_mode}')
+        self.watch_dir = Path(watch_dir)
+        self.state_dir = Path(state_dir)
+        self.state_path = self.state_dir / 'fingerprints.json'
+        self.journal_path = self.state_dir / 'journal.jsonl'
+        self.snapshot_dir = self.state_dir / 'snapshots'
+        self.delta_dir = self.state_dir / 'deltas'
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.status_mode = status_mode
+        self.chapters = chapters
+        self.bootstrap_snapshot = bootstrap_snapshot
+        self.order_ledger = order_ledger
+        self.plate_index = plate_index
+        self.settle_seconds = settle_seconds
+
+        # Huella de lo ya importado (persistente) y de lo ultimo enviado a parsear (en memoria)
+        self.imported: Dict[str, Fingerprint] = self._load_state()
+        self.submitted: Dict[str, Fingerprint] = dict(self.imported)
+        self.running: Dict[int, Tuple[Change, Future, float]] = {}
+        self.pending: Dict[int, Change] = {}
+        self._ignored: Set[str] = set()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> 'IngestService':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    # Estado persistente
+
+    def _load_state(self) -> Dict[str, Fingerprint]:
+        try:
+            data = json.loads(self.state_path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, ValueError):
+            return {}
+        if data.get('version') != STATE_VERSION:
+            return {}
+        return {name: Fingerprint(**entry) for name, entry in data['files'].items()}
+
+    def _save_state(self) -> None:
+        files = {name: {'size': fp.size, 'mtime_ns': fp.mtime_ns, 'sha256': fp.sha256}
+                 for name, fp in sorted(self.imported.items())}
+        _write_json(self.state_path, {'version': STATE_VERSION, 'files': files})
+
+    def _journal(self, entry: Dict[str, Any]) -> None:
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    # Deteccion de cambios
+
+    def scan(self) -> List[Change]:
+        """Libros de capitulo nuevos o con contenido distinto al ultimo enviado a parsear"""
+        changes = []
+        now = time.time()
+        for path in sorted(self.watch_dir.glob('*.xls*')):
+            if path.name.startswith('~$'):
+                continue  # archivo de bloqueo de Excel
+            chapter = chapter_for(path, self.chapters)
+            if chapter is None:
+                if path.name not in self._ignored:
+                    self._ignored.add(path.name)
+                    print(f'[WARNING] {path.name}: no corresponde a un capitulo conocido, se ignora')
+                continue
+            stat = path.stat()
+            previous = self.submitted.get(path.name)
+            if previous is not None and previous.same_stat(stat):
+                continue
+            if now - stat.st_mtime < self.settle_seconds:
+                continue
+            fingerprint = Fingerprint(stat.st_size, stat.st_mtime_ns, file_digest(path))
+            if previous is not None and previous.sha256 == fingerprint.sha256:
+                # Re-guardado sin cambios: solo se actualiza la huella
+                self.submitted[path.name] = fingerprint
+                if path.name in self.imported:
+                    self.imported[path.name] = fingerprint
+                    self._save_state()
+                continue
+            changes.append(Change(path, chapter[0], chapter[1], fingerprint))
+        return changes
+
+    def poll(self) -> int:
+        """Un sondeo: envia a parsear los libros que cambiaron; retorna cuantos se enviaron"""
+        submitted = 0
+        for change in self.scan():
+            self.submitted[change.path.name] = change.fingerprint
+            if change.chapter_id in self.running:
+                self.pending[change.chapter_id] = change
+            else:
+                self._submit(change)
+                submitted += 1
+        return submitted
+
+    def _submit(self, change: Change) -> None:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        future = self._executor.submit(parse_chapter, str(change.path), change.chapter_id, change.chapter,
+                                       self.status_mode)
+        self.running[change.chapter_id] = (change, future, time.perf_counter())
+        print(f'[OK] Parseando {change.path.name} (capitulo {change.chapter_id})')
+
+    def collect(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Espera trabajos terminados (hasta timeout) y los aplica; retorna las entradas del journal"""
+        if not self.running:
+            return []
+        futures = {future: chapter_id for chapter_id, (_, future, _) in self.running.items()}
+        done, _ = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        entries = []
+        for future in done:
+            chapter_id = futures[future]
+            change, _, started = self.running.pop(chapter_id)
+            entries.append(self._finish(change, future, started))
+            if chapter_id in self.pending:
+                self._submit(self.pending.pop(chapter_id))
+        return entries
+
+    def run_once(self) -> List[Dict[str, Any]]:
+        """Procesa todos los cambios pendientes y espera a que terminen"""
+        self.poll()
+        entries = []
+        while self.running:
+            entries.extend(self.collect())
+        return entries
+
+    def serve(self, interval: float = DEFAULT_INTERVAL) -> None:
+        print(f'[OK] Vigilando {self.watch_dir} cada {interval:.0f} s ({self.workers} procesos); Ctrl+C para salir')
+        try:
+            while True:
+                self.poll()
+                if self.running:
+                    self.collect(timeout=interval)
+                else:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            print('\n[OK] Servicio detenido')
+
+    # Aplicacion por capitulo
+
+    def _finish(self, change: Change, future: Future, started: float) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            'time': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'file': change.path.name, 'chapter_id': change.chapter_id, 'chapter': change.chapter,
+            'sha256': change.fingerprint.sha256,
+        }
+        try:
+            result = future.result()
+            print(result['log'], end='')
+            if not result['rows']:
+                # Sin filas no se genera delta: borraria el capitulo completo
+                raise ValueError('el libro no produjo miembros (ver log del parseo)')
+            entry.update(self._apply(change, result))
+            self.imported[change.path.name] = change.fingerprint
+            self._save_state()
+        except Exception as exc:
+            entry.update(status='error', error=f'{type(exc).__name__}: {exc}')
+            print(f'[ERROR] {change.path.name}: {entry["error"]}')
+        entry['seconds'] = round(time.perf_counter() - started, 3)
+        self._journal(entry)
+        return entry
+
+    def _previous_rows(self, chapter_id: int, base: Optional[Dict[str, Dict[str, Any]]] = None
+                       ) -> Dict[str, Dict[str, Any]]:
+        rows = load_snapshot(self.snapshot_dir / f'chapter_{chapter_id}.json')
+        if rows is not None:
+            return rows
+        if base is None and self.bootstrap_snapshot:
+            base = load_snapshot(self.bootstrap_snapshot)
+        return chapter_snapshot(base, chapter_id) if base else {}
+
+    def _seed_plates(self, plates: PlateIndex) -> None:
+        """Registra en el indice las placas ya importadas de todos los capitulos"""
+        base = load_snapshot(self.bootstrap_snapshot) if self.bootstrap_snapshot else None
+        for chapter_id in sorted(set(self.chapters.values())):
+            for owner, row in self._previous_rows(chapter_id, base).items():
+                # Las placas AUTO_ORD_ son de miembros sin placa: no pasan por el indice
+                if row['plate'] and not row['plate'].startswith('AUTO_ORD_'):
+                    plates.seed(row['plate'], owner, chapter_id, row['order'])
+
+    def _reserve(self, change: Change, count: int) -> List[int]:
+        with OrderAllocator(self.order_ledger) as allocator:
+            if not allocator.seeded:
+                base = load_snapshot(self.bootstrap_snapshot) if self.bootstrap_snapshot else None
+                allocator.advance(max((row['order'] for row in (base or {}).values()), default=0))
+                try:
+                    seed_from_database(allocator)
+                except DatabaseError as e:
+                    print(f'[WARNING] Ledger de Orders sin semilla de la BD: {e}')
+            return list(allocator.reserve(change.chapter_id, count, label=f'ingest_service {change.chapter}'))
+
+    def _apply(self, change: Change, result: Dict[str, Any]) -> Dict[str, Any]:
+        chapter_id = change.chapter_id
+        previous = self._previous_rows(chapter_id)
+
+        # Order: el anterior por llave natural, o uno nuevo del ledger
+        keys = natural_keys([{'chapter_id': chapter_id, 'complete_name': row['complete_name']}
+                             for row in result['rows']])
+        new_keys = [key for key in keys if key not in previous]
+        orders = {key: previous[key]['order'] for key in keys if key in previous}
+        if new_keys:
+            orders.update(zip(new_keys, self._reserve(change, len(new_keys))))
+
+        with PlateIndex(self.plate_index, label=f'ingest_service {change.chapter}') as plates:
+            self._seed_plates(plates)
+            members, vehicles = merge_chapters([result], plates, orders.__getitem__)
+
+        delta = diff_snapshot(previous, members, vehicles)
+        delta.print_summary()
+        script = None
+        statements = delta_statements(delta)
+        if statements:
+            stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+            slug = re.sub(r'\W+', '_', change.chapter).strip('_')
+            script = self.delta_dir / f'delta_{chapter_id:02d}_{slug}_{stamp}.sql'
+            self.delta_dir.mkdir(parents=True, exist_ok=True)
+            lines = delta_script(statements, f'INGESTA INCREMENTAL - {change.path.name}',
+                                 f'Ingesta incremental {change.chapter} completada')
+            with open(script, 'w', encoding='utf-8-sig') as f:
+                f.write('\n'.join(lines))
+            print(f'[OK] Script generado: {script} ({len(statements)} sentencias)')
+        else:
+            print(f'[OK] {change.chapter}: sin cambios en los datos, no se genera script')
+        save_snapshot(self.snapshot_dir / f'chapter_{chapter_id}.json', build_snapshot(members, vehicles))
+
+        new_members = sum(1 for match, _ in delta.members if match is None)
+        new_vehicles = sum(1 for match, _ in delta.vehicles if match is None)
+        return {
+            'status': 'ok' if statements else 'unchanged',
+            'members': len(members), 'vehicles': len(vehicles),
+            'changes': {'members_new': new_members, 'members_modified': len(delta.members) - new_members,
+                        'members_deleted': len(delta.deleted_orders), 'vehicles_new': new_vehicles,
+                        'vehicles_modified': len(delta.vehicles) - new_vehicles,
+                        'vehicles_deleted': len(delta.deleted_plates)},
+            'statements': len(statements), 'script': str(script) if script else None,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingesta incremental de los libros de INSUMOS/')
+    parser.add_argument('--watch-dir', default=DEFAULT_WATCH_DIR, help='Carpeta vigilada')
+    parser.add_argument('--state-dir', default=DEFAULT_STATE_DIR,
+                        help='Huellas, snapshots por capitulo, scripts delta y journal')
+    parser.add_argument('--once', action='store_true', help='Procesar los cambios pendientes y salir')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, help='Segundos entre sondeos')
+    parser.add_argument('--workers', type=int, default=2, help='Procesos de parseo (0 = todos los nucleos)')
+    parser.add_argument('--status-mode', choices=STATUS_MODES, default='normalize', help='Tratamiento de STATUS')
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT,
+                        help='Snapshot de la reimportacion completa (punto de partida de cada capitulo)')
+    parser.add_argument('--order-ledger', default=DEFAULT_ORDER_LEDGER, help='Ledger de Orders (SQLite)')
+    parser.add_argument('--plate-index', default=DEFAULT_PLATE_INDEX, help='Indice persistente de placas (SQLite)')
+    args = parser.parse_args()
+
+    with IngestService(args.watch_dir, args.state_dir, workers=args.workers, status_mode=args.status_mode,
+                       bootstrap_snapshot=args.snapshot, order_ledger=args.order_ledger,
+                       plate_index=args.plate_index) as service:
+        if args.once:
+            entries = service.run_once()
+            print(f'\n[OK] {len(entries)} libros procesados '
+                  f'({sum(1 for entry in entries if entry["status"] == "error")} con error)')
+        else:
+            service.serve(args.interval)
+
+
+if __name__ == '__main__':
+    main()
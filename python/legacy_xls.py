@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Libros Excel 97-2003 (.xls) convertidos una sola vez a .xlsx y cacheados por hash del contenido.
+
+Todos los lectores del ETL (xlsx_stream, header_detect, parse_cache, workbook_metadata) trabajan
+sobre .xlsx; un .xls se convierte y desde ahi sigue el mismo camino que un libro moderno. La
+conversion se guarda en <cache>/xls/<sha256 del .xls>.xlsx, asi en las corridas siguientes un
+capitulo .xls cuesta lo mismo que uno .xlsx (hash + cache de parseo), y un .xls renombrado o
+copiado reutiliza la conversion.
+
+Convertidores, en orden:
+  - xlrd (+ openpyxl): lectura nativa en el mismo proceso, sin lanzar nada
+  - LibreOffice: un solo proceso soffice --headless para todo el lote pendiente (no uno por
+    archivo), con un perfil de usuario propio que se reutiliza entre lotes y no choca con un
+    LibreOffice de escritorio abierto. Ejecutable: LAMA_SOFFICE, o soffice/libreoffice en el PATH
+
+Uso:
+  python python/legacy_xls.py "INSUMOS/(COL) SABANA CORTE NACIONAL.xls"   # convertir (o reutilizar)
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from parse_cache import ParseCache, default_cache, file_digest
+
+LEGACY_SUFFIXES = ('.xls',)
+# Tiempo maximo de un lote de LibreOffice (el primer arranque crea el perfil y es el mas lento)
+BATCH_TIMEOUT = 300.0
+
+
+class LegacyConversionError(RuntimeError):
+    """No se pudo convertir un libro .xls (sin convertidor disponible o fallo la conversion)"""
+
+
+def is_legacy(path: Union[str, Path]) -> bool:
+    return Path(path).suffix.lower() in LEGACY_SUFFIXES
+
+
+def conversion_dir(cache: Optional[ParseCache] = None) -> Path:
+    return (cache or default_cache()).cache_dir / 'xls'
+
+
+def converted_path(path: Union[str, Path], cache: Optional[ParseCache] = None) -> Path:
+    """Ruta del .xlsx convertido de un .xls (exista o no todavia)"""
+    return conversion_dir(cache) / f'{file_digest(path)}.xlsx'
+
+
+class Converter(ABC):
+    """Convierte un lote {.xls origen: .xlsx destino}; available indica si se puede usar aqui"""
+
+    name = ''
+
+    @property
+    @abstractmethod
+    def available(self) -> bool:
+        ...
+
+    @abstractmethod
+    def convert(self, jobs: Dict[Path, Path]) -> None:
+        ...
+
+
+class XlrdConverter(Converter):
+    """Lectura nativa del .xls con xlrd y escritura .xlsx con openpyxl (write-only)"""
+
+    name = 'xlrd'
+
+    @property
+    def available(self) -> bool:
+        try:
+            import openpyxl  # noqa: F401
+            import xlrd  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def convert(self, jobs: Dict[Path, Path]) -> None:
+        import openpyxl
+        import xlrd
+
+        for source, target in jobs.items():
+            book = xlrd.open_workbook(str(source))
+            workbook = openpyxl.Workbook(write_only=True)
+            for sheet in book.sheets():
+                worksheet = workbook.create_sheet(sheet.name)
+                for row in range(sheet.nrows):
+                    worksheet.append([self._value(cell, book.datemode) for cell in sheet.row(row)])
+            workbook.save(str(target))
+
+    @staticmethod
+    def _value(cell, datemode: int):
+        import xlrd
+
+        if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+            return None
+        if cell.ctype == xlrd.XL_CELL_DATE:
+            return xlrd.xldate.xldate_as_datetime(cell.value, datemode)
+        if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+            return bool(cell.value)
+        return cell.value
+
+
+class LibreOfficeConverter(Converter):
+    """soffice --headless --convert-to xlsx sobre el lote completo en un solo proceso"""
+
+    name = 'libreoffice'
+
+    def __init__(self, executable: Optional[str] = None, profile_dir: Optional[Path] = None,
+                 timeout: float = BATCH_TIMEOUT):
+        self.executable = (executable or os.environ.get('LAMA_SOFFICE') or shutil.which('soffice')
+                           or shutil.which('libreoffice'))
+        self.profile_dir = profile_dir
+        self.timeout = timeout
+
+    @property
+    def available(self) -> bool:
+        return self.executable is not None
+
+    def convert(self, jobs: Dict[Path, Path]) -> None:
+        profile_dir = self.profile_dir or conversion_dir() / 'soffice-profile'
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory() as work:
+            # Copias con el nombre final (<hash>.xls): la salida queda como <hash>.xlsx sin colisiones
+            inputs = []
+            for source, target in jobs.items():
+                copy = Path(work) / f'{target.stem}{source.suffix.lower()}'
+                shutil.copyfile(source, copy)
+                inputs.append(str(copy))
+            out_dir = Path(work) / 'out'
+            command = [self.executable, f'-env:UserInstallation={profile_dir.resolve().as_uri()}', '--headless',
+                       '--norestore', '--convert-to', 'xlsx', '--outdir', str(out_dir), *inputs]
+            try:
+                result = subprocess.run(command, capture_output=True, text=True, timeout=self.timeout)
+            except subprocess.TimeoutExpired as exc:
+                raise LegacyConversionError(f'LibreOffice no termino en {self.timeout:.0f} s') from exc
+            missing = []
+            for target in jobs.values():
+                produced = out_dir / target.name
+                if produced.exists():
+                    shutil.move(str(produced), target)
+                else:
+                    missing.append(target.name)
+            if missing:
+                detail = (result.stderr or result.stdout).strip().splitlines()
+                raise LegacyConversionError(f'LibreOffice no genero {", ".join(missing)} (codigo {result.returncode}'
+                                            f'{": " + detail[-1] if detail else ""})')
+
+
+def default_converters() -> List[Converter]:
+    return [XlrdConverter(), LibreOfficeConverter()]
+
+
+def ensure_xlsx(paths: Iterable[Union[str, Path]], cache: Optional[ParseCache] = None,
+                converters: Optional[Sequence[Converter]] = None) -> Dict[Path, Path]:
+    """
+    {ruta original: ruta .xlsx legible}. Los .xlsx se devuelven tal cual; los .xls salen de la
+    conversion cacheada o se convierten todos los pendientes en un solo lote. Un .xls que no se
+    pudo convertir queda fuera del resultado (el error se informa en consola).
+    """
+    resolved: Dict[Path, Path] = {}
+    pending: Dict[Path, Path] = {}
+    for path in map(Path, paths):
+        if not is_legacy(path):
+            resolved[path] = path
+            continue
+        target = converted_path(path, cache)
+        if target.exists():
+            resolved[path] = target
+        else:
+            pending[path] = target
+    if not pending:
+        return resolved
+
+    out_dir = conversion_dir(cache)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    available = [converter for converter in (converters or default_converters()) if converter.available]
+    if not available:
+        for path in pending:
+            print(f'     [ERROR] {path.name}: instalar xlrd + openpyxl o LibreOffice para leer libros .xls')
+        return resolved
+
+    # Cada convertidor escribe en un temporal; el .xlsx aparece completo (os.replace) o no aparece
+    with tempfile.TemporaryDirectory(dir=out_dir) as work:
+        staged = {source: Path(work) / target.name for source, target in pending.items()}
+        remaining = dict(staged)
+        errors: List[str] = []
+        for converter in available:
+            try:
+                converter.convert(remaining)
+            except Exception as exc:
+                errors.append(f'{converter.name}: {exc}')
+            remaining = {source: tmp for source, tmp in remaining.items() if not tmp.exists()}
+            if not remaining:
+                break
+        for source, tmp in staged.items():
+            if tmp.exists():
+                os.replace(tmp, pending[source])
+                resolved[source] = pending[source]
+                print(f'     [OK] Convertido a XLSX: {source.name}')
+            else:
+                print(f'     [ERROR] No se pudo convertir {source.name} ({"; ".join(errors) or "sin salida"})')
+    return resolved
+
+
+def xlsx_path(path: Union[str, Path], cache: Optional[ParseCache] = None,
+              converters: Optional[Sequence[Converter]] = None) -> Path:
+    """Ruta .xlsx legible de un libro (.xlsx tal cual; .xls convertido y cacheado)"""
+    resolved = ensure_xlsx([path], cache, converters)
+    if Path(path) not in resolved:
+        raise LegacyConversionError(f'No se pudo convertir {Path(path).name} a XLSX')
+    return resolved[Path(path)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convierte libros .xls a .xlsx (cache por hash)')
+    parser.add_argument('paths', nargs='+', help='Libros .xls (los .xlsx se ignoran)')
+    args = parser.parse_args()
+    resolved = ensure_xlsx(args.paths)
+    for source in map(Path, args.paths):
+        print(f'{source} -> {resolved.get(source, "[ERROR] sin conversion")}')
+    if len(resolved) < len(args.paths):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,27 +3,78 @@
 Script de migracion: Lee Excel y genera INSERT SQL para Members y Vehicles
 """
 
+import argparse
 import pandas as pd
 import sys
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import Dict, Iterator, List, Tuple
+
+from column_resolver import resolve_columns
+from columnar_transform import (escape_sql_string, int_column, iterrows_view, normalized_name_column,
+                                odometer_column, parse_int, sql_string_column, truthy_bit_column)
+from bulk_export import (BULK_ENCODINGS, BULK_VEHICLE_STAGING_TABLE, MEMBER_STAGING_TABLE, OUTPUT_TARGETS,
+                         BulkTable, write_bulk_load)
+from header_detect import find_header_row
+from parse_cache import load_sheet_columns
+from run_profiler import active_profiler, add_profile_arguments, instrumented
+from sql_emitter import (DEFAULT_BATCH_SIZE, LINK_MODES, MAX_VALUES_ROWS, check_batch_size, column_names,
+                         stream_batched_inserts, stream_linked_vehicle_inserts)
+from sql_writer import SqlScriptWriter, split_bytes
 
 class MigrationGenerator:
-    def __init__(self, excel_path: str):
+    # Columnas del ODOMETER que realmente consume el generador
+    USED_COLUMNS = ('Order', ' Complete Names', 'Country Birth', 'In Lama Since',
+                    ' Motorcycle Data', 'Lic Plate', 'Trike')
+    ODOMETER_PREFIXES = ('Starting Odometer', 'Final Odometer')
+
+    MEMBER_COLUMNS = (('[ChapterId]', 'INT'), ('[Order]', 'INT'), ('[ Complete Names]', 'NVARCHAR(255)'),
+                      ('[CompleteNamesNormalized]', 'NVARCHAR(255)'), ('[Country Birth]', 'NVARCHAR(100)'),
+                      ('[In Lama Since]', 'INT'), ('[STATUS]', 'NVARCHAR(50)'), ('[is_eligible]', 'BIT'))
+    # Datos del vehiculo (sin [MemberId], que se vincula por Order) con su tipo para la tabla staging
+    VEHICLE_COLUMNS = (('[ Motorcycle Data]', 'NVARCHAR(MAX)'), ('[Lic Plate]', 'NVARCHAR(50)'), ('[Trike]', 'BIT'),
+                       ('[OdometerUnit]', 'NVARCHAR(20)'), ('[Starting Odometer]', 'FLOAT'),
+                       ('[Final Odometer]', 'FLOAT'), ('[Photography]', 'NVARCHAR(50)'),
+                       ('[IsActiveForChampionship]', 'BIT'))
+
+    def __init__(self, excel_path: str, batch_size: int = 0, link: str = 'lookup'):
         self.excel_path = excel_path
+        # 0 = un INSERT por fila; N = INSERT multi-fila de hasta N filas (max 1000)
+        self.batch_size = check_batch_size(batch_size) if batch_size else 0
+        # 'lookup' = subconsulta por vehiculo; 'staging' = tabla staging + un solo join por Order
+        if link not in LINK_MODES:
+            raise ValueError(f'link invalido: {link}')
+        self.link = link
         self.members = {}  # Dict de members por Order
         self.vehicles = []  # Lista de vehiculos
         
+    def is_used_column(self, col) -> bool:
+        """Indica si la columna del encabezado es consumida por el generador"""
+        if col in self.USED_COLUMNS:
+            return True
+        return isinstance(col, str) and col.startswith(self.ODOMETER_PREFIXES)
+
     def read_excel(self) -> pd.DataFrame:
-        """Lee el Excel y retorna DataFrame con datos de odometro"""
+        """Lee el Excel (cache de parseo o streaming) y retorna DataFrame solo con las columnas usadas"""
+        profiler = active_profiler()
+        label = Path(self.excel_path).name
         try:
-            df = pd.read_excel(self.excel_path, sheet_name='ODOMETER', header=7, keep_default_na=False)
+            with profiler.stage('header_detect', label):
+                header = find_header_row(self.excel_path, 'ODOMETER')
+            # fill_value='' equivale a keep_default_na=False de pd.read_excel
+            with profiler.stage('open_workbook', label) as stage:
+                table = load_sheet_columns(self.excel_path, 'ODOMETER', header=header, fill_value='')
+                stage.rows_out = len(next(iter(table.values()), ()))
             print(f"[OK] Leyendo Excel: {self.excel_path}")
+            print(f"[OK] Encabezado detectado en fila {header + 1}")
             print(f"[OK] Columnas encontradas:")
-            for col in df.columns:
+            for col in table:
                 has_space = col.startswith(' ') if isinstance(col, str) else False
                 marker = "[ESPACIO]" if has_space else ""
                 print(f"  - '{col}' {marker}")
+            with profiler.stage('column_map', label, rows_in=len(table)) as stage:
+                columns = [col for col in table if self.is_used_column(col)]
+                df = pd.DataFrame({col: table[col] for col in columns}, columns=columns)
+                stage.rows_out = len(columns)
             return df
         except FileNotFoundError:
             print(f"[ERROR] Archivo no encontrado {self.excel_path}")
@@ -34,35 +85,23 @@ class MigrationGenerator:
     
     def safe_parse_int(self, value) -> int:
         """Parsea un valor de forma segura a int, retorna None si no es posible"""
-        try:
-            if pd.isna(value) or value == '' or str(value).strip() == '':
-                return None
-            # Si es datetime, extraer year
-            if hasattr(value, 'year'):
-                return value.year
-            # Si es string o numero, convertir
-            return int(float(str(value).strip()))
-        except (ValueError, TypeError, AttributeError):
-            return None
+        return parse_int(value)
     
     def escape_sql_string(self, value: str) -> str:
         """Escapa caracteres especiales para SQL"""
-        if value is None or (isinstance(value, float) and pd.isna(value)):
-            return "NULL"
-        value = str(value).replace("'", "''")
-        return f"N'{value}'"
+        return escape_sql_string(value)
     
     def find_odometer_column(self, df: pd.DataFrame, prefix: str) -> str:
-        """Busca columna que contenga el prefijo dado"""
-        for col in df.columns:
-            if isinstance(col, str) and col.startswith(prefix):
-                return col
-        return None
+        """Busca columna que empiece con el prefijo dado (plan de columnas memoizado)"""
+        prefixes = self.ODOMETER_PREFIXES if prefix in self.ODOMETER_PREFIXES else (prefix,)
+        return resolve_columns(df.columns, prefixes).prefixed[prefix]
 
     def generate_members_inserts(self, df: pd.DataFrame) -> List[str]:
         """Genera INSERTs para Members SOLO con columnas que existen en schema"""
-        inserts = []
-        
+        return list(self.iter_members_inserts(df))
+
+    def iter_members_inserts(self, df: pd.DataFrame) -> Iterator[str]:
+        """INSERTs de Members uno a uno, a medida que se consumen (escritura en streaming)"""
         order_col = 'Order'
         complete_names_col = ' Complete Names'
         country_birth_col = 'Country Birth'
@@ -70,39 +109,70 @@ class MigrationGenerator:
         
         if order_col not in df.columns or complete_names_col not in df.columns:
             print(f"[ERROR] Columnas requeridas no encontradas")
-            return inserts
+            return
         
-        for _, row in df.drop_duplicates(subset=[order_col]).iterrows():
-            order = self.safe_parse_int(row[order_col])
-            if not order or order == 0:
-                continue
-            
-            complete_names = row.get(complete_names_col, 'Unknown')
-            country_birth = row.get(country_birth_col, None) if country_birth_col in df.columns else None
-            in_lama_since = self.safe_parse_int(row[in_lama_since_col]) if in_lama_since_col in df.columns else None
-            
-            self.members[order] = {
-                'Order': order,
-                'CompleteNames': complete_names,
-                'CountryBirth': country_birth,
-                'InLamaSince': in_lama_since
-            }
-            
+        # Transformacion columnar: cada columna se convierte completa antes de armar los INSERTs
+        unique = iterrows_view(df.drop_duplicates(subset=[order_col]))
+        orders = int_column(unique[order_col])
+        names = unique[complete_names_col].tolist()
+        names_sql = sql_string_column(unique[complete_names_col])
+        normalized = normalized_name_column(names)
+        normalized_sql = [escape_sql_string(name) for name in normalized]
+        if country_birth_col in df.columns:
+            countries = unique[country_birth_col].tolist()
+            countries_sql = [sql if country else 'NULL'
+                             for country, sql in zip(countries, sql_string_column(unique[country_birth_col]))]
+        else:
+            countries = [None] * len(unique)
+            countries_sql = ['NULL'] * len(unique)
+        if in_lama_since_col in df.columns:
+            years = int_column(unique[in_lama_since_col])
+        else:
+            years = [None] * len(unique)
+        
+        def rows():
+            for order, complete_names, name_sql, normalized_name, normalized_name_sql, country_birth, country_sql, \
+                    in_lama_since in zip(orders, names, names_sql, normalized, normalized_sql, countries,
+                                         countries_sql, years):
+                if not order or order == 0:
+                    continue
+                
+                self.members[order] = {
+                    'Order': order,
+                    'CompleteNames': complete_names,
+                    'CompleteNamesNormalized': normalized_name,
+                    'CountryBirth': country_birth,
+                    'InLamaSince': in_lama_since
+                }
+                yield order, name_sql, normalized_name_sql, country_sql, in_lama_since
+        
+        if self.batch_size:
+            statements, report = stream_batched_inserts(
+                '[dbo].[Members]', column_names(self.MEMBER_COLUMNS),
+                (('1', str(order), name_sql, normalized_name_sql, country_sql,
+                  str(in_lama_since) if in_lama_since else 'NULL', "'ACTIVE'", '1')
+                 for order, name_sql, normalized_name_sql, country_sql, in_lama_since in rows()),
+                self.batch_size)
+            yield from statements
+            report.print_summary()
+            return
+        
+        for order, name_sql, normalized_name_sql, country_sql, in_lama_since in rows():
             insert_sql = f"""INSERT INTO [dbo].[Members] 
-    ([ChapterId], [Order], [ Complete Names], [Country Birth], [In Lama Since], [STATUS], [is_eligible])
+    ([ChapterId], [Order], [ Complete Names], [CompleteNamesNormalized], [Country Birth], [In Lama Since], [STATUS], [is_eligible])
 VALUES 
-    (1, {order}, {self.escape_sql_string(str(complete_names))}, 
-     {self.escape_sql_string(str(country_birth)) if country_birth else 'NULL'}, 
+    (1, {order}, {name_sql}, {normalized_name_sql}, 
+     {country_sql}, 
      {in_lama_since if in_lama_since else 'NULL'}, 'ACTIVE', 1);"""
             
-            inserts.append(insert_sql.strip())
-        
-        return inserts
+            yield insert_sql.strip()
 
     def generate_vehicles_inserts(self, df: pd.DataFrame) -> List[str]:
         """Genera INSERTs para Vehicles SOLO con columnas que existen en schema"""
-        inserts = []
-        
+        return list(self.iter_vehicles_inserts(df))
+
+    def iter_vehicles_inserts(self, df: pd.DataFrame) -> Iterator[str]:
+        """INSERTs de Vehicles uno a uno; requiere los Members ya generados (self.members)"""
         order_col = 'Order'
         motorcycle_data_col = ' Motorcycle Data'
         lic_plate_col = 'Lic Plate'
@@ -113,7 +183,7 @@ VALUES
         
         if missing_cols:
             print(f"[ERROR] Columnas faltantes: {missing_cols}")
-            return inserts
+            return
         
         starting_odo_col = self.find_odometer_column(df, 'Starting Odometer')
         final_odo_col = self.find_odometer_column(df, 'Final Odometer')
@@ -123,62 +193,123 @@ VALUES
         if not final_odo_col:
             print(f"[WARNING] No se encontro columna 'Final Odometer'")
         
-        for idx, row in df.iterrows():
-            order = self.safe_parse_int(row[order_col])
-            if not order or order == 0 or order not in self.members:
-                continue
-            
-            motorcycle_data = row.get(motorcycle_data_col, 'Unknown')
-            lic_plate_raw = row.get(lic_plate_col, '')
+        # Solo filas con Order de un miembro generado (el resto no se convierte)
+        df = iterrows_view(df)
+        orders = int_column(df[order_col])
+        keep = [i for i, order in enumerate(orders) if order and order != 0 and order in self.members]
+        
+        def kept(col):
+            return df[col].iloc[keep]
+        
+        orders = [orders[i] for i in keep]
+        motorcycles = kept(motorcycle_data_col).tolist()
+        motorcycles_sql = sql_string_column(kept(motorcycle_data_col))
+        plates = [
             # Si Lic Plate esta vacia, generar valor AUTO basado en Order para unicidad
-            if not lic_plate_raw or (isinstance(lic_plate_raw, str) and not lic_plate_raw.strip()):
-                lic_plate_sql = self.escape_sql_string(f'AUTO_ORD_{order}')
-            else:
-                lic_plate_sql = self.escape_sql_string(str(lic_plate_raw).strip())
-            trike = 1 if trike_col in df.columns and pd.notna(row.get(trike_col, None)) and row[trike_col] else 0
-            
-            starting_odo = None
-            final_odo = None
-            
-            if starting_odo_col:
-                starting_odo = row.get(starting_odo_col, None)
-            if final_odo_col:
-                final_odo = row.get(final_odo_col, None)
-            
-            starting_reading = starting_odo if pd.notna(starting_odo) and starting_odo > 0 else 0
-            final_reading = final_odo if pd.notna(final_odo) and final_odo > 0 else 0
-            
+            f'AUTO_ORD_{order}' if not plate or (isinstance(plate, str) and not plate.strip()) else str(plate).strip()
+            for order, plate in zip(orders, kept(lic_plate_col).tolist())
+        ]
+        plates_sql = [self.escape_sql_string(plate) for plate in plates]
+        trikes = truthy_bit_column(kept(trike_col)) if trike_col in df.columns else [0] * len(keep)
+        starting_readings = odometer_column(kept(starting_odo_col)) if starting_odo_col else [0] * len(keep)
+        final_readings = odometer_column(kept(final_odo_col)) if final_odo_col else [0] * len(keep)
+        
+        def rows():
+            for order, motorcycle, motorcycle_sql, lic_plate, lic_plate_sql, trike, starting_reading, final_reading in zip(
+                    orders, motorcycles, motorcycles_sql, plates, plates_sql, trikes, starting_readings, final_readings):
+                self.vehicles.append({
+                    'Order': order,
+                    'MotorcycleData': str(motorcycle),
+                    'LicPlate': lic_plate,
+                    'Trike': trike,
+                    'StartingOdometer': starting_reading if starting_reading > 0 else None,
+                    'FinalOdometer': final_reading if final_reading > 0 else None
+                })
+                yield (order, motorcycle_sql, lic_plate_sql, trike,
+                       starting_reading if starting_reading > 0 else 'NULL',
+                       final_reading if final_reading > 0 else 'NULL')
+        
+        if self.batch_size or self.link == 'staging':
+            statements, report = stream_linked_vehicle_inserts(
+                self.VEHICLE_COLUMNS,
+                ((order, (motorcycle_sql, lic_plate_sql, str(trike), "'Miles'", str(starting), str(final),
+                          "'PENDING'", '1'))
+                 for order, motorcycle_sql, lic_plate_sql, trike, starting, final in rows()),
+                link=self.link, batch_size=self.batch_size or DEFAULT_BATCH_SIZE)
+            yield from statements
+            report.print_summary()
+            return
+        
+        for order, motorcycle_sql, lic_plate_sql, trike, starting, final in rows():
             insert_sql = f"""INSERT INTO [dbo].[Vehicles]
     ([MemberId], [ Motorcycle Data], [Lic Plate], [Trike], [OdometerUnit], 
      [Starting Odometer], [Final Odometer], [Photography], [IsActiveForChampionship])
 VALUES
     ((SELECT TOP 1 [MemberId] FROM [dbo].[Members] WHERE [Order] = {order} ORDER BY [MemberId] DESC), 
-     {self.escape_sql_string(str(motorcycle_data))}, 
+     {motorcycle_sql}, 
      {lic_plate_sql}, 
      {trike}, 'Miles',
-     {starting_reading if starting_reading > 0 else 'NULL'}, 
-     {final_reading if final_reading > 0 else 'NULL'}, 
+     {starting}, 
+     {final}, 
      'PENDING', 1);"""
             
-            inserts.append(insert_sql.strip())
-        
-        return inserts
+            yield insert_sql.strip()
     
-    def generate_migration_script(self, output_path: str = "migration_script.sql"):
-        """Genera el script SQL completo de migracion"""
+    def generate_bulk_load(self, output_dir: str, encoding: str = 'utf-16') -> str:
+        """Escribe Members y Vehicles ya generados como archivos de carga masiva + driver BULK INSERT"""
+        # Un miembro por Order (self.members); los vehiculos se vinculan por Order en el driver
+        members = [
+            (1, member['Order'], str(member['CompleteNames']), member['CompleteNamesNormalized'],
+             str(member['CountryBirth']) if member['CountryBirth'] else None,
+             member['InLamaSince'] if member['InLamaSince'] else None, 'ACTIVE', 1)
+            for member in self.members.values()
+        ]
+        vehicles = [
+            (vehicle['Order'], (vehicle['MotorcycleData'], vehicle['LicPlate'], vehicle['Trike'], 'Miles',
+                                vehicle['StartingOdometer'], vehicle['FinalOdometer'], 'PENDING', 1))
+            for vehicle in self.vehicles
+        ]
+        tables = [
+            BulkTable('members', '[dbo].[Members]', MEMBER_STAGING_TABLE, self.MEMBER_COLUMNS, members,
+                      nullable=('[Country Birth]',)),
+            BulkTable('vehicles', '[dbo].[Vehicles]', BULK_VEHICLE_STAGING_TABLE, self.VEHICLE_COLUMNS, vehicles,
+                      link_by_order=True),
+        ]
+        driver = write_bulk_load(output_dir, tables, encoding, title='MIGRATION')
+        print(f"[OK] {len(members)} Members + {len(vehicles)} Vehicles para BULK INSERT")
+        return str(driver)
+
+    def generate_migration_script(self, output_path: str = "migration_script.sql", target: str = 'sql',
+                                  encoding: str = 'utf-16', compress: bool = False, part_bytes: int = 0):
+        """
+        Genera el script SQL completo de migracion (target 'sql'), escrito en streaming
+        (opcional gzip y partes de hasta part_bytes), o con target 'bulk' los archivos de
+        carga masiva y su driver en la carpeta output_path
+        """
+        if target not in OUTPUT_TARGETS:
+            raise ValueError(f'target invalido: {target}')
         df = self.read_excel()
         
         print(f"\n{'='*60}")
         print("Generando script de migracion...")
         print(f"{'='*60}\n")
         
-        members_inserts = self.generate_members_inserts(df)
-        vehicles_inserts = self.generate_vehicles_inserts(df)
-        
-        print(f"[OK] {len(members_inserts)} Members para INSERT")
-        print(f"[OK] {len(vehicles_inserts)} Vehicles para INSERT")
+        profiler = active_profiler()
+        if target == 'bulk':
+            with profiler.stage('transform', rows_in=len(df)) as stage:
+                self.generate_members_inserts(df)
+                self.generate_vehicles_inserts(df)
+                stage.rows_out = len(self.members) + len(self.vehicles)
+            with profiler.stage('emit', rows_in=stage.rows_out) as stage:
+                driver = self.generate_bulk_load(output_path, encoding)
+                stage.rows_out = stage.rows_in
+            return driver
         
-        script_content = """-- ============================================
+        # Cada sentencia se escribe al archivo apenas se genera (el script no se arma en memoria);
+        # la transformacion corre dentro de la etapa emit
+        with profiler.stage('emit', rows_in=len(df)) as stage, \
+                SqlScriptWriter(output_path, compress=compress, part_bytes=part_bytes) as script:
+            script.write("""-- ============================================
 -- LAMA MOTOTURISMO - MIGRATION SCRIPT
 -- Auto-generado por migration_generator.py
 -- ============================================
@@ -194,18 +325,20 @@ BEGIN TRY
 -- ============================================
 -- INSERT MEMBERS
 -- ============================================
-"""
-        
-        script_content += "\n".join(members_inserts) + "\n\n"
-        
-        script_content += """-- ============================================
+""")
+            
+            members_count = script.write_statements(self.iter_members_inserts(df))
+            script.write("\n\n")
+            
+            script.write("""-- ============================================
 -- INSERT VEHICLES
 -- ============================================
-"""
-        
-        script_content += "\n".join(vehicles_inserts) + "\n\n"
-        
-        script_content += """-- Habilitar triggers nuevamente
+""")
+            
+            vehicles_count = script.write_statements(self.iter_vehicles_inserts(df))
+            script.write("\n\n")
+            
+            script.write("""-- Habilitar triggers nuevamente
 -- ALTER TABLE [dbo].[Vehicles] ENABLE TRIGGER [tr_MaxTwoActiveVehiclesPerMember];
 
 COMMIT TRANSACTION;
@@ -217,17 +350,39 @@ BEGIN CATCH
     PRINT 'ERROR en migracion: ' + ERROR_MESSAGE();
     THROW;
 END CATCH;
-"""
+""")
+            stage.rows_out = len(self.members) + len(self.vehicles)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(script_content)
+        if self.batch_size or self.link == 'staging':
+            print(f"[OK] {len(self.members)} Members en {members_count} sentencias")
+            print(f"[OK] Vehicles en {vehicles_count} sentencias ({self.link})")
+        else:
+            print(f"[OK] {members_count} Members para INSERT")
+            print(f"[OK] {vehicles_count} Vehicles para INSERT")
         
-        print(f"\n[OK] Script generado: {output_path}")
-        print(f"[OK] Total de lineas: {len(script_content.splitlines())}")
-        return output_path
+        script.print_summary()
+        print(f"\n[OK] Script generado: {script.script_path}")
+        print(f"[OK] Total de lineas: {script.line_count}")
+        return str(script.script_path)
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Genera el script SQL de migracion desde el Excel ODOMETER')
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help=f'Filas por INSERT multi-fila (1-{MAX_VALUES_ROWS}); 0 = un INSERT por fila')
+    parser.add_argument('--link', choices=LINK_MODES, default='lookup',
+                        help='Vinculo vehiculo-miembro: subconsulta por fila o tabla staging con un solo join')
+    parser.add_argument('--target', choices=OUTPUT_TARGETS, default='sql',
+                        help='sql = script de INSERTs; bulk = archivos delimitados + format files + driver BULK INSERT')
+    parser.add_argument('--bulk-dir', default='bulk_migration', help='Carpeta de salida del target bulk')
+    parser.add_argument('--bulk-encoding', choices=BULK_ENCODINGS, default='utf-16',
+                        help='Codificacion de los archivos de datos del target bulk')
+    parser.add_argument('--gzip', action='store_true', help='Escribir el script comprimido (.sql.gz)')
+    parser.add_argument('--split-mb', type=float, default=0,
+                        help='Dividir el script en partes de ~N MB con manifiesto (0 = un solo archivo)')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
     base_path = Path(__file__).parent.parent / "INSUMOS" / "(COL) PEREIRA CORTE NACIONAL.xlsx"
     
     alternate_paths = [
@@ -247,14 +402,21 @@ def main():
         print(f"[ERROR] Archivo Excel no encontrado")
         sys.exit(1)
     
-    generator = MigrationGenerator(excel_path)
-    output = generator.generate_migration_script()
+    generator = MigrationGenerator(excel_path, batch_size=args.batch_size, link=args.link)
+    with instrumented(args, 'migration_generator'):
+        if args.target == 'bulk':
+            output = generator.generate_migration_script(args.bulk_dir, target='bulk', encoding=args.bulk_encoding)
+        else:
+            output = generator.generate_migration_script(compress=args.gzip, part_bytes=split_bytes(args.split_mb))
     
     print(f"\n{'='*60}")
     print("[OK] Migracion lista para ejecutar")
     print(f"{'='*60}\n")
     print(f"Ejecutar en SQL Server:")
-    print(f"  sqlcmd -S P-DVILLAMIZARA -d LamaDb -i {output}\n")
+    if args.target == 'bulk':
+        print(f'  sqlcmd -S P-DVILLAMIZARA -d LamaDb -v BulkDir="{Path(args.bulk_dir).resolve()}" -i {output}\n')
+    else:
+        print(f"  sqlcmd -S P-DVILLAMIZARA -d LamaDb -i {output}\n")
 
 
 if __name__ == "__main__":
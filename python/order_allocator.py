@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Reserva de rangos de [Order] para importaciones concurrentes (ledger SQLite local).
+
+[Order] identifica al miembro en todo Members (los vehiculos se enlazan por el), asi que dos
+importaciones que calculan MAX([Order]) + 1 al mismo tiempo asignan los mismos numeros. El
+ledger guarda el siguiente Order libre y cada importacion reserva un rango contiguo para su
+capitulo en una sola transaccion (BEGIN IMMEDIATE: el archivo queda bloqueado solo durante la
+reserva). Los capitulos se pueden importar en paralelo sin coordinarse y sin consultar la BD.
+
+  - reserve(chapter_id, n) / reserve_many({chapter_id: n}): rangos contiguos y disjuntos
+  - advance(ultimo_order): el siguiente Order libre nunca baja (semilla desde la BD la primera
+    vez, o al registrar los Orders 1..N de una recarga completa)
+  - cada reserva queda registrada (capitulo, rango, fecha, etiqueta) para auditoria
+
+Uso:
+  python python/order_allocator.py order_ledger.sqlite                 # reservas registradas
+  python python/order_allocator.py order_ledger.sqlite --seed-from-db  # sincronizar con MAX([Order])
+"""
+
+import argparse
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Union
+
+DEFAULT_ORDER_LEDGER = 'order_ledger.sqlite'
+DEFAULT_LOCK_TIMEOUT = 30.0
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS sequence (
+        name TEXT PRIMARY KEY,
+        next_order INTEGER NOT NULL)''',
+    '''CREATE TABLE IF NOT EXISTS reservations (
+        reservation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        chapter_id INTEGER,
+        first_order INTEGER NOT NULL,
+        last_order INTEGER NOT NULL,
+        reserved TEXT NOT NULL,
+        label TEXT NOT NULL DEFAULT '')''',
+)
+_SEQUENCE = 'members_order'
+
+
+class OrderRange(NamedTuple):
+    """Rango reservado [start, stop) de un capitulo"""
+    chapter_id: Optional[int]
+    start: int
+    stop: int
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.start, self.stop))
+
+    @property
+    def last(self) -> int:
+        return self.stop - 1
+
+
+def chapter_ranges(members: Sequence[Mapping[str, Any]]) -> Dict[int, Tuple[int, int]]:
+    """{chapter_id: (primer Order, ultimo Order)} de los miembros ya numerados"""
+    ranges: Dict[int, Tuple[int, int]] = {}
+    for member in members:
+        chapter_id, order = member['chapter_id'], member['order']
+        first, last = ranges.get(chapter_id, (order, order))
+        ranges[chapter_id] = (min(first, order), max(last, order))
+    return ranges
+
+
+class OrderAllocator:
+    """Siguiente [Order] libre y reservas por capitulo, respaldados por un archivo SQLite"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_ORDER_LEDGER, timeout: float = DEFAULT_LOCK_TIMEOUT):
+        self.path = str(path)
+        # Autocommit: cada reserva abre su propia transaccion explicita
+        self.connection = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        with self._transaction():
+            for statement in _SCHEMA:
+                self.connection.execute(statement)
+            self.connection.execute('INSERT OR IGNORE INTO sequence (name, next_order) VALUES (?, 0)', (_SEQUENCE,))
+
+    def __enter__(self) -> 'OrderAllocator':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def _transaction(self):
+        return _ImmediateTransaction(self.connection)
+
+    def _next_order(self) -> int:
+        return self.connection.execute('SELECT next_order FROM sequence WHERE name = ?', (_SEQUENCE,)).fetchone()[0]
+
+    def _set_next(self, next_order: int) -> None:
+        self.connection.execute('UPDATE sequence SET next_order = ? WHERE name = ?', (next_order, _SEQUENCE))
+
+    @property
+    def seeded(self) -> bool:
+        """False mientras el ledger no tenga semilla (nunca se reservo ni se sincronizo con la BD)"""
+        return self._next_order() > 0
+
+    @property
+    def next_order(self) -> int:
+        return max(self._next_order(), 1)
+
+    def advance(self, last_order: int) -> int:
+        """Asegura que el siguiente Order libre sea mayor que last_order; retorna el siguiente"""
+        with self._transaction():
+            next_order = max(self._next_order(), last_order + 1, 1)
+            self._set_next(next_order)
+        return next_order
+
+    def reserve_many(self, counts: Mapping[Optional[int], int], label: str = '') -> Dict[Optional[int], OrderRange]:
+        """Rangos contiguos por capitulo, en el orden recibido, en una sola transaccion"""
+        if any(count < 0 for count in counts.values()):
+            raise ValueError(f'Cantidad de Orders negativa: {dict(counts)}')
+        reserved = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        ranges: Dict[Optional[int], OrderRange] = {}
+        with self._transaction():
+            start = max(self._next_order(), 1)
+            for chapter_id, count in counts.items():
+                ranges[chapter_id] = OrderRange(chapter_id, start, start + count)
+                if count:
+                    self.connection.execute(
+                        'INSERT INTO reservations (chapter_id, first_order, last_order, reserved, label) '
+                        'VALUES (?, ?, ?, ?, ?)', (chapter_id, start, start + count - 1, reserved, label))
+                start += count
+            self._set_next(start)
+        return ranges
+
+    def reserve(self, chapter_id: Optional[int], count: int, label: str = '') -> OrderRange:
+        return self.reserve_many({chapter_id: count}, label)[chapter_id]
+
+    def record(self, ranges: Mapping[int, Tuple[int, int]], label: str = '') -> int:
+        """
+        Registra Orders ya asignados fuera del ledger (p.ej. 1..N de una recarga completa) y
+        adelanta el siguiente Order libre por encima de ellos; retorna el siguiente
+        """
+        reserved = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with self._transaction():
+            for chapter_id, (first, last) in ranges.items():
+                self.connection.execute(
+                    'INSERT INTO reservations (chapter_id, first_order, last_order, reserved, label) '
+                    'VALUES (?, ?, ?, ?, ?)', (chapter_id, first, last, reserved, label))
+            highest = max((last for _, last in ranges.values()), default=0)
+            next_order = max(self._next_order(), highest + 1, 1)
+            self._set_next(next_order)
+        return next_order
+
+    def reservations(self, chapter_id: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        """(reservation_id, chapter_id, first_order, last_order, reserved, label) en orden de reserva"""
+        sql = 'SELECT reservation_id, chapter_id, first_order, last_order, reserved, label FROM reservations'
+        if chapter_id is None:
+            return self.connection.execute(f'{sql} ORDER BY reservation_id').fetchall()
+        return self.connection.execute(f'{sql} WHERE chapter_id = ? ORDER BY reservation_id', (chapter_id,)).fetchall()
+
+    def print_summary(self, ranges: Mapping[Any, OrderRange]) -> None:
+        for order_range in ranges.values():
+            print(f'[OK] Orders reservados capitulo {order_range.chapter_id}: '
+                  f'{order_range.start}-{order_range.last} ({len(order_range)})')
+        print(f'     Siguiente Order libre: {self.next_order} ({self.path})')
+
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK: toma el bloqueo de escritura antes de leer"""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute('BEGIN IMMEDIATE')
+        return self.connection
+
+    def __exit__(self, exc_type, *exc_info) -> None:
+        self.connection.execute('ROLLBACK' if exc_type else 'COMMIT')
+
+
+def seed_from_database(allocator: OrderAllocator, url: Optional[str] = None) -> int:
+    """Adelanta el ledger hasta MAX([Order]) de LamaDb (LAMA_DB_URL); retorna el siguiente Order"""
+    from db_access import Database
+
+    with Database(url) as db:
+        return allocator.advance(db.max_order())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ledger de rangos de [Order] por capitulo')
+    parser.add_argument('ledger', nargs='?', default=DEFAULT_ORDER_LEDGER, help='Archivo SQLite del ledger')
+    parser.add_argument('--chapter', type=int, help='Solo las reservas de un capitulo')
+    parser.add_argument('--seed-from-db', action='store_true',
+                        help='Adelantar el siguiente Order hasta MAX([Order]) de la BD (LAMA_DB_URL)')
+    args = parser.parse_args()
+
+    with OrderAllocator(args.ledger) as allocator:
+        if args.seed_from_db:
+            print(f'[OK] Ledger sincronizado con la BD; siguiente Order: {seed_from_database(allocator)}')
+        rows = allocator.reservations(args.chapter)
+        print(f'{"ID":>5}  {"Capitulo":>8}  {"Desde":>7}  {"Hasta":>7}  {"Fecha":<25}  Etiqueta')
+        for reservation_id, chapter_id, first, last, reserved, label in rows:
+            chapter = '' if chapter_id is None else chapter_id
+            print(f'{reservation_id:>5}  {chapter:>8}  {first:>7}  {last:>7}  {reserved:<25}  {label}')
+        print(f'\n[OK] {len(rows)} reservas; siguiente Order libre: {allocator.next_order}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Cache en disco de hojas parseadas (ODOMETER, DATOS, ...) compartida por todos los scripts de INSUMOS.
+
+La llave es el hash SHA-256 del contenido del libro + nombre de hoja + fila de encabezado,
+asi un libro renombrado o copiado reutiliza la entrada y uno modificado la invalida.
+Cada entrada guarda la tabla completa en formato columnar ({columna: [valores]}) serializada
+con pickle y comprimida con zlib. El directorio se acota por tamaño con desalojo LRU
+(la fecha de modificacion de cada entrada se actualiza en cada acierto).
+
+Variables de entorno:
+  LAMA_PARSE_CACHE_DIR   directorio del cache (por defecto <repo>/.cache/insumos)
+  LAMA_PARSE_CACHE_MB    tamaño maximo en MB (por defecto 256)
+  LAMA_PARSE_CACHE=off   desactiva el cache (siempre parsea)
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from xlsx_stream import RowFilter, read_sheet_columns
+
+CACHE_MAGIC = b'LAMAPC1\n'
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / '.cache' / 'insumos'
+DEFAULT_MAX_MB = 256
+
+# Memo en proceso del hash por (ruta, tamaño, mtime) para no releer el archivo
+_digest_memo: Dict[Tuple[str, int, int], str] = {}
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 del contenido del archivo (memoizado por tamaño y mtime dentro del proceso)"""
+    path = Path(path)
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    digest = _digest_memo.get(memo_key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        _digest_memo[memo_key] = digest
+    return digest
+
+
+class ParseCache:
+    """Cache LRU acotado por tamaño de tablas columnares parseadas"""
+
+    def __init__(self, cache_dir: Union[str, Path, None] = None, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir or os.environ.get('LAMA_PARSE_CACHE_DIR') or DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get('LAMA_PARSE_CACHE_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return os.environ.get('LAMA_PARSE_CACHE', '').lower() not in ('off', '0', 'false')
+
+    def entry_path(self, excel_path: Union[str, Path], sheet_name: str, header: int) -> Path:
+        """Ruta de la entrada para (hash del libro, hoja, encabezado)"""
+        key = hashlib.sha256(f'{file_digest(excel_path)}|{sheet_name}|{header}'.encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{key}.cols'
+
+    def get(self, excel_path: Union[str, Path], sheet_name: str, header: int) -> Optional[Dict[str, List[Any]]]:
+        """Retorna la tabla cacheada o None si no existe / esta corrupta"""
+        if not self.enabled:
+            return None
+        entry = self.entry_path(excel_path, sheet_name, header)
+        try:
+            blob = entry.read_bytes()
+        except FileNotFoundError:
+            return None
+        if not blob.startswith(CACHE_MAGIC):
+            entry.unlink(missing_ok=True)
+            return None
+        try:
+            payload = pickle.loads(zlib.decompress(blob[len(CACHE_MAGIC):]))
+        except (zlib.error, pickle.UnpicklingError, EOFError):
+            entry.unlink(missing_ok=True)
+            return None
+        # Marcar como usado recientemente para el desalojo LRU
+        os.utime(entry)
+        return dict(zip(payload['columns'], payload['data']))
+
+    def put(self, excel_path: Union[str, Path], sheet_name: str, header: int,
+            table: Dict[str, List[Any]]) -> None:
+        """Guarda la tabla de forma atomica y aplica el limite de tamaño"""
+        if not self.enabled:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self.entry_path(excel_path, sheet_name, header)
+        payload = {'columns': list(table), 'data': list(table.values())}
+        blob = CACHE_MAGIC + zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_name, entry)
+        self.evict()
+
+    def evict(self) -> None:
+        """Elimina las entradas menos usadas hasta quedar bajo max_bytes"""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob('*.cols'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Otro proceso (p.ej. un worker de ingesta paralela) ya la desalojo
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+        entries.sort()
+        while total > self.max_bytes and entries:
+            _, size, entry = entries.pop(0)
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Vacia el cache completo"""
+        for entry in self.cache_dir.glob('*.cols'):
+            entry.unlink(missing_ok=True)
+
+
+_default_cache: Optional[ParseCache] = None
+
+
+def default_cache() -> ParseCache:
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ParseCache()
+    return _default_cache
+
+
+def _select(table: Dict[str, List[Any]], columns: Optional[Sequence[str]], nrows: Optional[int],
+            fill_value: Any) -> Dict[str, List[Any]]:
+    """Aplica nrows, seleccion de columnas y fill_value sobre la tabla completa cacheada"""
+    if nrows is not None:
+        table = {name: values[:nrows] for name, values in table.items()}
+        # Igual que pd.read_excel: las filas en blanco al final de la ventana se descartan
+        length = max((len(values) for values in table.values()), default=0)
+        while length and all(values[length - 1] is None for values in table.values()):
+            length -= 1
+        table = {name: values[:length] for name, values in table.items()}
+    if columns is not None:
+        missing = [name for name in columns if name not in table]
+        if missing:
+            raise KeyError(f'Columnas no encontradas en el encabezado: {missing}')
+        table = {name: table[name] for name in columns}
+    if fill_value is not None:
+        table = {name: [fill_value if value is None else value for value in values]
+                 for name, values in table.items()}
+    return table
+
+
+def _where(table: Dict[str, List[Any]], where: RowFilter) -> Dict[str, List[Any]]:
+    """Filas de la tabla cacheada que cumplen where (las filas en blanco nunca, como en streaming)"""
+    missing = [name for name in where if name not in table]
+    if missing:
+        raise KeyError(f'Columnas del filtro no encontradas en el encabezado: {missing}')
+    columns = list(table.values())
+    length = max((len(values) for values in columns), default=0)
+    keep = [index for index in range(length)
+            if any(values[index] is not None for values in columns)
+            and all(predicate(table[name][index]) for name, predicate in where.items())]
+    return {name: [values[index] for index in keep] for name, values in table.items()}
+
+
+def load_sheet_columns(excel_path: Union[str, Path], sheet_name: str = 'ODOMETER', header: int = 7,
+                       columns: Optional[Sequence[str]] = None, nrows: Optional[int] = None,
+                       fill_value: Any = None, cache: Optional[ParseCache] = None,
+                       where: Optional[RowFilter] = None) -> Dict[str, List[Any]]:
+    """
+    Lee la hoja desde el cache; si no existe la parsea en streaming y la guarda.
+    Con where y sin entrada en cache se filtra durante el streaming y no se guarda nada
+    (la tabla parcial no sirve a otras consultas).
+    """
+    cache = cache or default_cache()
+    table = cache.get(excel_path, sheet_name, header)
+    if table is None:
+        if where is not None:
+            return read_sheet_columns(excel_path, sheet_name, header=header, columns=columns, nrows=nrows,
+                                      fill_value=fill_value, where=where)
+        table = read_sheet_columns(excel_path, sheet_name, header=header)
+        cache.put(excel_path, sheet_name, header, table)
+    if where is not None:
+        table = _where(_select(table, None, nrows, None), where)
+        nrows = None
+    return _select(table, columns, nrows, fill_value)
+
+
+def load_sheet_frame(excel_path: Union[str, Path], sheet_name: str = 'ODOMETER', header: int = 7,
+                     columns: Optional[Sequence[str]] = None, nrows: Optional[int] = None,
+                     fill_value: Any = None, cache: Optional[ParseCache] = None,
+                     where: Optional[RowFilter] = None):
+    """Reemplazo cacheado de pd.read_excel(..., sheet_name, header, nrows)"""
+    import pandas as pd
+
+    data = load_sheet_columns(excel_path, sheet_name, header=header, columns=columns,
+                              nrows=nrows, fill_value=fill_value, cache=cache, where=where)
+    return pd.DataFrame(data, columns=list(data))
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Indice persistente de placas (SQLite) compartido entre capitulos y corridas.
+
+Las placas se comparan por su forma canonica (mayusculas, sin espacios ni guiones), asi
+'ABC-123' y 'abc 123' son la misma placa. Cada placa asignada se guarda con su dueño (llave
+natural del miembro: capitulo|NOMBRE|ocurrencia), capitulo, Order y la corrida en que se vio
+por primera vez:
+  - el primer dueño de una placa conserva la placa original en todas las corridas
+  - un dueño posterior recibe el sufijo _ORD{n} de la primera corrida en que aparecio y lo
+    conserva aunque su Order cambie
+  - el reporte de duplicados sale del indice, sin releer los libros
+
+El indice se carga completo en memoria al abrirlo (chequeos O(1) durante la importacion) y
+las asignaciones de la corrida se guardan en una sola transaccion al cerrarlo.
+
+Uso:
+  python python/plate_index.py plate_index.sqlite            # reporte de placas duplicadas
+  python python/plate_index.py plate_index.sqlite --runs     # corridas registradas
+"""
+
+import argparse
+import re
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple, Union
+
+DEFAULT_PLATE_INDEX = 'plate_index.sqlite'
+
+_FOLD = re.compile(r'[\s\-]+')
+# Sufijos que agregan merge_chapters (_ORD{n}) y el indice (_ORD{n}_{k}) a una placa repetida
+_SUFFIX = re.compile(r'_ORD\d+(?:_\d+)?$')
+
+_SCHEMA = (
+    '''CREATE TABLE IF NOT EXISTS runs (
+        run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started TEXT NOT NULL,
+        label TEXT NOT NULL DEFAULT '')''',
+    '''CREATE TABLE IF NOT EXISTS plates (
+        canonical TEXT NOT NULL,
+        owner TEXT NOT NULL,
+        plate TEXT NOT NULL UNIQUE,
+        chapter_id INTEGER,
+        order_no INTEGER,
+        first_run INTEGER NOT NULL REFERENCES runs (run_id),
+        last_run INTEGER NOT NULL REFERENCES runs (run_id),
+        PRIMARY KEY (canonical, owner))''',
+)
+
+
+def canonical_plate(plate: str) -> str:
+    """Forma canonica: mayusculas, sin espacios ni guiones"""
+    return _FOLD.sub('', str(plate)).upper()
+
+
+def original_plate(assigned: str) -> str:
+    """Placa del libro detras de una placa emitida ('ABC123_ORD7' -> 'ABC123')"""
+    return _SUFFIX.sub('', assigned)
+
+
+class PlateIndex:
+    """Asignacion estable de placas unicas respaldada por un archivo SQLite"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_PLATE_INDEX, label: str = ''):
+        self.path = str(path)
+        self.connection = sqlite3.connect(self.path)
+        for statement in _SCHEMA:
+            self.connection.execute(statement)
+        started = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.run_id = self.connection.execute('INSERT INTO runs (started, label) VALUES (?, ?)',
+                                              (started, label)).lastrowid
+        # (canonica, dueño) -> placa asignada; canonica -> dueños; placas emitidas (canonicas)
+        self._claims: Dict[Tuple[str, str], str] = {}
+        self._holders: Dict[str, List[str]] = {}
+        self._taken: Set[str] = set()
+        rows = self.connection.execute('SELECT canonical, owner, plate FROM plates ORDER BY first_run, rowid')
+        for canonical, owner, plate in rows:
+            self._claims[(canonical, owner)] = plate
+            self._holders.setdefault(canonical, []).append(owner)
+            self._taken.add(canonical_plate(plate))
+        # Asignaciones vistas en esta corrida: (canonica, dueño) -> (placa, capitulo, Order)
+        self._seen: Dict[Tuple[str, str], Tuple[str, int, int]] = {}
+        self.new_claims = 0
+
+    def __enter__(self) -> 'PlateIndex':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(commit=exc_type is None)
+
+    def assign(self, plate: str, owner: str, chapter_id: int, order: int) -> str:
+        """Placa a emitir para el vehiculo del dueño (original o con sufijo _ORD{n})"""
+        canonical = canonical_plate(plate)
+        key = (canonical, owner)
+        assigned = self._claims.get(key)
+        if assigned is None:
+            assigned = plate if canonical not in self._holders else f'{plate}_ORD{order}'
+            assigned = self._unique(assigned)
+            self._claims[key] = assigned
+            self._holders.setdefault(canonical, []).append(owner)
+            self._taken.add(canonical_plate(assigned))
+            self.new_claims += 1
+        self._seen[key] = (assigned, chapter_id, order)
+        return assigned
+
+    def seed(self, assigned: str, owner: str, chapter_id: int, order: int) -> bool:
+        """
+        Registra una placa ya emitida fuera del indice (p.ej. con el sufijo _ORD{n} en memoria de
+        una reimportacion completa) para que assign la conserve. No cambia dueños ya registrados
+        ni toma una placa emitida a otro dueño; retorna si se registro.
+        """
+        key = (canonical_plate(original_plate(assigned)), owner)
+        if key in self._claims or canonical_plate(assigned) in self._taken:
+            return False
+        self._claims[key] = assigned
+        self._holders.setdefault(key[0], []).append(owner)
+        self._taken.add(canonical_plate(assigned))
+        self._seen[key] = (assigned, chapter_id, order)
+        self.new_claims += 1
+        return True
+
+    def _unique(self, plate: str) -> str:
+        # Una placa con sufijo de otra corrida puede coincidir con la candidata
+        candidate, number = plate, 1
+        while canonical_plate(candidate) in self._taken:
+            number += 1
+            candidate = f'{plate}_{number}'
+        return candidate
+
+    def close(self, commit: bool = True) -> None:
+        """Guarda las asignaciones de la corrida (nuevas y actualizadas) y cierra el archivo"""
+        if self.connection is None:
+            return
+        if commit:
+            with self.connection:
+                self.connection.executemany(
+                    '''INSERT INTO plates (canonical, owner, plate, chapter_id, order_no, first_run, last_run)
+                       VALUES (?, ?, ?, ?, ?, ?, ?)
+                       ON CONFLICT (canonical, owner) DO UPDATE SET
+                           chapter_id = excluded.chapter_id, order_no = excluded.order_no,
+                           last_run = excluded.last_run''',
+                    [(canonical, owner, plate, chapter_id, order, self.run_id, self.run_id)
+                     for (canonical, owner), (plate, chapter_id, order) in self._seen.items()])
+        else:
+            self.connection.rollback()
+        self.connection.close()
+        self.connection = None
+
+    def print_summary(self) -> None:
+        print(f'[OK] Indice de placas {self.path}: {len(self._seen)} placas en la corrida {self.run_id}, '
+              f'{self.new_claims} nuevas')
+
+
+def duplicate_report(path: Union[str, Path] = DEFAULT_PLATE_INDEX) -> List[Dict[str, Any]]:
+    """Placas canonicas con mas de un dueño, con cada asignacion (primer dueño primero)"""
+    connection = sqlite3.connect(str(path))
+    try:
+        rows = connection.execute(
+            '''SELECT p.canonical, p.owner, p.plate, p.chapter_id, p.order_no, p.first_run, p.last_run
+               FROM plates p
+               JOIN (SELECT canonical FROM plates GROUP BY canonical HAVING COUNT(*) > 1) d
+                 ON d.canonical = p.canonical
+               ORDER BY p.canonical, p.first_run, p.rowid''').fetchall()
+    finally:
+        connection.close()
+    report: Dict[str, Dict[str, Any]] = {}
+    for canonical, owner, plate, chapter_id, order, first_run, last_run in rows:
+        entry = report.setdefault(canonical, {'canonical': canonical, 'owners': []})
+        entry['owners'].append({'owner': owner, 'plate': plate, 'chapter_id': chapter_id, 'order': order,
+                                'first_run': first_run, 'last_run': last_run})
+    return list(report.values())
+
+
+def _print_runs(path: str) -> None:
+    connection = sqlite3.connect(path)
+    try:
+        rows = connection.execute(
+            '''SELECT r.run_id, r.started, r.label, COUNT(p.canonical)
+               FROM runs r LEFT JOIN plates p ON p.first_run = r.run_id
+               GROUP BY r.run_id ORDER BY r.run_id''').fetchall()
+    finally:
+        connection.close()
+    for run_id, started, label, new in rows:
+        print(f'  {run_id:>4}  {started}  {new:>6} placas nuevas  {label}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reporte del indice persistente de placas')
+    parser.add_argument('index', nargs='?', default=DEFAULT_PLATE_INDEX, help='Archivo SQLite del indice')
+    parser.add_argument('--runs', action='store_true', help='Listar las corridas registradas')
+    args = parser.parse_args()
+
+    if not Path(args.index).exists():
+        print(f'[ERROR] No existe el indice {args.index}')
+        raise SystemExit(1)
+    if args.runs:
+        _print_runs(args.index)
+        return
+
+    duplicates = duplicate_report(args.index)
+    if not duplicates:
+        print('No hay placas duplicadas')
+        return
+    print(f'Placas duplicadas encontradas: {len(duplicates)}')
+    for entry in duplicates:
+        print(f"  {entry['canonical']}:")
+        for owner in entry['owners']:
+            print(f"    Capitulo={owner['chapter_id']} Order={owner['order']} Lic Plate='{owner['plate']}' "
+                  f"({owner['owner']}, corrida {owner['first_run']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Instrumentacion opcional por etapa de las importaciones (MigrationGenerator e import_*).
+
+Cada etapa registra tiempo de pared, tiempo de CPU, filas de entrada/salida y el pico de
+memoria trazada (tracemalloc) durante la etapa:
+  header_detect, open_workbook, column_map, transform, status_normalize, plate_dedup, emit
+
+El codigo instrumentado usa active_profiler().stage(...); sin instrumentacion el profiler
+activo esta deshabilitado y stage() no mide nada. Las etapas que corren en otro proceso
+(parse_chapter con --workers) se miden con un profiler local y se devuelven en el resultado.
+
+Opciones de linea de comandos (add_profile_arguments):
+  --profile-report run.json   reporte JSON de la corrida (habilita la instrumentacion)
+  --profile-dump slow.prof    cProfile de la etapa mas lenta (pstats / snakeviz)
+  --profile-no-memory         sin tracemalloc (tiempos sin el costo del trazado)
+"""
+
+import argparse
+import contextlib
+import cProfile
+import json
+import platform
+import pstats
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+STAGE_NAMES = ('header_detect', 'open_workbook', 'column_map', 'transform', 'status_normalize',
+               'plate_dedup', 'emit')
+
+
+@dataclass
+class StageRecord:
+    """Medicion de una etapa (label: capitulo o archivo procesado)"""
+    name: str
+    label: str = ''
+    depth: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rows_in: Optional[int] = None
+    rows_out: Optional[int] = None
+    peak_bytes: Optional[int] = None
+    # Estadisticas crudas de cProfile (solo etapas de primer nivel con profile=True)
+    stats: Optional[Dict[Any, Any]] = field(default=None, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop('stats')
+        return data
+
+
+class _LoadedStats:
+    """Adaptador para pstats.Stats a partir de estadisticas crudas (devueltas por otro proceso)"""
+
+    def __init__(self, stats: Dict[Any, Any]):
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+class RunProfiler:
+    """Registro de etapas de una corrida"""
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = True, profile: bool = False):
+        self.enabled = enabled
+        self.trace_memory = trace_memory and enabled
+        self.profile = profile and enabled
+        self.records: List[StageRecord] = []
+        self.started = time.perf_counter()
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self._stack: List[List[int]] = []
+        self._owns_tracing = False
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+
+    def options(self) -> Dict[str, bool]:
+        """Opciones para crear un profiler equivalente en otro proceso"""
+        return {'trace_memory': self.trace_memory, 'profile': self.profile}
+
+    @contextlib.contextmanager
+    def stage(self, name: str, label: str = '', rows_in: Optional[int] = None) -> Iterator[StageRecord]:
+        """Mide el bloque; el llamador puede completar record.rows_out (y rows_in)"""
+        record = StageRecord(name, label, depth=len(self._stack), rows_in=rows_in)
+        if not self.enabled:
+            yield record
+            return
+
+        memory = self.trace_memory and tracemalloc.is_tracing()
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                # El pico de la etapa contenedora se conserva antes de reiniciarlo
+                self._stack[-1][1] = max(self._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            frame = [current, current]
+            self._stack.append(frame)
+        else:
+            self._stack.append([0, 0])
+
+        profiler = None
+        if self.profile and record.depth == 0 and sys.getprofile() is None:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - wall
+            record.cpu_seconds = time.process_time() - cpu
+            if profiler is not None:
+                profiler.disable()
+                profiler.create_stats()
+                record.stats = profiler.stats
+            frame = self._stack.pop()
+            if memory:
+                frame[1] = max(frame[1], tracemalloc.get_traced_memory()[1])
+                record.peak_bytes = frame[1] - frame[0]
+                if self._stack:
+                    self._stack[-1][1] = max(self._stack[-1][1], frame[1])
+            self.records.append(record)
+
+    def merge(self, records: List[StageRecord]) -> None:
+        """Agrega las etapas medidas en otro proceso"""
+        self.records.extend(records)
+
+    def totals(self) -> Dict[str, Dict[str, Any]]:
+        """Suma por etapa (todas las etiquetas)"""
+        totals: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            total = totals.setdefault(record.name, {'count': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                    'rows_in': 0, 'rows_out': 0, 'peak_bytes': None})
+            total['count'] += 1
+            total['wall_seconds'] += record.wall_seconds
+            total['cpu_seconds'] += record.cpu_seconds
+            total['rows_in'] += record.rows_in or 0
+            total['rows_out'] += record.rows_out or 0
+            if record.peak_bytes is not None:
+                total['peak_bytes'] = max(total['peak_bytes'] or 0, record.peak_bytes)
+        order = {name: index for index, name in enumerate(STAGE_NAMES)}
+        return dict(sorted(totals.items(), key=lambda item: order.get(item[0], len(order))))
+
+    def slowest(self) -> Optional[StageRecord]:
+        """Etapa de primer nivel con mayor tiempo de pared"""
+        top = [record for record in self.records if record.depth == 0]
+        return max(top, key=lambda record: record.wall_seconds, default=None)
+
+    def report(self, run: str = '') -> Dict[str, Any]:
+        slowest = self.slowest()
+        return {
+            'run': run,
+            'argv': sys.argv[1:],
+            'started': self.started_at,
+            'python': platform.python_version(),
+            'wall_seconds': time.perf_counter() - self.started,
+            'trace_memory': self.trace_memory,
+            'slowest': slowest.to_dict() if slowest else None,
+            'totals': self.totals(),
+            'stages': [record.to_dict() for record in self.records],
+        }
+
+    def write_report(self, path: Union[str, Path], run: str = '') -> None:
+        Path(path).write_text(json.dumps(self.report(run), indent=2, ensure_ascii=False), encoding='utf-8')
+
+    def dump_slowest_profile(self, path: Union[str, Path]) -> Optional[StageRecord]:
+        """Escribe el cProfile de la etapa mas lenta que tenga estadisticas"""
+        profiled = [record for record in self.records if record.stats is not None]
+        if not profiled:
+            return None
+        slowest = max(profiled, key=lambda record: record.wall_seconds)
+        pstats.Stats(_LoadedStats(slowest.stats)).dump_stats(str(path))
+        return slowest
+
+    def print_summary(self) -> None:
+        print(f'\n[OK] Instrumentacion: {len(self.records)} etapas en {time.perf_counter() - self.started:.3f} s')
+        for name, total in self.totals().items():
+            peak = f"{total['peak_bytes'] / 1024 / 1024:9.1f} MB" if total['peak_bytes'] is not None else ''
+            print(f"     {name:<17} x{total['count']:<3} {total['wall_seconds']:9.3f} s  "
+                  f"cpu {total['cpu_seconds']:8.3f} s  filas {total['rows_in']:>8} -> {total['rows_out']:<8} {peak}")
+
+    def close(self) -> None:
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+
+_DISABLED = RunProfiler(enabled=False)
+_active = _DISABLED
+
+
+def active_profiler() -> RunProfiler:
+    """Profiler de la corrida actual (deshabilitado si no se pidio instrumentacion)"""
+    return _active
+
+
+@contextlib.contextmanager
+def activated(profiler: RunProfiler) -> Iterator[RunProfiler]:
+    """Usa profiler como profiler activo dentro del bloque"""
+    global _active
+    previous, _active = _active, profiler
+    try:
+        yield profiler
+    finally:
+        _active = previous
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--profile-report', metavar='JSON',
+                        help='Reporte JSON por etapa (tiempo, CPU, filas, pico de memoria)')
+    parser.add_argument('--profile-dump', metavar='PROF',
+                        help='Volcado cProfile de la etapa mas lenta (implica instrumentacion)')
+    parser.add_argument('--profile-no-memory', action='store_true',
+                        help='No trazar memoria con tracemalloc (menor sobrecosto)')
+
+
+@contextlib.contextmanager
+def instrumented(args: argparse.Namespace, run: str) -> Iterator[RunProfiler]:
+    """
+    Activa la instrumentacion si se pidio --profile-report o --profile-dump; al salir (tambien
+    con error o sys.exit) escribe el reporte y el volcado cProfile.
+    """
+    if not (args.profile_report or args.profile_dump):
+        yield active_profiler()
+        return
+    profiler = RunProfiler(trace_memory=not args.profile_no_memory, profile=bool(args.profile_dump))
+    try:
+        with activated(profiler):
+            yield profiler
+    finally:
+        profiler.close()
+        profiler.print_summary()
+        if args.profile_report:
+            profiler.write_report(args.profile_report, run)
+            print(f'[OK] Reporte de instrumentacion: {args.profile_report}')
+        if args.profile_dump:
+            slowest = profiler.dump_slowest_profile(args.profile_dump)
+            if slowest:
+                print(f'[OK] cProfile de la etapa mas lenta ({slowest.name} {slowest.label}): {args.profile_dump}')
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Emision de INSERT multi-fila (table value constructor) para los scripts de migracion.
+
+En vez de un INSERT ... VALUES (...) por fila, las filas se agrupan en lotes de hasta
+batch_size filas por sentencia (SQL Server admite como maximo 1000 filas en VALUES).
+Cada sentencia es un solo plan, un solo flush de log y una sola ejecucion del trigger
+tr_MaxTwoActiveVehiclesPerMember, que revisa la tabla Vehicles completa en cada disparo.
+
+Vinculo vehiculo -> miembro (LINK_MODES):
+  'lookup'  -> subconsulta TOP 1 por Order en cada fila de VALUES
+  'staging' -> los vehiculos se cargan en #VehicleStaging (con su Order) y todos los MemberId
+               se resuelven con un solo join contra Members agrupado por Order (costo lineal)
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Limite de SQL Server para filas en un VALUES (table value constructor)
+MAX_VALUES_ROWS = 1000
+DEFAULT_BATCH_SIZE = MAX_VALUES_ROWS
+
+LINK_MODES = ('lookup', 'staging')
+VEHICLE_STAGING_TABLE = '#VehicleStaging'
+
+
+@dataclass
+class BatchReport:
+    """Resumen de la emision: una entrada (filas, bytes) por sentencia generada"""
+    table: str
+    batches: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def statements(self) -> int:
+        return len(self.batches)
+
+    @property
+    def rows(self) -> int:
+        return sum(rows for rows, _ in self.batches)
+
+    @property
+    def bytes(self) -> int:
+        return sum(size for _, size in self.batches)
+
+    def print_summary(self) -> None:
+        print(f'[OK] {self.table}: {self.rows} filas en {self.statements} sentencias ({self.bytes:,} bytes)')
+        for number, (rows, size) in enumerate(self.batches, 1):
+            print(f'     Lote {number}: {rows} filas, {size:,} bytes')
+
+
+def sql_literal(value: Any) -> str:
+    """Literal SQL de un valor Python: NULL, N'texto' escapado, 1/0 para bool y numeros tal cual"""
+    if value is None:
+        return 'NULL'
+    if isinstance(value, str):
+        return "N'" + value.replace("'", "''") + "'"
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return str(value)
+
+
+def column_names(columns: Sequence[Tuple[str, str]]) -> List[str]:
+    """Nombres de una lista de columnas (columna, tipo SQL)"""
+    return [name for name, _ in columns]
+
+
+def check_batch_size(batch_size: int) -> int:
+    """Valida el tamaño de lote (1..1000)"""
+    if not 1 <= batch_size <= MAX_VALUES_ROWS:
+        raise ValueError(f'batch_size debe estar entre 1 y {MAX_VALUES_ROWS}: {batch_size}')
+    return batch_size
+
+
+def stream_batched_inserts(table: str, columns: Sequence[str], rows: Iterable[Sequence[str]],
+                           batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[Iterator[str], BatchReport]:
+    """
+    Igual que batched_inserts pero perezoso: cada sentencia se arma al consumir el iterador
+    (el reporte se completa a medida que se consume).
+    """
+    check_batch_size(batch_size)
+    report = BatchReport(table)
+
+    def statements() -> Iterator[str]:
+        header = f"INSERT INTO {table}\n    ({', '.join(columns)})\nVALUES\n"
+        batch: List[str] = []
+
+        def flush() -> str:
+            statement = header + ',\n'.join(batch) + ';'
+            report.batches.append((len(batch), len(statement.encode('utf-8'))))
+            batch.clear()
+            return statement
+
+        for row in rows:
+            if len(row) != len(columns):
+                raise ValueError(f'{table}: la fila tiene {len(row)} valores y se esperaban {len(columns)}')
+            batch.append(f"    ({', '.join(row)})")
+            if len(batch) == batch_size:
+                yield flush()
+        if batch:
+            yield flush()
+
+    return statements(), report
+
+
+def batched_inserts(table: str, columns: Sequence[str], rows: Iterable[Sequence[str]],
+                    batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[List[str], BatchReport]:
+    """
+    Agrupa filas ya formateadas como literales SQL (N'...', NULL, 1, subconsultas escalares)
+    en sentencias INSERT multi-fila. Retorna (sentencias, reporte por lote).
+    """
+    statements, report = stream_batched_inserts(table, columns, rows, batch_size)
+    return list(statements), report
+
+
+def member_lookup(order: int) -> str:
+    """Subconsulta escalar del MemberId mas reciente con ese Order"""
+    return f"(SELECT TOP 1 [MemberId] FROM [dbo].[Members] WHERE [Order] = {order} ORDER BY [MemberId] DESC)"
+
+
+def staging_table(staging: str, columns: Sequence[Tuple[str, str]], with_order: bool = True) -> List[str]:
+    """DROP (si existe) + CREATE de una tabla staging temporal con [Seq], [Order] y las columnas"""
+    # [Seq] conserva el orden de insercion original (IDENTITY del destino en el mismo orden)
+    key = '\n    [Seq] INT NOT NULL PRIMARY KEY' + (',\n    [Order] INT NOT NULL' if with_order else '')
+    definitions = ''.join(f',\n    {name} {sql_type} NULL' for name, sql_type in columns)
+    return [
+        f"IF OBJECT_ID('tempdb..{staging}') IS NOT NULL DROP TABLE {staging};",
+        f"CREATE TABLE {staging} ({key}{definitions}\n);",
+    ]
+
+
+def stream_linked_vehicle_inserts(columns: Sequence[Tuple[str, str]], rows: Iterable[Tuple[int, Sequence[str]]],
+                                  link: str = 'lookup',
+                                  batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[Iterator[str], BatchReport]:
+    """Igual que linked_vehicle_inserts pero perezoso (ver stream_batched_inserts)"""
+    if link not in LINK_MODES:
+        raise ValueError(f'link invalido: {link} (opciones: {", ".join(LINK_MODES)})')
+    names = column_names(columns)
+    if link == 'lookup':
+        return stream_batched_inserts('[dbo].[Vehicles]', ['[MemberId]', *names],
+                                      ((member_lookup(order), *values) for order, values in rows), batch_size)
+
+    staging = VEHICLE_STAGING_TABLE
+    loads, report = stream_batched_inserts(
+        staging, ['[Seq]', '[Order]', *names],
+        ((str(seq), str(order), *values) for seq, (order, values) in enumerate(rows, 1)), batch_size)
+    statements = itertools.chain(staging_table(staging, columns), loads,
+                                 [order_link_insert('[dbo].[Vehicles]', staging, names), f"DROP TABLE {staging};"])
+    return statements, report
+
+
+def linked_vehicle_inserts(columns: Sequence[Tuple[str, str]], rows: Iterable[Tuple[int, Sequence[str]]],
+                           link: str = 'lookup',
+                           batch_size: int = DEFAULT_BATCH_SIZE) -> Tuple[List[str], BatchReport]:
+    """
+    INSERTs de [dbo].[Vehicles] vinculados al miembro por Order.
+    columns: (columna, tipo SQL) de los datos del vehiculo, sin [MemberId].
+    rows: (Order, literales SQL en el orden de columns).
+    """
+    statements, report = stream_linked_vehicle_inserts(columns, rows, link, batch_size)
+    return list(statements), report
+
+
+def order_link_insert(target: str, staging: str, names: Sequence[str],
+                      select: Optional[Sequence[str]] = None) -> str:
+    """
+    INSERT ... SELECT desde una tabla staging con [Seq] y [Order], resolviendo el MemberId
+    con un solo join. select: expresiones sobre s.* por columna (por defecto s.<columna>).
+    """
+    select = select or ['s.' + name for name in names]
+    # Un solo join: MAX(MemberId) por Order equivale al TOP 1 ... ORDER BY [MemberId] DESC del modo lookup.
+    # LEFT JOIN para que un Order sin miembro falle igual que antes (MemberId NULL) en vez de omitirse.
+    return (
+        f"INSERT INTO {target}\n    ([MemberId], {', '.join(names)})\n"
+        f"SELECT m.[MemberId], {', '.join(select)}\n"
+        f"FROM {staging} AS s\n"
+        f"LEFT JOIN (SELECT [Order], MAX([MemberId]) AS [MemberId] FROM [dbo].[Members] GROUP BY [Order]) AS m\n"
+        f"    ON m.[Order] = s.[Order]\n"
+        f"ORDER BY s.[Seq];"
+    )
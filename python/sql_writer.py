@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Escritura en streaming de los scripts SQL generados.
+
+En vez de acumular el script completo (concatenacion de strings o sql_lines + '\\n'.join),
+cada encabezado, sentencia o lote se escribe directo a un archivo con buffer a medida que
+sale de la etapa de transformacion: la memoria no depende del tamaño del script.
+
+Opciones:
+  compress   -> salida gzip (<script>.sql.gz)
+  part_bytes -> divide el script en partes <script>.partNNN.sql de hasta ~part_bytes, siempre
+                en el limite de una sentencia. El encabezado queda en la primera parte y el
+                TRY/CATCH en la ultima: las partes concatenadas (sin su BOM) son el script
+                original. Cada parte se abre con la codificacion pedida, asi con 'utf-8-sig' cada
+                una lleva su propio BOM (sqlcmd :r la lee como UTF-8). Se escribe
+                <script>.manifest.json con las partes y, sin gzip, el propio <script>.sql pasa a
+                ser un driver de sqlcmd (:r parte) que las ejecuta en una sola sesion.
+"""
+
+import codecs
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Union
+
+# Buffer de escritura (las sentencias se acumulan en el buffer del archivo, no en listas)
+WRITE_BUFFER = 1024 * 1024
+
+
+class SqlScriptWriter:
+    """
+    Escritor de scripts SQL en streaming. Admite dos estilos de uso:
+      write(texto)       -> texto tal cual (script_content += ...)
+      append(linea)      -> como sql_lines.append: lineas separadas por '\\n', sin salto final
+    """
+
+    def __init__(self, path: Union[str, Path], encoding: str = 'utf-8', compress: bool = False,
+                 part_bytes: int = 0):
+        if part_bytes < 0:
+            raise ValueError(f'part_bytes debe ser >= 0: {part_bytes}')
+        self.path = Path(path)
+        self.encoding = encoding
+        self.compress = compress
+        self.part_bytes = part_bytes
+        self.parts: List[Dict[str, Any]] = []
+        self._file: Optional[BinaryIO] = None
+        self._encoder = None
+        self._hash = None
+        self._has_lines = False
+        self._newlines = 0
+        self._last = ''
+
+    # Rutas de salida
+
+    def _part_path(self, number: int) -> Path:
+        suffix = '.sql.gz' if self.compress else '.sql'
+        if self.part_bytes:
+            return self.path.with_name(f'{self.path.stem}.part{number:03d}{suffix}')
+        return self.path.with_name(self.path.stem + suffix) if self.compress else self.path
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.path.with_name(f'{self.path.stem}.manifest.json')
+
+    @property
+    def script_path(self) -> Path:
+        """Archivo a ejecutar o revisar: el script, el .gz, el driver de partes o el manifiesto"""
+        if not self.part_bytes:
+            return self._part_path(1)
+        return self.manifest_path if self.compress else self.path
+
+    @property
+    def line_count(self) -> int:
+        """Lineas del script completo (igual que len(contenido.splitlines()))"""
+        return self._newlines + (1 if self._last and self._last != '\n' else 0)
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(part['bytes'] for part in self.parts)
+
+    # Escritura
+
+    def _open_part(self) -> None:
+        path = self._part_path(len(self.parts) + 1)
+        # Se escribe en binario con un codificador por parte: bytes y sha256 del manifiesto son
+        # exactamente los del archivo (incluido el BOM de 'utf-8-sig'/'utf-16' de cada parte; con
+        # gzip, los del contenido descomprimido)
+        if self.compress:
+            self._file = gzip.open(path, 'wb')
+        else:
+            self._file = open(path, 'wb', buffering=WRITE_BUFFER)
+        self._encoder = codecs.getincrementalencoder(self.encoding)()
+        self._hash = hashlib.sha256()
+        self.parts.append({'path': str(path), 'bytes': 0, 'lines': 0})
+
+    def _close_part(self) -> None:
+        if self._file is not None:
+            self._emit_bytes(self._encoder.encode('', final=True))
+            self._file.close()
+            self.parts[-1]['sha256'] = self._hash.hexdigest()
+            self._file = None
+
+    def _emit_bytes(self, data: bytes) -> None:
+        self.parts[-1]['bytes'] += len(data)
+        self._hash.update(data)
+        self._file.write(data)
+
+    def _emit(self, text: str) -> None:
+        self._emit_bytes(self._encoder.encode(text))
+        self.parts[-1]['lines'] += text.count('\n')
+        self._newlines += text.count('\n')
+        self._last = text[-1]
+
+    def write(self, text: str) -> None:
+        """Escribe texto tal cual; una parte nueva solo empieza en el limite de una llamada"""
+        if not text:
+            return
+        if self._file is None:
+            self._open_part()
+        elif self.part_bytes and self.parts[-1]['bytes'] >= self.part_bytes:
+            # El salto de linea inicial queda al final de la parte anterior
+            if text.startswith('\n'):
+                self._emit('\n')
+                text = text[1:]
+            self._close_part()
+            self._open_part()
+            if not text:
+                return
+        self._emit(text)
+
+    def append(self, line: str) -> None:
+        """Agrega una linea (separador '\\n' entre lineas, como '\\n'.join(sql_lines))"""
+        self.write(('\n' if self._has_lines else '') + line)
+        self._has_lines = True
+
+    def extend(self, lines: Iterable[str]) -> None:
+        for line in lines:
+            self.append(line)
+
+    def write_statements(self, statements: Iterable[str], separator: str = '\n') -> int:
+        """Escribe las sentencias separadas (como separator.join) y retorna cuantas se escribieron"""
+        count = 0
+        for statement in statements:
+            self.write(statement if count == 0 else separator + statement)
+            count += 1
+        return count
+
+    def close(self) -> None:
+        if self._file is None and not self.parts:
+            # Script vacio: igual se crea el archivo
+            self._open_part()
+        self._close_part()
+        if self.part_bytes:
+            self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            'script': self.path.name,
+            'encoding': self.encoding,
+            'compressed': self.compress,
+            'bytes': self.bytes_written,
+            'parts': [dict(part, path=Path(part['path']).name) for part in self.parts],
+        }
+        self.manifest_path.write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+        if not self.compress:
+            # Driver: sqlcmd incluye las partes en la misma sesion (una sola transaccion)
+            lines = [f'-- {self.path.name}: {len(self.parts)} partes (ver {self.manifest_path.name})',
+                     '-- Ejecutar con sqlcmd desde esta carpeta']
+            lines.extend(f':r {Path(part["path"]).name}' for part in self.parts)
+            with open(self.path, 'w', encoding=self.encoding) as f:
+                f.write('\n'.join(lines) + '\n')
+
+    def print_summary(self) -> None:
+        """Detalle de las partes (solo cuando el script se divide)"""
+        if not self.part_bytes:
+            return
+        print(f'[OK] {len(self.parts)} partes ({self.bytes_written:,} bytes sin comprimir)')
+        for part in self.parts:
+            print(f"     {Path(part['path']).name}: {part['bytes']:,} bytes")
+        print(f'[OK] Manifiesto: {self.manifest_path}')
+
+    def __enter__(self) -> 'SqlScriptWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        elif self._file is not None:
+            # Con error solo se libera el archivo (sin manifiesto ni driver)
+            self._file.close()
+            self._file = None
+
+
+def split_bytes(split_mb: float) -> int:
+    """Tamaño de parte en bytes desde --split-mb (0 = sin dividir)"""
+    if split_mb < 0:
+        raise ValueError(f'split_mb debe ser >= 0: {split_mb}')
+    return int(split_mb * 1024 * 1024)
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+Destino local SQLite para medir la carga de los scripts generados (sin SQL Server).
+
+Aplica una traduccion de sql/schema.sql a SQLite y ejecuta los migration_*.sql tal como
+salen de los generadores (todos los modos: INSERT por fila, multi-fila, lookup/staging,
+DECLARE/SELECT por vehiculo, BULK INSERT con sus archivos .dat, MERGE del delta y drivers
+de partes con :r). Reporta filas/segundo por tabla.
+
+Emulaciones:
+  - El trigger tr_MaxTwoActiveVehiclesPerMember se extrae del esquema y se ejecuta como en
+    SQL Server: una vez por sentencia (no por fila) sobre la tabla completa, despues de cada
+    INSERT/UPDATE/MERGE sobre Vehicles. Su costo se suma al de la tabla.
+  - [Lic Plate] UNIQUE y las FK se aplican de forma nativa (PRAGMA foreign_keys = ON).
+
+El esquema vivo difiere de sql/schema.sql en nombres que usan los generadores (ver
+fix_column_names_v2.sql, add_dama_column.sql y setup_clean.sql); esos ajustes estan en
+COLUMN_OVERRIDES para que los scripts corran sin cambios. Las columnas que agregaron las
+migraciones de la aplicacion (AddCompleteNamesNormalized) estan en ADDED_COLUMNS.
+
+Uso:
+  python python/sqlite_target.py migration_reimport_clean_status.sql [--bulk-dir bulk] [--db carga.db]
+"""
+
+import argparse
+import gzip
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_SCHEMA = Path(__file__).resolve().parent.parent / 'sql' / 'schema.sql'
+# Capitulos referenciados por los generadores (FK de Members.ChapterId)
+DEFAULT_CHAPTERS = range(1, 7)
+
+# (tabla, columna de schema.sql) -> definicion usada por el esquema vivo
+COLUMN_OVERRIDES = {
+    ('Members', 'Id'): '[MemberId] INTEGER PRIMARY KEY AUTOINCREMENT',
+    ('Members', 'Complete Names'): '[ Complete Names] NVARCHAR(255) NOT NULL',
+    ('Members', 'Dama'): '[Dama] NVARCHAR(10) NULL',
+    ('Vehicles', 'Id'): '[VehicleId] INTEGER PRIMARY KEY AUTOINCREMENT',
+    ('Vehicles', 'Motorcycle Data'): '[ Motorcycle Data] TEXT NOT NULL',
+    ('Vehicles', 'OdometerUnit'): "[OdometerUnit] NVARCHAR(20) NOT NULL DEFAULT 'Miles'",
+}
+# (tabla, columna de schema.sql) -> columnas del esquema vivo que van a continuacion
+ADDED_COLUMNS = {
+    ('Members', 'Complete Names'): ('[CompleteNamesNormalized] NVARCHAR(255) NULL',),
+}
+# Columnas referenciadas por FK que cambian de nombre con COLUMN_OVERRIDES
+REFERENCE_RENAMES = {('Members', 'Id'): 'MemberId', ('Vehicles', 'Id'): 'VehicleId'}
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_SPECIAL = re.compile(r"['\[;\-/]")
+_VARIABLE = re.compile(r'@\w+')
+_SQLCMD_VARIABLE = re.compile(r'\$\((\w+)\)')
+_TARGET = re.compile(r'^(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|MERGE|BULK\s+INSERT)\s+(\S+)', re.IGNORECASE)
+
+
+class LoadError(RuntimeError):
+    """Error al ejecutar una sentencia del script (la transaccion se revierte)"""
+
+
+# ============================================
+# Lectura y division del script
+# ============================================
+
+def read_script(path: Union[str, Path], variables: Optional[Dict[str, str]] = None) -> str:
+    """Texto del script (.sql o .sql.gz) con las partes :r incluidas y las variables $(X) resueltas"""
+    path = Path(path)
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8-sig') as f:
+        text = f.read()
+    lines = []
+    for line in text.split('\n'):
+        if line.startswith(':r '):
+            lines.append(read_script(path.parent / line[3:].strip(), variables))
+        else:
+            lines.append(line)
+    text = '\n'.join(lines)
+
+    def resolve(match):
+        name = match.group(1)
+        if not variables or name not in variables:
+            raise LoadError(f'Variable sqlcmd sin valor: $({name})')
+        return variables[name]
+
+    return _SQLCMD_VARIABLE.sub(resolve, text)
+
+
+def split_statements(text: str) -> Iterator[str]:
+    """Sentencias separadas por ';' (respeta literales y [identificadores], quita comentarios)"""
+    buffer: List[str] = []
+    i, size = 0, len(text)
+    while i < size:
+        char = text[i]
+        if char == "'":
+            end = i + 1
+            while True:
+                end = text.find("'", end)
+                if end == -1:
+                    end = size
+                    break
+                if text.startswith("''", end):
+                    end += 2
+                    continue
+                end += 1
+                break
+            buffer.append(text[i:end])
+            i = end
+        elif char == '[':
+            end = text.find(']', i)
+            end = size if end == -1 else end + 1
+            buffer.append(text[i:end])
+            i = end
+        elif text.startswith('--', i):
+            end = text.find('\n', i)
+            i = size if end == -1 else end
+        elif text.startswith('/*', i):
+            end = text.find('*/', i)
+            i = size if end == -1 else end + 2
+        elif char == ';':
+            statement = ''.join(buffer).strip()
+            if statement:
+                yield statement
+            buffer = []
+            i += 1
+        else:
+            match = _SPECIAL.search(text, i + 1)
+            end = match.start() if match else size
+            buffer.append(text[i:end])
+            i = end
+    statement = ''.join(buffer).strip()
+    if statement:
+        yield statement
+
+
+# ============================================
+# Traduccion T-SQL -> SQLite
+# ============================================
+
+def _matching_paren(sql: str, start: int) -> int:
+    """Indice del ')' que cierra el '(' en start (ignora literales)"""
+    depth = 0
+    i = start
+    while i < len(sql):
+        char = sql[i]
+        if char == "'":
+            match = _LITERAL.match(sql, i)
+            i = match.end() if match else len(sql)
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(sql)
+
+
+def _code_segments(sql: str, convert) -> str:
+    """Aplica convert solo fuera de los literales; N'...' pasa a '...'"""
+    parts = []
+    last = 0
+    for match in _LITERAL.finditer(sql):
+        code = sql[last:match.start()]
+        if re.search(r'(?<![\w\]])N$', code):
+            code = code[:-1]
+        parts.append(convert(code))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(convert(sql[last:]))
+    return ''.join(parts)
+
+
+def _convert_code(code: str) -> str:
+    code = code.replace('[dbo].', '').replace('NVARCHAR(MAX)', 'TEXT')
+    code = re.sub(r'\bISNULL\(', 'IFNULL(', code, flags=re.IGNORECASE)
+    code = re.sub(r'\bCREATE\s+TABLE\s+#', 'CREATE TEMP TABLE #', code, flags=re.IGNORECASE)
+    # Tablas temporales de SQL Server (#Nombre) como identificadores entre corchetes
+    return re.sub(r'(?<![\w\[])#(\w+)', r'[#\1]', code)
+
+
+def _top_to_limit(sql: str) -> str:
+    """SELECT TOP n ... -> SELECT ... LIMIT n (hasta el cierre de la subconsulta)"""
+    while True:
+        match = re.search(r'\bSELECT\s+TOP\s+\(?(\d+)\)?\s+', sql, re.IGNORECASE)
+        if not match:
+            return sql
+        # Subconsulta escalar "(SELECT TOP n ...)": LIMIT va antes de su ')'; si no, al final
+        opening = sql.rfind('(', 0, match.start())
+        nested = opening != -1 and not sql[opening + 1:match.start()].strip()
+        end = _matching_paren(sql, opening) if nested else len(sql)
+        sql = sql[:match.start()] + 'SELECT ' + sql[match.end():end] + f' LIMIT {match.group(1)}' + sql[end:]
+
+
+def _alias_values(sql: str) -> str:
+    """(VALUES ...) AS x(c1, c2) -> (SELECT column1 AS c1, ... FROM (VALUES ...)) AS x"""
+    position = 0
+    while True:
+        match = re.compile(r'\(\s*VALUES\b', re.IGNORECASE).search(sql, position)
+        if not match:
+            return sql
+        end = _matching_paren(sql, match.start())
+        alias = re.compile(r'\s*AS\s+(\w+)\s*\(([^)]*)\)').match(sql, end + 1)
+        if not alias:
+            position = end
+            continue
+        columns = [column.strip() for column in alias.group(2).split(',')]
+        select = ', '.join(f'column{number} AS {column}' for number, column in enumerate(columns, 1))
+        replacement = f'(SELECT {select} FROM {sql[match.start():end + 1]}) AS {alias.group(1)}'
+        sql = sql[:match.start()] + replacement + sql[alias.end():]
+        position = match.start() + len(replacement)
+
+
+def translate_statement(sql: str) -> str:
+    """Traduce una sentencia T-SQL de los scripts generados a SQLite"""
+    temp = re.match(r"^IF\s+OBJECT_ID\('tempdb\.\.(#\w+)'\)\s+IS\s+NOT\s+NULL\s+DROP\s+TABLE\s+\S+$",
+                    sql, re.IGNORECASE)
+    if temp:
+        return f'DROP TABLE IF EXISTS [{temp.group(1)}]'
+    sql = _code_segments(sql, _convert_code)
+    if re.search(r'\bTOP\b', sql, re.IGNORECASE):
+        sql = _top_to_limit(sql)
+    if re.search(r'\bVALUES\b', sql, re.IGNORECASE) and re.search(r'\)\s*AS\s+\w+\s*\(', sql):
+        sql = _alias_values(sql)
+    return sql
+
+
+def table_name(identifier: str) -> str:
+    """[dbo].[Members] / Members / [#VehicleStaging] -> Members / #VehicleStaging"""
+    return identifier.replace('[dbo].', '').replace('dbo.', '').strip('[]')
+
+
+# ============================================
+# Esquema
+# ============================================
+
+@dataclass
+class TriggerCheck:
+    """Trigger AFTER de SQL Server emulado por sentencia: falla si la consulta retorna filas"""
+    name: str
+    table: str
+    events: Tuple[str, ...]
+    query: str
+    message: str
+
+
+def _translate_column(table: str, line: str) -> str:
+    name = re.match(r'\s*\[([^\]]+)\]', line)
+    if name and (table, name.group(1)) in COLUMN_OVERRIDES:
+        key = (table, name.group(1))
+        comma = ',' if line.rstrip().endswith(',') else ''
+        columns = (COLUMN_OVERRIDES[key], *ADDED_COLUMNS.get(key, ()))
+        return ',\n'.join('    ' + column for column in columns) + comma
+    line = re.sub(r'\bINT\s+PRIMARY\s+KEY\s+IDENTITY\(\d+,\s*\d+\)', 'INTEGER PRIMARY KEY AUTOINCREMENT', line)
+    line = line.replace('GETUTCDATE()', 'CURRENT_TIMESTAMP')
+
+    def reference(match):
+        target, column = match.group(1), match.group(2)
+        return f'REFERENCES [{target}]([{REFERENCE_RENAMES.get((target, column), column)}])'
+
+    return re.sub(r'REFERENCES\s+\[dbo\]\.\[(\w+)\]\(\[(\w+)\]\)', reference, line)
+
+
+def translate_schema(text: str) -> Tuple[List[str], List[TriggerCheck]]:
+    """sql/schema.sql -> (sentencias SQLite, triggers emulados)"""
+    triggers = []
+    trigger_pattern = re.compile(r'^CREATE\s+TRIGGER\s+\[(\w+)\]\s+ON\s+(\S+)\s+AFTER\s+([\w\s,]+?)\s+AS\s+(.*?)^END;',
+                                 re.IGNORECASE | re.DOTALL | re.MULTILINE)
+    for match in trigger_pattern.finditer(text):
+        body = match.group(4)
+        exists = re.search(r'IF\s+EXISTS\s*\(', body, re.IGNORECASE)
+        message = re.search(r"RAISERROR\('((?:[^']|'')*)'", body)
+        query = body[exists.end():_matching_paren(body, exists.end() - 1)]
+        triggers.append(TriggerCheck(
+            name=match.group(1), table=table_name(match.group(2)),
+            events=tuple(event.strip().upper() for event in match.group(3).split(',')),
+            query=translate_statement(' '.join(query.split())),
+            message=message.group(1) if message else match.group(1)))
+    text = trigger_pattern.sub('', text)
+
+    statements = []
+    for statement in split_statements(text):
+        create = re.match(r'CREATE\s+TABLE\s+\[dbo\]\.\[(\w+)\]', statement, re.IGNORECASE)
+        if create:
+            lines = [_translate_column(create.group(1), line) for line in statement.split('\n')]
+            statements.append(translate_statement('\n'.join(lines)))
+        elif re.match(r'ALTER\s+TABLE', statement, re.IGNORECASE):
+            # SQLite no agrega constraints a tablas existentes (FK de evidencias/confirmaciones)
+            continue
+        else:
+            statements.append(translate_statement(statement))
+    return statements, triggers
+
+
+# ============================================
+# Ejecucion y reporte
+# ============================================
+
+@dataclass
+class TableLoad:
+    """Carga acumulada de una tabla"""
+    statements: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+@dataclass
+class LoadReport:
+    """Resultado de ejecutar un script contra SQLite"""
+    script: str
+    tables: Dict[str, TableLoad] = field(default_factory=dict)
+    statements: int = 0
+    seconds: float = 0.0
+    trigger_firings: int = 0
+    trigger_seconds: float = 0.0
+
+    def table(self, name: str) -> TableLoad:
+        return self.tables.setdefault(name, TableLoad())
+
+    def print_summary(self) -> None:
+        print(f'[OK] {self.script}: {self.statements} sentencias en {self.seconds:.3f} s')
+        for name, load in self.tables.items():
+            print(f'     {name:<20} {load.rows:>8} filas  {load.statements:>6} sentencias  '
+                  f'{load.seconds:8.3f} s  {load.rows_per_second:>12,.0f} filas/s')
+        if self.trigger_firings:
+            print(f'     trigger: {self.trigger_firings} ejecuciones, {self.trigger_seconds:.3f} s')
+
+
+class SqliteTarget:
+    """Base SQLite con el esquema traducido, lista para ejecutar scripts generados"""
+
+    def __init__(self, path: str = ':memory:', schema_path: Union[str, Path] = DEFAULT_SCHEMA,
+                 chapters: Iterable[int] = DEFAULT_CHAPTERS):
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        statements, self.triggers = translate_schema(Path(schema_path).read_text(encoding='utf-8'))
+        for statement in statements:
+            self.connection.execute(statement)
+        self.connection.executemany('INSERT INTO [Chapters] ([Id], [Name], [Country]) VALUES (?, ?, ?)',
+                                    [(chapter, f'Chapter {chapter}', 'COLOMBIA') for chapter in chapters])
+        self._variables: Dict[str, Any] = {}
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def count(self, table: str) -> int:
+        return self.connection.execute(f'SELECT COUNT(*) FROM [{table}]').fetchone()[0]
+
+    def run_script(self, path: Union[str, Path], variables: Optional[Dict[str, str]] = None) -> LoadReport:
+        """Ejecuta el script (con sus partes :r y variables sqlcmd) y retorna el reporte"""
+        report = LoadReport(Path(path).name)
+        self.run_statements(split_statements(read_script(path, variables)), report)
+        return report
+
+    def run_statements(self, statements: Iterable[str], report: LoadReport) -> LoadReport:
+        self._variables = {}
+        started = time.perf_counter()
+        try:
+            for statement in statements:
+                if not self._execute(statement, report):
+                    break
+        except sqlite3.Error as exc:
+            self._rollback()
+            raise LoadError(f'{exc} (sentencia {report.statements})') from exc
+        except LoadError:
+            self._rollback()
+            raise
+        report.seconds = time.perf_counter() - started
+        return report
+
+    def _rollback(self) -> None:
+        if self.connection.in_transaction:
+            self.connection.execute('ROLLBACK')
+
+    def _execute(self, statement: str, report: LoadReport) -> bool:
+        """Ejecuta una sentencia; False cuando termina el bloque TRY (el CATCH no se ejecuta)"""
+        statement = re.sub(r'^(BEGIN\s+TRY\s*)+', '', statement, flags=re.IGNORECASE)
+        keyword = statement.upper()
+        if keyword.startswith('END TRY'):
+            return False
+        if not statement or keyword.startswith(('SET NOCOUNT', 'PRINT ', 'GO')):
+            return True
+        report.statements += 1
+        if keyword.startswith('BEGIN TRAN'):
+            self.connection.execute('BEGIN')
+            return True
+        if keyword.startswith('COMMIT'):
+            self.connection.execute('COMMIT')
+            return True
+        if keyword.startswith('DECLARE '):
+            for name in _VARIABLE.findall(statement):
+                self._variables.setdefault(name, None)
+            return True
+
+        statement = self._bind_variables(statement)
+        assignment = re.match(r'^SELECT\s+(@\w+)\s*=\s*(.+?)\s+FROM\s+(.+)$', statement, re.IGNORECASE | re.DOTALL)
+        target = _TARGET.match(statement)
+        if target:
+            name = table_name(target.group(1))
+        elif assignment:
+            # Lookups @MemberId_n = ... FROM Members del modo DECLARE/SELECT
+            name = table_name(assignment.group(3).split()[0]) + ' (lookup)'
+        else:
+            name = '(otras)'
+        load = report.table(name)
+        started = time.perf_counter()
+        if assignment:
+            rows = self.connection.execute(
+                translate_statement(f'SELECT {assignment.group(2)} FROM {assignment.group(3)}')).fetchall()
+            if rows:
+                # T-SQL asigna el valor de la ultima fila
+                self._variables[assignment.group(1)] = rows[-1][0]
+            affected = 0
+        elif keyword.startswith('BULK INSERT'):
+            affected = self._bulk_insert(statement)
+        elif keyword.startswith('MERGE'):
+            affected = self._merge(translate_statement(statement))
+        else:
+            affected = max(self.connection.execute(translate_statement(statement)).rowcount, 0)
+        if target and not keyword.startswith('DELETE'):
+            self._fire_triggers(name, report)
+        load.seconds += time.perf_counter() - started
+        load.statements += 1
+        load.rows += affected
+        return True
+
+    def _bind_variables(self, statement: str) -> str:
+        if '@' not in statement or not self._variables:
+            return statement
+
+        def bind(code):
+            return _VARIABLE.sub(lambda match: 'NULL' if self._variables.get(match.group(0)) is None
+                                 else str(self._variables[match.group(0)]), code)
+
+        # Solo se reemplazan las variables del lado izquierdo de las asignaciones ya resueltas
+        if re.match(r'^SELECT\s+@\w+\s*=', statement, re.IGNORECASE):
+            return statement
+        return _code_segments(statement, bind)
+
+    def _fire_triggers(self, table: str, report: LoadReport) -> None:
+        for trigger in self.triggers:
+            if trigger.table != table:
+                continue
+            started = time.perf_counter()
+            violated = self.connection.execute(f'SELECT EXISTS ({trigger.query})').fetchone()[0]
+            report.trigger_firings += 1
+            report.trigger_seconds += time.perf_counter() - started
+            if violated:
+                raise LoadError(f'{trigger.name}: {trigger.message}')
+
+    def _bulk_insert(self, statement: str) -> int:
+        """BULK INSERT desde los archivos de bulk_export (delimitados, con su format file)"""
+        match = re.match(r"^BULK\s+INSERT\s+(\S+)\s+FROM\s+'([^']+)'\s+WITH\s*\((.*)\)$", statement,
+                         re.IGNORECASE | re.DOTALL)
+        if not match:
+            raise LoadError(f'BULK INSERT no soportado: {statement[:120]}')
+        options = match.group(3)
+        format_match = re.search(r"FORMATFILE\s*=\s*'([^']+)'", options, re.IGNORECASE)
+        host_type, field_terminator, row_terminator = _read_format_file(_local_path(format_match.group(1))) \
+            if format_match else ('SQLNCHAR', '\t', '\r\n')
+        if host_type == 'SQLCHAR':
+            encoding = 'utf-8' if re.search(r"CODEPAGE\s*=\s*'65001'", options, re.IGNORECASE) else 'cp1252'
+        else:
+            encoding = 'utf-16'
+        with open(_local_path(match.group(2)), 'r', encoding=encoding, newline='') as f:
+            text = f.read()
+        rows = [[value if value != '' else None for value in line.split(field_terminator)]
+                for line in text.split(row_terminator) if line]
+        if not rows:
+            return 0
+        table = translate_statement(match.group(1))
+        marks = ', '.join('?' * len(rows[0]))
+        self.connection.executemany(f'INSERT INTO {table} VALUES ({marks})', rows)
+        return len(rows)
+
+    def _merge(self, sql: str) -> int:
+        """MERGE ... USING ... ON ... WHEN MATCHED UPDATE / WHEN NOT MATCHED INSERT (forma de delta_import)"""
+        match = re.match(
+            r'^MERGE\s+(?P<target>\S+)\s+AS\s+t\s+USING\s+(?P<source>.+?)\s+AS\s+s\s+ON\s+(?P<on>.+?)\s+'
+            r'WHEN\s+MATCHED\s+THEN\s+UPDATE\s+SET\s+(?P<set>.+?)\s+'
+            r'WHEN\s+NOT\s+MATCHED\s+BY\s+TARGET\s+THEN\s+'
+            r'INSERT\s*\((?P<columns>[^)]*)\)\s*VALUES\s*\((?P<values>.*)\)$',
+            sql, re.IGNORECASE | re.DOTALL)
+        if not match:
+            raise LoadError(f'MERGE no soportado: {sql[:120]}')
+        target = match.group('target')
+        source = '[#MergeSource]'
+        execute = self.connection.execute
+        # El match se evalua una sola vez antes de modificar (semantica de MERGE)
+        execute(f'DROP TABLE IF EXISTS {source}')
+        execute(f"CREATE TEMP TABLE {source} AS SELECT s.*, t.rowid AS [__rowid] "
+                f"FROM {match.group('source')} AS s LEFT JOIN {target} AS t ON {match.group('on')}")
+        assignments = re.sub(r'\bt\.(\[[^\]]+\])\s*=', r'\1 =', match.group('set'))
+        updated = execute(f'UPDATE {target} AS t SET {assignments} FROM {source} AS s '
+                          f'WHERE t.rowid = s.[__rowid]').rowcount
+        inserted = execute(f"INSERT INTO {target} ({match.group('columns')}) SELECT {match.group('values')} "
+                           f"FROM {source} AS s WHERE s.[__rowid] IS NULL ORDER BY s.rowid").rowcount
+        execute(f'DROP TABLE {source}')
+        return updated + inserted
+
+
+def _local_path(path: str) -> Path:
+    """Ruta de sqlcmd (con '\\') en el sistema local"""
+    return Path(path.replace('\\', os.sep))
+
+
+def _read_format_file(path: Path) -> Tuple[str, str, str]:
+    """(tipo de dato, terminador de campo, terminador de fila) de un format file no-XML"""
+    fields = [line.split() for line in path.read_text(encoding='ascii').splitlines()[2:] if line.strip()]
+
+    def terminator(value):
+        text = value.strip('"').replace('\\0', '')
+        return text.replace('\\t', '\t').replace('\\r', '\r').replace('\\n', '\n')
+
+    return fields[0][1], terminator(fields[0][4]), terminator(fields[-1][4])
+
+
+def load_scripts(scripts: Sequence[str], database: str = ':memory:', schema_path: Union[str, Path] = DEFAULT_SCHEMA,
+                 variables: Optional[Dict[str, str]] = None) -> List[LoadReport]:
+    """Ejecuta los scripts en orden sobre una base nueva e imprime el reporte de cada uno"""
+    target = SqliteTarget(database, schema_path)
+    reports = []
+    try:
+        for script in scripts:
+            report = target.run_script(script, variables)
+            report.print_summary()
+            reports.append(report)
+        print(f'[OK] Members: {target.count("Members")}, Vehicles: {target.count("Vehicles")}')
+    finally:
+        target.close()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ejecuta scripts generados contra SQLite y mide la carga')
+    parser.add_argument('scripts', nargs='+', help='Scripts a ejecutar en orden (.sql, .sql.gz o driver de partes)')
+    parser.add_argument('--db', default=':memory:', help='Archivo SQLite (por defecto en memoria)')
+    parser.add_argument('--schema', default=str(DEFAULT_SCHEMA), help='Esquema T-SQL a traducir')
+    parser.add_argument('--bulk-dir', help='Carpeta de los archivos .dat/.fmt (variable BulkDir)')
+    args = parser.parse_args()
+
+    variables = {'BulkDir': str(Path(args.bulk_dir).resolve())} if args.bulk_dir else None
+    try:
+        load_scripts(args.scripts, args.db, args.schema, variables)
+    except LoadError as exc:
+        print(f'[ERROR] {exc}')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
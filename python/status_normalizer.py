@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Normalizacion de STATUS de miembros a los 33 valores validos de la lista desplegable del Excel
+
+La comparacion usa una clave sin mayusculas, tildes, espacios ni puntuacion (indice precalculado);
+si no hay coincidencia exacta se busca el valor valido mas cercano por distancia de edicion
+(BK-tree, distancia acotada) y el resultado se memoiza por valor crudo.
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Mapeo de STATUS: normalizar typos y variaciones
+STATUS_MAPPING = {
+    'FULL COLOR MEMBER': 'FUL COLOR MEMBER',
+    'Full Color Member': 'FUL COLOR MEMBER',
+    'full color member': 'FUL COLOR MEMBER',
+    'CHAPTER MTO': 'CHAPTER MTO',
+    'Chapter Mto': 'CHAPTER MTO',
+    'chapter mto': 'CHAPTER MTO',
+    'CHAPTER SECRETARY': 'CHAPTER SECRETARY',
+    'Chapter Secretary': 'CHAPTER SECRETARY',
+    'chapter secretary': 'CHAPTER SECRETARY',
+    'CHAPTER VICEPRESIDENT': 'CHAPTER VICEPRESIDENT',
+    'Chapter Vicepresident': 'CHAPTER VICEPRESIDENT',
+    'Chapter Vice-President': 'CHAPTER VICEPRESIDENT',
+    'CHAPTER VICE-PRESIDEN': 'CHAPTER VICEPRESIDENT',  # Typo en Bucaramanga
+    'CHAPTER VICE-PRESIDENT': 'CHAPTER VICEPRESIDENT',
+    'REGIONAL VICEPRESIDENT': 'REGIONAL VICEPRESIDENT',
+    'Regional Vice-President': 'REGIONAL VICEPRESIDENT',
+    'NATIONAL VICEPRESIDENT': 'NATIONAL VICEPRESIDENT',
+    'National Vice-President': 'NATIONAL VICEPRESIDENT',
+    'CONTINENTAL VICEPRESIDENT': 'CONTINENTAL VICEPRESIDENT',
+    'Continental Vice-President': 'CONTINENTAL VICEPRESIDENT',
+    'INTERNATIONAL VICEPRESIDENT': 'INTERNATIONAL VICEPRESIDENT',
+    'International Vice-President': 'INTERNATIONAL VICEPRESIDENT',
+}
+
+VALID_STATUSES = {
+    'PROSPECT', 'ROCKET PROSPECT', 'FUL COLOR MEMBER',
+    'CHAPTER PRESIDENT', 'CHAPTER VICEPRESIDENT', 'CHAPTER TREASURER', 'CHAPTER BUSSINESS MANAGER', 'CHAPTER SECRETARY', 'CHAPTER MTO',
+    'REGIONAL PRESIDENT', 'REGIONAL VICEPRESIDENT', 'REGIONAL TREASURER', 'REGIONAL BUSSINESS MANAGER', 'REGIONAL SECRETARY', 'REGIONAL MTO',
+    'NATIONAL PRESIDENT', 'NATIONAL VICEPRESIDENT', 'NATIONAL TREASURER', 'NATIONAL BUSSINESS MANAGER', 'NATIONAL SECRETARY', 'NATIONAL MTO',
+    'CONTINENTAL PRESIDENT', 'CONTINENTAL VICEPRESIDENT', 'CONTINENTAL TREASURER', 'CONTINENTAL BUSSINESS MANAGER', 'CONTINENTAL SECRETARY', 'CONTINENTAL MTO',
+    'INTERNATIONAL PRESIDENT', 'INTERNATIONAL VICEPRESIDENT', 'INTERNATIONAL TREASURER', 'INTERNATIONAL BUSSINESS MANAGER', 'INTERNATIONAL SECRETARY', 'INTERNATIONAL MTO'
+}
+
+
+# Distancia de edicion maxima segun el largo de la clave (claves cortas: solo coincidencia exacta)
+FUZZY_MIN_LENGTH = 6
+FUZZY_MAX_DISTANCE = 2
+MEMO_SIZE = 4096
+
+
+def status_key(value: str) -> str:
+    """Clave de comparacion: casefold, sin tildes, espacios ni puntuacion"""
+    text = unicodedata.normalize('NFKD', value.casefold())
+    return ''.join(ch for ch in text if ch.isalnum())
+
+
+def edit_distance(a: str, b: str) -> int:
+    """Distancia de Levenshtein"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+class BKTree:
+    """Arbol BK sobre claves de STATUS: busqueda por distancia de edicion acotada"""
+
+    def __init__(self, keys: Iterable[str] = ()):
+        self.root: Optional[Tuple[str, Dict[int, Any]]] = None
+        for key in keys:
+            self.add(key)
+
+    def add(self, key: str) -> None:
+        if self.root is None:
+            self.root = (key, {})
+            return
+        node = self.root
+        while True:
+            distance = edit_distance(key, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (key, {})
+                return
+            node = child
+
+    def search(self, key: str, max_distance: int) -> List[Tuple[int, str]]:
+        """Claves a distancia <= max_distance, ordenadas por distancia"""
+        found = []
+        pending = [self.root] if self.root else []
+        while pending:
+            node_key, children = pending.pop()
+            distance = edit_distance(key, node_key)
+            if distance <= max_distance:
+                found.append((distance, node_key))
+            # Desigualdad triangular: solo los hijos en [d - max, d + max] pueden estar cerca
+            pending.extend(child for edge, child in children.items()
+                           if distance - max_distance <= edge <= distance + max_distance)
+        return sorted(found)
+
+
+# Indice precalculado: clave -> valor valido (los typos conocidos de STATUS_MAPPING incluidos)
+STATUS_INDEX = {status_key(status): status for status in VALID_STATUSES}
+STATUS_INDEX.update({status_key(raw): status for raw, status in STATUS_MAPPING.items()})
+STATUS_TREE = BKTree(sorted(STATUS_INDEX))
+
+
+def max_distance(key: str) -> int:
+    if len(key) < FUZZY_MIN_LENGTH:
+        return 0
+    return min(FUZZY_MAX_DISTANCE, len(key) // FUZZY_MIN_LENGTH)
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def match_status(status_str: str) -> Optional[str]:
+    """Valor valido para el texto (exacto por clave o aproximado), None si no hay uno inequivoco"""
+    key = status_key(status_str)
+    if key in STATUS_INDEX:
+        return STATUS_INDEX[key]
+    limit = max_distance(key)
+    if not limit:
+        return None
+    candidates = STATUS_TREE.search(key, limit)
+    if not candidates:
+        return None
+    best = candidates[0][0]
+    statuses = {STATUS_INDEX[candidate] for distance, candidate in candidates if distance == best}
+    # Empate entre valores distintos: ambiguo
+    return statuses.pop() if len(statuses) == 1 else None
+
+
+def normalize_status(val):
+    """Normalizar STATUS al valor exacto"""
+    if not val or pd.isna(val):
+        return 'PROSPECT'  # Default
+    
+    status_str = str(val).strip()
+    
+    # Indice exacto por clave y, si no, busqueda fuzzy acotada (memoizadas)
+    status = match_status(status_str)
+    if status is not None:
+        return status
+    
+    # Si no coincide, loguear y usar default
+    print(f'     [WARN] STATUS desconocido: "{status_str}" -> PROSPECT')
+    return 'PROSPECT'
+
+
+def normalize_status_column(values) -> List[str]:
+    """normalize_status por valor unico (una vez por corrida) y difundido a todas las filas"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    # El codigo -1 (nulos) toma el ultimo elemento: el default
+    normalized = np.array([normalize_status(value) for value in uniques] + ['PROSPECT'], dtype=object)
+    return normalized[codes].tolist()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Generador de libros CORTE NACIONAL sinteticos (hoja ODOMETER) para pruebas y benchmarks.
+
+Reproduce el template real: titulo en las primeras filas, encabezado en la fila 8 con los
+espacios iniciales (' Complete Names', ' Motorcycle Data', ...) y los problemas de datos que
+el ETL debe tolerar:
+  - 'In Lama Since' mezclado: año numerico, fecha, texto ('2015-05', 'desde 2012') y vacio
+  - placas duplicadas, vacias y con espacios
+  - STATUS con typos, mayusculas/minusculas y espacios extra
+  - nombres con tildes, apostrofes, espacios dobles y filas en blanco intermedias
+
+La hoja se escribe en streaming (XML directo dentro del ZIP, cadenas inline), asi que escala
+de 100 a 1.000.000 de filas con memoria constante. Misma semilla -> mismo libro.
+
+Uso:
+  python python/synthetic_workbook.py salida.xlsx --rows 100000 [--seed 7]
+"""
+
+import argparse
+import random
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, List, Sequence, Union
+from xml.sax.saxutils import escape
+
+from xlsx_stream import NS_MAIN, NS_PKG_REL, NS_REL, column_letters
+
+# Encabezado del template ODOMETER (fila 8), con los espacios iniciales del libro real
+ODOMETER_HEADERS = (
+    'Order', ' Complete Names', 'Dama', ' Country Birth', ' In Lama Since', 'STATUS', ' Motorcycle Data',
+    ' Trike', ' Lic Plate', 'Photography', ' Starting Odometer', ' Final Odometer',
+    ' Event Start Date (AAAA/MM/DD)', ' Name of the event', ' Mileage', ' Points per event',
+    ' Points per Distance', ' Points awarded per member', ' Visitor Class',
+)
+HEADER_ROW = 8
+# Limite de filas de Excel menos titulo y encabezado
+MAX_ROWS = 1048576 - HEADER_ROW
+
+FIRST_NAMES = ('José', 'María', 'Luis', 'Ana', 'Carlos', 'Lucía', 'Andrés', 'Sofía', 'Jorge', 'Ángela',
+               'Héctor', 'Beatriz', 'Julián', 'Natalia', 'Óscar', 'Diana', 'Iván', 'Paula', 'Fabián', 'Nuria')
+LAST_NAMES = ('Pérez', 'Gómez', 'Rodríguez', 'Martínez', 'Londoño', "O'Neil", 'Muñoz', 'Castaño', 'Ríos',
+              'Zuluaga', 'Giraldo', 'Peña', 'Ospina', 'Quiñones', 'Vélez', 'Ibáñez', 'Arango', 'Duque')
+MOTORCYCLES = ('BMW R1250 GS', 'Harley-Davidson Road King', 'Honda Gold Wing', 'Yamaha Tenere 700',
+               'Suzuki V-Strom 650', 'KTM 890 Adventure', 'Triumph Tiger 900', 'Kawasaki Versys 650')
+COUNTRIES = ('COLOMBIA', 'Colombia', 'VENEZUELA', 'ECUADOR', 'MEXICO', 'ESPAÑA', '')
+STATUSES = ('PROSPECT', 'FUL COLOR MEMBER', 'ROCKET PROSPECT', 'CHAPTER PRESIDENT', 'CHAPTER MTO',
+            'CHAPTER SECRETARY', 'CHAPTER TREASURER', 'REGIONAL PRESIDENT', 'NATIONAL SECRETARY')
+# Variantes reales y typos (mapeados, fuzzy o invalidos)
+STATUS_TYPOS = ('Full Color Member', 'full color member', 'PROSPECT ', ' prospect', 'Chapter Mto',
+                'CHAPTER VICE-PRESIDEN', 'Chapter Vice-President', 'PROSPCT', 'FULL COLOR', 'ACTIVE',
+                'INACTIVE', 'Regional Vice-President', 'chapter secretary', '')
+
+_EPOCH = datetime(1899, 12, 30)
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{NS_PKG_REL}">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<workbook xmlns="{NS_MAIN}" xmlns:r="{NS_REL}">'
+    '<sheets><sheet name="ODOMETER" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{NS_PKG_REL}">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/></Relationships>'
+)
+# Estilo 1 = fecha (numFmtId 14), para las celdas 'In Lama Since' tipo fecha
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<styleSheet xmlns="{NS_MAIN}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def _since_value(rng: random.Random) -> Any:
+    """'In Lama Since' con los tipos mezclados del libro real"""
+    year = rng.randint(1995, 2025)
+    kind = rng.random()
+    if kind < 0.55:
+        return year
+    if kind < 0.80:
+        return datetime(year, rng.randint(1, 12), rng.randint(1, 28))
+    if kind < 0.90:
+        return rng.choice((f'{year}-{rng.randint(1, 12):02d}', f'desde {year}', f'{year} '))
+    return None
+
+
+def _plate(rng: random.Random, order: int, issued: List[str], duplicate_rate: float) -> Any:
+    kind = rng.random()
+    if issued and kind < duplicate_rate:
+        return rng.choice(issued)
+    if kind < duplicate_rate + 0.05:
+        return None
+    plate = f'{rng.choice("ABCDEFGHJKLMNPRSTUVWXYZ")}{rng.choice("ABCDEFGHJKLMNPRSTUVWXYZ")}' \
+            f'{rng.choice("ABCDEFGHJKLMNPRSTUVWXYZ")}{order % 100:02d}{rng.choice("ABCDEFGHJK")}'
+    if len(issued) < 10000:
+        issued.append(plate)
+    return f' {plate}' if kind > 0.98 else plate
+
+
+def generate_rows(rows: int, seed: int = 0, duplicate_rate: float = 0.03,
+                  typo_rate: float = 0.15) -> Iterator[List[Any]]:
+    """Filas del ODOMETER en el orden de ODOMETER_HEADERS (None = celda vacia)"""
+    rng = random.Random(seed)
+    issued: List[str] = []
+    for order in range(1, rows + 1):
+        if rng.random() < 0.002:
+            # Fila en blanco intermedia (sin nombre): el ETL la descarta
+            yield [order] + [None] * (len(ODOMETER_HEADERS) - 1)
+            continue
+        name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {rng.choice(LAST_NAMES)}'
+        if rng.random() < 0.05:
+            name = rng.choice((f' {name}', f'{name}  ', name.replace(' ', '  ', 1), name.upper()))
+        status = rng.choice(STATUS_TYPOS) if rng.random() < typo_rate else rng.choice(STATUSES)
+        starting = rng.choice((0, rng.randint(0, 80000), round(rng.uniform(0, 80000), 1), None))
+        final = None if rng.random() < 0.2 else round(rng.uniform(0, 120000), 2)
+        yield [
+            order, name, rng.choice(('SI', 'NO', 'NO', 'si', None)), rng.choice(COUNTRIES), _since_value(rng),
+            status, rng.choice(MOTORCYCLES) if rng.random() > 0.05 else None,
+            rng.choice(('NO', 'NO', 'SI', 'no', None)), _plate(rng, order, issued, duplicate_rate),
+            rng.choice(('SI', 'NO', 'PENDING', None)), starting, final,
+            None, None, None, None, None, None, None,
+        ]
+
+
+def _cell(ref: str, value: Any) -> str:
+    if value is None or value == '':
+        return ''
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, datetime):
+        return f'<c r="{ref}" s="1"><v>{(value - _EPOCH).days}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"><v>{value!r}</v></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>'
+
+
+def _row(number: int, values: Sequence[Any], letters: Sequence[str]) -> str:
+    cells = ''.join(_cell(f'{letter}{number}', value) for letter, value in zip(letters, values))
+    return f'<row r="{number}">{cells}</row>'
+
+
+def write_workbook(path: Union[str, Path], rows: int, seed: int = 0, duplicate_rate: float = 0.03,
+                   typo_rate: float = 0.15, chapter_name: str = 'SINTETICO') -> Path:
+    """Escribe el libro sintetico y retorna su ruta"""
+    if not 0 <= rows <= MAX_ROWS:
+        raise ValueError(f'rows debe estar entre 0 y {MAX_ROWS}: {rows}')
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    letters = [column_letters(index) for index in range(len(ODOMETER_HEADERS))]
+    last_row = HEADER_ROW + rows
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _ROOT_RELS)
+        archive.writestr('xl/workbook.xml', _WORKBOOK)
+        archive.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        archive.writestr('xl/styles.xml', _STYLES)
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as raw:
+            buffer: List[str] = [
+                '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n',
+                f'<worksheet xmlns="{NS_MAIN}" xmlns:r="{NS_REL}">',
+                f'<dimension ref="A1:{letters[-1]}{last_row}"/><sheetData>',
+                _row(1, ['L.A.MA. ODOMETER'], letters),
+                _row(3, [f'CHAPTER {chapter_name}'], letters),
+                _row(HEADER_ROW, ODOMETER_HEADERS, letters),
+            ]
+            for number, values in enumerate(generate_rows(rows, seed, duplicate_rate, typo_rate), HEADER_ROW + 1):
+                buffer.append(_row(number, values, letters))
+                if len(buffer) >= 5000:
+                    raw.write(''.join(buffer).encode('utf-8'))
+                    buffer.clear()
+            buffer.append('</sheetData></worksheet>')
+            raw.write(''.join(buffer).encode('utf-8'))
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera un libro CORTE NACIONAL sintetico (hoja ODOMETER)')
+    parser.add_argument('output', help='Ruta del .xlsx a generar')
+    parser.add_argument('--rows', type=int, default=1000, help=f'Filas de miembros (1-{MAX_ROWS})')
+    parser.add_argument('--seed', type=int, default=0, help='Semilla (mismo valor -> mismo libro)')
+    parser.add_argument('--duplicate-rate', type=float, default=0.03, help='Fraccion de placas repetidas')
+    parser.add_argument('--typo-rate', type=float, default=0.15, help='Fraccion de STATUS con typos')
+    args = parser.parse_args()
+
+    path = write_workbook(args.output, args.rows, args.seed, args.duplicate_rate, args.typo_rate)
+    print(f'[OK] {path}: {args.rows} filas ({path.stat().st_size:,} bytes)')
+
+
+if __name__ == '__main__':
+    main()
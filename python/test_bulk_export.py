@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la salida de carga masiva (archivos delimitados + format files + driver)
+"""
+
+import pytest
+
+from bulk_export import BulkTable, bulk_field, format_file, write_bulk_load
+from chapter_ingest import bulk_tables
+
+MEMBERS = [
+    {'chapter_id': 1, 'order': 1, 'complete_name': "Ana O'Neil", 'dama': 'SI', 'country_birth': 'COLOMBIA',
+     'in_lama_since': 2015, 'status': 'ACTIVE'},
+    {'chapter_id': 2, 'order': 2, 'complete_name': 'Luis\tPerez', 'dama': 'NO', 'country_birth': '',
+     'in_lama_since': 2020, 'status': 'PROSPECT'},
+]
+VEHICLES = [
+    {'order': 1, 'motorcycle_data': 'BMW R1250', 'lic_plate': 'ABC12', 'trike': 'NO', 'photography': 'NO',
+     'starting_odometer': 100.5, 'final_odometer': None},
+]
+
+
+def test_fields_are_sanitized():
+    assert bulk_field(None) == ''
+    assert bulk_field(True) == '1'
+    assert bulk_field(12.5) == '12.5'
+    assert bulk_field('a\tb\r\nc') == 'a b c'
+
+
+def test_format_file_matches_encoding():
+    wide = format_file(['[Seq]', '[ Complete Names]'], 'utf-16').splitlines()
+    assert wide[:2] == ['10.0', '2']
+    assert wide[2].split() == ['1', 'SQLNCHAR', '0', '0', r'"\t\0"', '1', 'Seq', '""']
+    assert wide[3].split()[4] == r'"\r\0\n\0"' and wide[3].split()[6] == 'CompleteNames'
+    utf8 = format_file(['[Seq]'], 'utf-8').splitlines()
+    assert utf8[2].split()[1:5] == ['SQLCHAR', '0', '0', r'"\r\n"']
+    with pytest.raises(ValueError):
+        format_file(['[Seq]'], 'latin-1')
+
+
+def test_chapter_tables_write_data_and_driver(tmp_path):
+    driver = write_bulk_load(str(tmp_path), bulk_tables(MEMBERS, VEHICLES), preamble=('DELETE FROM [dbo].[Members];',))
+    members = (tmp_path / 'members.dat').read_bytes().decode('utf-16').split('\r\n')
+    assert members[0].split('\t') == ['1', '1', '1', "Ana O'Neil", "ANA O'NEIL", 'SI', 'COLOMBIA', '2015', 'ACTIVE', '1']
+    assert members[1].split('\t')[3:7] == ['Luis Perez', 'LUIS PEREZ', 'NO', '']
+    vehicles = (tmp_path / 'vehicles.dat').read_bytes().decode('utf-16').split('\r\n')
+    assert vehicles[0].split('\t') == ['1', '1', 'BMW R1250', 'ABC12', '0', 'NO', '100.5', '', '1']
+
+    script = driver.read_text(encoding='utf-8-sig')
+    assert "BULK INSERT #MemberStaging\n    FROM '$(BulkDir)\\members.dat'" in script
+    assert "FORMATFILE = '$(BulkDir)\\vehicles.fmt', KEEPNULLS, TABLOCK" in script
+    # Texto vacio vuelve como N'' (el script de INSERTs insertaba N''), los vehiculos se unen por Order
+    assert "ISNULL(s.[Country Birth], N'')" in script
+    assert 'GROUP BY [Order]) AS m' in script
+    assert script.index('DELETE FROM [dbo].[Members];') < script.index('INSERT INTO [dbo].[Members]')
+
+
+def test_nullable_text_and_utf8(tmp_path):
+    table = BulkTable('members', '[dbo].[Members]', '#MemberStaging',
+                      (('[Order]', 'INT'), ('[Country Birth]', 'NVARCHAR(100)')), [(1, None)],
+                      nullable=('[Country Birth]',))
+    driver = write_bulk_load(str(tmp_path), [table], encoding='utf-8')
+    assert (tmp_path / 'members.dat').read_bytes() == b'1\t1\t\r\n'
+    script = driver.read_text(encoding='utf-8-sig')
+    assert 'SELECT s.[Order], s.[Country Birth]' in script
+    assert "CODEPAGE = '65001'" in script
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la ingesta por capitulo: el modo paralelo debe producir el mismo resultado que el serial
+"""
+
+import openpyxl
+import pytest
+
+from chapter_ingest import ingest_chapters, merge_chapters
+
+HEADERS = ['Order', ' Complete Names', 'Dama', 'Country Birth', 'In Lama Since', 'STATUS',
+           ' Motorcycle Data', 'Trike', 'Lic Plate', 'Photography', 'Starting Odometer', 'Final Odometer']
+
+
+def _write_chapter(path, rows):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'ODOMETER'
+    for col, header in enumerate(HEADERS, 1):
+        ws.cell(8, col, header)
+    for row in rows:
+        ws.append(row)
+    wb.save(path)
+
+
+@pytest.fixture
+def files_chapters(tmp_path, monkeypatch):
+    monkeypatch.setenv('LAMA_PARSE_CACHE', 'off')
+    pereira = tmp_path / '(COL) PEREIRA CORTE NACIONAL.xlsx'
+    sabana = tmp_path / '(COL) SABANA CORTE NACIONAL.xlsx'
+    _write_chapter(pereira, [
+        [1, 'Ana', 'SI', 'COLOMBIA', 2019, 'Chapter Vice-President', 'Harley', 'NO', 'ABC123', 'SI', 100, 200],
+        [2, 'Bo', 'NO', None, '2020-01', 'PROSPECT', 'BMW', 'SI', None, None, None, None],
+    ])
+    _write_chapter(sabana, [
+        [1, 'Cy', 'NO', 'PERU', 2018, 'FULL COLOR MEMBER', 'Honda', 'NO', 'ABC123', 'NO', 5, 10],
+    ])
+    return [
+        (str(pereira), 1, 'PEREIRA'),
+        (str(tmp_path / 'NO EXISTE.xlsx'), 2, 'MEDELLÍN'),
+        (str(sabana), 3, 'SABANA'),
+    ]
+
+
+def test_parallel_matches_serial(files_chapters):
+    serial = ingest_chapters(files_chapters, status_mode='normalize', workers=1)
+    parallel = ingest_chapters(files_chapters, status_mode='normalize', workers=3)
+    assert parallel == serial
+
+
+def test_orders_and_plate_suffixes_are_deterministic(files_chapters):
+    members, vehicles = ingest_chapters(files_chapters, status_mode='normalize', workers=2)
+    assert [(m['chapter_id'], m['order'], m['complete_name']) for m in members] == [
+        (1, 1, 'Ana'), (1, 2, 'Bo'), (3, 3, 'Cy')]
+    assert [v['lic_plate'] for v in vehicles] == ['ABC123', 'AUTO_ORD_2', 'ABC123_ORD3']
+    assert [m['status'] for m in members] == ['CHAPTER VICEPRESIDENT', 'PROSPECT', 'FUL COLOR MEMBER']
+
+
+def test_merge_with_no_rows_is_empty():
+    assert merge_chapters([{'chapter_id': 1, 'rows': []}]) == ([], [])
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Pruebas del plan de columnas compilado contra la cadena if/elif original
+"""
+
+import pytest
+
+from column_resolver import resolve_columns
+
+TEMPLATE = ['Unnamed: 0', 'Order', ' Complete Names', 'Dama', 'Country Birth', 'In Lama Since', 'STATUS',
+            ' Motorcycle Data', 'Trike', 'Lic Plate', 'Photography', 'Starting Odometer (Miles)',
+            'Final Odometer (Miles)', 'Order.1']
+
+
+def _legacy_col_map(columns):
+    """Cadena if/elif original de los scripts de reimportacion"""
+    complete_col = next((col for col in columns if 'Complete' in str(col).strip()), None)
+    if complete_col is None:
+        return None
+    col_map = dict.fromkeys(['order', 'dama', 'country_birth', 'in_lama_since', 'status', 'motorcycle_data',
+                             'trike', 'lic_plate', 'photography', 'starting_odometer', 'final_odometer'])
+    col_map = {'complete_names': complete_col, **col_map}
+    for col in columns:
+        col_str = str(col).strip().upper()
+        if 'ORDER' in col_str and col_map['order'] is None:
+            col_map['order'] = col
+        elif 'DAMA' in col_str:
+            col_map['dama'] = col
+        elif 'COUNTRY' in col_str and 'BIRTH' in col_str:
+            col_map['country_birth'] = col
+        elif 'LAMA' in col_str and 'SINCE' in col_str:
+            col_map['in_lama_since'] = col
+        elif 'STATUS' in col_str:
+            col_map['status'] = col
+        elif 'MOTORCYCLE' in col_str and 'DATA' in col_str:
+            col_map['motorcycle_data'] = col
+        elif 'TRIKE' in col_str:
+            col_map['trike'] = col
+        elif 'LIC' in col_str or 'PLATE' in col_str:
+            col_map['lic_plate'] = col
+        elif 'PHOTO' in col_str:
+            col_map['photography'] = col
+        elif 'STARTING' in col_str and 'ODOMETER' in col_str:
+            col_map['starting_odometer'] = col
+        elif 'FINAL' in col_str and 'ODOMETER' in col_str:
+            col_map['final_odometer'] = col
+    return col_map
+
+
+@pytest.mark.parametrize('columns', [
+    TEMPLATE,
+    ['Order', 'Complete Names', 'Plate', 'Photo ID', 'Status 2025', 'Dama Order'],
+    ['Order', 'NAMES', 'Lic Plate'],
+    [None, 5, 'Complete', 'LICENSE PLATE', 'Final Odometer'],
+])
+def test_plan_matches_legacy_chain(columns):
+    assert resolve_columns(columns).col_map() == _legacy_col_map(columns)
+
+
+def test_plan_is_memoized_by_header_signature():
+    assert resolve_columns(list(TEMPLATE)) is resolve_columns(tuple(TEMPLATE))
+
+
+def test_names_fallback_and_prefixes():
+    plan = resolve_columns(['Unnamed: 0', 'MEMBER NAMES', 'Starting Odometer', 'Starting Odometer 2'],
+                           ('Starting Odometer', 'Final Odometer'))
+    assert plan.col_map() is None
+    assert plan.names == 'MEMBER NAMES'
+    assert plan.prefixed == {'Starting Odometer': 'Starting Odometer', 'Final Odometer': None}
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la transformacion columnar: mismas reglas que los ciclos iterrows originales
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from chapter_ingest import transform_rows
+from columnar_transform import (int_column, iterrows_view, normalize_name, normalized_name_column, odometer_column,
+                                parse_int, sql_string_column, text_column, year_column)
+
+
+def test_int_column_matches_parse_int():
+    values = [7, '  ', '', ' 12 ', '3.9', 'abc', datetime(2019, 5, 1), None, True, -2.5]
+    series = pd.Series(values, dtype=object)
+    assert int_column(series) == [parse_int(value) for value in values]
+    assert int_column(pd.Series([1.0, np.nan, 2.7])) == [1, None, 2]
+
+
+def test_text_and_year_columns():
+    assert text_column(pd.Series([' si ', None, 'no', ' si ']), 'NO', upper=True) == ['SI', 'NO', 'NO', 'SI']
+    years = pd.Series([datetime(2015, 1, 1), 2019, 2018.0, '2020-01', 'abc', None], dtype=object)
+    assert year_column(years) == [2015, 2019, 2018, 2020, 2025, 2025]
+
+
+def test_odometer_and_sql_literals():
+    assert odometer_column(pd.Series([0, 150, -3])) == [0, 150, 0]
+    assert odometer_column(pd.Series([1.5, np.nan])) == [1.5, 0]
+    assert sql_string_column(pd.Series(["O'Hara", 'Ana', "O'Hara"])) == ["N'O''Hara'", "N'Ana'", "N'O''Hara'"]
+
+
+def test_normalized_names_match_complete_names_normalized():
+    names = ['José  Pérez', ' ñoño Müller ', 'ÀNGELA\tdí  az', 'José  Pérez', None, 'O\'Brien']
+    assert normalized_name_column(names) == ['JOSE PEREZ', 'NONO MULLER', 'ANGELA DI AZ', 'JOSE PEREZ', '', "O'BRIEN"]
+    assert normalized_name_column(names[:4]) == [normalize_name(name) for name in names[:4]]
+
+
+def test_iterrows_view_unifies_numeric_rows():
+    df = iterrows_view(pd.DataFrame({'a': [1, 2], 'b': [0.5, 1.0]}))
+    assert df['a'].tolist() == [1.0, 2.0]
+
+
+def test_transform_rows_defaults_for_missing_columns():
+    df = pd.DataFrame({'Complete Names': [' Ana ', 'Bo'], 'Trike': ['si', None],
+                       'Odo': ['120', 'x']})
+    col_map = dict.fromkeys(['order', 'dama', 'country_birth', 'in_lama_since', 'status', 'motorcycle_data',
+                             'lic_plate', 'photography', 'final_odometer'])
+    col_map.update(complete_names='Complete Names', trike='Trike', starting_odometer='Odo')
+    rows = transform_rows(df, col_map, 'raw')
+    assert [row['complete_name'] for row in rows] == ['Ana', 'Bo']
+    assert [row['complete_name_normalized'] for row in rows] == ['ANA', 'BO']
+    assert [row['trike'] for row in rows] == ['SI', 'NO']
+    assert [row['starting_odometer'] for row in rows] == [120.0, None]
+    assert rows[0]['status'] == 'ACTIVE' and rows[0]['in_lama_since'] == 2025 and rows[0]['country_birth'] == 'COLOMBIA'
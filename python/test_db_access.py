@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la capa de acceso a datos (pool, consultas con nombre y backend SQLite)
+"""
+
+import sys
+import threading
+
+import pytest
+
+from db_access import ConnectionPool, Database, DatabaseError
+from sqlite_target import SqliteTarget
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """Base SQLite con el esquema traducido y algunos miembros"""
+    path = tmp_path / 'lama.db'
+    target = SqliteTarget(str(path))
+    target.connection.executemany(
+        'INSERT INTO [Members] ([ChapterId], [Order], [ Complete Names], [STATUS]) VALUES (?, ?, ?, ?)',
+        [(1, 1, 'Ana', 'PROSPECT'), (1, 7, 'Bo', 'CHAPTER MTO'), (2, 3, 'Cy', 'PROSPECT')])
+    target.close()
+    return f'sqlite:///{path}'
+
+
+def test_reference_lookups(sqlite_db, tmp_path):
+    with Database(sqlite_db) as db:
+        assert db.max_order() == 7
+        assert db.max_order(chapter_id=2) == 3
+        assert db.max_order(chapter_id=9) == 0
+        assert db.distinct_statuses() == ['CHAPTER MTO', 'PROSPECT']
+        assert db.scalar('SELECT COUNT(*) FROM [dbo].[Members] WHERE [STATUS] = ?', ('PROSPECT',)) == 2
+        with pytest.raises(KeyError):
+            db.lookup('no_existe')
+
+    empty = tmp_path / 'vacia.db'
+    SqliteTarget(str(empty)).close()
+    with Database(f'sqlite:///{empty}') as db:
+        assert db.max_order() == 0 and db.distinct_statuses() == []
+
+
+def test_one_session_reuses_connection_and_prepared_cursors(sqlite_db):
+    with Database(sqlite_db) as db:
+        for _ in range(50):
+            db.max_order()
+            db.distinct_statuses()
+        assert db.pool.opened == 1
+        with db.pool.connection() as conn:
+            assert len(conn.cursors) == 2
+
+
+def test_failed_query_discards_connection(sqlite_db):
+    with Database(sqlite_db) as db:
+        db.max_order()
+        with pytest.raises(DatabaseError, match='no such table'):
+            db.query('SELECT * FROM [dbo].[NoExiste]')
+        db.max_order()
+        assert db.pool.opened == 2
+
+
+def test_pool_is_bounded():
+    pool = ConnectionPool(lambda: type('Raw', (), {'close': lambda self: None, 'cursor': lambda self: None})(),
+                          size=2, timeout=0.05)
+    inside = threading.Barrier(3)
+    release = threading.Event()
+
+    def borrow():
+        with pool.connection():
+            inside.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=borrow) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    inside.wait()
+    with pytest.raises(DatabaseError, match='Sin conexiones libres'):
+        with pool.connection():
+            pass
+    release.set()
+    for thread in threads:
+        thread.join()
+    with pool.connection():
+        pass
+    assert pool.opened == 2
+
+
+def test_configuration_errors(tmp_path, monkeypatch):
+    with pytest.raises(DatabaseError, match='no soportada'):
+        Database('postgres://localhost/lama')
+    with pytest.raises(DatabaseError, match='No existe'):
+        Database(f'sqlite:///{tmp_path / "falta.db"}')
+    monkeypatch.setitem(sys.modules, 'pyodbc', None)
+    with pytest.raises(DatabaseError, match='pyodbc'):
+        Database('mssql://P-DVILLAMIZARA/LamaDb')
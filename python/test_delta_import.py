@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la importacion incremental contra el snapshot
+"""
+
+import copy
+
+from chapter_ingest import merge_chapters
+from delta_import import (build_snapshot, carry_orders, delta_statements, diff_snapshot, load_snapshot,
+                          save_snapshot)
+
+
+def _row(name, status='ACTIVE', plate=None):
+    return {'complete_name': name, 'dama': 'NO', 'country_birth': 'COLOMBIA', 'in_lama_since': 2015,
+            'status': status, 'motorcycle_data': 'BMW', 'trike': 'NO', 'lic_plate': plate, 'photography': 'NO',
+            'starting_odometer': 10.0, 'final_odometer': None}
+
+
+def _chapters(rows):
+    return [{'chapter_id': 1, 'rows': rows}]
+
+
+BASE = [_row('Ana Perez', plate='AAA1'), _row('Luis Gomez', plate='BBB2'), _row('Ana Perez', plate='CCC3')]
+
+
+def test_unchanged_parse_has_empty_delta(tmp_path):
+    members, vehicles = merge_chapters(_chapters(BASE))
+    path = tmp_path / 'snapshot.json'
+    save_snapshot(path, build_snapshot(members, vehicles))
+    delta = diff_snapshot(load_snapshot(path), members, vehicles)
+    assert delta.empty and delta_statements(delta) == []
+    assert load_snapshot(tmp_path / 'missing.json') is None
+
+
+def test_one_cell_fix_is_one_statement():
+    snapshot = build_snapshot(*merge_chapters(_chapters(BASE)))
+    rows = copy.deepcopy(BASE)
+    rows[1]['status'] = 'CHAPTER MTO'
+    delta = diff_snapshot(snapshot, *merge_chapters(_chapters(rows)))
+    statements = delta_statements(delta)
+    assert len(statements) == 1
+    assert statements[0].startswith('MERGE [dbo].[Members] AS t')
+    assert "(2, 1, 2, N'Luis Gomez', N'LUIS GOMEZ', N'NO', N'COLOMBIA', 2015, N'CHAPTER MTO', 1)" in statements[0]
+
+
+def test_removed_and_added_rows():
+    snapshot = build_snapshot(*merge_chapters(_chapters(BASE)))
+    # Se elimina Luis (Order 2) y se agrega un miembro nuevo al final: la segunda Ana pasa a Order 2
+    rows = [BASE[0], BASE[2], _row('Maria Ruiz')]
+    delta = diff_snapshot(snapshot, *merge_chapters(_chapters(rows)))
+    assert delta.deleted_orders == [2] and delta.deleted_plates == ['BBB2']
+    assert [(match, member['order']) for match, member in delta.members] == [(3, 2), (None, 3)]
+    # La placa de la segunda Ana no cambia; Maria recibe placa AUTO y se vincula por Order
+    assert [(match, vehicle['lic_plate']) for match, vehicle in delta.vehicles] == [(None, 'AUTO_ORD_3')]
+    statements = delta_statements(delta)
+    assert statements[0] == "DELETE FROM [dbo].[Vehicles] WHERE [Lic Plate] IN (N'BBB2');"
+    assert statements[1] == "DELETE FROM [dbo].[Members] WHERE [Order] IN (2);"
+    assert statements[3].startswith('MERGE [dbo].[Vehicles] AS t')
+    assert 'ON t.[Lic Plate] = s.[MatchPlate]' in statements[3]
+
+
+def test_inserted_member_does_not_shift_later_orders():
+    """Con los Orders del snapshot, un miembro nuevo en el capitulo 1 es una sola fila nueva"""
+    chapters = [{'chapter_id': 1, 'rows': BASE},
+                {'chapter_id': 2, 'rows': [_row('Eva Diaz', plate='AAA1'), _row('Juan Mora')]}]
+    snapshot = build_snapshot(*merge_chapters(chapters))
+    edited = [{'chapter_id': 1, 'rows': [BASE[0], _row('Nuevo Socio', plate='NEW9'), *BASE[1:]]}, chapters[1]]
+    members, vehicles = merge_chapters(edited, assign_order=carry_orders(snapshot))
+    delta = diff_snapshot(snapshot, members, vehicles)
+    assert [(match, member['complete_name'], member['order']) for match, member in delta.members] == [
+        (None, 'Nuevo Socio', 6)]
+    assert [(match, vehicle['lic_plate']) for match, vehicle in delta.vehicles] == [(None, 'NEW9')]
+    assert not delta.deleted_orders and not delta.deleted_plates
+    # La placa repetida del capitulo 2 conserva su sufijo _ORD del Order anterior
+    assert 'AAA1_ORD4' in {vehicle['lic_plate'] for vehicle in vehicles}
+
+    reserved = iter([40])
+    assign = carry_orders(snapshot, reserve=lambda chapter_id: next(reserved))
+    assert (assign('1|NUEVO SOCIO|1'), assign('1|NUEVO SOCIO|1'), assign('2|JUAN MORA|1')) == (40, 40, 5)
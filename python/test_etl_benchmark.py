@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Pruebas del benchmark por etapas del ETL
+"""
+
+from etl_benchmark import STAGES, append_result, benchmark, load_results, previous_result, print_result
+
+
+def test_benchmark_records_every_stage(tmp_path, capsys):
+    result = benchmark(200, seed=1, workbook_dir=tmp_path, label='prueba')
+    assert set(result['stages']) == set(STAGES)
+    assert result['members'] == result['vehicles'] and 190 <= result['members'] <= 200
+    assert result['sql_bytes'] > 0 and result['total'] == sum(result['stages'].values())
+    assert (tmp_path / 'synthetic_200_1.xlsx').exists()
+
+    results_path = tmp_path / 'results.jsonl'
+    append_result(results_path, result)
+    other = dict(result, rows=100)
+    append_result(results_path, other)
+    history = load_results(results_path)
+    assert previous_result(history, dict(result, label='nueva')) == history[0]
+    assert previous_result(history, dict(result, link='staging')) is None
+
+    print_result(dict(result, stages={stage: 1.0 for stage in STAGES}, total=4.0), history[0])
+    assert 'prueba' in capsys.readouterr().out
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la deteccion automatica de la fila de encabezado
+"""
+
+import openpyxl
+import pytest
+
+import header_detect
+from header_detect import HeaderIndex, detect_header
+
+
+def _write_workbook(path, header_row):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'ODOMETER'
+    ws['A1'] = 'L.A.MA. ODOMETER 2025'
+    ws['A3'] = 'Order of the chapter'
+    headers = ['Order', ' Complete Names', 'STATUS', 'Lic Plate', 'Starting Odometer (Miles)']
+    for col, header in enumerate(headers, 1):
+        ws.cell(header_row, col, header)
+    ws.cell(header_row + 1, 1, 1)
+    ws.cell(header_row + 1, 2, 'Ana')
+    wb.save(path)
+
+
+@pytest.mark.parametrize('header_row', [7, 8, 10])
+def test_detects_misplaced_header(tmp_path, header_row):
+    path = tmp_path / 'libro.xlsx'
+    _write_workbook(path, header_row)
+    match = detect_header(path, index=HeaderIndex(tmp_path / 'headers.json'))
+    assert match.header == header_row - 1
+    assert match.column_map['Complete Names'] == ' Complete Names'
+    assert match.column_map['Starting Odometer'] == 'Starting Odometer (Miles)'
+
+
+def test_result_is_cached_by_workbook_fingerprint(tmp_path, monkeypatch):
+    path = tmp_path / 'libro.xlsx'
+    _write_workbook(path, 8)
+    index_path = tmp_path / 'headers.json'
+    first = detect_header(path, index=HeaderIndex(index_path))
+
+    monkeypatch.setattr(header_detect, 'scan_header',
+                        lambda *args, **kwargs: pytest.fail('no deberia volver a escanear'))
+    assert detect_header(path, index=HeaderIndex(index_path)) == first
+
+
+def test_sheet_without_vocabulary_returns_none(tmp_path):
+    path = tmp_path / 'vacio.xlsx'
+    wb = openpyxl.Workbook()
+    wb.active.title = 'ODOMETER'
+    wb.active['A1'] = 'nada'
+    wb.save(path)
+    assert detect_header(path, index=HeaderIndex(tmp_path / 'headers.json')) is None
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la resolucion de identidad de miembros (bloqueo + puntaje)
+"""
+
+import csv
+import itertools
+
+import pytest
+
+from identity_resolution import (MATCH_TABLE_COLUMNS, MIN_SCORE, NameKey, fold_name, name_similarity,
+                                 resolve_groups, resolve_identities, spanish_phonetic)
+
+
+def test_fold_and_phonetic_keys():
+    assert fold_name(" José  Pérez-Gómez ") == ['JOSE', 'PEREZ', 'GOMEZ']
+    assert NameKey.of('Pérez José') == NameKey.of('JOSE PEREZ ')
+    pairs = [('VARGAS', 'BARGAS'), ('PEREZ', 'PERES'), ('HERNANDEZ', 'ERNANDEZ'), ('CECILIA', 'SESILIA'),
+             ('GUILLERMO', 'GUIYERMO'), ('QUINTERO', 'KINTERO'), ('XIMENA', 'JIMENA'), ('CHAVEZ', 'CHAVES')]
+    for left, right in pairs:
+        assert spanish_phonetic(left) == spanish_phonetic(right), (left, right)
+    assert spanish_phonetic('GUILLERMO') != spanish_phonetic('GILLERMO')
+    assert spanish_phonetic('CHAVEZ') != spanish_phonetic('CAVEZ')
+
+
+@pytest.mark.parametrize('left,right,rule', [
+    ('José Pérez', 'JOSE PEREZ ', 'exact'),
+    ('José Pérez', 'Pérez José', 'exact'),
+    ('Jose Vargas', 'José Bargas', 'phonetic'),
+    ('José Pérez', 'José Luis Pérez', 'subset'),
+    ('Ana María Gómez Ruiz', 'Ana Maria Gomez Ruiz Ortiz', 'subset'),
+])
+def test_matching_rules(left, right, rule):
+    score, found = name_similarity(NameKey.of(left), NameKey.of(right))
+    assert found == rule and score >= 0.85
+
+
+def test_different_people_stay_apart():
+    for left, right in [('José Pérez', 'Juan Pérez'), ('José Pérez', 'Josefa Pérez'), ('Ana Gómez', 'Ana Ruiz')]:
+        assert name_similarity(NameKey.of(left), NameKey.of(right))[0] < MIN_SCORE
+
+
+def test_blocking_finds_the_same_matches_as_all_pairs():
+    names = [(chapter, name) for chapter, name in [
+        (1, 'José Pérez'), (1, 'Ana Gómez'), (2, 'JOSE PEREZ '), (2, 'José Luis Pérez'), (3, 'Ana Gomes'),
+        (3, 'Juan Pérez'), (4, 'Hernández Ximena'), (5, 'Ernandez Jimena'), (6, 'Camilo Restrepo Osorio'),
+        (6, 'Camilo Restrepo'),
+    ]]
+    resolution = resolve_identities(names)
+    keys = [NameKey.of(name) for _, name in names]
+    expected = {(a, b) for a, b in itertools.combinations(range(len(names)), 2)
+                if name_similarity(keys[a], keys[b])[0] >= MIN_SCORE}
+    assert {(match.left.record_id, match.right.record_id) for match in resolution.matches} == expected
+    assert resolution.comparisons < len(names) * (len(names) - 1) // 2
+    assert [[record.name for record in group] for group in resolution.entities()] == [
+        ['José Pérez', 'JOSE PEREZ ', 'José Luis Pérez'], ['Ana Gómez', 'Ana Gomes'],
+        ['Hernández Ximena', 'Ernandez Jimena'], ['Camilo Restrepo Osorio', 'Camilo Restrepo']]
+
+
+def test_oversized_blocks_are_skipped():
+    names = [(1, f'Jose Perez {suffix}') for suffix in ('Gomez', 'Ruiz', 'Diaz', 'Mejia')]
+    resolution = resolve_identities(names, max_block=2)
+    assert resolution.skipped_blocks >= 1 and resolution.matches == []
+
+
+def test_dedupe_within_chapter_and_match_table(tmp_path):
+    resolution = resolve_groups({1: ['José Pérez', 'JOSE  PEREZ', 'Ana Gómez'], 2: ['Jose Perez']})
+    assert resolution.dedupe_groups() == {1: ['José Pérez', 'Ana Gómez'], 2: ['Jose Perez']}
+
+    path = tmp_path / 'matches.csv'
+    resolution.write_match_table(path)
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == MATCH_TABLE_COLUMNS
+    assert [row[:6] for row in rows[1:]] == [
+        ['1', 'José Pérez', '1', 'JOSE  PEREZ', '1.000', 'exact'],
+        ['1', 'José Pérez', '2', 'Jose Perez', '1.000', 'exact'],
+        ['1', 'JOSE  PEREZ', '2', 'Jose Perez', '1.000', 'exact'],
+    ]
+    assert {row[6] for row in rows[1:]} == {'0'}
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Pruebas del servicio de ingesta incremental (sondeo de INSUMOS/ y delta por capitulo)
+"""
+
+import json
+import os
+import unicodedata
+
+import openpyxl
+import pytest
+
+from chapter_ingest import merge_chapters, parse_chapter
+from delta_import import build_snapshot, load_snapshot, save_snapshot
+from ingest_service import IngestService, chapter_for
+from synthetic_workbook import HEADER_ROW, ODOMETER_HEADERS, write_workbook
+
+
+def test_chapter_for_file_names():
+    assert chapter_for('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx') == (1, 'PEREIRA')
+    # Nombre con la tilde separada (NFD), como lo entregan algunos sistemas de archivos
+    nfd = unicodedata.normalize('NFD', '(COL) MEDELLÍN CORTE NACIONAL.xlsx')
+    assert chapter_for(nfd) == (2, 'MEDELLÍN')
+    assert chapter_for('(COL) TUNJA CORTE NACIONAL.xlsx') is None
+    assert chapter_for('REGION NORTE.xlsx') is None
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setenv('LAMA_PARSE_CACHE', 'off')
+    monkeypatch.setenv('LAMA_DB_URL', f'sqlite:///{tmp_path / "sin_base.db"}')
+    insumos = tmp_path / 'INSUMOS'
+    insumos.mkdir()
+    write_workbook(insumos / '(COL) PEREIRA CORTE NACIONAL.xlsx', rows=20, seed=1)
+    write_workbook(insumos / '(COL) SABANA CORTE NACIONAL.xlsx', rows=15, seed=2)
+    with IngestService(insumos, tmp_path / 'state', workers=2, bootstrap_snapshot=None,
+                       order_ledger=str(tmp_path / 'order_ledger.sqlite'),
+                       plate_index=str(tmp_path / 'plate_index.sqlite'), settle_seconds=0) as service:
+        yield service
+
+
+def _orders(service, chapter_id):
+    rows = load_snapshot(service.snapshot_dir / f'chapter_{chapter_id}.json')
+    return {key: row['order'] for key, row in rows.items()}
+
+
+def test_only_new_or_changed_workbooks_are_processed(service):
+    entries = service.run_once()
+    assert sorted((entry['chapter_id'], entry['status']) for entry in entries) == [(1, 'ok'), (3, 'ok')]
+    pereira, sabana = _orders(service, 1), _orders(service, 3)
+    # Rangos de Orders disjuntos por capitulo, reservados en el ledger
+    assert not set(pereira.values()) & set(sabana.values())
+    assert all(os.path.exists(entry['script']) for entry in entries)
+
+    # Sin cambios, o re-guardado con el mismo contenido: no se parsea nada
+    assert service.run_once() == []
+    path = service.watch_dir / '(COL) SABANA CORTE NACIONAL.xlsx'
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10 ** 9))
+    assert service.run_once() == []
+
+    # Un capitulo con una fila mas: solo ese capitulo, los miembros existentes conservan su Order
+    write_workbook(service.watch_dir / '(COL) PEREIRA CORTE NACIONAL.xlsx', rows=21, seed=1)
+    entries = service.run_once()
+    assert [(entry['chapter_id'], entry['changes']['members_new'], entry['changes']['members_modified'],
+             entry['changes']['members_deleted']) for entry in entries] == [(1, 1, 0, 0)]
+    updated = _orders(service, 1)
+    assert {key: updated[key] for key in pereira} == pereira
+    assert min(set(updated.values()) - set(pereira.values())) > max(sabana.values())
+
+    journal = [json.loads(line) for line in service.journal_path.read_text(encoding='utf-8').splitlines()]
+    assert [entry['status'] for entry in journal] == ['ok', 'ok', 'ok']
+
+
+def test_failed_parse_is_journaled_and_not_imported(service):
+    (service.watch_dir / '(COL) CUCUTA CORTE NACIONAL.xlsx').write_bytes(b'no es un libro')
+    entries = {entry['chapter_id']: entry for entry in service.run_once()}
+    assert entries[4]['status'] == 'error'
+    assert '(COL) CUCUTA CORTE NACIONAL.xlsx' not in service.imported
+    assert json.loads(service.state_path.read_text(encoding='utf-8'))['files'].keys() == {
+        '(COL) PEREIRA CORTE NACIONAL.xlsx', '(COL) SABANA CORTE NACIONAL.xlsx'}
+    # El mismo contenido fallido no se reintenta en cada sondeo
+    assert service.run_once() == []
+
+
+def _chapter_book(path, members):
+    """Libro ODOMETER minimo con (nombre, placa, STATUS) por miembro"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'ODOMETER'
+    for col, header in enumerate(ODOMETER_HEADERS, 1):
+        ws.cell(HEADER_ROW, col, header)
+    for row, (name, plate, status) in enumerate(members, HEADER_ROW + 1):
+        values = [row - HEADER_ROW, name, 'NO', 'COLOMBIA', 2015, status, 'BMW R1250 GS', 'NO', plate, 'NO', 100]
+        for col, value in enumerate(values, 1):
+            ws.cell(row, col, value)
+    wb.save(path)
+
+
+def test_bootstrap_plates_keep_their_owner(tmp_path, monkeypatch):
+    """Una placa repetida entre capitulos sigue con el dueño de la reimportacion completa"""
+    monkeypatch.setenv('LAMA_PARSE_CACHE', 'off')
+    monkeypatch.setenv('LAMA_DB_URL', f'sqlite:///{tmp_path / "sin_base.db"}')
+    insumos, origen = tmp_path / 'INSUMOS', tmp_path / 'origen'
+    insumos.mkdir()
+    origen.mkdir()
+    pereira, sabana = '(COL) PEREIRA CORTE NACIONAL.xlsx', '(COL) SABANA CORTE NACIONAL.xlsx'
+    _chapter_book(origen / pereira, [('Ana Perez', 'XYZ123', 'PROSPECT')])
+    _chapter_book(origen / sabana, [('Luis Gomez', 'XYZ123', 'PROSPECT'), ('Eva Diaz', 'ABC987', 'PROSPECT')])
+
+    # Reimportacion completa sin indice de placas: sufijo _ORD{n} en memoria
+    members, vehicles = merge_chapters([parse_chapter(str(origen / pereira), 1, 'PEREIRA'),
+                                        parse_chapter(str(origen / sabana), 3, 'SABANA')])
+    assert [vehicle['lic_plate'] for vehicle in vehicles] == ['XYZ123', 'XYZ123_ORD2', 'ABC987']
+    bootstrap = tmp_path / 'import_snapshot.json'
+    save_snapshot(bootstrap, build_snapshot(members, vehicles))
+
+    # Solo cambia un STATUS de SABANA, y SABANA se procesa antes que PEREIRA
+    _chapter_book(insumos / sabana, [('Luis Gomez', 'XYZ123', 'CHAPTER MTO'), ('Eva Diaz', 'ABC987', 'PROSPECT')])
+    with IngestService(insumos, tmp_path / 'state', workers=1, bootstrap_snapshot=str(bootstrap),
+                       order_ledger=str(tmp_path / 'order_ledger.sqlite'),
+                       plate_index=str(tmp_path / 'plate_index.sqlite'), settle_seconds=0) as service:
+        [entry] = service.run_once()
+        assert entry['changes'] == {'members_new': 0, 'members_modified': 1, 'members_deleted': 0,
+                                    'vehicles_new': 0, 'vehicles_modified': 0, 'vehicles_deleted': 0}
+        assert 'MERGE [dbo].[Vehicles]' not in open(entry['script'], encoding='utf-8-sig').read()
+
+        # PEREIRA sin cambios conserva la placa original
+        (insumos / pereira).write_bytes((origen / pereira).read_bytes())
+        [entry] = service.run_once()
+        assert entry['status'] == 'unchanged'
+        assert {row['plate'] for row in load_snapshot(service.snapshot_dir / 'chapter_1.json').values()} == {
+            'XYZ123'}
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la conversion cacheada de libros .xls
+"""
+
+import shutil
+
+import pytest
+
+import legacy_xls
+import parse_cache
+from chapter_ingest import parse_chapter
+from legacy_xls import Converter, LegacyConversionError, converted_path, ensure_xlsx, xlsx_path
+from parse_cache import ParseCache
+from synthetic_workbook import write_workbook
+
+
+class CopyConverter(Converter):
+    """Convertidor de prueba: los '.xls' de las pruebas ya contienen un .xlsx"""
+
+    name = 'copia'
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    @property
+    def available(self):
+        return True
+
+    def convert(self, jobs):
+        self.batches.append(sorted(source.name for source in jobs))
+        if self.fail:
+            raise OSError('convertidor roto')
+        for source, target in jobs.items():
+            shutil.copyfile(source, target)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / 'cache')
+
+
+@pytest.fixture
+def legacy_books(tmp_path):
+    paths = []
+    for seed, name in enumerate(['(COL) SABANA CORTE NACIONAL.xls', '(COL) TUNJA CORTE NACIONAL.xls']):
+        path = tmp_path / name
+        write_workbook(path, rows=5, seed=seed)
+        paths.append(path)
+    return paths
+
+
+def test_batch_conversion_is_cached_by_content(legacy_books, cache, tmp_path):
+    modern = tmp_path / 'moderno.xlsx'
+    write_workbook(modern, rows=3)
+    converter = CopyConverter()
+    resolved = ensure_xlsx([*legacy_books, modern], cache, [converter])
+    # Un solo lote para todos los pendientes; los .xlsx no se tocan
+    assert converter.batches == [sorted(path.name for path in legacy_books)]
+    assert resolved[modern] == modern
+    assert resolved[legacy_books[0]] == converted_path(legacy_books[0], cache)
+    assert resolved[legacy_books[0]].read_bytes() == legacy_books[0].read_bytes()
+
+    # Segunda corrida y copia renombrada: misma conversion, sin convertir de nuevo
+    renamed = tmp_path / 'copia.xls'
+    shutil.copyfile(legacy_books[1], renamed)
+    assert xlsx_path(renamed, cache, [converter]) == resolved[legacy_books[1]]
+    assert len(converter.batches) == 1
+
+
+def test_fallback_and_failures(legacy_books, cache, capsys):
+    broken, working = CopyConverter(fail=True), CopyConverter()
+    resolved = ensure_xlsx(legacy_books[:1], cache, [broken, working])
+    assert broken.batches == working.batches == [[legacy_books[0].name]]
+    assert legacy_books[0] in resolved
+
+    with pytest.raises(LegacyConversionError):
+        xlsx_path(legacy_books[1], cache, [CopyConverter(fail=True)])
+    assert 'convertidor roto' in capsys.readouterr().out
+    assert not converted_path(legacy_books[1], cache).exists()
+
+    class Missing(Converter):
+        name = 'ausente'
+        available = False
+
+        def convert(self, jobs):
+            pytest.fail('un convertidor no disponible no deberia usarse')
+
+    class Incomplete(Converter):
+        available = True
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+    assert ensure_xlsx(legacy_books[1:], cache, [Missing()]) == {}
+
+
+def test_chapter_ingest_reads_legacy_workbooks(legacy_books, cache, monkeypatch):
+    monkeypatch.setattr(parse_cache, '_default_cache', cache)
+    monkeypatch.setattr(legacy_xls, 'default_converters', lambda: [CopyConverter()])
+    result = parse_chapter(str(legacy_books[0]), 3, 'SABANA')
+    assert len(result['rows']) == 5
+    assert '[OK] Convertido a XLSX' in result['log']
+    # Con la conversion en cache ya no se convierte
+    assert 'Convertido' not in parse_chapter(str(legacy_books[0]), 3, 'SABANA')['log']
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Pruebas del ledger de rangos de [Order]
+"""
+
+import threading
+
+from order_allocator import OrderAllocator, chapter_ranges, seed_from_database
+from sqlite_target import SqliteTarget
+
+
+def test_ranges_are_contiguous_and_persist(tmp_path):
+    path = tmp_path / 'order_ledger.sqlite'
+    with OrderAllocator(path) as allocator:
+        assert not allocator.seeded and allocator.next_order == 1
+        first = allocator.reserve(3, 4, label='sabana')
+        ranges = allocator.reserve_many({5: 2, 7: 0, 9: 3})
+    assert (first.start, first.last, list(first)) == (1, 4, [1, 2, 3, 4])
+    assert [(r.chapter_id, r.start, r.stop) for r in ranges.values()] == [(5, 5, 7), (7, 7, 7), (9, 7, 10)]
+
+    with OrderAllocator(path) as allocator:
+        assert allocator.seeded and allocator.next_order == 10
+        assert [row[1:4] for row in allocator.reservations()] == [(3, 1, 4), (5, 5, 6), (9, 7, 9)]
+        assert allocator.reservations(3)[0][5] == 'sabana'
+
+
+def test_concurrent_reservations_never_overlap(tmp_path):
+    path = tmp_path / 'order_ledger.sqlite'
+    OrderAllocator(path).close()
+    reserved = []
+
+    def worker(chapter_id):
+        # Una conexion por hilo, como procesos de importacion independientes
+        with OrderAllocator(path) as allocator:
+            for _ in range(10):
+                reserved.append(allocator.reserve(chapter_id, 7))
+
+    threads = [threading.Thread(target=worker, args=(chapter_id,)) for chapter_id in range(1, 7)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    orders = [order for order_range in reserved for order in order_range]
+    assert sorted(orders) == list(range(1, 6 * 10 * 7 + 1))
+
+
+def test_advance_and_record_never_move_backwards(tmp_path):
+    members = [{'chapter_id': 1, 'order': 1}, {'chapter_id': 1, 'order': 2}, {'chapter_id': 2, 'order': 3}]
+    assert chapter_ranges(members) == {1: (1, 2), 2: (3, 3)}
+    with OrderAllocator(tmp_path / 'order_ledger.sqlite') as allocator:
+        assert allocator.advance(40) == 41
+        assert allocator.advance(10) == 41
+        assert allocator.record(chapter_ranges(members), label='recarga') == 41
+        assert allocator.record({1: (1, 60)}) == 61
+        assert allocator.reserve(3, 1).start == 61
+
+
+def test_seed_from_database(tmp_path, monkeypatch):
+    db_path = tmp_path / 'carga.db'
+    target = SqliteTarget(str(db_path))
+    target.connection.execute('INSERT INTO [Members] ([ChapterId], [Order], [ Complete Names]) VALUES (1, 25, ?)',
+                              ('Ana',))
+    target.close()
+    monkeypatch.setenv('LAMA_DB_URL', f'sqlite:///{db_path}')
+    with OrderAllocator(tmp_path / 'order_ledger.sqlite') as allocator:
+        assert seed_from_database(allocator) == 26
+        assert allocator.reserve(2, 3).start == 26
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Pruebas del cache de parseo por hash de contenido
+"""
+
+import shutil
+
+import openpyxl
+import pytest
+
+import parse_cache
+from parse_cache import ParseCache, load_sheet_columns
+
+
+def _write_workbook(path, names):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'ODOMETER'
+    ws.cell(8, 1, 'Order')
+    ws.cell(8, 2, ' Complete Names')
+    for order, name in enumerate(names, 1):
+        ws.cell(8 + order, 1, order)
+        ws.cell(8 + order, 2, name)
+    wb.save(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(tmp_path / 'cache', max_bytes=10 * 1024 * 1024)
+
+
+def test_second_load_is_served_from_cache(tmp_path, cache, monkeypatch):
+    """Una copia con el mismo contenido reutiliza la entrada sin volver a parsear"""
+    original = tmp_path / 'a.xlsx'
+    _write_workbook(original, ['Ana', 'Bo', None, 'Cy'])
+    first = load_sheet_columns(original, 'ODOMETER', header=7, cache=cache)
+
+    copy = tmp_path / 'b.xlsx'
+    shutil.copy(original, copy)
+    monkeypatch.setattr(parse_cache, 'read_sheet_columns',
+                        lambda *args, **kwargs: pytest.fail('no deberia parsear de nuevo'))
+    assert load_sheet_columns(copy, 'ODOMETER', header=7, cache=cache) == first
+
+
+def test_nrows_and_fill_value_are_applied_on_cached_table(tmp_path, cache):
+    path = tmp_path / 'a.xlsx'
+    _write_workbook(path, ['Ana', 'Bo', None, 'Cy'])
+    load_sheet_columns(path, 'ODOMETER', header=7, cache=cache)
+    data = load_sheet_columns(path, 'ODOMETER', header=7, columns=[' Complete Names'],
+                              nrows=3, fill_value='', cache=cache)
+    assert data == {' Complete Names': ['Ana', 'Bo', '']}
+
+
+def test_where_matches_streaming_and_miss_is_not_cached(tmp_path, cache):
+    """Sin entrada se filtra en streaming sin guardar; con entrada se filtra la tabla cacheada"""
+    path = tmp_path / 'a.xlsx'
+    _write_workbook(path, ['Ana', 'Bo', None, 'Cy'])
+    where = {' Complete Names': lambda name: name is not None and name != 'Bo'}
+    streamed = load_sheet_columns(path, 'ODOMETER', header=7, nrows=3, cache=cache, where=where)
+    assert streamed == {'Order': [1], ' Complete Names': ['Ana']}
+    assert cache.get(path, 'ODOMETER', 7) is None
+
+    load_sheet_columns(path, 'ODOMETER', header=7, cache=cache)
+    for nrows in (None, 3):
+        assert load_sheet_columns(path, 'ODOMETER', header=7, nrows=nrows, cache=cache, where=where) == \
+            load_sheet_columns(path, 'ODOMETER', header=7, nrows=nrows, cache=ParseCache(tmp_path / 'vacio'),
+                               where=where)
+
+
+def test_modified_workbook_invalidates_entry(tmp_path, cache):
+    path = tmp_path / 'a.xlsx'
+    _write_workbook(path, ['Ana'])
+    assert load_sheet_columns(path, cache=cache)[' Complete Names'] == ['Ana']
+    _write_workbook(path, ['Ana', 'Bo'])
+    assert load_sheet_columns(path, cache=cache)[' Complete Names'] == ['Ana', 'Bo']
+
+
+def test_lru_eviction_respects_size_limit(tmp_path):
+    cache = ParseCache(tmp_path / 'cache', max_bytes=1)
+    path = tmp_path / 'a.xlsx'
+    _write_workbook(path, ['Ana'])
+    load_sheet_columns(path, cache=cache)
+    assert list((tmp_path / 'cache').glob('*.cols')) == []
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Pruebas del indice persistente de placas
+"""
+
+import sqlite3
+
+from chapter_ingest import merge_chapters
+from plate_index import PlateIndex, canonical_plate, duplicate_report, original_plate
+
+
+def _row(name, plate):
+    return {'complete_name': name, 'lic_plate': plate, 'dama': 'NO', 'country_birth': 'COLOMBIA',
+            'in_lama_since': 2020, 'status': 'PROSPECT', 'motorcycle_data': 'Moto', 'trike': 'NO',
+            'photography': 'NO', 'starting_odometer': None, 'final_odometer': None}
+
+
+def _plates(results, plate_index=None):
+    _, vehicles = merge_chapters(results, plate_index)
+    return [vehicle['lic_plate'] for vehicle in vehicles]
+
+
+def test_canonical_form_folds_case_spaces_and_hyphens():
+    assert canonical_plate(' abc-123 ') == canonical_plate('ABC 123') == canonical_plate('Abc--1 23') == 'ABC123'
+    assert canonical_plate('ABC_123') != 'ABC123'
+
+
+def test_in_memory_merge_compares_canonical_plates():
+    results = [{'chapter_id': 1, 'rows': [_row('Ana', 'ABC-123'), _row('Bo', 'abc 123'), _row('Cy', None)]}]
+    assert _plates(results) == ['ABC-123', 'abc 123_ORD2', 'AUTO_ORD_3']
+
+
+def test_fresh_index_matches_in_memory_merge(tmp_path):
+    results = [{'chapter_id': 1, 'rows': [_row('Ana', 'X1'), _row('Bo', 'x-1'), _row('Cy', '')]},
+               {'chapter_id': 2, 'rows': [_row('Ana', 'X1'), _row('Di', 'Y2')]}]
+    with PlateIndex(tmp_path / 'plates.sqlite') as plate_index:
+        assert _plates(results, plate_index) == _plates(results)
+
+
+def test_suffixes_are_stable_across_runs(tmp_path):
+    path = tmp_path / 'plates.sqlite'
+    first = [{'chapter_id': 1, 'rows': [_row('Ana', 'ABC123'), _row('Bo', 'ABC-123')]}]
+    with PlateIndex(path) as plate_index:
+        assert _plates(first, plate_index) == ['ABC123', 'ABC-123_ORD2']
+
+    # Nuevo miembro al inicio: cambian los Order pero no las placas ya asignadas
+    second = [{'chapter_id': 1, 'rows': [_row('Nuevo', 'abc 123'), _row('Ana', 'ABC123'), _row('Bo', 'ABC-123')]}]
+    with PlateIndex(path) as plate_index:
+        assert _plates(second, plate_index) == ['abc 123_ORD1', 'ABC123', 'ABC-123_ORD2']
+        assert plate_index.new_claims == 1
+
+    report = duplicate_report(path)
+    assert [entry['canonical'] for entry in report] == ['ABC123']
+    assert [(owner['owner'], owner['order'], owner['first_run'], owner['last_run']) for owner in report[0]['owners']] \
+        == [('1|ANA|1', 2, 1, 2), ('1|BO|1', 3, 1, 2), ('1|NUEVO|1', 1, 2, 2)]
+
+
+def test_suffix_collision_with_stored_plate_and_rollback(tmp_path):
+    path = tmp_path / 'plates.sqlite'
+    with PlateIndex(path) as plate_index:
+        assert plate_index.assign('Z9', '1|A|1', 1, 1) == 'Z9'
+        assert plate_index.assign('Z9_ORD2', '1|B|1', 1, 2) == 'Z9_ORD2'
+        assert plate_index.assign('Z9', '1|C|1', 1, 2) == 'Z9_ORD2_2'
+
+    plate_index = PlateIndex(path)
+    plate_index.assign('Q1', '1|D|1', 1, 4)
+    plate_index.close(commit=False)
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT COUNT(*) FROM plates WHERE canonical = 'Q1'").fetchone() == (0,)
+    connection.close()
+
+
+def test_seeded_plates_are_kept_for_their_owner(tmp_path):
+    """Placas emitidas fuera del indice (sufijo en memoria) se conservan y no se reasignan"""
+    assert original_plate('XYZ123_ORD7') == original_plate('XYZ123_ORD7_2') == 'XYZ123'
+    with PlateIndex(tmp_path / 'plates.sqlite') as index:
+        assert index.seed('XYZ123_ORD2', '3|LUIS|1', 3, 2)
+        assert index.seed('XYZ123', '1|ANA|1', 1, 1)
+        # Ni el mismo dueño ni otro dueño con la misma placa emitida
+        assert not index.seed('XYZ123', '1|ANA|1', 1, 1) and not index.seed('XYZ123', '5|EVA|1', 5, 9)
+        assert index.assign('XYZ123', '3|LUIS|1', 3, 40) == 'XYZ123_ORD2'
+        assert index.assign('xyz-123', '1|ANA|1', 1, 41) == 'XYZ123'
+    with PlateIndex(tmp_path / 'plates.sqlite') as index:
+        assert index.assign('XYZ123', '3|LUIS|1', 3, 2) == 'XYZ123_ORD2'
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la instrumentacion por etapa de las importaciones
+"""
+
+import argparse
+import json
+import pstats
+
+from chapter_ingest import ingest_chapters
+from run_profiler import RunProfiler, activated, active_profiler, add_profile_arguments, instrumented
+from synthetic_workbook import write_workbook
+
+
+def _args(*argv):
+    parser = argparse.ArgumentParser()
+    add_profile_arguments(parser)
+    return parser.parse_args(list(argv))
+
+
+def test_stage_records_time_rows_and_nested_peak():
+    profiler = RunProfiler()
+    try:
+        with profiler.stage('transform', 'A', rows_in=3) as outer:
+            with profiler.stage('status_normalize', rows_in=3) as inner:
+                data = bytearray(2 * 1024 * 1024)
+                inner.rows_out = 3
+            del data
+            outer.rows_out = 2
+    finally:
+        profiler.close()
+    assert [(record.name, record.depth) for record in profiler.records] == \
+        [('status_normalize', 1), ('transform', 0)]
+    assert inner.peak_bytes >= 2 * 1024 * 1024 and outer.peak_bytes >= inner.peak_bytes
+    assert outer.wall_seconds >= inner.wall_seconds and (outer.rows_in, outer.rows_out) == (3, 2)
+    assert profiler.totals()['transform'] == {'count': 1, 'wall_seconds': outer.wall_seconds,
+                                              'cpu_seconds': outer.cpu_seconds, 'rows_in': 3, 'rows_out': 2,
+                                              'peak_bytes': outer.peak_bytes}
+
+
+def test_disabled_by_default():
+    assert not active_profiler().enabled
+    with active_profiler().stage('emit', rows_in=1) as stage:
+        stage.rows_out = 1
+    assert active_profiler().records == [] and stage.wall_seconds == 0.0
+    with instrumented(_args(), 'run') as profiler:
+        assert profiler is active_profiler() and not profiler.enabled
+
+
+def test_report_and_slowest_profile_dump(tmp_path):
+    report, dump = tmp_path / 'run.json', tmp_path / 'slow.prof'
+    with instrumented(_args('--profile-report', str(report), '--profile-dump', str(dump)), 'prueba') as profiler:
+        assert active_profiler() is profiler
+        with profiler.stage('header_detect'):
+            pass
+        with profiler.stage('emit', rows_in=10) as stage:
+            sum(range(200000))
+            stage.rows_out = 10
+    assert not active_profiler().enabled
+
+    data = json.loads(report.read_text(encoding='utf-8'))
+    assert data['run'] == 'prueba' and [stage['name'] for stage in data['stages']] == ['header_detect', 'emit']
+    assert data['slowest']['name'] == 'emit' and data['totals']['emit']['rows_out'] == 10
+    assert pstats.Stats(str(dump)).total_calls > 0
+
+
+def test_ingest_chapters_records_pipeline_stages(tmp_path):
+    workbook = tmp_path / 'capitulo.xlsx'
+    write_workbook(workbook, 40, seed=3)
+    profiler = RunProfiler(trace_memory=False)
+    with activated(profiler):
+        members, _ = ingest_chapters([(str(workbook), 1, 'SINTETICO')], status_mode='normalize')
+    names = {record.name for record in profiler.records}
+    assert names == {'header_detect', 'open_workbook', 'column_map', 'transform', 'status_normalize', 'plate_dedup'}
+    dedup = next(record for record in profiler.records if record.name == 'plate_dedup')
+    assert dedup.rows_out == len(members)
+    assert {record.label for record in profiler.records if record.depth == 0} == {'SINTETICO', ''}
+    assert next(record for record in profiler.records if record.name == 'status_normalize').depth == 1
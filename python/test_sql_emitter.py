@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la emision de INSERT multi-fila
+"""
+
+import pytest
+
+from sql_emitter import MAX_VALUES_ROWS, batched_inserts, linked_vehicle_inserts
+
+
+def _rows(count):
+    return [(str(i), f"N'Miembro {i}'") for i in range(1, count + 1)]
+
+
+def test_rows_are_split_in_batches():
+    statements, report = batched_inserts('[dbo].[Members]', ('[Order]', '[ Complete Names]'), _rows(5), batch_size=2)
+    assert len(statements) == 3
+    assert statements[0] == ("INSERT INTO [dbo].[Members]\n    ([Order], [ Complete Names])\nVALUES\n"
+                             "    (1, N'Miembro 1'),\n    (2, N'Miembro 2');")
+    assert [rows for rows, _ in report.batches] == [2, 2, 1]
+    assert report.rows == 5 and report.statements == 3
+    assert report.bytes == sum(len(statement.encode('utf-8')) for statement in statements)
+
+
+def test_default_batch_respects_values_limit():
+    statements, report = batched_inserts('[dbo].[Members]', ('[Order]', '[ Complete Names]'), _rows(2500))
+    assert [rows for rows, _ in report.batches] == [MAX_VALUES_ROWS, MAX_VALUES_ROWS, 500]
+
+
+def test_invalid_batch_size_and_row_width():
+    with pytest.raises(ValueError):
+        batched_inserts('[dbo].[Members]', ('[Order]',), [('1',)], batch_size=MAX_VALUES_ROWS + 1)
+    with pytest.raises(ValueError):
+        batched_inserts('[dbo].[Members]', ('[Order]', '[ Complete Names]'), [('1',)])
+
+
+def test_staging_link_resolves_members_with_one_join():
+    columns = (('[Lic Plate]', 'NVARCHAR(50)'), ('[Trike]', 'BIT'))
+    rows = [(7, ("N'ABC'", '1')), (9, ("N'XYZ'", '0'))]
+    statements, report = linked_vehicle_inserts(columns, rows, link='staging')
+    assert statements[1].startswith('CREATE TABLE #VehicleStaging')
+    assert "(1, 7, N'ABC', 1),\n    (2, 9, N'XYZ', 0);" in statements[2]
+    link_sql = statements[3]
+    assert link_sql.count('SELECT') == 2 and 'GROUP BY [Order]' in link_sql and 'ORDER BY s.[Seq]' in link_sql
+    assert statements[-1] == 'DROP TABLE #VehicleStaging;'
+    assert report.rows == 2
+
+
+def test_lookup_link_embeds_member_subquery():
+    statements, _ = linked_vehicle_inserts((('[Trike]', 'BIT'),), [(3, ('1',))], link='lookup')
+    assert '(SELECT TOP 1 [MemberId] FROM [dbo].[Members] WHERE [Order] = 3 ORDER BY [MemberId] DESC), 1)' in statements[0]
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Pruebas del escritor de scripts SQL en streaming
+"""
+
+import gzip
+import hashlib
+import json
+
+import pytest
+
+from sql_writer import SqlScriptWriter, split_bytes
+
+STATEMENTS = [f"INSERT INTO [dbo].[Members] ([Order]) VALUES ({i});" for i in range(1, 201)]
+
+
+def _expected():
+    return 'BEGIN TRY\n' + '\n'.join(STATEMENTS) + '\n\nEND TRY'
+
+
+def _write(writer):
+    with writer as script:
+        script.write('BEGIN TRY\n')
+        assert script.write_statements(STATEMENTS) == len(STATEMENTS)
+        script.write('\n\nEND TRY')
+    return writer
+
+
+def test_plain_output_matches_join(tmp_path):
+    writer = _write(SqlScriptWriter(tmp_path / 'out.sql'))
+    text = (tmp_path / 'out.sql').read_text(encoding='utf-8')
+    assert text == _expected()
+    assert writer.line_count == len(text.splitlines())
+    assert writer.script_path == tmp_path / 'out.sql'
+
+
+def test_append_behaves_like_sql_lines(tmp_path):
+    lines = ['SET NOCOUNT ON;', '', 'BEGIN TRY', '\nDECLARE @x INT;\n', 'END TRY']
+    with SqlScriptWriter(tmp_path / 'out.sql', encoding='utf-8-sig') as script:
+        script.extend(lines)
+    assert (tmp_path / 'out.sql').read_bytes() == '\n'.join(lines).encode('utf-8-sig')
+
+
+def test_gzip_output(tmp_path):
+    writer = _write(SqlScriptWriter(tmp_path / 'out.sql', compress=True))
+    assert writer.script_path == tmp_path / 'out.sql.gz'
+    assert gzip.open(tmp_path / 'out.sql.gz', 'rt', encoding='utf-8').read() == _expected()
+
+
+def test_split_parts_concatenate_to_script(tmp_path):
+    writer = _write(SqlScriptWriter(tmp_path / 'out.sql', part_bytes=1000))
+    manifest = json.loads((tmp_path / 'out.manifest.json').read_text(encoding='utf-8'))
+    parts = [tmp_path / part['path'] for part in manifest['parts']]
+    assert len(parts) > 5 and manifest['bytes'] == len(_expected().encode('utf-8'))
+    texts = [part.read_text(encoding='utf-8') for part in parts]
+    assert ''.join(texts) == _expected()
+    # Cada parte termina en el limite de una sentencia
+    assert all(text.endswith('\n') for text in texts[:-1])
+    assert all(part['bytes'] < 1000 + 100 for part in manifest['parts'])
+    # El script principal es el driver que incluye las partes en orden
+    driver = (tmp_path / 'out.sql').read_text(encoding='utf-8').splitlines()
+    assert [line for line in driver if line.startswith(':r ')] == [f':r {part.name}' for part in parts]
+    assert writer.script_path == tmp_path / 'out.sql'
+
+
+@pytest.mark.parametrize('encoding,compress', [('utf-8-sig', False), ('utf-16', False), ('utf-8-sig', True)])
+def test_manifest_matches_bytes_on_disk(tmp_path, encoding, compress):
+    """bytes y sha256 de cada parte son los del archivo, con su BOM (descomprimido si es gzip)"""
+    writer = _write(SqlScriptWriter(tmp_path / 'out.sql', encoding=encoding, compress=compress, part_bytes=1000))
+    manifest = json.loads((tmp_path / 'out.manifest.json').read_text(encoding='utf-8'))
+    assert len(manifest['parts']) > 1
+    texts = []
+    for part in manifest['parts']:
+        data = (tmp_path / part['path']).read_bytes()
+        if compress:
+            data = gzip.decompress(data)
+        assert part['bytes'] == len(data) and part['sha256'] == hashlib.sha256(data).hexdigest()
+        # Cada parte con su propio BOM; sin el, las partes concatenadas son el script
+        texts.append(data.decode(encoding))
+    assert ''.join(texts) == _expected()
+    assert manifest['bytes'] == writer.bytes_written
+
+
+def test_split_size_validation():
+    assert split_bytes(0) == 0 and split_bytes(1.5) == 1536 * 1024
+    with pytest.raises(ValueError):
+        split_bytes(-1)
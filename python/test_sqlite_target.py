@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Pruebas del destino SQLite para medir la carga de los scripts generados
+"""
+
+import pytest
+
+from bulk_export import write_bulk_load
+from chapter_ingest import MEMBER_COLUMNS, VEHICLE_COLUMNS, bulk_tables, member_values, vehicle_values
+from delta_import import build_snapshot, delta_statements, diff_snapshot
+from sql_emitter import column_names, stream_batched_inserts, stream_linked_vehicle_inserts
+from sqlite_target import (DEFAULT_SCHEMA, LoadError, SqliteTarget, split_statements, translate_schema,
+                           translate_statement)
+
+MEMBERS = [
+    {'chapter_id': 1, 'order': order, 'complete_name': f"Miembro O'{order}", 'dama': 'NO',
+     'country_birth': 'COLOMBIA', 'in_lama_since': 2015, 'status': 'ACTIVE'}
+    for order in range(1, 6)
+]
+VEHICLES = [
+    {'order': order, 'motorcycle_data': f'Moto {order}', 'lic_plate': f'P{order}', 'trike': 'NO',
+     'photography': 'NO', 'starting_odometer': 10.0, 'final_odometer': None}
+    for order in range(1, 6)
+]
+
+
+def _script(tmp_path, statements, name='script.sql'):
+    path = tmp_path / name
+    path.write_text('SET NOCOUNT ON;\nBEGIN TRANSACTION;\nBEGIN TRY\n' + '\n'.join(statements) +
+                    "\nCOMMIT TRANSACTION;\nPRINT 'ok';\nEND TRY\nBEGIN CATCH\n    ROLLBACK TRANSACTION;\nEND CATCH;",
+                    encoding='utf-8-sig')
+    return path
+
+
+def _statements(vehicles=VEHICLES, link='lookup', batch_size=2):
+    members, _ = stream_batched_inserts('[dbo].[Members]', column_names(MEMBER_COLUMNS),
+                                        map(member_values, MEMBERS), batch_size)
+    linked, _ = stream_linked_vehicle_inserts(
+        VEHICLE_COLUMNS, ((vehicle['order'], vehicle_values(vehicle)) for vehicle in vehicles), link, batch_size)
+    return [*members, *linked]
+
+
+def _rows(target):
+    return target.connection.execute(
+        'SELECT m.[Order], m.[ Complete Names], v.[Lic Plate], v.[OdometerUnit] '
+        'FROM [Vehicles] v JOIN [Members] m ON m.[MemberId] = v.[MemberId] ORDER BY v.[VehicleId]').fetchall()
+
+
+def test_splitter_respects_literals_and_comments():
+    text = "-- comentario; no divide\nINSERT INTO t VALUES (N'a;b', 'it''s');\n/* ; */ SELECT [x;y] FROM t;"
+    assert list(split_statements(text)) == ["INSERT INTO t VALUES (N'a;b', 'it''s')", 'SELECT [x;y] FROM t']
+
+
+def test_translation():
+    assert translate_statement("SELECT ISNULL(s.[A], N'') FROM #Staging AS s") == \
+        "SELECT IFNULL(s.[A], '') FROM [#Staging] AS s"
+    assert translate_statement("IF OBJECT_ID('tempdb..#Stg') IS NOT NULL DROP TABLE #Stg") == \
+        'DROP TABLE IF EXISTS [#Stg]'
+    assert translate_statement('(SELECT TOP 1 [MemberId] FROM [dbo].[Members] WHERE [Order] = 3 '
+                               'ORDER BY [MemberId] DESC), 1') == \
+        '(SELECT [MemberId] FROM [Members] WHERE [Order] = 3 ORDER BY [MemberId] DESC LIMIT 1), 1'
+
+
+def test_schema_uses_live_column_names_and_extracts_trigger():
+    statements, triggers = translate_schema(DEFAULT_SCHEMA.read_text(encoding='utf-8'))
+    members = next(statement for statement in statements if statement.startswith('CREATE TABLE [Members]'))
+    assert '[MemberId] INTEGER PRIMARY KEY AUTOINCREMENT' in members and '[ Complete Names]' in members
+    assert [(trigger.name, trigger.table, trigger.events) for trigger in triggers] == \
+        [('tr_MaxTwoActiveVehiclesPerMember', 'Vehicles', ('INSERT', 'UPDATE'))]
+
+
+@pytest.mark.parametrize('link,batch_size', [('lookup', 1), ('lookup', 3), ('staging', 2)])
+def test_generated_modes_load_the_same_rows(tmp_path, link, batch_size):
+    target = SqliteTarget()
+    report = target.run_script(_script(tmp_path, _statements(link=link, batch_size=batch_size)))
+    assert _rows(target) == [(order, f"Miembro O'{order}", f'P{order}', 'Miles') for order in range(1, 6)]
+    assert target.connection.execute('SELECT [CompleteNamesNormalized] FROM [Members] ORDER BY [Order]').fetchall() \
+        == [(f"MIEMBRO O'{order}",) for order in range(1, 6)]
+    assert report.tables['Members'].rows == 5 and report.tables['Vehicles'].rows == 5
+    assert report.trigger_firings == report.tables['Vehicles'].statements
+    assert not target.connection.in_transaction
+
+
+def test_declare_select_variables(tmp_path):
+    statements = _statements(vehicles=[])[:-1] + [
+        'DECLARE @MemberId_2 INT;',
+        'SELECT @MemberId_2 = [MemberId] FROM [dbo].[Members] WHERE [Order] = 2;',
+        "INSERT INTO [dbo].[Vehicles] ([MemberId], [ Motorcycle Data], [Lic Plate])\n"
+        "VALUES (@MemberId_2, N'BMW', N'X1');",
+    ]
+    target = SqliteTarget()
+    report = target.run_script(_script(tmp_path, statements))
+    assert _rows(target) == [(2, "Miembro O'2", 'X1', 'Miles')]
+    assert report.tables['Members (lookup)'].statements == 1
+
+
+def test_constraints_and_trigger_roll_back(tmp_path):
+    duplicate = VEHICLES + [dict(VEHICLES[0], order=2)]
+    target = SqliteTarget()
+    with pytest.raises(LoadError, match='UNIQUE'):
+        target.run_script(_script(tmp_path, _statements(vehicles=duplicate)))
+    assert target.count('Members') == 0
+
+    third = [dict(VEHICLES[0], lic_plate=f'Q{number}') for number in range(3)]
+    with pytest.raises(LoadError, match='tr_MaxTwoActiveVehiclesPerMember'):
+        target.run_script(_script(tmp_path, _statements(vehicles=third, link='staging')))
+    assert target.count('Vehicles') == 0
+
+
+@pytest.mark.parametrize('encoding', ['utf-16', 'utf-8'])
+def test_bulk_driver(tmp_path, encoding):
+    driver = write_bulk_load(str(tmp_path), bulk_tables(MEMBERS, VEHICLES), encoding)
+    target = SqliteTarget()
+    report = target.run_script(driver, {'BulkDir': str(tmp_path)})
+    assert _rows(target) == [(order, f"Miembro O'{order}", f'P{order}', 'Miles') for order in range(1, 6)]
+    assert report.tables['#VehicleBulkStaging'].rows == 5
+
+
+def test_delta_merge(tmp_path):
+    target = SqliteTarget()
+    target.run_script(_script(tmp_path, _statements()))
+    snapshot = build_snapshot(MEMBERS, VEHICLES)
+    members = [dict(member, order=member['order'] - 1) for member in MEMBERS[1:]]
+    members[0]['status'] = 'PROSPECT'
+    vehicles = [dict(vehicle, order=vehicle['order'] - 1) for vehicle in VEHICLES[1:]]
+    members.append(dict(MEMBERS[0], order=5, complete_name='Nuevo'))
+    vehicles.append(dict(VEHICLES[0], order=5, lic_plate='NEW5'))
+    statements = delta_statements(diff_snapshot(snapshot, members, vehicles))
+    target.run_script(_script(tmp_path, statements, 'delta.sql'))
+    assert _rows(target) == [(order, f"Miembro O'{order + 1}", f'P{order + 1}', 'Miles') for order in range(1, 5)] + \
+        [(5, 'Nuevo', 'NEW5', 'Miles')]
+    assert target.connection.execute('SELECT [STATUS] FROM [Members] WHERE [Order] = 1').fetchone() == ('PROSPECT',)
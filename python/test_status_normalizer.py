@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la normalizacion de STATUS (indice por clave, fuzzy acotado y difusion por valor unico)
+"""
+
+import pytest
+
+from status_normalizer import (STATUS_MAPPING, VALID_STATUSES, BKTree, edit_distance, normalize_status,
+                               normalize_status_column, status_key)
+
+
+def _legacy_normalize(val):
+    """Busqueda original: mapping exacto, lista de validos y comparacion en mayusculas"""
+    status_str = str(val).strip()
+    status_str = STATUS_MAPPING.get(status_str, status_str)
+    for valid in VALID_STATUSES:
+        if valid.upper() == status_str.upper():
+            return valid
+    return 'PROSPECT'
+
+
+def test_known_values_match_legacy_lookup():
+    for value in [*VALID_STATUSES, *STATUS_MAPPING, *(status.lower() for status in VALID_STATUSES)]:
+        assert normalize_status(value) == _legacy_normalize(value)
+
+
+@pytest.mark.parametrize('raw,expected', [
+    (' Chapter  Vice-President ', 'CHAPTER VICEPRESIDENT'),
+    ('chapter.secretary', 'CHAPTER SECRETARY'),
+    ('PRÓSPECT', 'PROSPECT'),
+    ('CHAPTER VICE-PRESIDEN', 'CHAPTER VICEPRESIDENT'),
+    ('PROSPCT', 'PROSPECT'),
+    ('NATIONAL PRESIDENTE', 'NATIONAL PRESIDENT'),
+    ('REGIONAL BUSINESS MANAGER', 'REGIONAL BUSSINESS MANAGER'),
+])
+def test_punctuation_insensitive_and_fuzzy(raw, expected):
+    assert normalize_status(raw) == expected
+
+
+def test_unknown_short_and_empty_values_default(capsys):
+    for raw in ('ACTIVE', 'INACTIVE', 'FULL COLOR', 'MTO'):
+        assert normalize_status(raw) == 'PROSPECT'
+    assert normalize_status('') == normalize_status(None) == normalize_status(float('nan')) == 'PROSPECT'
+    assert capsys.readouterr().out.count('[WARN]') == 4
+
+
+def test_bk_tree_matches_linear_scan():
+    keys = sorted({status_key(status) for status in VALID_STATUSES})
+    tree = BKTree(keys)
+    for probe in ('chaptermt', 'nationaltresurer', 'prospecto', 'xyz'):
+        expected = sorted((edit_distance(probe, key), key) for key in keys if edit_distance(probe, key) <= 2)
+        assert tree.search(probe, 2) == expected
+
+
+def test_column_broadcasts_unique_values(capsys):
+    values = ['Chapter Mto', None, 'ACTIVE', 'Chapter Mto', float('nan'), '', 'ACTIVE', 'PROSPCT']
+    assert normalize_status_column(values) == [normalize_status(value) for value in values]
+    capsys.readouterr()
+    normalize_status_column(values)
+    assert capsys.readouterr().out.count('[WARN]') == 1
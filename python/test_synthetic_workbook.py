@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Pruebas del generador de libros sinteticos del template ODOMETER
+"""
+
+from collections import Counter
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from column_resolver import resolve_columns
+from header_detect import find_header_row
+from synthetic_workbook import MAX_ROWS, ODOMETER_HEADERS, write_workbook
+from xlsx_stream import read_sheet_columns
+
+
+@pytest.fixture(scope='module')
+def workbook(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('synthetic') / 'synthetic.xlsx', 2000, seed=3)
+
+
+def test_template_headers_keep_leading_spaces(workbook):
+    assert find_header_row(workbook) == 7
+    data = read_sheet_columns(workbook, 'ODOMETER', header=7)
+    assert tuple(data) == ODOMETER_HEADERS
+    assert {' Complete Names', ' Motorcycle Data', ' Lic Plate'} <= set(data)
+    col_map = resolve_columns(data).col_map()
+    assert col_map['complete_names'] == ' Complete Names' and col_map['lic_plate'] == ' Lic Plate'
+
+
+def test_dirty_data_is_present(workbook):
+    data = read_sheet_columns(workbook, 'ODOMETER', header=7)
+    assert len(data['Order']) == 2000
+    since_types = {type(value) for value in data[' In Lama Since']}
+    assert {int, str, datetime, type(None)} <= since_types
+    plates = Counter(plate for plate in data[' Lic Plate'] if plate)
+    assert any(count > 1 for count in plates.values())
+    assert {'PROSPCT', 'Full Color Member'} & set(data['STATUS'])
+    assert any(name is None for name in data[' Complete Names'])
+
+
+def test_same_seed_same_workbook_and_pandas_compatible(workbook, tmp_path):
+    again = write_workbook(tmp_path / 'again.xlsx', 2000, seed=3)
+    assert read_sheet_columns(again, 'ODOMETER', header=7) == read_sheet_columns(workbook, 'ODOMETER', header=7)
+    df = pd.read_excel(workbook, sheet_name='ODOMETER', header=7)
+    assert list(df.columns) == list(ODOMETER_HEADERS) and len(df) == 2000
+
+
+def test_row_limit(tmp_path):
+    with pytest.raises(ValueError):
+        write_workbook(tmp_path / 'big.xlsx', MAX_ROWS + 1)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Pruebas del extractor de metadatos del libro (validaciones, nombres definidos, VML y cache)
+"""
+
+import io
+import re
+
+import openpyxl
+import pytest
+from openpyxl.comments import Comment
+from openpyxl.workbook.defined_name import DefinedName
+from openpyxl.worksheet.datavalidation import DataValidation
+
+import workbook_metadata
+from parse_cache import ParseCache
+from workbook_metadata import (extract_metadata, find_validations, literal_list, load_metadata, metadata_path,
+                               sheet_metadata)
+
+
+@pytest.fixture
+def validated_workbook(tmp_path):
+    """Libro con listas literal, por rango en otra hoja y por nombre definido, y una nota"""
+    path = tmp_path / '(COL) PRUEBA CORTE NACIONAL.xlsx'
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'ODOMETER'
+    for row in range(1, 30):
+        ws.cell(row, 1, row)
+    lists = wb.create_sheet('Listas')
+    lists.sheet_state = 'hidden'
+    for row, status in enumerate(['PROSPECT', 'CHAPTER MTO', 'FULL COLOR MEMBER'], 1):
+        lists.cell(row, 2, status)
+    for formula, sqref in [('"SI,NO"', 'H9:H200'), ('Listas!$B$1:$B$3', 'G9:G200'), ('=ESTADOS', 'F9')]:
+        validation = DataValidation(type='list', formula1=formula)
+        validation.add(sqref)
+        ws.add_data_validation(validation)
+    validation = DataValidation(type='whole', operator='between', formula1='0', formula2='10')
+    validation.add('A9:A10')
+    ws.add_data_validation(validation)
+    wb.defined_names['ESTADOS'] = DefinedName('ESTADOS', attr_text='Listas!$B$1:$B$2')
+    ws['B2'].comment = Comment('nota', 'autor')
+    wb.save(path)
+    return path
+
+
+def test_extracts_validations_names_and_controls(validated_workbook):
+    metadata = extract_metadata(validated_workbook)
+    assert [(sheet['name'], sheet['state'], sheet['dimension']) for sheet in metadata['sheets']] == \
+        [('ODOMETER', 'visible', 'A1:B29'), ('Listas', 'hidden', 'B1:B3')]
+    odometer = sheet_metadata(metadata, 'ODOMETER')
+    assert [(v['sqref'], v['type'], v['values']) for v in odometer['validations']] == [
+        ('H9:H200', 'list', ['SI', 'NO']),
+        ('G9:G200', 'list', ['PROSPECT', 'CHAPTER MTO', 'FULL COLOR MEMBER']),
+        ('F9', 'list', ['PROSPECT', 'CHAPTER MTO']),
+        ('A9:A10', 'whole', None),
+    ]
+    assert odometer['validations'][3]['formula2'] == '10'
+    assert metadata['defined_names'] == [{'name': 'ESTADOS', 'value': 'Listas!$B$1:$B$2', 'sheet': None,
+                                          'hidden': False}]
+    assert [(c['object_type'], c['row'], c['column']) for c in odometer['controls']] == [('Note', '1', '1')]
+    assert 'xl/worksheets/sheet2.xml' in {part['name'] for part in metadata['parts']}
+
+
+def test_cache_by_content_hash(validated_workbook, tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path / 'cache')
+    first = load_metadata(validated_workbook, cache=cache)
+    assert metadata_path(validated_workbook, cache).exists()
+
+    def fail(path):
+        raise AssertionError('no debe reabrir el libro')
+
+    monkeypatch.setattr(workbook_metadata, 'extract_metadata', fail)
+    assert load_metadata(validated_workbook, cache=cache) == first
+
+
+def test_sheet_data_is_never_parsed(monkeypatch):
+    rows = ''.join(f'<row r="{n}"><c r="A{n}"><v>{n}</v></c></row>' for n in range(1, 200))
+    xml = (f'<worksheet xmlns="{workbook_metadata.NS_MAIN}" '
+           'xmlns:x14="http://schemas.microsoft.com/office/spreadsheetml/2009/9/main" '
+           'xmlns:xm="http://schemas.microsoft.com/office/excel/2006/main">'
+           f'<dimension ref="A1:A199"/><sheetData>{rows}</sheetData>'
+           '<extLst><ext><x14:dataValidations><x14:dataValidation type="list">'
+           '<x14:formula1><xm:f>Listas!$B$1:$B$3</xm:f></x14:formula1><xm:sqref>G9:G20</xm:sqref>'
+           '</x14:dataValidation></x14:dataValidations></ext></extLst></worksheet>').encode('utf-8')
+    # Bloques pequeños: las etiquetas de sheetData quedan partidas entre lecturas
+    monkeypatch.setattr(workbook_metadata, '_CHUNK', 7)
+    stripped = b''.join(workbook_metadata._without_sheet_data(io.BytesIO(xml)))
+    assert stripped == re.sub(rb'<sheetData>.*</sheetData>', b'<sheetData></sheetData>', xml)
+
+    info = workbook_metadata._parse_worksheet(io.BytesIO(xml))
+    assert info['dimension'] == 'A1:A199'
+    assert [(v['sqref'], v['formula1'], v['source']) for v in info['validations']] == \
+        [('G9:G20', 'Listas!$B$1:$B$3', 'x14')]
+
+
+def test_vml_drop_down_control():
+    vml = ('<xml><v:shape id="_x0000_s1025" type="#_x0000_t201"><x:ClientData ObjectType="Drop">'
+           '<x:Anchor>\n 6, 0, 8, 0, 7, 0, 9, 0</x:Anchor><x:FmlaLink>$G$9</x:FmlaLink>'
+           '<x:FmlaRange>Listas!$B$1:$B$3</x:FmlaRange><x:Sel>0</x:Sel></x:ClientData></v:shape><br></xml>')
+    assert workbook_metadata._parse_vml(vml) == [{
+        'shape_id': '_x0000_s1025', 'object_type': 'Drop', 'anchor': '6, 0, 8, 0, 7, 0, 9, 0',
+        'fmla_link': '$G$9', 'fmla_range': 'Listas!$B$1:$B$3', 'selected': '0'}]
+
+
+def test_find_validations_by_sqref_intersection(validated_workbook):
+    metadata = extract_metadata(validated_workbook)
+    assert [v['sqref'] for v in find_validations(metadata, 'G10:G300')] == ['G9:G200']
+    assert [v['sqref'] for v in find_validations(metadata, 'A10:I49', 'ODOMETER')] == \
+        ['H9:H200', 'G9:G200', 'A9:A10']
+    assert [v['sqref'] for v in find_validations(metadata, '$F:$F')] == ['F9']
+    assert find_validations(metadata, 'G201:G300') == find_validations(metadata, 'Listas!B1:B3') == []
+
+
+def test_literal_lists():
+    assert literal_list('"SI, NO,,""X"""') == ['SI', 'NO', '"X"']
+    assert literal_list('Listas!$B$1:$B$3') is None
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Pruebas del lector en streaming: debe coincidir con pd.read_excel en la hoja ODOMETER
+"""
+
+from datetime import datetime
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from xlsx_stream import (XlsxStreamReader, column_index, column_letters, not_empty, parse_range, ranges_intersect,
+                         read_range, read_sheet_columns, sqref_ranges, value_in)
+
+
+@pytest.fixture
+def odometer_workbook(tmp_path):
+    """Libro minimo con el template ODOMETER (encabezado en fila 8, espacios iniciales)"""
+    path = tmp_path / '(COL) PRUEBA CORTE NACIONAL.xlsx'
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'ODOMETER'
+    ws['A1'] = 'L.A.MA. ODOMETER'
+    headers = ['Order', ' Complete Names', None, 'Lic Plate', 'Lic Plate', 'In Lama Since', 'STATUS']
+    for col, header in enumerate(headers, 1):
+        if header:
+            ws.cell(8, col, header)
+    ws.append([1, 'José Pérez', None, 'ABC-123', None, datetime(2019, 3, 1), 'PROSPECT'])
+    ws.cell(11, 1, 2.0)
+    ws.cell(11, 2, "O'Neil")
+    ws.cell(11, 6, 2020)
+    ws.cell(12, 1, 3.5)
+    ws.cell(12, 9, 'fuera')
+    wb.create_sheet('Resumen')['E4'] = 'PROSPECT'
+    wb.save(path)
+    return path
+
+
+def test_read_columns_matches_pandas(odometer_workbook):
+    """Sin filtro de columnas el resultado es identico a pd.read_excel(keep_default_na=False)"""
+    expected = pd.read_excel(odometer_workbook, sheet_name='ODOMETER', header=7,
+                             keep_default_na=False).to_dict('list')
+    assert read_sheet_columns(odometer_workbook, 'ODOMETER', header=7, fill_value='') == expected
+
+
+def test_only_requested_columns_are_returned(odometer_workbook):
+    """Solo se materializan las columnas pedidas, respetando nrows"""
+    data = read_sheet_columns(odometer_workbook, 'ODOMETER', header=7,
+                              columns=[' Complete Names', 'In Lama Since'], nrows=1)
+    assert data == {' Complete Names': ['José Pérez'], 'In Lama Since': [datetime(2019, 3, 1)]}
+
+
+def test_header_names_follow_pandas_conventions(odometer_workbook):
+    """Encabezados vacios y duplicados se nombran igual que pandas"""
+    with XlsxStreamReader(odometer_workbook) as reader:
+        headers = reader.read_header('ODOMETER', header=7)
+        assert reader.sheet_names() == ['ODOMETER', 'Resumen']
+    assert headers[:6] == ['Order', ' Complete Names', 'Unnamed: 2', 'Lic Plate', 'Lic Plate.1', 'In Lama Since']
+
+
+def test_missing_sheet_raises_key_error(odometer_workbook):
+    with XlsxStreamReader(odometer_workbook) as reader:
+        with pytest.raises(KeyError):
+            reader.read_header('NO EXISTE')
+
+
+def test_column_letter_round_trip():
+    for index in (0, 25, 26, 701, 702):
+        assert column_index(column_letters(index)) == index
+
+
+def test_read_range_resolves_sheet_and_pads_gaps(odometer_workbook):
+    """Rango A1 con la hoja en la referencia o por parametro; huecos como None"""
+    assert read_range(odometer_workbook, 'Resumen!$E$3:$E$5') == [[None], ['PROSPECT'], [None]]
+    assert read_range(odometer_workbook, 'A9:B11', 'ODOMETER') == [[1, 'José Pérez'], [None, None], [2, "O'Neil"]]
+    with XlsxStreamReader(odometer_workbook) as reader:
+        assert reader.read_range("'Resumen'!E:E") == [[None], [None], [None], ['PROSPECT']]
+        assert reader.read_range('A1') == [['L.A.MA. ODOMETER']]
+        with pytest.raises(ValueError):
+            reader.read_range('INDIRECT(A1)')
+
+
+def test_sqref_intersection():
+    assert parse_range("='Mi hoja'!$B$2:$B$4") == ('Mi hoja', (1, 3, 1, 1))
+    assert parse_range('$C:$C') == (None, (0, None, 2, 2))
+    assert parse_range('C:5') is None
+    ranges = sqref_ranges('G10:G300 I10:I12 basura')
+    assert ranges == [(9, 299, 6, 6), (9, 11, 8, 8)]
+    assert ranges_intersect(ranges[0], parse_range('A1:G10')[1])
+    assert not ranges_intersect(ranges[1], parse_range('I13:J20')[1])
+    assert ranges_intersect(parse_range('$I:$I')[1], ranges[1])
+    assert not ranges_intersect(parse_range('$H:$H')[1], ranges[1])
+
+
+def test_where_keeps_only_matching_rows(odometer_workbook):
+    """El filtro no deja huecos ni filas en blanco; nrows se cuenta antes de filtrar"""
+    names = read_sheet_columns(odometer_workbook, 'ODOMETER', header=7, columns=['Order'],
+                               where={' Complete Names': not_empty})
+    assert names == {'Order': [1, 2]}
+    status = read_sheet_columns(odometer_workbook, 'ODOMETER', header=7, columns=['Order', 'STATUS'],
+                                where={'STATUS': value_in([' PROSPECT ', 'PROSPECT'])})
+    assert status == {'Order': [1], 'STATUS': ['PROSPECT']}
+    assert read_sheet_columns(odometer_workbook, 'ODOMETER', header=7, columns=['Order'], nrows=2,
+                              where={' Complete Names': not_empty}) == {'Order': [1]}
+    with pytest.raises(KeyError):
+        read_sheet_columns(odometer_workbook, 'ODOMETER', header=7, where={'NO EXISTE': not_empty})
+
+
+def test_where_decodes_only_filter_cells_of_rejected_rows(odometer_workbook, monkeypatch):
+    decoded = []
+    original = XlsxStreamReader._cell_value
+
+    def spy(self, cell):
+        decoded.append(cell.get('r'))
+        return original(self, cell)
+
+    monkeypatch.setattr(XlsxStreamReader, '_cell_value', spy)
+    with XlsxStreamReader(odometer_workbook) as reader:
+        reader.read_header('ODOMETER', header=7)
+        decoded.clear()
+        assert reader.read_columns('ODOMETER', header=7, where={'STATUS': value_in(['ACTIVO'])}) == {
+            name: [] for name in reader.read_header('ODOMETER', header=7)}
+    # Solo la celda STATUS de la unica fila que la tiene; el resto de la hoja no se decodifica
+    assert [ref for ref in decoded if int(ref[1:]) > 8] == ['G9']
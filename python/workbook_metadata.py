@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Metadatos de un libro .xlsx en una sola pasada, cacheados por hash del archivo.
+
+Las herramientas de inspeccion (extract_dropdown_list.py, inspect_validations.py,
+search_all_sheets.py, read_vml.py, list_xlsx_contents.py) necesitan la lista de partes del
+ZIP, las validaciones de datos, los nombres definidos y los controles VML. En vez de que cada
+una abra el ZIP y parsee el XML completo de cada hoja, extract_metadata abre el libro una vez
+y recorre cada parte con un parser incremental al que nunca le llega el contenido de
+<sheetData> (las filas se descartan a nivel de bytes, sin tokenizarlas).
+
+El registro resultante es un dict serializable a JSON:
+  parts           [{name, size, compressed}]
+  sheets          [{name, part, state, dimension, validations, controls}]
+  defined_names   [{name, value, sheet, hidden}]
+Cada validacion de tipo lista trae sus valores resueltos ('values'): la lista literal
+"A,B,C" o las celdas del rango/nombre definido al que apunta (None si no se puede resolver,
+p.ej. INDIRECT).
+
+load_metadata guarda el registro junto al cache de hojas parseadas (parse_cache), con la
+misma llave SHA-256 del contenido: un libro sin cambios se responde sin abrir el ZIP.
+
+Uso:
+  python python/workbook_metadata.py "INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx" [--json] [--no-cache]
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from parse_cache import ParseCache, default_cache, file_digest
+from xlsx_stream import NS_MAIN, NS_PKG_REL, NS_REL, XlsxStreamReader, parse_range, ranges_intersect, sqref_ranges
+
+# Version del formato del registro; un cambio invalida las entradas anteriores
+METADATA_VERSION = 1
+
+NS_X14 = 'http://schemas.microsoft.com/office/spreadsheetml/2009/9/main'
+NS_XM = 'http://schemas.microsoft.com/office/excel/2006/main'
+
+_DATA_VALIDATION = f'{{{NS_MAIN}}}dataValidation'
+_X14_DATA_VALIDATION = f'{{{NS_X14}}}dataValidation'
+_DIMENSION = f'{{{NS_MAIN}}}dimension'
+_LEGACY_DRAWING = f'{{{NS_MAIN}}}legacyDrawing'
+
+_SHEET_DATA_OPEN = re.compile(rb'<(?:[A-Za-z_][\w.-]*:)?sheetData\b[^>]*?(/?)>')
+_SHEET_DATA_CLOSE = re.compile(rb'</(?:[A-Za-z_][\w.-]*:)?sheetData\s*>')
+_CHUNK = 1024 * 1024
+
+# Bloques de forma VML y campos de su x:ClientData (el VML de Excel no siempre es XML valido)
+# (los prefijos v:/x: cambian segun la herramienta que escribio el libro)
+_VML_SHAPE = re.compile(r'<(?:\w+:)?shape\b([^>]*)>(.*?)</(?:\w+:)?shape\s*>', re.DOTALL | re.IGNORECASE)
+_VML_CLIENT_DATA = re.compile(r'<(?:\w+:)?ClientData\b[^>]*ObjectType="([^"]*)"[^>]*>(.*?)</(?:\w+:)?ClientData\s*>',
+                              re.DOTALL | re.IGNORECASE)
+_VML_FIELD = re.compile(r'<(?:\w+:)?(\w+)\s*>(.*?)</(?:\w+:)?\1\s*>', re.DOTALL)
+_VML_ID = re.compile(r'\bid="([^"]*)"')
+_VML_FIELDS = {'Anchor': 'anchor', 'FmlaRange': 'fmla_range', 'FmlaLink': 'fmla_link', 'Sel': 'selected',
+               'DropLines': 'drop_lines', 'Row': 'row', 'Column': 'column'}
+
+
+def _without_sheet_data(stream: BinaryIO) -> Iterator[bytes]:
+    """Bytes de la parte con el contenido de <sheetData> eliminado (se conservan sus etiquetas)"""
+    buffer = b''
+    inside = False
+    for chunk in iter(lambda: stream.read(_CHUNK), b''):
+        buffer += chunk
+        while True:
+            pattern = _SHEET_DATA_CLOSE if inside else _SHEET_DATA_OPEN
+            match = pattern.search(buffer)
+            if match is None:
+                # Conservar una posible etiqueta incompleta para el siguiente bloque
+                cut = buffer.rfind(b'<')
+                cut = len(buffer) if cut == -1 else cut
+                if not inside:
+                    yield buffer[:cut]
+                buffer = buffer[cut:]
+                break
+            if not inside:
+                yield buffer[:match.end()]
+                inside = not match.group(1)
+            else:
+                yield match.group(0)
+                inside = False
+            buffer = buffer[match.end():]
+    if not inside:
+        yield buffer
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _parse_worksheet(stream: BinaryIO) -> Dict[str, Any]:
+    """dimension, validaciones (clasicas y x14) y r:id del dibujo VML de una hoja"""
+    parser = ET.XMLPullParser(events=('end',))
+    info: Dict[str, Any] = {'dimension': None, 'validations': [], 'legacy_drawing': None}
+
+    def drain():
+        for _, elem in parser.read_events():
+            if elem.tag == _DIMENSION:
+                info['dimension'] = elem.get('ref')
+            elif elem.tag == _DATA_VALIDATION:
+                info['validations'].append(_validation(elem, f'{{{NS_MAIN}}}formula1', f'{{{NS_MAIN}}}formula2',
+                                                       elem.get('sqref', ''), 'main'))
+            elif elem.tag == _X14_DATA_VALIDATION:
+                # Excel 2010+: listas que apuntan a otra hoja van en extLst con xm:f / xm:sqref
+                sqref = elem.findtext(f'{{{NS_XM}}}sqref') or ''
+                info['validations'].append(_validation(elem, f'{{{NS_X14}}}formula1/{{{NS_XM}}}f',
+                                                       f'{{{NS_X14}}}formula2/{{{NS_XM}}}f', sqref, 'x14'))
+            elif elem.tag == _LEGACY_DRAWING:
+                info['legacy_drawing'] = elem.get(f'{{{NS_REL}}}id')
+
+    for chunk in _without_sheet_data(stream):
+        parser.feed(chunk)
+        drain()
+    parser.close()
+    drain()
+    return info
+
+
+def _validation(elem: ET.Element, formula1_path: str, formula2_path: str, sqref: str,
+                source: str) -> Dict[str, Any]:
+    attributes = {_local_name(name): value for name, value in elem.attrib.items() if name != 'sqref'}
+    return {
+        'sqref': sqref.strip(),
+        'type': elem.get('type'),
+        'operator': elem.get('operator'),
+        'formula1': elem.findtext(formula1_path),
+        'formula2': elem.findtext(formula2_path),
+        'attributes': attributes,
+        'source': source,
+        'values': None,
+    }
+
+
+def _parse_vml(text: str) -> List[Dict[str, Any]]:
+    """Controles y notas de un dibujo VML (x:ClientData con su ObjectType)"""
+    controls = []
+    for shape_attrs, body in _VML_SHAPE.findall(text):
+        client = _VML_CLIENT_DATA.search(body)
+        if client is None:
+            continue
+        shape_id = _VML_ID.search(shape_attrs)
+        control: Dict[str, Any] = {'shape_id': shape_id.group(1) if shape_id else None,
+                                   'object_type': client.group(1)}
+        for field, value in _VML_FIELD.findall(client.group(2)):
+            if field in _VML_FIELDS:
+                control[_VML_FIELDS[field]] = ' '.join(value.split())
+        controls.append(control)
+    return controls
+
+
+def _rels(reader: XlsxStreamReader, part: str, names: set) -> Dict[str, str]:
+    """Relaciones de una parte: r:id -> ruta interna"""
+    folder, filename = posixpath.split(part)
+    rels_part = posixpath.join(folder, '_rels', filename + '.rels')
+    if rels_part not in names:
+        return {}
+    targets = {}
+    for rel in ET.fromstring(reader.archive.read(rels_part)).iter(f'{{{NS_PKG_REL}}}Relationship'):
+        target = rel.get('Target', '')
+        if rel.get('TargetMode') == 'External':
+            continue
+        targets[rel.get('Id')] = (target.lstrip('/') if target.startswith('/')
+                                  else posixpath.normpath(posixpath.join(folder, target)))
+    return targets
+
+
+def literal_list(formula: str) -> Optional[List[str]]:
+    """Valores de una lista literal '"A,B,C"' (None si la formula no es literal)"""
+    formula = formula.strip()
+    if len(formula) < 2 or not formula.startswith('"') or not formula.endswith('"'):
+        return None
+    return [value.strip() for value in formula[1:-1].replace('""', '"').split(',') if value.strip()]
+
+
+def _resolve_lists(reader: XlsxStreamReader, sheets: List[Dict[str, Any]],
+                   defined_names: List[Dict[str, Any]]) -> None:
+    """Completa 'values' de las validaciones de tipo lista"""
+    names = {}
+    for entry in defined_names:
+        # Los nombres globales no pisan a los locales de la hoja
+        names.setdefault((entry['sheet'], entry['name'].upper()), entry['value'])
+    known_sheets = {sheet['name'] for sheet in sheets}
+    ranges: Dict[Tuple, List[Any]] = {}
+    for sheet in sheets:
+        for validation in sheet['validations']:
+            formula = (validation['formula1'] or '').strip()
+            if validation['type'] != 'list' or not formula:
+                continue
+            literal = literal_list(formula)
+            if literal is not None:
+                validation['values'] = literal
+                continue
+            target = formula.lstrip('=')
+            target = names.get((sheet['name'], target.upper()), names.get((None, target.upper()), target))
+            parsed = parse_range(target)
+            if parsed is None or (parsed[0] or sheet['name']) not in known_sheets:
+                continue
+            reference = (parsed[0] or sheet['name'], parsed[1])
+            if reference not in ranges:
+                grid = reader.read_range(target, sheet['name'])
+                ranges[reference] = [str(value) for row in grid for value in row if value is not None]
+            validation['values'] = ranges[reference]
+
+
+def extract_metadata(path: Union[str, Path]) -> Dict[str, Any]:
+    """Registro de metadatos del libro (una sola apertura del ZIP, sin parsear filas)"""
+    path = Path(path)
+    with XlsxStreamReader(path) as reader:
+        infos = reader.archive.infolist()
+        names = {info.filename for info in infos}
+        parts = [{'name': info.filename, 'size': info.file_size, 'compressed': info.compress_size}
+                 for info in infos]
+
+        workbook = ET.fromstring(reader.archive.read('xl/workbook.xml'))
+        sheet_elems = list(workbook.iter(f'{{{NS_MAIN}}}sheet'))
+        sheet_names = [sheet.get('name') for sheet in sheet_elems]
+        defined_names = []
+        for elem in workbook.iter(f'{{{NS_MAIN}}}definedName'):
+            local = elem.get('localSheetId')
+            defined_names.append({
+                'name': elem.get('name'),
+                'value': (elem.text or '').strip(),
+                'sheet': sheet_names[int(local)] if local is not None and int(local) < len(sheet_names) else None,
+                'hidden': elem.get('hidden') in ('1', 'true'),
+            })
+
+        sheets = []
+        for elem in sheet_elems:
+            name = elem.get('name')
+            try:
+                part = reader.sheet_part(name)
+            except KeyError:
+                continue
+            sheet: Dict[str, Any] = {'name': name, 'part': part, 'state': elem.get('state', 'visible'),
+                                     'dimension': None, 'validations': [], 'controls': []}
+            if part in names:
+                with reader.archive.open(part) as stream:
+                    info = _parse_worksheet(stream)
+                sheet['dimension'] = info['dimension']
+                sheet['validations'] = info['validations']
+                vml_part = _rels(reader, part, names).get(info['legacy_drawing'])
+                if vml_part in names:
+                    text = reader.archive.read(vml_part).decode('utf-8', errors='ignore')
+                    sheet['controls'] = [dict(control, part=vml_part) for control in _parse_vml(text)]
+            sheets.append(sheet)
+
+        _resolve_lists(reader, sheets, defined_names)
+
+    return {'version': METADATA_VERSION, 'file': path.name, 'parts': parts, 'sheets': sheets,
+            'defined_names': defined_names}
+
+
+def metadata_path(path: Union[str, Path], cache: Optional[ParseCache] = None) -> Path:
+    """Entrada del cache para el contenido actual del libro"""
+    cache = cache or default_cache()
+    return cache.cache_dir / f'{file_digest(path)}.meta.json'
+
+
+def load_metadata(path: Union[str, Path], cache: Optional[ParseCache] = None) -> Dict[str, Any]:
+    """Registro de metadatos desde el cache; si no existe (o es de otra version) lo extrae y lo guarda"""
+    cache = cache or default_cache()
+    if not cache.enabled:
+        return extract_metadata(path)
+    entry = metadata_path(path, cache)
+    try:
+        metadata = json.loads(entry.read_text(encoding='utf-8'))
+        if metadata.get('version') == METADATA_VERSION:
+            metadata['file'] = Path(path).name
+            return metadata
+    except (FileNotFoundError, ValueError):
+        pass
+    metadata = extract_metadata(path)
+    cache.cache_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=cache.cache_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, ensure_ascii=False)
+    os.replace(tmp_name, entry)
+    return metadata
+
+
+def sheet_metadata(metadata: Dict[str, Any], sheet_name: Optional[str] = None) -> Dict[str, Any]:
+    """Metadatos de una hoja (la primera si no se indica)"""
+    for sheet in metadata['sheets']:
+        if sheet_name is None or sheet['name'] == sheet_name:
+            return sheet
+    raise KeyError(f"Hoja '{sheet_name}' no encontrada en {metadata['file']}")
+
+
+def find_validations(metadata: Dict[str, Any], ref: str, sheet_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Validaciones cuyo sqref intersecta el rango A1 (hoja de la referencia, sheet_name o la primera)"""
+    parsed = parse_range(ref)
+    if parsed is None:
+        raise ValueError(f'Referencia A1 invalida: {ref}')
+    sheet = sheet_metadata(metadata, parsed[0] or sheet_name)
+    return [validation for validation in sheet['validations']
+            if any(ranges_intersect(parsed[1], cells) for cells in sqref_ranges(validation['sqref']))]
+
+
+def print_summary(metadata: Dict[str, Any]) -> None:
+    print(f"[OK] {metadata['file']}: {len(metadata['parts'])} partes, {len(metadata['sheets'])} hojas, "
+          f"{len(metadata['defined_names'])} nombres definidos")
+    for sheet in metadata['sheets']:
+        state = '' if sheet['state'] == 'visible' else f" ({sheet['state']})"
+        print(f"  {sheet['name']}{state}  {sheet['dimension'] or '-'}  {len(sheet['validations'])} validaciones, "
+              f"{len(sheet['controls'])} controles VML")
+        for validation in sheet['validations']:
+            values = validation['values']
+            detail = f'{len(values)} valores' if values is not None else validation['formula1']
+            print(f"    {validation['sqref']}: {validation['type']} -> {detail}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Metadatos de un libro .xlsx (validaciones, nombres, VML)')
+    parser.add_argument('workbook', help='Libro .xlsx/.xlsm')
+    parser.add_argument('--json', action='store_true', help='Imprimir el registro completo en JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Extraer sin leer ni escribir el cache')
+    args = parser.parse_args()
+
+    if not Path(args.workbook).exists():
+        print(f'[ERROR] No existe el libro {args.workbook}')
+        raise SystemExit(1)
+    metadata = extract_metadata(args.workbook) if args.no_cache else load_metadata(args.workbook)
+    if args.json:
+        print(json.dumps(metadata, ensure_ascii=False, indent=2))
+    else:
+        print_summary(metadata)
+
+
+if __name__ == '__main__':
+    main()
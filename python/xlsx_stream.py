@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+Lector en streaming de hojas XLSX (ODOMETER, DATOS, ...) sin pasar por pd.read_excel.
+
+Abre el .xlsx como ZIP, resuelve sharedStrings.xml una sola vez y recorre
+xl/worksheets/sheetN.xml con un parser incremental (iterparse), liberando cada
+<row> apenas se procesa. Solo se decodifican las columnas solicitadas, asi la
+memoria se mantiene plana sin importar el tamaño del libro.
+
+Semantica compatible con pd.read_excel:
+  - header es el indice 0-based de la fila fisica del encabezado (header=7 -> fila 8)
+  - encabezados vacios -> 'Unnamed: N', duplicados -> 'Nombre.1', 'Nombre.2', ...
+  - filas en blanco intermedias se conservan, las finales se descartan
+  - numeros enteros se devuelven como int, fechas como datetime
+
+read_range lee un rango A1 ('Resumen!E4:E36'): resuelve la hoja por workbook.xml y sus rels,
+no decodifica las filas anteriores al rango y deja de leer al pasar su ultima fila.
+sqref_ranges / ranges_intersect responden que validaciones cubren un rango sin recorrer celdas.
+
+where={'CHAPTER': value_in([...])} filtra filas durante el recorrido: de cada fila se decodifican
+primero solo las columnas del filtro y, si no cumple, el resto de la fila nunca se decodifica ni
+se acumula (el costo de extraer unos capitulos de DATOS es proporcional a las filas que cumplen).
+"""
+
+import re
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+NS_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_DIMENSION = f'{{{NS_MAIN}}}dimension'
+_SHEET_DATA = f'{{{NS_MAIN}}}sheetData'
+_ROW = f'{{{NS_MAIN}}}row'
+_CELL = f'{{{NS_MAIN}}}c'
+_VALUE = f'{{{NS_MAIN}}}v'
+_INLINE = f'{{{NS_MAIN}}}is'
+_TEXT = f'{{{NS_MAIN}}}t'
+_PHONETIC = f'{{{NS_MAIN}}}rPh'
+
+# numFmtId integrados de Excel que representan fechas/horas
+_BUILTIN_DATE_FORMATS = set(range(14, 23)) | set(range(27, 37)) | set(range(45, 48)) | set(range(50, 59))
+_DATE_TOKENS = re.compile(r'[dmyhs]', re.IGNORECASE)
+_FORMAT_NOISE = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.|_.|\*.')
+_CELL_REF = re.compile(r'([A-Z]+)(\d+)')
+# Referencia A1 con hoja opcional: Hoja!$A$1:$A$20, 'Mi hoja'!B2, $C:$C
+_RANGE_REF = re.compile(r"^(?:(?:'((?:[^']|'')+)'|([^'!:]+))!)?"
+                        r"\$?([A-Z]{1,3})\$?(\d*)(?::\$?([A-Z]{1,3})\$?(\d*))?$")
+
+ColumnSelector = Union[None, Sequence[str], Callable[[str], bool]]
+# Predicado por columna (nombre de encabezado -> funcion sobre el valor; None = celda vacia)
+RowFilter = Mapping[str, Callable[[Any], bool]]
+# (fila_min, fila_max | None = hasta el final, col_min, col_max), todo 0-based e inclusivo
+CellRange = Tuple[int, Optional[int], int, int]
+
+
+def column_index(letters: str) -> int:
+    """Convierte letras de columna ('A', 'AB') a indice 0-based"""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - 64)
+    return index - 1
+
+
+def column_letters(index: int) -> str:
+    """Convierte indice 0-based a letras de columna"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def parse_range(ref: str) -> Optional[Tuple[Optional[str], CellRange]]:
+    """(hoja | None, rango) de una referencia A1 ('=Resumen!$E$4:$E$36', 'G10', '$C:$C'); None si no lo es"""
+    match = _RANGE_REF.match(ref.strip().lstrip('='))
+    if match is None:
+        return None
+    quoted, plain, first_col, first_row, last_col, last_row = match.groups()
+    sheet = quoted.replace("''", "'") if quoted else plain
+    if last_col is None:
+        last_col, last_row = first_col, first_row
+    if bool(first_row) != bool(last_row):
+        return None
+    columns = sorted((column_index(first_col), column_index(last_col)))
+    if not first_row:
+        return sheet, (0, None, columns[0], columns[1])
+    rows = sorted((int(first_row) - 1, int(last_row) - 1))
+    return sheet, (rows[0], rows[1], columns[0], columns[1])
+
+
+def sqref_ranges(sqref: str) -> List[CellRange]:
+    """Rangos de un sqref de validacion ('G10:G300 I10:I300'); se ignoran las partes invalidas"""
+    ranges = []
+    for part in sqref.split():
+        parsed = parse_range(part)
+        if parsed is not None:
+            ranges.append(parsed[1])
+    return ranges
+
+
+def ranges_intersect(a: CellRange, b: CellRange) -> bool:
+    """Indica si dos rangos comparten al menos una celda"""
+    a_first, a_last, a_left, a_right = a
+    b_first, b_last, b_left, b_right = b
+    if a_left > b_right or b_left > a_right:
+        return False
+    return (a_last is None or b_first <= a_last) and (b_last is None or a_first <= b_last)
+
+
+def value_in(values: Iterable[Any], strip: bool = True) -> Callable[[Any], bool]:
+    """Predicado 'valor en values' para where; con strip compara el texto sin espacios en los extremos"""
+    accepted = set(values)
+
+    def predicate(value: Any) -> bool:
+        if strip and isinstance(value, str):
+            value = value.strip()
+        return value in accepted
+
+    return predicate
+
+
+def not_empty(value: Any) -> bool:
+    """Predicado 'celda con valor' para where (equivale a notna)"""
+    return value is not None
+
+
+def _is_date_format(format_code: str) -> bool:
+    """Indica si un formato numerico personalizado corresponde a fecha/hora"""
+    cleaned = _FORMAT_NOISE.sub('', format_code.split(';')[0])
+    return bool(_DATE_TOKENS.search(cleaned))
+
+
+def dedupe_headers(raw_headers: Sequence[Any]) -> List[Any]:
+    """Nombra encabezados igual que pandas: vacios -> 'Unnamed: N', duplicados -> '.1'"""
+    headers = []
+    seen: Dict[Any, int] = {}
+    for index, value in enumerate(raw_headers):
+        name = value if value is not None and value != '' else f'Unnamed: {index}'
+        if name in seen:
+            count = seen[name]
+            candidate = f'{name}.{count}'
+            while candidate in seen:
+                count += 1
+                candidate = f'{name}.{count}'
+            seen[name] = count + 1
+            seen[candidate] = 1
+            name = candidate
+        else:
+            seen[name] = 1
+        headers.append(name)
+    return headers
+
+
+class XlsxStreamReader:
+    """Lee hojas de un .xlsx/.xlsm en streaming, resolviendo sharedStrings una sola vez"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path)
+        self._sheets: Optional[Dict[str, str]] = None
+        self._shared_strings: Optional[List[str]] = None
+        self._date_styles: Optional[set] = None
+        self._epoch = datetime(1899, 12, 30)
+
+    def __enter__(self) -> 'XlsxStreamReader':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    @property
+    def archive(self) -> zipfile.ZipFile:
+        """ZIP abierto del libro, para leer otras partes sin reabrirlo"""
+        return self._zip
+
+    # ------------------------------------------------------------------
+    # Metadatos del libro
+    # ------------------------------------------------------------------
+
+    def sheet_names(self) -> List[str]:
+        """Nombres de hojas en el orden del libro"""
+        return list(self._sheet_parts())
+
+    def sheet_part(self, sheet_name: str) -> str:
+        """Ruta interna del XML de la hoja (p.ej. 'xl/worksheets/sheet1.xml')"""
+        parts = self._sheet_parts()
+        if sheet_name not in parts:
+            raise KeyError(f"Hoja '{sheet_name}' no encontrada en {self.path.name}")
+        return parts[sheet_name]
+
+    def _sheet_parts(self) -> Dict[str, str]:
+        if self._sheets is None:
+            rels = ET.fromstring(self._zip.read('xl/_rels/workbook.xml.rels'))
+            targets = {}
+            for rel in rels.iter(f'{{{NS_PKG_REL}}}Relationship'):
+                target = rel.get('Target', '')
+                if target.startswith('/'):
+                    target = target.lstrip('/')
+                else:
+                    target = posixpath.normpath(posixpath.join('xl', target))
+                targets[rel.get('Id')] = target
+
+            workbook = ET.fromstring(self._zip.read('xl/workbook.xml'))
+            properties = workbook.find(f'{{{NS_MAIN}}}workbookPr')
+            if properties is not None and properties.get('date1904') in ('1', 'true'):
+                self._epoch = datetime(1904, 1, 1)
+
+            self._sheets = {}
+            for sheet in workbook.iter(f'{{{NS_MAIN}}}sheet'):
+                rel_id = sheet.get(f'{{{NS_REL}}}id')
+                if rel_id in targets:
+                    self._sheets[sheet.get('name')] = targets[rel_id]
+        return self._sheets
+
+    def shared_strings(self) -> List[str]:
+        """Tabla de sharedStrings, cargada una sola vez por libro"""
+        if self._shared_strings is None:
+            self._shared_strings = []
+            if 'xl/sharedStrings.xml' in self._zip.namelist():
+                with self._zip.open('xl/sharedStrings.xml') as stream:
+                    for _, elem in ET.iterparse(stream, events=('end',)):
+                        if elem.tag == f'{{{NS_MAIN}}}si':
+                            self._shared_strings.append(self._rich_text(elem))
+                            elem.clear()
+        return self._shared_strings
+
+    def _date_style_indexes(self) -> set:
+        """Indices de cellXfs cuyo formato numerico es fecha/hora"""
+        if self._date_styles is None:
+            self._date_styles = set()
+            if 'xl/styles.xml' in self._zip.namelist():
+                styles = ET.fromstring(self._zip.read('xl/styles.xml'))
+                custom_dates = set()
+                num_fmts = styles.find(f'{{{NS_MAIN}}}numFmts')
+                if num_fmts is not None:
+                    for fmt in num_fmts:
+                        if _is_date_format(fmt.get('formatCode', '')):
+                            custom_dates.add(int(fmt.get('numFmtId')))
+                cell_xfs = styles.find(f'{{{NS_MAIN}}}cellXfs')
+                if cell_xfs is not None:
+                    for index, xf in enumerate(cell_xfs):
+                        fmt_id = int(xf.get('numFmtId', 0))
+                        if fmt_id in _BUILTIN_DATE_FORMATS or fmt_id in custom_dates:
+                            self._date_styles.add(index)
+        return self._date_styles
+
+    @staticmethod
+    def _rich_text(elem: ET.Element) -> str:
+        """Concatena los <t> de un <si>/<is>, ignorando textos foneticos"""
+        parts = []
+        for child in elem:
+            if child.tag == _TEXT:
+                parts.append(child.text or '')
+            elif child.tag != _PHONETIC:
+                for run_text in child.iter(_TEXT):
+                    parts.append(run_text.text or '')
+        return ''.join(parts)
+
+    # ------------------------------------------------------------------
+    # Lectura de celdas
+    # ------------------------------------------------------------------
+
+    def _cell_value(self, cell: ET.Element) -> Any:
+        """Decodifica una celda <c> a su valor Python tipado"""
+        cell_type = cell.get('t', 'n')
+        if cell_type == 'inlineStr':
+            inline = cell.find(_INLINE)
+            return self._rich_text(inline) if inline is not None else None
+
+        raw = cell.findtext(_VALUE)
+        if raw is None:
+            return None
+        if cell_type == 's':
+            return self.shared_strings()[int(raw)]
+        if cell_type in ('str', 'd'):
+            return raw
+        if cell_type == 'b':
+            return raw == '1'
+        if cell_type == 'e':
+            return None
+
+        number = float(raw) if ('.' in raw or 'E' in raw or 'e' in raw) else int(raw)
+        style = cell.get('s')
+        if style is not None and int(style) in self._date_style_indexes():
+            return self._epoch + timedelta(days=float(number))
+        if isinstance(number, float) and number.is_integer():
+            return int(number)
+        return number
+
+    def iter_raw_rows(self, sheet_name: str, wanted: Optional[Callable[[int], bool]] = None,
+                      first_row: int = 0, where: Optional[Mapping[int, Callable[[Any], bool]]] = None
+                      ) -> Iterator[Tuple[int, Dict[int, Any]]]:
+        """
+        Recorre la hoja con iterparse y produce (indice_fila_0based, {columna: valor}).
+        Solo decodifica las celdas cuyo indice de columna acepte `wanted`, y ninguna de las
+        filas anteriores a first_row.
+        where: {columna: predicado}; las filas que no cumplen todos los predicados se descartan
+        decodificando solo las columnas del filtro.
+        Las filas sin celdas no se emiten (el llamador decide como tratar huecos).
+        """
+        part = self.sheet_part(sheet_name)
+        next_row = 0
+        sheet_data = None
+        with self._zip.open(part) as stream:
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == _SHEET_DATA:
+                        sheet_data = elem
+                    continue
+                if elem.tag != _ROW:
+                    continue
+                row_attr = elem.get('r')
+                row_index = int(row_attr) - 1 if row_attr else next_row
+                next_row = row_index + 1
+                if row_index < first_row:
+                    if sheet_data is not None:
+                        sheet_data.clear()
+                    continue
+
+                cells = []
+                next_col = 0
+                for cell in elem.iter(_CELL):
+                    ref = cell.get('r')
+                    if ref:
+                        match = _CELL_REF.match(ref)
+                        col = column_index(match.group(1))
+                    else:
+                        col = next_col
+                    next_col = col + 1
+                    cells.append((col, cell))
+
+                checked: Dict[int, Any] = {}
+                if where is not None and not self._row_matches(dict(cells), where, checked):
+                    if sheet_data is not None:
+                        sheet_data.clear()
+                    continue
+
+                values: Dict[int, Any] = {}
+                has_data = False
+                for col, cell in cells:
+                    if wanted is not None and not wanted(col):
+                        # No se decodifica, pero se registra que la fila no esta vacia
+                        if not has_data and (cell.find(_VALUE) is not None or cell.find(_INLINE) is not None):
+                            has_data = True
+                        continue
+                    value = checked[col] if col in checked else self._cell_value(cell)
+                    if value is not None and value != '':
+                        values[col] = value
+                        has_data = True
+
+                # Soltar la fila ya procesada para mantener la memoria plana
+                if sheet_data is not None:
+                    sheet_data.clear()
+                if has_data:
+                    yield row_index, values
+
+    def _row_matches(self, cells: Dict[int, ET.Element], where: Mapping[int, Callable[[Any], bool]],
+                     checked: Dict[int, Any]) -> bool:
+        """Evalua los predicados decodificando solo sus columnas (quedan en checked)"""
+        for col, predicate in where.items():
+            cell = cells.get(col)
+            value = self._cell_value(cell) if cell is not None else None
+            if value == '':
+                value = None
+            if not predicate(value):
+                return False
+            checked[col] = value
+        return True
+
+    def read_range(self, ref: str, sheet_name: Optional[str] = None) -> List[List[Any]]:
+        """
+        Valores de un rango A1 como filas x columnas (None en celdas vacias). La hoja sale de la
+        referencia ('Resumen!E4:E36') o de sheet_name; por defecto, la primera del libro.
+        Un rango de columnas completas ('$C:$C') termina en la ultima fila con datos.
+        """
+        parsed = parse_range(ref)
+        if parsed is None:
+            raise ValueError(f'Referencia A1 invalida: {ref}')
+        sheet, (first_row, last_row, first_col, last_col) = parsed
+        sheet = sheet or sheet_name or self.sheet_names()[0]
+        width = last_col - first_col + 1
+        rows: List[List[Any]] = []
+        wanted = range(first_col, last_col + 1)
+        for row_index, values in self.iter_raw_rows(sheet, wanted=wanted.__contains__, first_row=first_row):
+            if last_row is not None and row_index > last_row:
+                break
+            # Filas sin celdas dentro del rango
+            rows.extend([None] * width for _ in range(row_index - first_row - len(rows)))
+            rows.append([values.get(col) for col in wanted])
+        if last_row is not None:
+            rows.extend([None] * width for _ in range(last_row - first_row + 1 - len(rows)))
+        else:
+            while rows and all(value is None for value in rows[-1]):
+                rows.pop()
+        return rows
+
+    def sheet_width(self, sheet_name: str) -> int:
+        """Ancho declarado en <dimension ref='A1:H12'> (0 si la hoja no lo declara)"""
+        with self._zip.open(self.sheet_part(sheet_name)) as stream:
+            for _, elem in ET.iterparse(stream, events=('start',)):
+                if elem.tag == _DIMENSION:
+                    last_ref = elem.get('ref', '').split(':')[-1]
+                    match = _CELL_REF.match(last_ref)
+                    return column_index(match.group(1)) + 1 if match else 0
+                if elem.tag == _SHEET_DATA:
+                    break
+        return 0
+
+    def read_header(self, sheet_name: str, header: int = 7) -> List[Any]:
+        """Lee solo hasta la fila de encabezado y retorna los nombres estilo pandas"""
+        for row_index, values in self.iter_raw_rows(sheet_name):
+            if row_index < header:
+                continue
+            if row_index > header or not values:
+                break
+            width = max(max(values) + 1, self.sheet_width(sheet_name))
+            return dedupe_headers([values.get(i) for i in range(width)])
+        return []
+
+    def iter_rows(self, sheet_name: str, header: int = 7, columns: ColumnSelector = None,
+                  nrows: Optional[int] = None, fill_value: Any = None,
+                  where: Optional[RowFilter] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Produce un dict por fila de datos con solo las columnas solicitadas.
+
+        columns: lista de nombres de encabezado, predicado sobre el nombre, o None (todas).
+        nrows: maximo de filas de datos (cuenta filas en blanco intermedias, como pandas).
+        fill_value: valor para celdas vacias (None ~ NaN, '' ~ keep_default_na=False).
+        where: {encabezado: predicado sobre el valor}; solo se producen las filas que cumplen
+        todos (las filas en blanco nunca). nrows se cuenta antes de filtrar.
+        """
+        headers = self.read_header(sheet_name, header)
+        selected = self._select_columns(headers, columns)
+        wanted_cols = {index for index, _ in selected}
+        predicates = self._row_filter(headers, where)
+        for _, values in self._iter_data_rows(sheet_name, header, wanted_cols, nrows, predicates):
+            yield {name: values.get(index, fill_value) for index, name in selected}
+
+    def read_columns(self, sheet_name: str, header: int = 7, columns: ColumnSelector = None,
+                     nrows: Optional[int] = None, fill_value: Any = None,
+                     where: Optional[RowFilter] = None) -> Dict[str, List[Any]]:
+        """Igual que iter_rows pero acumulando en lotes por columna {nombre: [valores]}"""
+        headers = self.read_header(sheet_name, header)
+        selected = self._select_columns(headers, columns)
+        wanted_cols = {index for index, _ in selected}
+        predicates = self._row_filter(headers, where)
+        batches: Dict[str, List[Any]] = {name: [] for _, name in selected}
+        for _, values in self._iter_data_rows(sheet_name, header, wanted_cols, nrows, predicates):
+            for index, name in selected:
+                batches[name].append(values.get(index, fill_value))
+        return batches
+
+    @staticmethod
+    def _select_columns(headers: List[Any], columns: ColumnSelector) -> List[Tuple[int, Any]]:
+        if columns is None:
+            return list(enumerate(headers))
+        if callable(columns):
+            return [(i, name) for i, name in enumerate(headers) if columns(name)]
+        missing = [name for name in columns if name not in headers]
+        if missing:
+            raise KeyError(f'Columnas no encontradas en el encabezado: {missing}')
+        positions = {name: i for i, name in enumerate(headers)}
+        return [(positions[name], name) for name in columns]
+
+    @staticmethod
+    def _row_filter(headers: List[Any], where: Optional[RowFilter]) -> Optional[Dict[int, Callable[[Any], bool]]]:
+        if where is None:
+            return None
+        missing = [name for name in where if name not in headers]
+        if missing:
+            raise KeyError(f'Columnas del filtro no encontradas en el encabezado: {missing}')
+        positions = {name: i for i, name in enumerate(headers)}
+        return {positions[name]: predicate for name, predicate in where.items()}
+
+    def _iter_data_rows(self, sheet_name: str, header: int, wanted_cols: set, nrows: Optional[int],
+                        where: Optional[Mapping[int, Callable[[Any], bool]]] = None
+                        ) -> Iterator[Tuple[int, Dict[int, Any]]]:
+        """Filas de datos posteriores al encabezado, rellenando huecos intermedios (sin filtro)"""
+        last_index = header
+        limit = header + nrows if nrows is not None else None
+        # El filtro no se aplica a las filas del titulo ni al encabezado
+        rows = self.iter_raw_rows(sheet_name, wanted=wanted_cols.__contains__, first_row=header + 1, where=where)
+        for row_index, values in rows:
+            if limit is not None and row_index > limit:
+                break
+            if where is not None:
+                yield row_index, values
+                continue
+            # Filas en blanco intermedias: pandas las conserva como NaN
+            for gap_index in range(last_index + 1, row_index):
+                yield gap_index, {}
+            yield row_index, values
+            last_index = row_index
+
+
+def read_sheet_columns(path: Union[str, Path], sheet_name: str = 'ODOMETER', header: int = 7,
+                       columns: ColumnSelector = None, nrows: Optional[int] = None,
+                       fill_value: Any = None, where: Optional[RowFilter] = None) -> Dict[str, List[Any]]:
+    """Atajo: abre el libro, lee las columnas pedidas (de las filas que cumplen where) y lo cierra"""
+    with XlsxStreamReader(path) as reader:
+        return reader.read_columns(sheet_name, header=header, columns=columns,
+                                   nrows=nrows, fill_value=fill_value, where=where)
+
+
+def read_range(path: Union[str, Path], ref: str, sheet_name: Optional[str] = None) -> List[List[Any]]:
+    """Atajo: abre el libro, lee el rango A1 y lo cierra"""
+    with XlsxStreamReader(path) as reader:
+        return reader.read_range(ref, sheet_name)
+
+
+def read_sheet_frame(path: Union[str, Path], sheet_name: str = 'ODOMETER', header: int = 7,
+                     columns: ColumnSelector = None, nrows: Optional[int] = None,
+                     fill_value: Any = None, where: Optional[RowFilter] = None):
+    """Reemplazo directo de pd.read_excel(..., sheet_name, header, nrows) basado en streaming"""
+    import pandas as pd
+
+    data = read_sheet_columns(path, sheet_name, header=header, columns=columns,
+                              nrows=nrows, fill_value=fill_value, where=where)
+    return pd.DataFrame(data, columns=list(data))
@@ -6,6 +6,11 @@ Validar espacios iniciales y caracteres especiales
 import pandas as pd
 import os
 import sys
+from pathlib import Path
+
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from header_detect import find_header_row
 
 # Cambiar a directorio INSUMOS
 os.chdir(r"c:\Users\DanielVillamizar\COR L.A.MA\INSUMOS")
@@ -24,7 +29,7 @@ print("=" * 80)
 
 file_path = "(COL) PEREIRA CORTE NACIONAL.xlsx"
 sheet = "ODOMETER"
-header_row = 6  # header=6 significa row 7 (0-indexed)
+header_row = find_header_row(file_path, sheet)  # indice 0-based detectado (no fijo)
 
 try:
     # Leer con pandas
@@ -32,7 +37,7 @@ try:
     
     print(f"\n📄 Archivo: {file_path}")
     print(f"📊 Sheet: {sheet}")
-    print(f"📍 Header Row: 7 (fila visible, index=6)")
+    print(f"📍 Header Row: {header_row + 1} (fila visible, index={header_row})")
     print(f"📈 Total columnas: {len(df.columns)}")
     print(f"📊 Total filas datos: {len(df)}")
     
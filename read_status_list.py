@@ -1,46 +1,45 @@
-import win32com.client
+import sys
 from pathlib import Path
 
-file_path = Path('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx').absolute()
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from xlsx_stream import XlsxStreamReader
+
+file_path = Path('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx')
 
 print("=" * 70)
 print("LEYENDO LISTA DE VALORES DESDE LA HOJA 'RESUMEN'")
 print("=" * 70)
 
 try:
-    # Crear instancia de Excel
-    excel = win32com.client.Dispatch("Excel.Application")
-    excel.Visible = False
-    
-    # Abrir archivo
+    # Leer el XML del libro directamente (sin Excel): solo las filas del rango
     print(f'\nAbriendo: {file_path}')
-    wb = excel.Workbooks.Open(str(file_path))
-    
-    # Buscar hoja "Resumen"
-    print('\nBuscando hoja "Resumen"...')
-    
-    # Listar todas las hojas
-    print(f'Hojas disponibles:')
-    for i in range(1, wb.Sheets.Count + 1):
-        sheet_name = wb.Sheets(i).Name
-        print(f'  {i}. {sheet_name}')
-    
-    # Obtener la hoja Resumen
-    try:
-        ws_resumen = wb.Sheets("Resumen")
-        print(f'\n✓ Hoja "Resumen" encontrada')
-    except:
-        ws_resumen = wb.Sheets(3)  # Tercera hoja (sheet3.xml)
-        print(f'\n✓ Usando tercera hoja: {ws_resumen.Name}')
-    
-    # Leer rango E4:E36
-    print('\nLeyendo rango E4:E36 (lista de valores de STATUS):')
-    print("-" * 70)
+    with XlsxStreamReader(file_path) as reader:
+        # Buscar hoja "Resumen"
+        print('\nBuscando hoja "Resumen"...')
+        
+        # Listar todas las hojas
+        print(f'Hojas disponibles:')
+        sheet_names = reader.sheet_names()
+        for i, sheet_name in enumerate(sheet_names, 1):
+            print(f'  {i}. {sheet_name}')
+        
+        # Obtener la hoja Resumen
+        if 'Resumen' in sheet_names:
+            resumen = 'Resumen'
+            print(f'\n✓ Hoja "Resumen" encontrada')
+        else:
+            resumen = sheet_names[2]  # Tercera hoja (sheet3.xml)
+            print(f'\n✓ Usando tercera hoja: {resumen}')
+        
+        # Leer rango E4:E36
+        print('\nLeyendo rango E4:E36 (lista de valores de STATUS):')
+        print("-" * 70)
+        
+        cells = reader.read_range('E4:E36', resumen)
     
     values = []
-    for row in range(4, 37):
-        cell_value = ws_resumen.Cells(row, 5).Value  # Columna E = 5
-        
+    for row, (cell_value,) in enumerate(cells, 4):
         if cell_value is not None:
             # Limpiar valor
             cell_str = str(cell_value).strip()
@@ -56,8 +55,6 @@ try:
     for i, val in enumerate(values, 1):
         print(f'{i:2d}. {val}')
     
-    wb.Close(False)
-    excel.Quit()
     print('\n✓ Completado')
     
 except Exception as e:
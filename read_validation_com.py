@@ -1,48 +1,45 @@
-import win32com.client
+import sys
 from pathlib import Path
 
-file_path = Path('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx').absolute()
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from workbook_metadata import find_validations, load_metadata, sheet_metadata
+
+file_path = Path('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx')
 
 print("=" * 70)
-print("EXTRAYENDO LISTA DESPLEGABLE CON COM EXCEL")
+print("EXTRAYENDO LISTA DESPLEGABLE (VALIDACIONES DEL XML, SIN EXCEL)")
 print("=" * 70)
 
 try:
-    # Crear instancia de Excel
-    excel = win32com.client.Dispatch("Excel.Application")
-    excel.Visible = False
-    
-    # Abrir archivo
+    # Metadatos del libro (validaciones con la lista ya resuelta, cache por hash)
     print(f'\nAbriendo: {file_path}')
-    wb = excel.Workbooks.Open(str(file_path))
+    metadata = load_metadata(file_path)
     
     # Primera hoja
-    ws = wb.Sheets(1)
+    ws = sheet_metadata(metadata)['name']
     
     # Obtener validaciones de columna G (STATUS)
     print('\nBuscando validación en columna G (STATUS)...\n')
     
-    # Verificar cada celda G10:G300
-    target_range = ws.Range("G10:G300")
-    dv = target_range.Validation
+    # Validaciones cuyo sqref intersecta G10:G300 (sin recorrer celda por celda)
+    validations = find_validations(metadata, 'G10:G300', ws)
     
-    if dv:
-        print(f'Validación encontrada en G10:G300:')
-        print(f'  Tipo: {dv.Type}')  # xlValidateList, xlValidateWholeNumber, etc
-        
-        # Type 3 = xlValidateList
-        if dv.Type == 3:
-            print(f'  Fórmula1: {dv.Formula1}')
+    if validations:
+        for dv in validations:
+            print(f"Validación encontrada en G10:G300 (sqref {dv['sqref']}):")
+            print(f"  Tipo: {dv['type']}")
             
-            # Si es una lista separada por comas
-            if dv.Formula1:
-                values = dv.Formula1.split(',')
-                print(f'\n  LISTA DESPLEGABLE ({len(values)} valores):')
-                for i, val in enumerate(values, 1):
-                    clean_val = val.strip().strip('"').strip("'")
-                    print(f'    {i:2d}. {clean_val}')
-        else:
-            print(f'  [Tipo de validación: {dv.Type}]')
+            if dv['type'] == 'list':
+                print(f"  Fórmula1: {dv['formula1']}")
+                
+                # Lista literal o rango/nombre definido ya resuelto
+                if dv['values'] is not None:
+                    print(f"\n  LISTA DESPLEGABLE ({len(dv['values'])} valores):")
+                    for i, val in enumerate(dv['values'], 1):
+                        print(f'    {i:2d}. {val}')
+            else:
+                print(f"  [Tipo de validación: {dv['type']}]")
     else:
         print('No se encontró validación en G10:G300')
     
@@ -51,18 +48,12 @@ try:
     print('BUSCANDO TODAS LAS VALIDACIONES EN LA HOJA')
     print("=" * 70)
     
-    for row in range(10, 50):  # Primeras 40 filas
-        for col in range(1, 10):  # Primeras 9 columnas
-            cell = ws.Cells(row, col)
-            dv = cell.Validation
-            
-            if dv and dv.Type == 3:  # List type
-                col_letter = chr(64 + col)
-                print(f'\nValidación lista en {col_letter}{row}:')
-                print(f'  Fórmula: {dv.Formula1[:100]}...')
+    # Primeras 40 filas, primeras 9 columnas
+    for dv in find_validations(metadata, 'A10:I49', ws):
+        if dv['type'] == 'list':
+            print(f"\nValidación lista en {dv['sqref']}:")
+            print(f"  Fórmula: {(dv['formula1'] or '')[:100]}...")
     
-    wb.Close(False)
-    excel.Quit()
     print('\n✓ Completado')
     
 except Exception as e:
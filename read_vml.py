@@ -1,52 +1,40 @@
-import zipfile
+import sys
 from pathlib import Path
 
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from workbook_metadata import load_metadata
+
 file_path = Path('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx')
 
 print("=" * 70)
 print("BUSCANDO LISTAS DESPLEGABLES EN ARCHIVOS VML")
 print("=" * 70)
 
-with zipfile.ZipFile(file_path) as zip_file:
-    # VML files pueden contener comentarios y validaciones
-    vml_files = [f for f in zip_file.namelist() if f.endswith('.vml')]
+metadata = load_metadata(file_path)
+
+# VML files pueden contener comentarios y controles de formulario (combobox = ObjectType "Drop")
+vml_files = [part['name'] for part in metadata['parts'] if part['name'].endswith('.vml')]
+print(f'\nArchivos VML encontrados: {len(vml_files)}\n')
+
+for sheet in metadata['sheets']:
+    if not sheet['controls']:
+        continue
+    print(f"Hoja: {sheet['name']} ({sheet['controls'][0]['part']})")
+    print("-" * 70)
     
-    print(f'\nArchivos VML encontrados: {len(vml_files)}\n')
+    for control in sheet['controls']:
+        print(f"  {control['object_type']} {control['shape_id'] or ''}")
+        # Lista desplegable: rango con los valores y celda vinculada
+        if control.get('fmla_range'):
+            print(f"    Rango de valores: {control['fmla_range']}")
+        if control.get('fmla_link'):
+            print(f"    Celda vinculada: {control['fmla_link']}")
+        if control.get('row') is not None:
+            print(f"    Celda: fila {int(control['row']) + 1}, columna {int(control['column']) + 1}")
+        elif control.get('anchor'):
+            print(f"    Anchor: {control['anchor']}")
     
-    for vml_file in vml_files:
-        print(f'Leyendo: {vml_file}')
-        print("-" * 70)
-        
-        try:
-            vml_content = zip_file.read(vml_file).decode('utf-8', errors='ignore')
-            
-            # Buscar listas desplegables (combobox, lista, etc)
-            # Las validaciones en VML están entre etiquetas <v:comment> o <o:data>
-            
-            if 'combolist' in vml_content.lower() or 'combo' in vml_content.lower():
-                print('Encontrado combolist')
-                # Buscar patrones
-                import re
-                combos = re.findall(r'<o:combolist>(.*?)</o:combolist>', vml_content, re.DOTALL | re.IGNORECASE)
-                for combo in combos:
-                    print(f'  {combo}')
-            
-            if 'data type' in vml_content.lower() or 'validation' in vml_content.lower():
-                print('Encontrada mención a validación')
-                # Extraer contexto
-                import re
-                matches = re.finditer(r'(<.*?(?:validation|combolist|list|data type).*?>.*?<.*?>)', vml_content, re.IGNORECASE)
-                for match in list(matches)[:5]:
-                    print(f'  {match.group(0)[:200]}')
-            
-            # Mostrar primeras 2000 caracteres para inspeccionar
-            if vml_content.strip():
-                print('\nPrimeros 1500 caracteres:')
-                print(vml_content[:1500])
-        
-        except Exception as e:
-            print(f'Error: {e}')
-        
-        print()
+    print()
 
 print("=" * 70)
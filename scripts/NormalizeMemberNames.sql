@@ -5,6 +5,9 @@
 --            (sin tildes, mayúsculas, espacios trimmed) para búsquedas rápidas
 --
 -- Ejecutar DESPUÉS de aplicar migración: AddCompleteNamesNormalized
+-- Los importadores Python (import_reimport_clean_status.py, import_complete_all_data.py,
+-- MigrationGenerator) ya emiten CompleteNamesNormalized en los INSERTs; este script
+-- solo hace falta para filas cargadas por otros medios.
 -- Tiempo estimado: ~2 segundos para 4,000 registros
 -- ==============================================================================
 
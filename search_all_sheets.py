@@ -1,59 +1,46 @@
-import zipfile
-import xml.etree.ElementTree as ET
+import sys
 from pathlib import Path
 
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from workbook_metadata import load_metadata
+
 file_path = Path('INSUMOS/(COL) PEREIRA CORTE NACIONAL.xlsx')
 
 print("=" * 70)
 print("BUSCANDO LISTA DESPLEGABLE EN TODAS LAS HOJAS")
 print("=" * 70)
 
-with zipfile.ZipFile(file_path) as zip_file:
-    # Listar todas las hojas disponibles
-    xml_files = [f for f in zip_file.namelist() if f.startswith('xl/worksheets/') and f.endswith('.xml')]
-    
-    print(f'\nHojas encontradas: {len(xml_files)}')
-    for xml_file in sorted(xml_files):
-        print(f'  - {xml_file}')
-    
-    # Buscar en cada hoja
-    ns = {'x': 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'}
+# Hojas y validaciones desde los metadatos cacheados (no se parsean las filas)
+sheets = load_metadata(file_path)['sheets']
+
+print(f'\nHojas encontradas: {len(sheets)}')
+for sheet in sorted(sheets, key=lambda sheet: sheet['part']):
+    print(f"  - {sheet['part']} ({sheet['name']})")
+
+# Buscar en cada hoja
+for sheet in sheets:
+    validations = sheet['validations']
     
-    for xml_file in xml_files:
-        worksheet_xml = zip_file.read(xml_file)
-        root = ET.fromstring(worksheet_xml)
-        
-        validations = root.findall('.//x:dataValidation', ns)
+    if validations:
+        print(f'\n{"=" * 70}')
+        print(f"VALIDACIONES EN: {sheet['part']} ({sheet['name']})")
+        print("=" * 70)
         
-        if validations:
-            print(f'\n{"=" * 70}')
-            print(f'VALIDACIONES EN: {xml_file}')
-            print("=" * 70)
+        for dv in validations:
+            print(f"\nRango: {dv['sqref']}")
+            print(f"  type: {dv['type']}")
+            print(f"  allow: {dv['attributes'].get('allow')}")
+            
+            if dv['values'] is not None:
+                # Lista literal o rango/nombre definido ya resuelto
+                print(f"  Formula1 (lista): {len(dv['values'])} valores")
+                for v in dv['values']:
+                    print(f'    • {v}')
+            elif dv['formula1']:
+                print(f"  Formula1: {dv['formula1']}")
             
-            for dv in validations:
-                sqref = dv.get('sqref')
-                dv_type = dv.get('type')
-                allow = dv.get('allow')
-                formula1_elem = dv.find('x:formula1', ns)
-                formula2_elem = dv.find('x:formula2', ns)
-                
-                print(f'\nRango: {sqref}')
-                print(f'  type: {dv_type}')
-                print(f'  allow: {allow}')
-                
-                if formula1_elem is not None and formula1_elem.text:
-                    text = formula1_elem.text
-                    # Si es una lista separada por comas
-                    if ',' in text:
-                        values = [v.strip().strip('"').strip("'") for v in text.split(',')]
-                        print(f'  Formula1 (lista): {len(values)} valores')
-                        for v in values:
-                            if v:
-                                print(f'    • {v}')
-                    else:
-                        print(f'  Formula1: {text}')
-                
-                if formula2_elem is not None:
-                    print(f'  Formula2: {formula2_elem.text}')
+            if dv['formula2'] is not None:
+                print(f"  Formula2: {dv['formula2']}")
 
 print("\n" + "=" * 70)
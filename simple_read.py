@@ -1,5 +1,13 @@
 import pandas as pd
-df = pd.read_excel(r"c:\Users\DanielVillamizar\COR L.A.MA\INSUMOS\(COL) PEREIRA CORTE NACIONAL.xlsx", sheet_name="ODOMETER", header=6)
+import sys
+from pathlib import Path
+
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from header_detect import find_header_row
+
+excel_path = r"c:\Users\DanielVillamizar\COR L.A.MA\INSUMOS\(COL) PEREIRA CORTE NACIONAL.xlsx"
+df = pd.read_excel(excel_path, sheet_name="ODOMETER", header=find_header_row(excel_path, "ODOMETER"))
 cols = list(df.columns)
 for i, c in enumerate(cols):
     print(f"{i+1}|{c}|{len(c)}|{ord(c[0]) if c else 0}")
@@ -0,0 +1,14 @@
+-- Agregar indice por [Order] a Members si no existe
+-- (los scripts de migracion vinculan cada vehiculo a su miembro por Order)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes
+               WHERE name = 'IX_Members_Order' AND object_id = OBJECT_ID('[dbo].[Members]'))
+BEGIN
+    CREATE INDEX [IX_Members_Order] ON [dbo].[Members]([Order]);
+    
+    PRINT 'Indice [IX_Members_Order] creado en Members';
+END
+ELSE
+BEGIN
+    PRINT 'Indice [IX_Members_Order] ya existe';
+END
+GO
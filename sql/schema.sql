@@ -34,6 +34,7 @@ CREATE TABLE [dbo].[Members] (
 );
 
 CREATE INDEX [IX_Members_ChapterId] ON [dbo].[Members]([ChapterId]);
+CREATE INDEX [IX_Members_Order] ON [dbo].[Members]([Order]); -- Vinculo de vehiculos por Order
 
 -- ============================================
 -- 3. VEHICLES
@@ -1,6 +1,12 @@
 from pathlib import Path
+import sys
 import zipfile
 
+# Modulos compartidos del ETL (python/)
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'python'))
+from header_detect import find_header_row
+from parse_cache import load_sheet_frame
+
 f = Path('INSUMOS/(COL) SABANA CORTE NACIONAL.xlsx')
 
 print(f'Archivo: {f.name}')
@@ -18,15 +24,14 @@ try:
         print(f'  Tiene workbook.xml: {has_workbook}')
         
         if has_workbook:
-            print('\nIntentando leer con pandas...')
-            import pandas as pd
+            print('\nIntentando leer ODOMETER (cache de parseo)...')
             try:
-                df = pd.read_excel(f, sheet_name='ODOMETER', header=7, nrows=10)
-                print(f'✓ Pandas puede leer el archivo')
+                df = load_sheet_frame(f, 'ODOMETER', header=find_header_row(f), nrows=10)
+                print(f'✓ La hoja ODOMETER se puede leer')
                 print(f'  Columnas: {len(df.columns)}')
                 print(f'  Primeras columnas: {list(df.columns[:5])}')
             except Exception as e2:
-                print(f'✗ Pandas error: {e2}')
+                print(f'✗ Error de lectura: {e2}')
         
 except Exception as e:
     print(f'✗ ERROR ZIP: {e}')